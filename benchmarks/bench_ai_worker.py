@@ -0,0 +1,43 @@
+"""Benchmark frame times while the engine searches in and out of the loop."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_worker import AIWorker  # noqa: E402
+from constants import FPS  # noqa: E402
+from engine import Engine  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+
+DEPTH = 6
+
+
+def main() -> None:
+    """Compare the longest frame of a blocking search with the worker."""
+    geometry = get_geometry(4)
+    frame = 1 / FPS
+
+    start = time.perf_counter()
+    Engine().search(Position(geometry), DEPTH)
+    blocking = time.perf_counter() - start
+
+    frames = []
+    with AIWorker(geometry, DEPTH) as worker:
+        worker.request(0, 0)
+        while True:
+            frame_start = time.perf_counter()
+            update = worker.poll()
+            time.sleep(max(0.0, frame - (time.perf_counter() - frame_start)))
+            frames.append(time.perf_counter() - frame_start)
+            if update is not None and update.move is not None:
+                break
+
+    print(f"blocking search frame: {blocking * 1000:8.1f} ms")
+    print(f"worker longest frame:  {max(frames) * 1000:8.1f} ms")
+    print(f"target frame:          {frame * 1000:8.1f} ms ({len(frames)} frames)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark streaming analytics against replaying through TicTacToe."""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analytics import analyze_archive  # noqa: E402
+from archive import ArchiveReader, ArchiveWriter  # noqa: E402
+from game_logic import TicTacToe  # noqa: E402
+
+GAMES = 200_000
+
+
+def main() -> None:
+    """Archive random games and time the analytics pipeline over them."""
+    rng = random.Random(0)
+    cells = [(row, col) for row in range(3) for col in range(3)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ArchiveWriter(directory, chunk_games=GAMES // 8) as writer:
+            for _ in range(GAMES):
+                rng.shuffle(cells)
+                writer.append(cells)
+
+        start = time.perf_counter()
+        with ArchiveReader(directory) as reader:
+            for moves in reader:
+                game = TicTacToe()
+                for row, col in moves:
+                    if not game.make_move(row, col):
+                        break
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analyze_archive(directory, processes=1)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats = analyze_archive(directory)
+        parallel = time.perf_counter() - start
+
+    print(f"TicTacToe replay:  {GAMES / naive:10,.0f} games/s")
+    print(f"pipeline serial:   {GAMES / serial:10,.0f} games/s")
+    print(f"pipeline parallel: {GAMES / parallel:10,.0f} games/s")
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
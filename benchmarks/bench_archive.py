@@ -0,0 +1,55 @@
+"""Benchmark archive writes, sequential scans and random access."""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from archive import ArchiveReader, ArchiveWriter  # noqa: E402
+
+GAMES = 1_000_000
+LOOKUPS = 200_000
+
+
+def main() -> None:
+    """Write an archive of random move orders and time reading it back."""
+    rng = random.Random(0)
+    cells = [(row, col) for row in range(3) for col in range(3)]
+    games = []
+    for _ in range(1000):
+        rng.shuffle(cells)
+        games.append(tuple(cells[: rng.randint(5, 9)]))
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with ArchiveWriter(directory) as writer:
+            for index in range(GAMES):
+                writer.append(games[index % len(games)])
+        written = time.perf_counter() - start
+
+        with ArchiveReader(directory) as reader:
+            size = sum(view.nbytes for view in reader.chunks)
+            start = time.perf_counter()
+            total = 0
+            for chunk in range(len(reader.chunks)):
+                for moves in reader.iter_cells(chunk):
+                    total += len(moves)
+            scanned = time.perf_counter() - start
+
+            indices = [rng.randrange(GAMES) for _ in range(LOOKUPS)]
+            start = time.perf_counter()
+            for index in indices:
+                reader[index]
+            looked_up = time.perf_counter() - start
+
+    print(f"archive size:  {size / GAMES:.1f} bytes/game")
+    print(f"append:        {GAMES / written:12,.0f} games/s")
+    print(f"sequential:    {GAMES / scanned:12,.0f} games/s")
+    print(f"random access: {LOOKUPS / looked_up:12,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
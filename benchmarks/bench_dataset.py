@@ -0,0 +1,66 @@
+"""Benchmark dataset export against encoding positions one cell at a time."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dataset import (  # noqa: E402
+    encode_planes,
+    export_dataset,
+    load_dataset,
+    reachable_positions,
+)
+
+REPEAT = 20
+
+
+def encode_naive(positions: list[tuple[int, int]], size: int) -> np.ndarray:
+    """Fill the planes cell by cell."""
+    planes = np.zeros((len(positions), 3, size, size), dtype=np.uint8)
+    for index, (x_bits, o_bits) in enumerate(positions):
+        for cell in range(size * size):
+            row, col = divmod(cell, size)
+            if x_bits >> cell & 1:
+                planes[index, 0, row, col] = 1
+            elif o_bits >> cell & 1:
+                planes[index, 1, row, col] = 1
+            else:
+                planes[index, 2, row, col] = 1
+    return planes
+
+
+def main() -> None:
+    """Time encoding, labelling and loading every reachable 3x3 position."""
+    positions = reachable_positions() * REPEAT
+
+    start = time.perf_counter()
+    encode_naive(positions, 3)
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encode_planes(positions, 3)
+    vectorized = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        shards = export_dataset(directory, reachable_positions())
+        export = time.perf_counter() - start
+
+        start = time.perf_counter()
+        total = sum(int(shard.value.sum()) for shard in load_dataset(directory))
+        load = time.perf_counter() - start
+
+    count = len(positions)
+    print(f"per-cell encoding:   {count / naive:12,.0f} positions/s")
+    print(f"vectorized encoding: {count / vectorized:12,.0f} positions/s")
+    print(f"full 3x3 export:     {export * 1000:10.1f} ms ({shards} shards)")
+    print(f"memory-mapped load:  {load * 1000:10.1f} ms (value sum {total})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark the vectorized environment against stepping single games."""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from environment import TicTacToeEnv, VectorEnv, random_policy  # noqa: E402
+
+SINGLE_STEPS = 20_000
+NUM_ENVS = 4096
+VECTOR_STEPS = 500
+
+
+def main() -> None:
+    """Time random self-play in both environments."""
+    rng = np.random.default_rng(0)
+
+    env = TicTacToeEnv()
+    _, info = env.reset()
+    start = time.perf_counter()
+    for _ in range(SINGLE_STEPS):
+        action = int(rng.choice(np.flatnonzero(info["action_mask"])))
+        _, _, terminated, _, info = env.step(action)
+        if terminated:
+            _, info = env.reset()
+    single = SINGLE_STEPS / (time.perf_counter() - start)
+
+    vector = VectorEnv(NUM_ENVS)
+    observations, info = vector.reset()
+    games = 0
+    start = time.perf_counter()
+    for _ in range(VECTOR_STEPS):
+        actions = random_policy(observations, info["action_mask"], rng)
+        observations, _, terminated, _, info = vector.step(actions)
+        games += int(terminated.sum())
+    elapsed = time.perf_counter() - start
+
+    print(f"single env:  {single:12,.0f} steps/s")
+    print(f"vector env:  {NUM_ENVS * VECTOR_STEPS / elapsed:12,.0f} steps/s")
+    print(f"             {games / elapsed:12,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark 15 x 15 five in a row against rescanning the board per move."""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from constants import GOMOKU_VIEW  # noqa: E402
+from engine import Engine  # noqa: E402
+from game_ui import GameUI  # noqa: E402
+from gomoku import SIZE, GomokuGame, GomokuPosition  # noqa: E402
+
+PLAYOUTS = 50
+SEARCH_SECONDS = 2.0
+OPENING_MOVES = 10
+FRAMES = 200
+
+
+def rescan_winner(board: list[list[str | None]]) -> str | None:
+    """Return the owner of five in a row, scanning like _check_winner."""
+    for row in range(SIZE):
+        for col in range(SIZE):
+            mark = board[row][col]
+            if mark is None:
+                continue
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if all(
+                    0 <= row + d_row * k < SIZE
+                    and 0 <= col + d_col * k < SIZE
+                    and board[row + d_row * k][col + d_col * k] == mark
+                    for k in range(1, 5)
+                ):
+                    return mark
+    return None
+
+
+def rescan_playout(rng: random.Random) -> None:
+    """Play a random game on a list board, rescanning it after each move.
+
+    Moves are picked near the stones, as GomokuPosition offers them.
+    """
+    board: list[list[str | None]] = [[None] * SIZE for _ in range(SIZE)]
+    mark = "x"
+    moves = [(SIZE // 2, SIZE // 2)]
+    while moves:
+        row, col = rng.choice(moves)
+        board[row][col] = mark
+        if rescan_winner(board):
+            return
+        mark = "o" if mark == "x" else "x"
+        moves = [
+            (row, col)
+            for row in range(SIZE)
+            for col in range(SIZE)
+            if board[row][col] is None
+            and any(
+                board[other_row][other_col] is not None
+                for other_row in range(max(0, row - 2), min(SIZE, row + 3))
+                for other_col in range(max(0, col - 2), min(SIZE, col + 3))
+            )
+        ]
+
+
+def incremental_playout(rng: random.Random) -> None:
+    """Play a random game on a GomokuPosition and take it back."""
+    position = GomokuPosition()
+    while not position.last_move_won() and not position.is_full():
+        position.make(rng.choice(position.legal_moves()))
+    while position.history:
+        position.unmake()
+
+
+def main() -> None:
+    """Report playout rates, branching, search speed and redraw time."""
+    for label, playout in (
+        ("rescanning the board", rescan_playout),
+        ("incremental windows", incremental_playout),
+    ):
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(PLAYOUTS):
+            playout(rng)
+        seconds = time.perf_counter() - start
+        print(f"random playouts, {label}: {PLAYOUTS / seconds:,.1f} games/s")
+
+    rng = random.Random(1)
+    game = GomokuGame()
+    for _ in range(OPENING_MOVES):
+        game.make_move(*divmod(rng.choice(game.position.legal_moves()), SIZE))
+    position = GomokuPosition(*game.key())
+    empty = SIZE * SIZE - OPENING_MOVES
+    print(
+        f"after {OPENING_MOVES} moves: {len(position.legal_moves())} candidate "
+        f"moves of {empty} empty cells"
+    )
+
+    engine = Engine()
+    start = time.perf_counter()
+    result = engine.think(position, SEARCH_SECONDS, SIZE * SIZE)
+    seconds = time.perf_counter() - start
+    print(
+        f"search: depth {result.depth} in {seconds:.2f}s, "
+        f"{result.nodes / seconds:,.0f} nodes/s"
+    )
+
+    for label, view in (("whole board", None), (f"{GOMOKU_VIEW}-cell view", GOMOKU_VIEW)):
+        ui = GameUI(SIZE, SIZE, view=view)
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            ui.draw_board()
+            ui.draw_symbols(game)
+        seconds = time.perf_counter() - start
+        print(f"redraw, {label}: {seconds / FRAMES * 1000:.2f} ms/frame")
+        ui.quit()
+
+
+if __name__ == "__main__":
+    main()
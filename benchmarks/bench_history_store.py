@@ -0,0 +1,40 @@
+"""Benchmark recording games into the history store."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from constants import PLAYER_X  # noqa: E402
+from history_store import HistoryStore  # noqa: E402
+from position import parse_board  # noqa: E402
+
+GAMES = 20_000
+MOVES = [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]
+
+
+def main() -> None:
+    """Time queueing, committing and querying games."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(Path(directory) / "history.db")
+        start = time.perf_counter()
+        for index in range(GAMES):
+            store.record_game(MOVES, PLAYER_X, f"player{index % 100}")
+        queued = time.perf_counter() - start
+        store.flush()
+        committed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reached = store.games_reaching(parse_board("xx.o....."))
+        queried = time.perf_counter() - start
+        store.close()
+
+    print(f"record_game (caller):  {queued / GAMES * 1e6:8.2f} us/game")
+    print(f"committed:             {GAMES / committed:10,.0f} games/s")
+    print(f"games_reaching:        {len(reached):,} games in {queried * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark the best-move API with single and batched requests."""
+
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game_logic import TicTacToe  # noqa: E402
+from http_api import BestMoveServer  # noqa: E402
+from position import format_board  # noqa: E402
+
+BOARDS = 2_000
+BATCH = 500
+
+
+def _random_boards(count: int) -> list[str]:
+    """Play random games and collect their intermediate boards."""
+    rng = random.Random(0)
+    boards: list[str] = []
+    while len(boards) < count:
+        game = TicTacToe()
+        cells = [(row, col) for row in range(3) for col in range(3)]
+        rng.shuffle(cells)
+        for row, col in cells:
+            if not game.make_move(row, col) or game.winner:
+                break
+            boards.append(format_board(game.board))
+    return boards[:count]
+
+
+def main() -> None:
+    """Time the same boards sent one per request and in batches."""
+    server = BestMoveServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    boards = _random_boards(BOARDS)
+
+    start = time.perf_counter()
+    for board in boards:
+        connection.request("GET", f"/best-move?board={board}")
+        connection.getresponse().read()
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, BOARDS, BATCH):
+        body = json.dumps({"boards": boards[offset : offset + BATCH]})
+        connection.request("POST", "/best-move", body=body)
+        connection.getresponse().read()
+    batched = time.perf_counter() - start
+
+    print(f"single requests:  {BOARDS / single:10,.0f} boards/s")
+    print(f"batched requests: {BOARDS / batched:10,.0f} boards/s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark response times of fixed-depth and time-budgeted searches."""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import engine as engine_module  # noqa: E402
+from engine import INFINITY, Engine  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+
+BOARDS = ((3, 3), (4, 4), (5, 4), (6, 4), (7, 5))
+POSITIONS = 5
+OPENING_MARKS = 2
+FIXED_DEPTH = 4
+SECONDS = 0.25
+WINDOW_DEPTH = 5
+
+
+def openings(size: int, win_length: int) -> list[Position]:
+    """Return positions after a few random moves."""
+    rng = random.Random(0)
+    geometry = get_geometry(size, win_length)
+    positions = []
+    for _ in range(POSITIONS):
+        position = Position(geometry)
+        for _ in range(OPENING_MARKS):
+            position.make(rng.choice(position.legal_moves()))
+        positions.append(Position(geometry, *position.key()))
+    return positions
+
+
+def timings(positions: list[Position], *, timed: bool) -> tuple[list[float], int]:
+    """Return the seconds per search and the deepest depth reached."""
+    seconds = []
+    depth = 0
+    for position in positions:
+        engine = Engine()
+        start = time.perf_counter()
+        if timed:
+            result = engine.think(position, SECONDS)
+        else:
+            result = engine.search(position, FIXED_DEPTH)
+        seconds.append(time.perf_counter() - start)
+        depth = max(depth, result.depth)
+    return seconds, depth
+
+
+def window_nodes(positions: list[Position], window: int) -> int:
+    """Return the nodes of deepening to WINDOW_DEPTH with a given window."""
+    engine_module.ENGINE_ASPIRATION_WINDOW = window
+    return sum(
+        Engine().think(position, 3600.0, WINDOW_DEPTH).nodes for position in positions
+    )
+
+
+def main() -> None:
+    """Report response times per board and the nodes aspiration saves."""
+    for size, win_length in BOARDS:
+        positions = openings(size, win_length)
+        for label, timed in ((f"depth {FIXED_DEPTH}", False), (f"{SECONDS}s", True)):
+            seconds, depth = timings(positions, timed=timed)
+            print(
+                f"{size}x{size} k{win_length}, {label:>9}: "
+                f"mean {1000 * statistics.mean(seconds):8.1f} ms, "
+                f"max {1000 * max(seconds):8.1f} ms, depth up to {depth}"
+            )
+
+    positions = openings(4, 4)
+    window = engine_module.ENGINE_ASPIRATION_WINDOW
+    full = window_nodes(positions, INFINITY)
+    narrow = window_nodes(positions, window)
+    print(
+        f"4x4 deepening to {WINDOW_DEPTH}: {full:,} nodes with full windows, "
+        f"{narrow:,} with aspiration windows of {window}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Benchmark self-play training throughput across batch sizes."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from learner import TabularLearner  # noqa: E402
+
+GAMES = 150_000
+
+
+def main() -> None:
+    """Train on 3x3 with growing batches and report games/s and strength."""
+    for num_envs in (16, 128, 1024):
+        learner = TabularLearner()
+        report = learner.train(GAMES if num_envs > 16 else GAMES // 10, num_envs, seed=1)
+        print(
+            f"{num_envs:5} envs: {report.games_per_second:10,.0f} games/s, "
+            f"optimal moves {learner.optimal_move_rate():.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Benchmark matchmaking join and pairing throughput."""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from matchmaking import Matchmaker  # noqa: E402
+
+PLAYERS = 100_000
+
+
+def main() -> None:
+    """Queue a burst of players, pair them, and print throughput."""
+    rng = random.Random(0)
+    ratings = [int(rng.gauss(1500, 300)) for _ in range(PLAYERS)]
+    matchmaker = Matchmaker()
+
+    start = time.perf_counter()
+    for player, rating in enumerate(ratings):
+        matchmaker.join(player, rating, preference=player % 2)
+    joined = time.perf_counter()
+    matches = matchmaker.pair()
+    paired = time.perf_counter()
+
+    print(f"joins:   {PLAYERS / (joined - start):12,.0f} /s")
+    print(f"pairing: {len(matches) / (paired - joined):12,.0f} matches/s")
+    print(f"left in queue: {matchmaker.queue_depth}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark the per-move overhead of the write-ahead log."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game_logic import TicTacToe  # noqa: E402
+from move_log import MoveLog  # noqa: E402
+
+GAMES = 20_000
+MOVES = [(0, 0), (1, 1), (0, 1), (0, 2), (2, 0), (1, 0), (1, 2), (2, 1), (2, 2)]
+
+
+def main() -> None:
+    """Play many games with and without the log and print per-move cost."""
+    start = time.perf_counter()
+    for _ in range(GAMES):
+        game = TicTacToe()
+        for row, col in MOVES:
+            game.make_move(row, col)
+    plain = (time.perf_counter() - start) / (GAMES * len(MOVES))
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = MoveLog(directory)
+        start = time.perf_counter()
+        for game_id in range(GAMES):
+            for row, col in MOVES:
+                log.make_move(game_id, row, col)
+            log.end_game(game_id)
+        log.close()
+        logged = (time.perf_counter() - start) / (GAMES * len(MOVES))
+
+    print(f"make_move:         {plain * 1e6:6.2f} us/move")
+    print(f"logged make_move:  {logged * 1e6:6.2f} us/move")
+    print(f"logging overhead:  {(logged - plain) * 1e6:6.2f} us/move")
+
+
+if __name__ == "__main__":
+    main()
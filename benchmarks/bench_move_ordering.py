@@ -0,0 +1,43 @@
+"""Benchmark engine nodes and time with and without move ordering."""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from engine import Engine  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+
+SEARCHES = (((3, 3), 9), ((4, 4), 7), ((5, 4), 5), ((6, 4), 4))
+OPENINGS = 4  # positions per board, after 0, 2, 4 and 6 random moves
+
+
+def run(size: int, win_length: int, depth: int, ordering: bool) -> tuple[int, float]:
+    """Search the same openings and return total nodes and seconds."""
+    rng = random.Random(0)
+    nodes = 0
+    start = time.perf_counter()
+    for opening in range(OPENINGS):
+        position = Position(get_geometry(size, win_length))
+        for _ in range(2 * opening):
+            position.make(rng.choice(position.legal_moves()))
+        nodes += Engine(ordering=ordering).search(position, depth).nodes
+    return nodes, time.perf_counter() - start
+
+
+def main() -> None:
+    """Report node counts before and after move ordering."""
+    for (size, win_length), depth in SEARCHES:
+        plain_nodes, plain_seconds = run(size, win_length, depth, ordering=False)
+        nodes, seconds = run(size, win_length, depth, ordering=True)
+        print(
+            f"{size}x{size} k{win_length} depth {depth}: "
+            f"{plain_nodes:7,} -> {nodes:7,} nodes ({plain_nodes / nodes:.1f}x), "
+            f"{plain_seconds:5.2f}s -> {seconds:5.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
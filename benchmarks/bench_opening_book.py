@@ -0,0 +1,81 @@
+"""Benchmark opening book generation, lookups and first-move latency."""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from engine import Engine  # noqa: E402
+from opening_book import OpeningBook, generate_book, write_book  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+
+SIZE = 5
+WIN_LENGTH = 4
+PLIES = 3
+DEPTH = 4
+LOOKUPS = 20_000
+
+
+def early_positions(book: OpeningBook, count: int) -> list[tuple[int, int]]:
+    """Return random early positions in random orientations."""
+    rng = random.Random(0)
+    geometry = book.geometry
+    positions = []
+    while len(positions) < count:
+        position = Position(geometry)
+        for _ in range(rng.randrange(PLIES)):
+            position.make(rng.choice(position.legal_moves()))
+        x_bits, o_bits, _ = geometry.canonical(*position.key())
+        symmetry = rng.choice(geometry.symmetries)
+        positions.append(
+            tuple(
+                sum(
+                    1 << symmetry[cell]
+                    for cell in range(geometry.cells)
+                    if bits >> cell & 1
+                )
+                for bits in (x_bits, o_bits)
+            )
+        )
+    return positions
+
+
+def main() -> None:
+    """Report generation time, book size, lookup rate and move latency."""
+    geometry = get_geometry(SIZE, WIN_LENGTH)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.book"
+        start = time.perf_counter()
+        book = generate_book(geometry, PLIES, DEPTH)
+        write_book(path, book, geometry, PLIES)
+        print(
+            f"{SIZE}x{SIZE} k{WIN_LENGTH} book, {PLIES} plies at depth {DEPTH}: "
+            f"{len(book):,} positions in {time.perf_counter() - start:.2f}s, "
+            f"{path.stat().st_size:,} bytes"
+        )
+
+        with OpeningBook(path) as opening_book:
+            positions = early_positions(opening_book, LOOKUPS)
+            start = time.perf_counter()
+            for x_bits, o_bits in positions:
+                opening_book.choose(x_bits, o_bits)
+            seconds = time.perf_counter() - start
+            print(f"lookups: {LOOKUPS / seconds:,.0f}/s")
+
+            start = time.perf_counter()
+            opening_book.choose(0, 0)
+            book_ms = 1000 * (time.perf_counter() - start)
+        start = time.perf_counter()
+        Engine().search(Position(geometry), DEPTH)
+        search_ms = 1000 * (time.perf_counter() - start)
+        print(
+            f"first move: book {book_ms:.3f} ms, "
+            f"depth {DEPTH} search {search_ms:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Benchmark Lazy SMP time-to-depth as workers are added."""
+
+import os
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from parallel_search import time_to_depth  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+
+ROUNDS = 3
+SEARCHES = (((4, 4), 7), ((5, 4), 5))
+
+
+def main() -> None:
+    """Report the median time to reach a fixed depth for 1, 2, 4... workers."""
+    most = max(os.cpu_count() or 1, 2)
+    for (size, win_length), depth in SEARCHES:
+        position = Position(get_geometry(size, win_length))
+        baseline = None
+        workers = 1
+        while workers <= most:
+            seconds = statistics.median(
+                time_to_depth(position, depth, workers) for _ in range(ROUNDS)
+            )
+            baseline = baseline or seconds
+            print(
+                f"{size}x{size} k{win_length} depth {depth}, {workers} workers: "
+                f"{seconds * 1000:7.1f} ms ({baseline / seconds:.2f}x)"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark AI reply latency with and without pondering."""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_worker import AIWorker  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+
+THINK_TIME = 2.0  # seconds the simulated human takes per move
+GAMES = (((4, 4), 6), ((5, 4), 4))
+
+
+def wait_for_move(worker: AIWorker) -> int:
+    """Poll until the worker answers and return the chosen cell."""
+    while True:
+        update = worker.poll()
+        if update is not None and update.move is not None:
+            row, col = update.move
+            return row * worker.geometry.size + col
+        time.sleep(0.0005)
+
+
+def play(size: int, win_length: int, depth: int, ponder: bool) -> list[float]:
+    """Play one game against random human moves and time every AI reply."""
+    rng = random.Random(0)
+    geometry = get_geometry(size, win_length)
+    position = Position(geometry)
+    latencies = []
+    with AIWorker(geometry, depth) as worker:
+        while True:
+            if ponder:
+                worker.ponder(*position.key())
+            time.sleep(THINK_TIME)
+            position.make(rng.choice(position.legal_moves()))
+            if position.last_move_won() or position.is_full():
+                return latencies
+
+            start = time.perf_counter()
+            worker.request(*position.key())
+            position.make(wait_for_move(worker))
+            latencies.append(time.perf_counter() - start)
+            if position.last_move_won() or position.is_full():
+                return latencies
+
+
+def main() -> None:
+    """Compare median reply latency with and without pondering."""
+    for (size, win_length), depth in GAMES:
+        for ponder in (False, True):
+            latencies = sorted(play(size, win_length, depth, ponder))
+            median = latencies[len(latencies) // 2]
+            label = "pondering" if ponder else "no ponder"
+            print(
+                f"{size}x{size} k={win_length} depth {depth} {label}: "
+                f"median {median * 1000:8.1f} ms, "
+                f"max {latencies[-1] * 1000:8.1f} ms over {len(latencies)} replies"
+            )
+
+
+if __name__ == "__main__":
+    main()
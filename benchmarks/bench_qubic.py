@@ -0,0 +1,141 @@
+"""Benchmark Qubic make/unmake, search and caching on the 4 x 4 x 4 cube.
+
+The cube's tree is far larger than a 3 x 3 board's, so this is the heavy
+benchmark for the engine, its transposition tables and Lazy SMP.
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from engine import Engine  # noqa: E402
+from parallel_search import time_to_depth  # noqa: E402
+from qubic import LINES, QubicPosition  # noqa: E402
+from transposition import TranspositionTable  # noqa: E402
+
+PLAYOUTS = 2_000
+OPENING_MOVES = 6
+DEPTH = 4
+BUDGETS = (0.0625, 1, 16)
+THINK_SECONDS = 2.0
+
+
+def rescan_playout(rng: random.Random) -> None:
+    """Play a random game scanning every line for the engine's questions.
+
+    Each move is followed by the win check, evaluation and threat search a
+    search node asks for, and the game is taken back at the end.
+    """
+    bits = [0, 0]
+    history = []
+    while True:
+        player = len(history) % 2
+        empty = [grid for grid in range(64) if not (bits[0] | bits[1]) >> grid & 1]
+        if not empty:
+            break
+        grid = rng.choice(empty)
+        bits[player] |= 1 << grid
+        history.append(grid)
+        mine, theirs = bits[player], bits[player ^ 1]
+        if any(mine & line == line for line in LINES):
+            break
+        score = threats = 0
+        for line in LINES:
+            own = (mine & line).bit_count()
+            other = (theirs & line).bit_count()
+            if own and not other:
+                score += 10**own
+                threats |= line if own == 3 else 0
+            elif other and not own:
+                score -= 10**other
+                threats |= line if other == 3 else 0
+    while history:
+        bits[(len(history) - 1) % 2] &= ~(1 << history.pop())
+
+
+def incremental_playout(rng: random.Random) -> None:
+    """Play the same random game on a QubicPosition and take it back."""
+    position = QubicPosition()
+    while not position.is_full():
+        position.make(rng.choice(position.legal_moves()))
+        if position.last_move_won():
+            break
+        position.evaluate()
+        position.threats()
+    while position.history:
+        position.unmake()
+
+
+def opening(rng: random.Random) -> QubicPosition:
+    """Return a position after a few random moves, without a threat."""
+    while True:
+        position = QubicPosition()
+        for _ in range(OPENING_MOVES):
+            position.make(rng.choice(position.legal_moves()))
+        if position.threats() == (0, 0):
+            return QubicPosition(*position.key())
+
+
+def main() -> None:
+    """Report playout rates, table behaviour, thinking and Lazy SMP speedup."""
+    for label, playout in (
+        ("rescanning 76 lines", rescan_playout),
+        ("incremental counters", incremental_playout),
+    ):
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(PLAYOUTS):
+            playout(rng)
+        seconds = time.perf_counter() - start
+        print(f"random playouts, {label}: {PLAYOUTS / seconds:,.0f} games/s")
+
+    position = opening(random.Random(1))
+    print(f"depth {DEPTH} from a {OPENING_MOVES}-move opening")
+    table = {}
+    start = time.perf_counter()
+    result = Engine(table).search(position, DEPTH)
+    seconds = time.perf_counter() - start
+    print(
+        f"  dict      : {seconds * 1000:8.1f} ms, {result.nodes:8,} nodes, "
+        f"{len(table):8,} entries"
+    )
+    for megabytes in BUDGETS:
+        table = TranspositionTable(megabytes)
+        start = time.perf_counter()
+        result = Engine(table).search(position, DEPTH)
+        seconds = time.perf_counter() - start
+        stats = table.stats()
+        print(
+            f"  {megabytes:6g} MB : {seconds * 1000:8.1f} ms, "
+            f"{result.nodes:8,} nodes, hit rate {stats.hit_rate:5.1%}, "
+            f"collisions {stats.collision_rate:5.1%}, fill {stats.fill:5.1%}"
+        )
+
+    engine = Engine()
+    start = time.perf_counter()
+    result = engine.think(QubicPosition(), THINK_SECONDS)
+    seconds = time.perf_counter() - start
+    print(
+        f"search from the empty cube: depth {result.depth} in {seconds:.2f}s, "
+        f"{result.nodes / seconds:,.0f} nodes/s"
+    )
+
+    most = max(os.cpu_count() or 1, 2)
+    baseline = None
+    workers = 1
+    while workers <= most:
+        seconds = time_to_depth(position, DEPTH, workers)
+        baseline = baseline or seconds
+        print(
+            f"Lazy SMP depth {DEPTH}, {workers} workers: "
+            f"{seconds * 1000:8.1f} ms ({baseline / seconds:.2f}x)"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark the retrograde solver on 3x3 and 4x4 boards."""
+
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from retrograde import RetrogradeTable  # noqa: E402
+
+SIZES = (3, 4)
+LOOKUPS = 100_000
+
+
+def main() -> None:
+    """Report solve time, table size and memory-mapped lookup speed."""
+    for size in SIZES:
+        start = time.perf_counter()
+        table = RetrogradeTable.solve(size)
+        seconds = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"{size}x{size}: {table.values.size:>12,} codes solved in "
+            f"{seconds:6.2f}s (peak RSS {peak:,.0f} MB)"
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "values.npy"
+            table.save(path)
+            mapped = RetrogradeTable.load(path, size)
+            start = time.perf_counter()
+            for step in range(LOOKUPS):
+                mapped.values[step * 7919 % mapped.values.size]
+            seconds = time.perf_counter() - start
+            print(f"      memory-mapped lookups: {LOOKUPS / seconds:,.0f}/s")
+            del mapped
+
+
+if __name__ == "__main__":
+    main()
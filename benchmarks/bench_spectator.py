@@ -0,0 +1,45 @@
+"""Benchmark spectator fan-out against per-spectator full-state sends."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game_logic import TicTacToe  # noqa: E402
+from spectator import GameBroadcast  # noqa: E402
+from wire import encode_board  # noqa: E402
+
+SPECTATORS = 5_000
+MOVES = [(0, 0), (1, 1), (0, 1), (0, 2), (2, 0), (1, 0), (1, 2), (2, 1), (2, 2)]
+
+
+def main() -> None:
+    """Play a full game to many spectators and print delivery rates."""
+    broadcast = GameBroadcast(TicTacToe())
+    subscribers = [broadcast.subscribe() for _ in range(SPECTATORS)]
+    for subscriber in subscribers:
+        subscriber.drain()
+
+    start = time.perf_counter()
+    for row, col in MOVES:
+        broadcast.make_move(row, col)
+        for subscriber in subscribers:
+            subscriber.drain()
+    elapsed = time.perf_counter() - start
+
+    game = TicTacToe()
+    full_start = time.perf_counter()
+    for row, col in MOVES:
+        game.make_move(row, col)
+        for _ in range(SPECTATORS):
+            encode_board(game)
+    full_elapsed = time.perf_counter() - full_start
+
+    deliveries = SPECTATORS * len(MOVES)
+    print(f"delta fan-out:    {deliveries / elapsed:12,.0f} deliveries/s")
+    print(f"full-state sends: {deliveries / full_elapsed:12,.0f} deliveries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark tablebase generation, lookups and engine endgames."""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from engine import Engine  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+from tablebase import Tablebase, generate_tablebase, slice_entries  # noqa: E402
+
+SIZE = 4
+MIN_MARKS = 0
+LOOKUPS = 20_000
+ENDGAMES = 20
+ENDGAME_MARKS = 8
+
+
+def random_boards(count: int, marks: int) -> list[tuple[int, int]]:
+    """Return random boards with the given number of marks."""
+    rng = random.Random(0)
+    boards = []
+    for _ in range(count):
+        cells = rng.sample(range(SIZE * SIZE), marks)
+        x_bits = sum(1 << cell for cell in cells[0::2])
+        o_bits = sum(1 << cell for cell in cells[1::2])
+        boards.append((x_bits, o_bits))
+    return boards
+
+
+def random_endgames(count: int) -> list[Position]:
+    """Return unfinished positions reached by random play."""
+    rng = random.Random(1)
+    geometry = get_geometry(SIZE)
+    positions = []
+    while len(positions) < count:
+        position = Position(geometry)
+        for _ in range(ENDGAME_MARKS):
+            position.make(rng.choice(position.legal_moves()))
+            if position.last_move_won():
+                break
+        if not position.last_move_won():
+            positions.append(Position(geometry, *position.key()))
+    return positions
+
+
+def main() -> None:
+    """Report generation time, lookup rates and engine node counts."""
+    entries = sum(slice_entries(SIZE * SIZE, marks) for marks in range(SIZE * SIZE + 1))
+    with tempfile.TemporaryDirectory() as directory:
+        for processes in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            generate_tablebase(directory, SIZE, None, MIN_MARKS, processes)
+            seconds = time.perf_counter() - start
+            print(
+                f"{SIZE}x{SIZE} generation, {processes} processes: {seconds:6.2f}s "
+                f"({entries / seconds:,.0f} boards/s)"
+            )
+        size = sum(path.stat().st_size for path in Path(directory).iterdir())
+        print(f"on disk: {size:,} bytes for {entries:,} boards")
+
+        with Tablebase(directory) as tablebase:
+            boards = random_boards(LOOKUPS, 10)
+            for label in ("cold cache", "warm cache"):
+                start = time.perf_counter()
+                for x_bits, o_bits in boards:
+                    tablebase.score(x_bits, o_bits)
+                seconds = time.perf_counter() - start
+                print(f"lookups, {label}: {LOOKUPS / seconds:,.0f}/s")
+
+            endgames = random_endgames(ENDGAMES)
+            for label, engine in (
+                ("search only", Engine()),
+                ("with tablebase", Engine(tablebase=tablebase)),
+            ):
+                nodes = 0
+                start = time.perf_counter()
+                for position in endgames:
+                    engine.clear()
+                    nodes += engine.search(position).nodes
+                seconds = time.perf_counter() - start
+                print(
+                    f"{ENDGAMES} exact endgames from {ENDGAME_MARKS} marks, "
+                    f"{label}: {nodes:,} nodes, {seconds:.2f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
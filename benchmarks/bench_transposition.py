@@ -0,0 +1,46 @@
+"""Benchmark fixed-memory transposition tables against an unbounded dict."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from engine import Engine  # noqa: E402
+from position import Position, get_geometry  # noqa: E402
+from transposition import TranspositionTable  # noqa: E402
+
+SEARCHES = (((4, 4), 7), ((5, 4), 5))
+BUDGETS = (0.0625, 1, 16)
+
+
+def main() -> None:
+    """Report search time, nodes and table usage for each table."""
+    for (size, win_length), depth in SEARCHES:
+        position = Position(get_geometry(size, win_length))
+        print(f"{size}x{size} k{win_length} depth {depth}")
+
+        table = {}
+        start = time.perf_counter()
+        result = Engine(table).search(position, depth)
+        seconds = time.perf_counter() - start
+        print(
+            f"  dict      : {seconds * 1000:7.1f} ms, {result.nodes:8,} nodes, "
+            f"{len(table):8,} entries"
+        )
+
+        for megabytes in BUDGETS:
+            table = TranspositionTable(megabytes)
+            start = time.perf_counter()
+            result = Engine(table).search(position, depth)
+            seconds = time.perf_counter() - start
+            stats = table.stats()
+            print(
+                f"  {megabytes:6g} MB : {seconds * 1000:7.1f} ms, "
+                f"{result.nodes:8,} nodes, hit rate {stats.hit_rate:5.1%}, "
+                f"collisions {stats.collision_rate:5.1%}, fill {stats.fill:5.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark ultimate tic-tac-toe bitboards against nine TicTacToe objects."""
+
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from constants import GAME_ACTIVE, GAME_WON, PLAYER_O, PLAYER_X  # noqa: E402
+from engine import Engine  # noqa: E402
+from game_logic import TicTacToe  # noqa: E402
+from simulation import engine_player, random_player, simulate  # noqa: E402
+from ultimate import UltimatePosition  # noqa: E402
+
+PLAYOUTS = 2_000
+SEARCH_SECONDS = 2.0
+GAMES = 4
+
+
+def naive_playout(rng: random.Random) -> None:
+    """Play a random game on nine TicTacToe objects, copying each state."""
+    boards = [TicTacToe() for _ in range(9)]
+    forced = None
+    player = PLAYER_X
+    meta = TicTacToe()
+    while meta.game_state == GAME_ACTIVE:
+        allowed = [
+            index
+            for index, board in enumerate(boards)
+            if board.game_state == GAME_ACTIVE and (forced is None or index == forced)
+        ] or [
+            index
+            for index, board in enumerate(boards)
+            if board.game_state == GAME_ACTIVE
+        ]
+        if not allowed:
+            return
+        moves = [
+            (index, row, col)
+            for index in allowed
+            for row in range(3)
+            for col in range(3)
+            if boards[index].board[row][col] is None
+        ]
+        index, row, col = rng.choice(moves)
+        # A search would keep the state of every node it visits
+        boards = copy.deepcopy(boards)
+        board = boards[index]
+        board.current_player = player
+        board.make_move(row, col)
+        if board.game_state == GAME_WON:
+            meta.current_player = player
+            meta.make_move(*divmod(index, 3))
+        forced = row * 3 + col
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def bitboard_playout(rng: random.Random) -> None:
+    """Play a random game on an UltimatePosition and take it back."""
+    position = UltimatePosition()
+    while not position.last_move_won() and not position.is_full():
+        position.make(rng.choice(position.legal_moves()))
+    while position.history:
+        position.unmake()
+
+
+def main() -> None:
+    """Report playout rates, search speed and engine self-play."""
+    for label, playout, count in (
+        ("nine TicTacToe objects", naive_playout, PLAYOUTS // 20),
+        ("bitboards", bitboard_playout, PLAYOUTS),
+    ):
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(count):
+            playout(rng)
+        seconds = time.perf_counter() - start
+        print(f"random playouts, {label}: {count / seconds:,.0f} games/s")
+
+    engine = Engine()
+    start = time.perf_counter()
+    result = engine.think(UltimatePosition(), SEARCH_SECONDS, 64)
+    seconds = time.perf_counter() - start
+    print(
+        f"search from the empty board: depth {result.depth} in {seconds:.2f}s, "
+        f"{result.nodes / seconds:,.0f} nodes/s"
+    )
+
+    report = simulate(
+        UltimatePosition,
+        (engine_player(64, 0.05), random_player(random.Random(1))),
+        GAMES,
+    )
+    print(
+        f"engine (50 ms) against random: {report.x_wins}/{report.games} won, "
+        f"{report.moves_per_second:,.1f} moves/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark the binary wire format against JSON."""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game_logic import TicTacToe  # noqa: E402
+from wire import SNAPSHOT_SIZE, decode_board, encode_board, encode_board_into  # noqa: E402
+
+ROUNDS = 200_000
+
+
+def _as_dict(game: TicTacToe) -> dict:
+    return {
+        "board": game.board,
+        "current_player": game.current_player,
+        "game_state": game.game_state,
+        "winner": game.winner,
+    }
+
+
+def _from_json(text: str, game: TicTacToe) -> TicTacToe:
+    state = json.loads(text)
+    game.board = state["board"]
+    game.current_player = state["current_player"]
+    game.game_state = state["game_state"]
+    game.winner = state["winner"]
+    return game
+
+
+def main() -> None:
+    """Run the benchmark and print per-operation timings."""
+    game = TicTacToe()
+    for row, col in ((0, 0), (1, 1), (0, 1), (2, 2)):
+        game.make_move(row, col)
+
+    target = TicTacToe()
+    snapshot = encode_board(game)
+    text = json.dumps(_as_dict(game))
+    buffer = bytearray(SNAPSHOT_SIZE)
+
+    cases = {
+        "wire encode": lambda: encode_board(game),
+        "wire encode_into": lambda: encode_board_into(game, buffer),
+        "wire decode": lambda: decode_board(snapshot, 0, target),
+        "json encode": lambda: json.dumps(_as_dict(game)),
+        "json decode": lambda: _from_json(text, target),
+    }
+    print(f"size: wire={len(snapshot)} bytes, json={len(text)} bytes")
+    for name, func in cases.items():
+        seconds = timeit.timeit(func, number=ROUNDS)
+        print(f"{name:18s} {seconds / ROUNDS * 1e9:8.0f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Background AI worker that keeps engine search out of the event loop.
+
+The engine runs in a separate process fed by a request queue. Progress
+reports and the chosen move come back on a response queue, which the game
+loop drains without blocking once per frame. Every request carries a
+generation number; bumping the shared generation cancels the search in
+flight, and anything the worker still sends for an older generation is
+dropped. Searches deepen until a per-move time budget runs out, so the
+answer comes in the same time on any board.
+
+While the human is to move the worker ponders: it searches the position
+after each of the human's replies, predicted best reply first, and keeps
+the results. The engine keeps its transposition table between searches,
+so even a reply that was not reached in time is searched faster.
+
+Requests carry a position's key. Standard boards are rebuilt as Position;
+other variants pass a position class that is built from its own key.
+"""
+
+import functools
+import multiprocessing
+import queue
+import random
+from collections.abc import Callable
+from multiprocessing.queues import Queue, SimpleQueue
+from multiprocessing.sharedctypes import Synchronized
+from pathlib import Path
+from typing import NamedTuple
+
+from constants import AI_CLOSE_TIMEOUT, AI_MOVE_SECONDS
+from engine import Engine, SearchAbortedError, SearchPosition, SearchResult
+from opening_book import OpeningBook
+from position import Geometry, Position, get_geometry
+from tablebase import Tablebase
+
+_SEARCH = 0
+_PONDER = 1
+
+_PROGRESS = 0
+_RESULT = 1
+
+
+class AIUpdate(NamedTuple):
+    """Latest news from the worker for the current request.
+
+    move is None while the search is still running.
+    """
+
+    progress: float
+    move: tuple[int, int] | None
+    score: int | None
+
+
+def _serve(  # noqa: PLR0913
+    requests: SimpleQueue,
+    responses: Queue,
+    generation: Synchronized,
+    new_position: Callable[..., SearchPosition],
+    depth: int | None,
+    seconds: float | None,
+    tablebase: str | Path | None,
+    book: str | Path | None,
+) -> None:
+    """Answer search and ponder requests until a None request arrives."""
+    engine = Engine(tablebase=Tablebase(tablebase) if tablebase else None)
+    opening_book = OpeningBook(book) if book else None
+    rng = random.Random()  # noqa: S311
+    pondered: dict[tuple[int, ...], SearchResult] = {}
+    while (request := requests.get()) is not None:
+        kind, request_id, state = request
+        if generation.value != request_id:
+            continue
+
+        def progress(done: int, total: int, request_id: int = request_id) -> None:
+            responses.put((_PROGRESS, request_id, done / total))
+
+        def should_stop(request_id: int = request_id) -> bool:
+            return generation.value != request_id
+
+        position = new_position(*state)
+        if kind == _PONDER:
+            pondered = {}
+            _ponder(engine, position, depth, should_stop, pondered)
+            continue
+
+        move = None if opening_book is None else opening_book.choose(*state, rng)
+        if move is not None:
+            responses.put((_RESULT, request_id, move, None))
+            continue
+
+        result = pondered.get(state)
+        try:
+            if result is None and seconds is None:
+                result = engine.search(position, depth, progress, should_stop)
+            elif result is None:
+                result = engine.think(position, seconds, depth, progress, should_stop)
+        except SearchAbortedError:
+            continue
+        responses.put((_RESULT, request_id, result.move, result.score))
+
+
+def _ponder(
+    engine: Engine,
+    position: SearchPosition,
+    depth: int | None,
+    should_stop: Callable[[], bool],
+    pondered: dict[tuple[int, ...], SearchResult],
+) -> None:
+    """Search the position after each reply, deeper and deeper, until told to stop.
+
+    Each round thinks about every reply one ply deeper than the last, the
+    reply the engine expects first, so all replies have an answer early and
+    the answers improve the longer the opponent takes. Replies whose search
+    has reached its deepest useful depth drop out. pondered keeps the
+    deepest completed search of each reply.
+    """
+    moves = position.legal_moves()
+    if not moves:
+        return
+    try:
+        expected = engine.search(position, 1, should_stop=should_stop).move
+        replies = []
+        for move in [expected, *(move for move in moves if move != expected)]:
+            position.make(move)
+            if not position.last_move_won() and not position.is_full():
+                deepest = len(position.legal_moves())
+                replies.append((move, min(depth or deepest, deepest)))
+            position.unmake()
+        iteration = 1
+        while replies:
+            deeper = []
+            for move, deepest in replies:
+                position.make(move)
+                try:
+                    result = engine.think(
+                        position, None, iteration, should_stop=should_stop
+                    )
+                    pondered[position.key()] = result
+                finally:
+                    position.unmake()
+                # think() stops early once the result is decided
+                if result.depth == iteration < deepest:
+                    deeper.append((move, deepest))
+            replies = deeper
+            iteration += 1
+    except SearchAbortedError:
+        return
+
+
+def _check_board(found: Geometry, expected: Geometry, path: str | Path) -> None:
+    """Raise ValueError if a file was made for a different board."""
+    if (found.size, found.win_length) != (expected.size, expected.win_length):
+        msg = (
+            f"{path} is for {found.size}x{found.size} with {found.win_length} "
+            f"in a row, not {expected.size}x{expected.size} with "
+            f"{expected.win_length} in a row"
+        )
+        raise ValueError(msg)
+
+
+class AIWorker:
+    """Engine search in a background process."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        geometry: Geometry | None = None,
+        depth: int | None = None,
+        tablebase: str | Path | None = None,
+        book: str | Path | None = None,
+        seconds: float | None = AI_MOVE_SECONDS,
+        variant: type[SearchPosition] | None = None,
+    ) -> None:
+        """Start the worker process.
+
+        Args:
+            geometry: Board geometry, defaulting to the game's board
+            depth: Search depth in plies, defaulting to an exact search;
+                with a time budget it is the deepest iteration tried
+            tablebase: Directory of tablebase slices for the same board;
+                standard boards only
+            book: Opening book file for the same board, standard boards
+                only; book moves are played without searching
+            seconds: Thinking time per move; None searches to the full
+                depth however long it takes
+            variant: Position class of another game, built from the keys
+                passed to request() and ponder(); its size attribute is
+                the number of columns its moves are numbered by
+
+        Raises:
+            ValueError: If a tablebase or book is given with a variant, or
+                was made for another board
+
+        """
+        if variant is not None and (tablebase or book):
+            msg = "tablebases and opening books only cover the standard board"
+            raise ValueError(msg)
+        self.geometry = geometry or get_geometry()
+        if tablebase:
+            with Tablebase(tablebase) as table:
+                _check_board(table.geometry, self.geometry, tablebase)
+        if book:
+            with OpeningBook(book) as opening_book:
+                _check_board(opening_book.geometry, self.geometry, book)
+        if variant is None:
+            new_position = functools.partial(Position, self.geometry)
+            self.size = self.geometry.size
+        else:
+            new_position = variant
+            self.size = variant.size
+        context = multiprocessing.get_context("fork")
+        self._generation = context.Value("q", 0, lock=False)
+        self._requests = context.SimpleQueue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=_serve,
+            args=(
+                self._requests,
+                self._responses,
+                self._generation,
+                new_position,
+                depth,
+                seconds,
+                tablebase,
+                book,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        self.pending: tuple[int, ...] | None = None
+        self.pondering: tuple[int, ...] | None = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether a search is in flight."""
+        return self.pending is not None
+
+    def request(self, *state: int) -> None:
+        """Start searching a position, cancelling any search in flight.
+
+        Args:
+            state: Key of the position, (x_bits, o_bits) for standard boards
+
+        """
+        self._generation.value += 1
+        self.pending = state
+        self.pondering = None
+        self._requests.put((_SEARCH, self._generation.value, state))
+
+    def ponder(self, *state: int) -> None:
+        """Search the replies to a position while the opponent decides.
+
+        Args:
+            state: Key of the opponent's position, (x_bits, o_bits) for
+                standard boards
+
+        """
+        self._generation.value += 1
+        self.pending = None
+        self.pondering = state
+        self._requests.put((_PONDER, self._generation.value, state))
+
+    def cancel(self) -> None:
+        """Abandon the search in flight, e.g. because the game was reset."""
+        if self.pending is not None or self.pondering is not None:
+            self._generation.value += 1
+            self.pending = None
+            self.pondering = None
+
+    def poll(self) -> AIUpdate | None:
+        """Drain the response queue without blocking.
+
+        Returns:
+            The newest update for the current request, or None if there is
+            nothing new
+
+        """
+        update = None
+        while True:
+            try:
+                kind, request_id, *payload = self._responses.get_nowait()
+            except queue.Empty:
+                return update
+            if self.pending is None or request_id != self._generation.value:
+                continue
+            if kind == _PROGRESS:
+                update = AIUpdate(payload[0], None, None)
+                continue
+            cell, score = payload
+            self.pending = None
+            return AIUpdate(1.0, divmod(cell, self.size), score)
+
+    def close(self, timeout: float = AI_CLOSE_TIMEOUT) -> None:
+        """Stop the search in flight and shut the worker down."""
+        self.cancel()
+        self._generation.value += 1
+        self._requests.put(None)
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._responses.close()
+
+    def __enter__(self) -> "AIWorker":
+        """Return the worker for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Shut the worker down."""
+        self.close()
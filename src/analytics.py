@@ -0,0 +1,211 @@
+"""Streaming analytics over game archives.
+
+Games flow through a generator pipeline: archive records are decoded,
+replayed on bitboards and folded into a GameStats aggregate, so memory use
+does not grow with the archive. Chunks are processed in parallel by a
+process pool and the partial aggregates are merged.
+"""
+
+import argparse
+import multiprocessing
+import os
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from archive import ArchiveReader
+from constants import BOARD_SIZE, PLAYER_O, PLAYER_X
+from position import bits_to_board, format_board, get_geometry
+
+DRAW = "draw"
+
+
+class GameResult(NamedTuple):
+    """Outcome of one replayed game."""
+
+    opening: int
+    length: int
+    winner: str | None
+    losing_position: tuple[int, int] | None
+
+
+def replay(games: Iterable[tuple[int, ...]]) -> Iterator[GameResult]:
+    """Replay games given as cell sequences on bitboards.
+
+    The losing position of a won game is the (x_bits, o_bits) position the
+    loser left on the board with their last move, i.e. the position in which
+    the winner found the winning move.
+    """
+    cell_lines = get_geometry().cell_lines
+    for cells in games:
+        if not cells:
+            continue
+        x_bits = o_bits = 0
+        winner = None
+        losing_position = None
+        length = 0
+        for length, cell in enumerate(cells, start=1):
+            if length & 1:
+                bits = x_bits = x_bits | 1 << cell
+            else:
+                bits = o_bits = o_bits | 1 << cell
+            for line in cell_lines[cell]:
+                if bits & line == line:
+                    break
+            else:
+                continue
+            if length & 1:
+                winner = PLAYER_X
+                losing_position = (x_bits ^ 1 << cell, o_bits)
+            else:
+                winner = PLAYER_O
+                losing_position = (x_bits, o_bits ^ 1 << cell)
+            break
+        yield GameResult(cells[0], length, winner, losing_position)
+
+
+class GameStats:
+    """Mergeable aggregate of replayed games."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.games = 0
+        self.total_moves = 0
+        self.outcomes: Counter[str] = Counter()
+        self.openings: dict[int, Counter[str]] = {}
+        self.losing_positions: Counter[tuple[int, int]] = Counter()
+
+    def add(self, result: GameResult) -> None:
+        """Fold one game into the statistics."""
+        outcome = result.winner or DRAW
+        self.games += 1
+        self.total_moves += result.length
+        self.outcomes[outcome] += 1
+        opening = self.openings.get(result.opening)
+        if opening is None:
+            opening = self.openings[result.opening] = Counter()
+        opening[outcome] += 1
+        if result.losing_position is not None:
+            self.losing_positions[result.losing_position] += 1
+
+    def merge(self, other: "GameStats") -> None:
+        """Add another partial aggregate."""
+        self.games += other.games
+        self.total_moves += other.total_moves
+        self.outcomes.update(other.outcomes)
+        for opening, outcomes in other.openings.items():
+            self.openings.setdefault(opening, Counter()).update(outcomes)
+        self.losing_positions.update(other.losing_positions)
+
+    @property
+    def average_length(self) -> float:
+        """Mean number of moves per game."""
+        return self.total_moves / self.games if self.games else 0.0
+
+    @property
+    def first_mover_advantage(self) -> float:
+        """X's win rate minus O's win rate."""
+        if not self.games:
+            return 0.0
+        return (self.outcomes[PLAYER_X] - self.outcomes[PLAYER_O]) / self.games
+
+    def win_rates_by_opening(self) -> dict[tuple[int, int], dict[str, float]]:
+        """Return the outcome rates of the games starting on each cell."""
+        rates = {}
+        for opening in sorted(self.openings):
+            outcomes = self.openings[opening]
+            total = sum(outcomes.values())
+            rates[divmod(opening, BOARD_SIZE)] = {
+                outcome: outcomes[outcome] / total
+                for outcome in (PLAYER_X, PLAYER_O, DRAW)
+            }
+        return rates
+
+    def most_common_losing_positions(self, count: int = 10) -> list[tuple[str, int]]:
+        """Return the most frequent losing positions as compact board strings.
+
+        Positions are counted as played and combined by symmetry only here,
+        so the replay loop never pays for canonicalization.
+        """
+        geometry = get_geometry()
+        canonical: Counter[tuple[int, int]] = Counter()
+        for (x_bits, o_bits), games in self.losing_positions.items():
+            canonical[geometry.canonical(x_bits, o_bits)[:2]] += games
+        return [
+            (format_board(bits_to_board(x_bits, o_bits)), games)
+            for (x_bits, o_bits), games in canonical.most_common(count)
+        ]
+
+    def report(self) -> str:
+        """Format the statistics for the terminal."""
+        lines = [
+            f"games:                 {self.games:,}",
+            f"average length:        {self.average_length:.2f} moves",
+            f"first-mover advantage: {self.first_mover_advantage:+.2%}",
+            "win rate by opening:",
+        ]
+        for (row, col), rates in self.win_rates_by_opening().items():
+            lines.append(
+                f"  ({row}, {col})  x {rates[PLAYER_X]:6.1%}  "
+                f"o {rates[PLAYER_O]:6.1%}  draw {rates[DRAW]:6.1%}"
+            )
+        lines.append("most common losing positions:")
+        lines.extend(
+            f"  {board}  {games:,}"
+            for board, games in self.most_common_losing_positions()
+        )
+        return "\n".join(lines)
+
+
+def aggregate(results: Iterable[GameResult]) -> GameStats:
+    """Fold a stream of results into statistics."""
+    stats = GameStats()
+    for result in results:
+        stats.add(result)
+    return stats
+
+
+def analyze_chunk(directory: str | Path, chunk: int) -> GameStats:
+    """Compute statistics for one archive chunk."""
+    with ArchiveReader(directory) as reader:
+        return aggregate(replay(reader.iter_cells(chunk)))
+
+
+def analyze_archive(directory: str | Path, processes: int | None = None) -> GameStats:
+    """Compute statistics for a whole archive.
+
+    Args:
+        directory: Archive directory
+        processes: Worker processes, defaulting to the CPU count; chunks are
+            processed in the calling process when this is 1
+
+    """
+    with ArchiveReader(directory) as reader:
+        chunks = len(reader.chunks)
+
+    processes = min(processes or os.cpu_count() or 1, chunks)
+    stats = GameStats()
+    if processes <= 1:
+        for chunk in range(chunks):
+            stats.merge(analyze_chunk(directory, chunk))
+        return stats
+
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        tasks = [(directory, chunk) for chunk in range(chunks)]
+        for partial in pool.starmap(analyze_chunk, tasks, chunksize=1):
+            stats.merge(partial)
+    return stats
+
+
+def main() -> None:
+    """Print a report for an archive from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archive", help="archive directory")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    print(analyze_archive(args.archive, args.processes).report())  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
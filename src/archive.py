@@ -0,0 +1,282 @@
+"""Compact archive of finished games with memory-mapped random access.
+
+Each game is a fixed-width five-byte record: the low nibble of the first
+byte holds the number of moves and the remaining nine nibbles hold the cell
+index (row * BOARD_SIZE + col) of each move in order. Records are appended
+to chunk files of at most ``chunk_games`` games, and an index file lists the
+number of the first game in every chunk, so game n is found with a binary
+search over chunks and one multiplication within its chunk.
+"""
+
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from types import TracebackType
+
+from constants import ARCHIVE_CHUNK_GAMES, BOARD_SIZE
+
+_CELLS = BOARD_SIZE * BOARD_SIZE
+_RECORD = struct.Struct("<BI")
+_HEADER = struct.Struct("<4sBBH")
+_MAGIC = b"TTTA"
+_VERSION = 1
+_INDEX = struct.Struct("<Q")
+
+RECORD_SIZE = _RECORD.size
+HEADER_SIZE = _HEADER.size
+INDEX_FILE = "index"
+
+Moves = tuple[tuple[int, int], ...]
+
+
+def _chunk_path(directory: Path, chunk: int) -> Path:
+    """Return the path of a chunk file."""
+    return directory / f"chunk-{chunk:06d}.tttg"
+
+
+def encode_game(moves: Sequence[tuple[int, int]]) -> bytes:
+    """Encode a game's moves as one fixed-width record.
+
+    Raises:
+        ValueError: If the game has more moves than the board has cells
+
+    """
+    if len(moves) > _CELLS:
+        msg = f"a game has at most {_CELLS} moves"
+        raise ValueError(msg)
+    packed = 0
+    for row, col in reversed(moves):
+        packed = packed << 4 | (row * BOARD_SIZE + col)
+    return (packed << 4 | len(moves)).to_bytes(RECORD_SIZE, "little")
+
+
+def decode_cells(head: int, tail: int) -> tuple[int, ...]:
+    """Decode an unpacked record into the cell index of each move.
+
+    Args:
+        head: The first byte of the record
+        tail: The remaining four bytes as a little-endian integer
+
+    """
+    packed = tail << 4 | head >> 4
+    return tuple(packed >> shift & 0xF for shift in range(0, 4 * (head & 0xF), 4))
+
+
+def decode_game(data: bytes | memoryview, offset: int = 0) -> Moves:
+    """Decode the record at offset into (row, col) moves."""
+    cells = decode_cells(*_RECORD.unpack_from(data, offset))
+    return tuple(divmod(cell, BOARD_SIZE) for cell in cells)
+
+
+class ArchiveWriter:
+    """Appends games to an archive directory."""
+
+    def __init__(
+        self, directory: str | Path, chunk_games: int = ARCHIVE_CHUNK_GAMES
+    ) -> None:
+        """Open an archive for appending, creating it if needed.
+
+        Args:
+            directory: Directory holding the chunk and index files
+            chunk_games: Games stored per chunk file before starting another
+
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunk_games = chunk_games
+        self.starts = _scan_chunks(self.directory)
+
+        if self.starts:
+            self.chunk = len(self.starts) - 1
+            path = _chunk_path(self.directory, self.chunk)
+            size = path.stat().st_size
+            self._count = max(size - HEADER_SIZE, 0) // RECORD_SIZE
+            # Drop a torn record left by an interrupted write, and write the
+            # header of a chunk that was created without one.
+            with path.open("r+b") as file:
+                if size < HEADER_SIZE:
+                    file.write(_HEADER.pack(_MAGIC, _VERSION, RECORD_SIZE, 0))
+                file.truncate(HEADER_SIZE + self._count * RECORD_SIZE)
+            self._file = path.open("ab")
+        else:
+            self.chunk = -1
+            self._count = chunk_games
+            self._file = None
+
+    def __len__(self) -> int:
+        """Return the number of games, including unflushed ones."""
+        if not self.starts:
+            return 0
+        return self.starts[-1] + self._count
+
+    def append(self, moves: Sequence[tuple[int, int]]) -> int:
+        """Append a game.
+
+        Returns:
+            The archive index of the appended game
+
+        """
+        if self._count >= self.chunk_games:
+            self._start_chunk()
+        self._file.write(encode_game(moves))
+        self._count += 1
+        return len(self) - 1
+
+    def flush(self) -> None:
+        """Write buffered records to their chunk file."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush records and write the index."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._write_index()
+
+    def __enter__(self) -> "ArchiveWriter":
+        """Use the writer as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the writer."""
+        self.close()
+
+    def _start_chunk(self) -> None:
+        """Close the current chunk and start a new one."""
+        if self._file is not None:
+            self._file.close()
+        self.starts.append(len(self))
+        self.chunk += 1
+        self._count = 0
+        self._file = _chunk_path(self.directory, self.chunk).open("wb")
+        # Flush the header before the index lists the chunk, so a reader
+        # opening the archive meanwhile maps a valid, empty chunk
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, RECORD_SIZE, 0))
+        self._file.flush()
+        self._write_index()
+
+    def _write_index(self) -> None:
+        """Write the first game number of every chunk."""
+        data = b"".join(_INDEX.pack(start) for start in self.starts)
+        temporary = self.directory / (INDEX_FILE + ".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(self.directory / INDEX_FILE)
+
+
+class ArchiveReader:
+    """Memory-maps an archive for iteration and random access."""
+
+    def __init__(self, directory: str | Path) -> None:
+        """Open and map every chunk of an archive.
+
+        Raises:
+            ValueError: If a chunk file has an unknown header
+
+        """
+        self.directory = Path(directory)
+        self.starts = _read_index(self.directory)
+        self._maps: list[mmap.mmap] = []
+        self.chunks: list[memoryview] = []
+
+        for chunk in range(len(self.starts)):
+            path = _chunk_path(self.directory, chunk)
+            with path.open("rb") as file:
+                if os.fstat(file.fileno()).st_size < HEADER_SIZE:
+                    # A chunk whose header is not written yet holds no games
+                    self.chunks.append(memoryview(b""))
+                    continue
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size, _ = _HEADER.unpack_from(mapped)
+            if (magic, version, record_size) != (_MAGIC, _VERSION, RECORD_SIZE):
+                mapped.close()
+                msg = f"{path} is not a version {_VERSION} game archive chunk"
+                raise ValueError(msg)
+            count = (len(mapped) - HEADER_SIZE) // RECORD_SIZE
+            self._maps.append(mapped)
+            self.chunks.append(
+                memoryview(mapped)[HEADER_SIZE : HEADER_SIZE + count * RECORD_SIZE]
+            )
+        self._length = (
+            self.starts[-1] + len(self.chunks[-1]) // RECORD_SIZE if self.chunks else 0
+        )
+
+    def __len__(self) -> int:
+        """Return the number of games in the archive."""
+        return self._length
+
+    def __getitem__(self, index: int) -> Moves:
+        """Return the moves of game number index."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            msg = "game index out of range"
+            raise IndexError(msg)
+        chunk = bisect_right(self.starts, index) - 1
+        return decode_game(
+            self.chunks[chunk], (index - self.starts[chunk]) * RECORD_SIZE
+        )
+
+    def __iter__(self) -> Iterator[Moves]:
+        """Iterate over every game in archive order."""
+        for chunk in range(len(self.chunks)):
+            for cells in self.iter_cells(chunk):
+                yield tuple(divmod(cell, BOARD_SIZE) for cell in cells)
+
+    def iter_cells(self, chunk: int) -> Iterator[tuple[int, ...]]:
+        """Iterate over the games of one chunk as tuples of cell indices."""
+        for head, tail in _RECORD.iter_unpack(self.chunks[chunk]):
+            yield decode_cells(head, tail)
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        for view in self.chunks:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self.chunks.clear()
+        self._maps.clear()
+
+    def __enter__(self) -> "ArchiveReader":
+        """Use the reader as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the reader."""
+        self.close()
+
+
+def _read_index(directory: Path) -> list[int]:
+    """Read the chunk index, rebuilding it if it is missing or stale."""
+    path = directory / INDEX_FILE
+    if path.exists():
+        data = path.read_bytes()
+        starts = [start for (start,) in _INDEX.iter_unpack(data)]
+        if not _chunk_path(directory, len(starts)).exists():
+            return starts
+    return _scan_chunks(directory)
+
+
+def _scan_chunks(directory: Path) -> list[int]:
+    """Compute the first game number of every chunk from the file sizes."""
+    starts = []
+    total = 0
+    chunk = 0
+    while (path := _chunk_path(directory, chunk)).exists():
+        starts.append(total)
+        total += (path.stat().st_size - HEADER_SIZE) // RECORD_SIZE
+        chunk += 1
+    return starts
@@ -0,0 +1,58 @@
+"""Asynchronous client for the sharded game server."""
+
+import asyncio
+
+from constants import SERVER_HOST, SERVER_PORT
+from game_logic import TicTacToe
+from server import HELLO
+from wire import RESET_MESSAGE, SNAPSHOT_SIZE, decode_board, encode_move
+
+
+class GameClient:
+    """A connection to one game on the server."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        game_id: int,
+    ) -> None:
+        """Initialize a client around an open connection."""
+        self.reader = reader
+        self.writer = writer
+        self.game_id = game_id
+        self.game = TicTacToe()
+
+    @classmethod
+    async def connect(
+        cls,
+        game_id: int,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+    ) -> "GameClient":
+        """Connect to a game and wait for its initial snapshot."""
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer, game_id)
+        writer.write(HELLO.pack(game_id))
+        await client._read_snapshot()
+        return client
+
+    async def make_move(self, row: int, col: int) -> TicTacToe:
+        """Send a move and return the game as the server sees it after."""
+        self.writer.write(bytes((encode_move(row, col, self.game.current_player),)))
+        return await self._read_snapshot()
+
+    async def reset_game(self) -> TicTacToe:
+        """Ask the server to reset the game."""
+        self.writer.write(bytes((RESET_MESSAGE,)))
+        return await self._read_snapshot()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def _read_snapshot(self) -> TicTacToe:
+        """Read one snapshot into the local copy of the game."""
+        data = await self.reader.readexactly(SNAPSHOT_SIZE)
+        return decode_board(data, 0, self.game)
@@ -50,3 +50,107 @@ SYMBOL_OFFSET = 30
 GAME_ACTIVE = "active"
 GAME_WON = "won"
 GAME_DRAW = "draw"
+
+# Wire format
+WIRE_VERSION = 1
+WIRE_HEADER_SIZE = 1
+WIRE_MOVE_SIZE = 1
+
+# Matchmaking
+DEFAULT_RATING = 1500
+RATING_BUCKET_WIDTH = 100
+MAX_RATING_GAP = 200
+
+# Spectator broadcast
+SPECTATOR_BUFFER_SIZE = 64
+
+# Move log
+LOG_GROUP_COMMIT_BYTES = 64 * 1024
+LOG_GROUP_COMMIT_INTERVAL = 0.01  # seconds
+LOG_SNAPSHOT_RECORDS = 100_000
+
+# Game server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_READ_SIZE = 4096
+SERVER_BACKLOG = 4096
+
+# Board analysis
+WIN_LENGTH = BOARD_SIZE
+EMPTY_CELL_CHARS = ".-_ "
+SOLVER_CACHE_SIZE = 65536
+
+# Best-move HTTP API
+API_HOST = "127.0.0.1"
+API_PORT = 8080
+API_MAX_BODY_BYTES = 8 * 1024 * 1024
+
+# Load testing
+LOAD_TEST_CLIENTS = 1000
+LOAD_TEST_DURATION = 10.0  # seconds
+LOAD_TEST_THINK_TIME = 0.05  # seconds
+LOAD_TEST_TIMEOUT = 5.0  # seconds
+
+# Game archive
+ARCHIVE_CHUNK_GAMES = 1 << 20
+
+# Game history store
+HISTORY_BATCH_SIZE = 500
+HISTORY_FLUSH_INTERVAL = 0.5  # seconds
+
+# Training dataset export
+DATASET_SHARD_POSITIONS = 1 << 16
+DATASET_PLAYOUTS_PER_POSITION = 1000  # random games tried per sampled position
+
+# Reinforcement learning environment
+ENV_WIN_REWARD = 1.0
+ENV_DRAW_REWARD = 0.0
+ENV_LOSS_REWARD = -1.0
+ENV_ILLEGAL_MOVE_REWARD = -1.0
+
+# Tabular learner
+LEARNER_LEARNING_RATE = 0.3
+LEARNER_EXPLORATION = 0.3
+LEARNER_NUM_ENVS = 1024
+
+# Search engine
+ENGINE_WIN_SCORE = 1 << 30
+ENGINE_STOP_CHECK_NODES = 1024
+ENGINE_DEADLINE_CHECK_NODES = 64  # under a time budget
+ENGINE_ASPIRATION_WINDOW = 1000  # evaluation points either side of the guess
+
+# AI opponent
+THINKING_MESSAGE = "AI thinking..."
+THINKING_BAR_WIDTH = 200
+THINKING_BAR_HEIGHT = 8
+THINKING_BAR_Y = 470
+AI_CLOSE_TIMEOUT = 1.0  # seconds
+AI_MOVE_SECONDS = 0.5  # thinking time per move
+
+# Transposition table and parallel search
+TT_MEGABYTES = 16
+SMP_WORKERS = None  # defaults to the CPU count
+SMP_SHUFFLE_PLIES = 2  # plies whose moves helpers search in their own order
+
+# Endgame tablebases
+TABLEBASE_PAGE_ENTRIES = 1 << 14
+TABLEBASE_CACHE_PAGES = 1024
+TABLEBASE_CHUNK_ENTRIES = 1 << 18
+
+# Opening book
+BOOK_PLIES = 4
+BOOK_DEPTH = 6
+BOOK_MARGIN = 50  # evaluation points a book move may trail the best by
+
+# Ultimate tic-tac-toe
+ULTIMATE_META_WEIGHT = 100  # meta-board lines against lines inside sub-boards
+ULTIMATE_DEPTH = 64  # deepest iteration tried under the time budget
+SUB_LINE_WIDTH = 2
+HIGHLIGHT_COLOR = (90, 150, 250)
+HIGHLIGHT_WIDTH = 3
+
+# Gomoku
+GOMOKU_RADIUS = 2  # candidate moves lie this many rows or columns from a stone
+GOMOKU_DEPTH = 32  # deepest iteration tried under the time budget
+GOMOKU_VIEW = 9  # rows and columns shown before zooming
+MIN_VIEW = 5  # fewest rows and columns a zoomed-in view shows
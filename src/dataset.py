@@ -0,0 +1,303 @@
+"""Export labelled positions as NumPy arrays for machine learning.
+
+Each position becomes four arrays: one-hot planes of shape (3, n, n) for
+X, O and empty cells, the side to move (+1 for X, -1 for O), the
+game-theoretic value for the side to move (+1 win, 0 draw, -1 loss) and a
+mask over the n * n cells marking every optimal move. Positions are split
+into shards written as plain .npy files, labelled in parallel by a process
+pool, and loaded back as read-only memory maps without copying.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import (
+    BOARD_SIZE,
+    DATASET_PLAYOUTS_PER_POSITION,
+    DATASET_SHARD_POSITIONS,
+)
+from position import Geometry, get_geometry
+from solver import Solver
+
+ARRAYS = ("planes", "to_move", "value", "best_moves")
+
+
+class Shard(NamedTuple):
+    """Arrays of one dataset shard, indexed by position."""
+
+    planes: np.ndarray
+    to_move: np.ndarray
+    value: np.ndarray
+    best_moves: np.ndarray
+
+
+def reachable_positions(geometry: Geometry | None = None) -> list[tuple[int, int]]:
+    """Return every reachable position that still has a move to play.
+
+    Positions are (x_bits, o_bits) pairs in the order they are first reached
+    by a breadth-first walk from the empty board.
+    """
+    geometry = geometry or get_geometry()
+    positions = []
+    level = {(0, 0)}
+    while level:
+        positions.extend(sorted(level))
+        following = set()
+        for x_bits, o_bits in level:
+            x_to_move = x_bits.bit_count() == o_bits.bit_count()
+            empty = geometry.full & ~(x_bits | o_bits)
+            while empty:
+                low = empty & -empty
+                empty ^= low
+                cell = low.bit_length() - 1
+                if x_to_move:
+                    child = (x_bits | low, o_bits)
+                    mover = child[0]
+                else:
+                    child = (x_bits, o_bits | low)
+                    mover = child[1]
+                full = child[0] | child[1] == geometry.full
+                if not full and not geometry.wins_with(mover, cell):
+                    following.add(child)
+        level = following
+    return positions
+
+
+def random_positions(
+    count: int,
+    geometry: Geometry | None = None,
+    min_stones: int = 0,
+    seed: int | None = None,
+) -> list[tuple[int, int]]:
+    """Sample distinct positions from random playouts.
+
+    Large boards cannot be enumerated, so positions are taken from random
+    games stopped at a random ply. Raising min_stones keeps the positions
+    close enough to the end of the game for the exact labels to be cheap.
+
+    Args:
+        count: Number of positions to return, at most the number of
+            reachable positions with at least min_stones marks
+        geometry: Board geometry, defaulting to the game's board
+        min_stones: Fewest marks a sampled position may have
+        seed: Seed for the random number generator
+
+    Returns:
+        Distinct (x_bits, o_bits) positions with a move still to play
+
+    Raises:
+        ValueError: If min_stones leaves no room for a move, or count
+            distinct positions are not found within
+            DATASET_PLAYOUTS_PER_POSITION playouts per position
+
+    """
+    geometry = geometry or get_geometry()
+    if not 0 <= min_stones < geometry.cells:
+        msg = f"min_stones must be in [0, {geometry.cells})"
+        raise ValueError(msg)
+
+    rng = random.Random(seed)  # noqa: S311
+    cells = list(range(geometry.cells))
+    positions: dict[tuple[int, int], None] = {}
+    playouts = count * DATASET_PLAYOUTS_PER_POSITION
+    while len(positions) < count:
+        if not playouts:
+            msg = (
+                f"found {len(positions)} of {count} distinct positions in "
+                f"{count * DATASET_PLAYOUTS_PER_POSITION} playouts"
+            )
+            raise ValueError(msg)
+        playouts -= 1
+        rng.shuffle(cells)
+        stop = rng.randrange(min_stones, geometry.cells)
+        bits = [0, 0]
+        for ply, cell in enumerate(cells[:stop]):
+            bits[ply & 1] |= 1 << cell
+            if geometry.wins_with(bits[ply & 1], cell):
+                break
+        else:
+            positions[bits[0], bits[1]] = None
+    return list(positions)
+
+
+def encode_planes(
+    positions: list[tuple[int, int]], size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Encode positions as one-hot planes and the side to move.
+
+    The bitboards are laid out as little-endian bytes and unpacked in one
+    vectorized call, so boards of any size are handled alike.
+
+    Returns:
+        Tuple of (planes, to_move) with shapes (N, 3, size, size) and (N,)
+
+    """
+    cells = size * size
+    width = (cells + 7) // 8
+    count = len(positions)
+    packed = np.empty((2, count, width), dtype=np.uint8)
+    for player in (0, 1):
+        packed[player] = np.frombuffer(
+            b"".join(
+                position[player].to_bytes(width, "little") for position in positions
+            ),
+            dtype=np.uint8,
+        ).reshape(count, width)
+    stones = np.unpackbits(packed, axis=2, count=cells, bitorder="little")
+
+    planes = np.empty((count, 3, cells), dtype=np.uint8)
+    planes[:, :2] = stones.transpose(1, 0, 2)
+    planes[:, 2] = 1 - planes[:, 0] - planes[:, 1]
+
+    totals = stones.sum(axis=2, dtype=np.int16)
+    to_move = np.where(totals[0] == totals[1], 1, -1).astype(np.int8)
+    return planes.reshape(count, 3, size, size), to_move
+
+
+def label_positions(
+    positions: list[tuple[int, int]], geometry: Geometry | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Solve positions exactly and return their labels.
+
+    Returns:
+        Tuple of (value, best_moves) with shapes (N,) and (N, cells)
+
+    """
+    geometry = geometry or get_geometry()
+    solver = Solver(geometry)
+    value = np.empty(len(positions), dtype=np.int8)
+    best_moves = np.zeros((len(positions), geometry.cells), dtype=np.bool_)
+    for index, (x_bits, o_bits) in enumerate(positions):
+        if x_bits.bit_count() == o_bits.bit_count():
+            scores = solver.move_scores(x_bits, o_bits)
+        else:
+            scores = solver.move_scores(o_bits, x_bits)
+        best = max(scores.values())
+        value[index] = (best > 0) - (best < 0)
+        best_cells = [cell for cell, score in scores.items() if score == best]
+        best_moves[index, best_cells] = True
+    return value, best_moves
+
+
+def shard_path(directory: str | Path, shard: int, name: str) -> Path:
+    """Return the file holding one array of a shard."""
+    return Path(directory) / f"shard-{shard:05d}-{name}.npy"
+
+
+def export_shard(
+    directory: str | Path,
+    shard: int,
+    positions: list[tuple[int, int]],
+    size: int,
+    win_length: int,
+) -> int:
+    """Label and write one shard.
+
+    Returns:
+        Number of positions written
+
+    """
+    geometry = get_geometry(size, win_length)
+    planes, to_move = encode_planes(positions, size)
+    value, best_moves = label_positions(positions, geometry)
+    for name, array in zip(ARRAYS, (planes, to_move, value, best_moves), strict=True):
+        np.save(shard_path(directory, shard, name), array)
+    return len(positions)
+
+
+def export_dataset(
+    directory: str | Path,
+    positions: list[tuple[int, int]],
+    geometry: Geometry | None = None,
+    shard_positions: int = DATASET_SHARD_POSITIONS,
+    processes: int | None = None,
+) -> int:
+    """Label positions and write them as sharded .npy files.
+
+    Args:
+        directory: Output directory, created if missing
+        positions: (x_bits, o_bits) positions with a move still to play
+        geometry: Board geometry, defaulting to the game's board
+        shard_positions: Most positions per shard
+        processes: Worker processes, defaulting to the CPU count; shards are
+            written by the calling process when this is 1
+
+    Returns:
+        Number of shards written
+
+    """
+    geometry = geometry or get_geometry()
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (
+            directory,
+            shard,
+            positions[start : start + shard_positions],
+            geometry.size,
+            geometry.win_length,
+        )
+        for shard, start in enumerate(range(0, len(positions), shard_positions))
+    ]
+
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    if processes <= 1:
+        for task in tasks:
+            export_shard(*task)
+    else:
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            pool.starmap(export_shard, tasks, chunksize=1)
+    return len(tasks)
+
+
+def load_shard(directory: str | Path, shard: int) -> Shard:
+    """Map one shard into memory without reading it."""
+    return Shard(
+        *(np.load(shard_path(directory, shard, name), mmap_mode="r") for name in ARRAYS)
+    )
+
+
+def load_dataset(directory: str | Path) -> list[Shard]:
+    """Map every shard of a dataset into memory, in shard order."""
+    shards = sorted(Path(directory).glob(f"shard-*-{ARRAYS[0]}.npy"))
+    return [load_shard(directory, int(path.name.split("-")[1])) for path in shards]
+
+
+def main() -> None:
+    """Export a dataset from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--size", type=int, default=None)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument(
+        "--positions",
+        type=int,
+        default=0,
+        help="sample this many random positions instead of enumerating all",
+    )
+    parser.add_argument("--min-stones", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--shard-positions", type=int, default=DATASET_SHARD_POSITIONS)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    geometry = get_geometry(args.size or BOARD_SIZE, args.win_length)
+    if args.positions:
+        positions = random_positions(
+            args.positions, geometry, args.min_stones, args.seed
+        )
+    else:
+        positions = reachable_positions(geometry)
+    shards = export_dataset(
+        args.directory, positions, geometry, args.shard_positions, args.processes
+    )
+    print(f"wrote {len(positions):,} positions in {shards} shards")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""Alpha-beta search engine.
+
+The engine searches any position object offering the SearchPosition
+methods, so every board variant shares it. Scores are from the side to
+move's point of view: a win is ENGINE_WIN_SCORE less the plies needed to
+reach it, and unfinished lines at the depth limit are scored by the
+position's own evaluation.
+
+Moves are searched best-first: the transposition table's best move, then
+immediate wins, then blocks of the opponent's immediate wins, then the
+killer moves that caused a cutoff at the same ply, and the rest by how
+often they caused cutoffs anywhere (the history heuristic).
+
+With a tablebase, positions it covers are scored exactly without search.
+
+think() searches under a time budget instead of to a fixed depth. It
+deepens one ply at a time, each iteration inside an aspiration window
+around an earlier score, and when the budget runs out mid-iteration it
+abandons that iteration and answers with the last one it completed.
+"""
+
+import random
+import time
+from collections.abc import Callable, Hashable
+from typing import NamedTuple, Protocol
+
+from constants import (
+    ENGINE_ASPIRATION_WINDOW,
+    ENGINE_DEADLINE_CHECK_NODES,
+    ENGINE_STOP_CHECK_NODES,
+    ENGINE_WIN_SCORE,
+    SMP_SHUFFLE_PLIES,
+)
+from tablebase import Tablebase
+from transposition import TranspositionTable
+
+INFINITY = ENGINE_WIN_SCORE + 1
+_MATE_THRESHOLD = ENGINE_WIN_SCORE - 1024
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+_TABLE_MOVE = 4 << 40
+_WIN = 3 << 40
+_BLOCK = 2 << 40
+_KILLER = 1 << 40
+
+
+class SearchPosition(Protocol):
+    """Methods the engine needs from a position."""
+
+    def key(self) -> Hashable:
+        """Return a hashable key identifying the position."""
+
+    def legal_moves(self) -> list[int]:
+        """Return the moves available to the side to move."""
+
+    def make(self, move: int) -> None:
+        """Play a move."""
+
+    def unmake(self) -> None:
+        """Take back the last move."""
+
+    def last_move_won(self) -> bool:
+        """Check whether the last move won the game."""
+
+    def is_full(self) -> bool:
+        """Check whether the game ended without a winner."""
+
+    def threats(self) -> tuple[int, int]:
+        """Return bitmasks of the moves that win and that block a win."""
+
+    def evaluate(self) -> int:
+        """Score an unfinished position for the side to move."""
+
+
+class Table(Protocol):
+    """Mapping methods the engine needs from a transposition table."""
+
+    def get(self, key: Hashable) -> tuple[int, int, int, int] | None:
+        """Return (depth, score, bound, best_move) for a key, or None."""
+
+    def __setitem__(self, key: Hashable, entry: tuple[int, int, int, int]) -> None:
+        """Store (depth, score, bound, best_move) for a key."""
+
+    def clear(self) -> None:
+        """Forget every entry."""
+
+
+class SearchAbortedError(Exception):
+    """Raised inside a search that was asked to stop."""
+
+
+class SearchResult(NamedTuple):
+    """Best move found by a search."""
+
+    move: int
+    score: int
+    depth: int
+    nodes: int
+
+
+class Engine:
+    """Negamax alpha-beta search with a transposition table."""
+
+    def __init__(
+        self,
+        table: Table | None = None,
+        rng: random.Random | None = None,
+        *,
+        ordering: bool = True,
+        tablebase: Tablebase | None = None,
+    ) -> None:
+        """Initialize an engine.
+
+        Args:
+            table: Transposition table mapping position keys to (depth,
+                score, bound, best_move), defaulting to a fixed-memory
+                TranspositionTable
+            rng: Shuffles the moves of the first SMP_SHUFFLE_PLIES plies
+                when given, so engines sharing a table explore the tree in
+                different orders; deeper nodes keep the usual order
+            ordering: Search the most promising moves first; turning it off
+                searches them in the position's own order
+            tablebase: Exact scores for the positions it covers
+
+        """
+        self.table: Table = TranspositionTable() if table is None else table
+        self.rng = rng
+        self.ordering = ordering
+        self.tablebase = tablebase
+        self.nodes = 0
+        self.killers: list[list[int]] = []
+        self.history: dict[int, int] = {}
+        self._should_stop: Callable[[], bool] | None = None
+        self._check_nodes = ENGINE_STOP_CHECK_NODES
+
+    def clear(self) -> None:
+        """Forget every stored position and move-ordering statistic."""
+        self.table.clear()
+        self.killers = []
+        self.history = {}
+
+    def search(  # noqa: PLR0913
+        self,
+        position: SearchPosition,
+        depth: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        should_stop: Callable[[], bool] | None = None,
+        alpha: int = -INFINITY,
+        beta: int = INFINITY,
+    ) -> SearchResult:
+        """Search a position to a fixed depth.
+
+        Args:
+            position: Position to search; it is restored before returning
+            depth: Plies to search, defaulting to the number of legal moves,
+                which is exact for games that fill the board
+            progress: Called with (done, total) after each root move
+            should_stop: Polled every ENGINE_STOP_CHECK_NODES nodes; the
+                search raises SearchAbortedError once it returns True
+            alpha: Lower bound of the window; a score at or below it only
+                shows the true score is no higher
+            beta: Upper bound of the window; a score at or above it only
+                shows the true score is no lower
+
+        Returns:
+            The best move with its score, the depth and the nodes searched
+
+        Raises:
+            ValueError: If the position has no legal move
+            SearchAbortedError: If should_stop asked the search to stop
+
+        """
+        key = position.key()
+        entry = self.table.get(key)
+        moves = self._ordered_moves(position, 0, -1 if entry is None else entry[3])
+        if not moves:
+            msg = "position has no legal move"
+            raise ValueError(msg)
+        depth = depth or len(moves)
+        self.nodes = 0
+        self._should_stop = should_stop
+        self.killers = [[-1, -1] for _ in range(depth + 1)]
+        self.history = {move: score >> 1 for move, score in self.history.items()}
+
+        original_alpha = alpha
+        best = -INFINITY
+        best_move = moves[0]
+        for done, move in enumerate(moves, start=1):
+            score = self._move_score(position, move, depth, alpha, beta, 0)
+            if score > best:
+                best, best_move = score, move
+                alpha = max(alpha, best)
+            if progress is not None:
+                progress(done, len(moves))
+            if alpha >= beta:
+                break
+        self.table[key] = (depth, best, _bound(best, original_alpha, beta), best_move)
+        return SearchResult(best_move, best, depth, self.nodes)
+
+    def think(
+        self,
+        position: SearchPosition,
+        seconds: float | None,
+        depth: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> SearchResult:
+        """Deepen the search of a position until a time budget runs out.
+
+        Depth one is always completed, so there is a move to play however
+        small the budget. Each later depth is searched inside an aspiration
+        window around the score two depths before, when the same side made
+        the last move, and searched again with the window opened on the
+        side it failed.
+
+        Args:
+            position: Position to search; it is restored before returning
+            seconds: Time budget, or None to deepen until depth is reached
+                or should_stop asks to stop
+            depth: Deepest search to try, defaulting to an exact search
+            progress: Called with (elapsed, budget) in milliseconds after
+                each root move, or with (done, total) root moves when there
+                is no time budget
+            should_stop: Polled like in search(); unlike running out of
+                time, it abandons the whole search
+
+        Returns:
+            The result of the deepest completed iteration, with the nodes
+            of every iteration
+
+        Raises:
+            ValueError: If the position has no legal move
+            SearchAbortedError: If should_stop asked the search to stop
+
+        """
+        start = time.monotonic()
+        if seconds is None:
+            deadline = float("inf")
+            budget = 0
+        else:
+            deadline = start + seconds
+            budget = max(1, round(seconds * 1000))
+
+        def report(done: int, total: int) -> None:
+            if progress is None:
+                return
+            if not budget:
+                progress(done, total)
+                return
+            elapsed = round((time.monotonic() - start) * 1000)
+            progress(min(elapsed, budget), budget)
+
+        def out_of_time() -> bool:
+            return time.monotonic() >= deadline or (
+                should_stop is not None and should_stop()
+            )
+
+        result = self.search(position, 1, report, should_stop)
+        nodes = result.nodes
+        # The evaluation swings with the side that moves last, so the
+        # window is centred on the last score of the same parity.
+        scores = [result.score]
+        self._check_nodes = ENGINE_DEADLINE_CHECK_NODES
+        try:
+            for iteration in range(2, (depth or len(position.legal_moves())) + 1):
+                if abs(result.score) > _MATE_THRESHOLD or time.monotonic() >= deadline:
+                    break
+                try:
+                    searched = self._aspiration(
+                        position, iteration, scores[-2:][0], report, out_of_time
+                    )
+                except SearchAbortedError:
+                    if should_stop is not None and should_stop():
+                        raise
+                    nodes += self.nodes
+                    break
+                nodes += searched.nodes
+                result = searched
+                scores.append(result.score)
+        finally:
+            self._check_nodes = ENGINE_STOP_CHECK_NODES
+        return result._replace(nodes=nodes)
+
+    def _aspiration(
+        self,
+        position: SearchPosition,
+        depth: int,
+        guess: int,
+        progress: Callable[[int, int], None],
+        should_stop: Callable[[], bool],
+    ) -> SearchResult:
+        """Search a depth in a window around a guess, widening on failure."""
+        alpha = guess - ENGINE_ASPIRATION_WINDOW
+        beta = guess + ENGINE_ASPIRATION_WINDOW
+        nodes = 0
+        while True:
+            result = self.search(position, depth, progress, should_stop, alpha, beta)
+            nodes += result.nodes
+            if result.score <= alpha:
+                alpha = -INFINITY
+            elif result.score >= beta:
+                beta = INFINITY
+            else:
+                return result._replace(nodes=nodes)
+
+    def _ordered_moves(
+        self, position: SearchPosition, ply: int, table_move: int
+    ) -> list[int]:
+        """Return the legal moves in the order to search them."""
+        moves = position.legal_moves()
+        if self.rng is not None and ply < SMP_SHUFFLE_PLIES:
+            self.rng.shuffle(moves)
+        if not self.ordering or len(moves) < 2:  # noqa: PLR2004
+            return moves
+
+        wins, blocks = position.threats()
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+
+        def priority(move: int) -> int:
+            if move == table_move:
+                return _TABLE_MOVE
+            if wins >> move & 1:
+                return _WIN
+            if blocks >> move & 1:
+                return _BLOCK
+            if move in killers:
+                return _KILLER
+            return history.get(move, 0)
+
+        moves.sort(key=priority, reverse=True)
+        return moves
+
+    def _lookup(
+        self, key: Hashable, depth: int, alpha: int, beta: int, ply: int
+    ) -> tuple[int | None, int]:
+        """Return a known score that settles a node and the stored best move.
+
+        The tablebase is exact, so it settles any position it covers; a
+        transposition table entry settles the node if it is deep enough and
+        its bound fits the window.
+        """
+        if self.tablebase is not None:
+            score = self.tablebase.probe(key)
+            if score is not None:
+                return _from_table(score, ply), -1
+        entry = self.table.get(key)
+        if entry is None:
+            return None, -1
+        return _table_cutoff(entry, depth, alpha, beta, ply), entry[3]
+
+    def _cutoff(self, move: int, depth: int, ply: int) -> None:
+        """Remember a move that refuted the opponent's last move."""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def _move_score(  # noqa: PLR0913
+        self,
+        position: SearchPosition,
+        move: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+    ) -> int:
+        """Return the score of playing a move, for the side playing it."""
+        position.make(move)
+        try:
+            if position.last_move_won():
+                return ENGINE_WIN_SCORE - ply - 1
+            if position.is_full():
+                return 0
+            if depth == 1:
+                return -position.evaluate()
+            return -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            position.unmake()
+
+    def _negamax(
+        self, position: SearchPosition, depth: int, alpha: int, beta: int, ply: int
+    ) -> int:
+        """Return the score of an unfinished position for the side to move."""
+        self.nodes += 1
+        if (
+            self._should_stop is not None
+            and self.nodes % self._check_nodes == 0
+            and self._should_stop()
+        ):
+            raise SearchAbortedError
+
+        key = position.key()
+        score, table_move = self._lookup(key, depth, alpha, beta, ply)
+        if score is not None:
+            return score
+
+        original_alpha = alpha
+        best = -INFINITY
+        best_move = -1
+        for move in self._ordered_moves(position, ply, table_move):
+            score = self._move_score(position, move, depth, alpha, beta, ply)
+            if score > best:
+                best, best_move = score, move
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        self._cutoff(move, depth, ply)
+                        break
+
+        bound = _bound(best, original_alpha, beta)
+        self.table[key] = (depth, _to_table(best, ply), bound, best_move)
+        return best
+
+
+def _bound(score: int, alpha: int, beta: int) -> int:
+    """Return what a score searched in the window (alpha, beta) proves."""
+    if score <= alpha:
+        return UPPER
+    if score >= beta:
+        return LOWER
+    return EXACT
+
+
+def _table_cutoff(
+    entry: tuple[int, int, int, int], depth: int, alpha: int, beta: int, ply: int
+) -> int | None:
+    """Return a stored score that settles the node, or None."""
+    if entry[0] < depth:
+        return None
+    score = _from_table(entry[1], ply)
+    bound = entry[2]
+    if (
+        bound == EXACT
+        or (bound == LOWER and score >= beta)
+        or (bound == UPPER and score <= alpha)
+    ):
+        return score
+    return None
+
+
+def _to_table(score: int, ply: int) -> int:
+    """Make a win score relative to the node storing it."""
+    if score > _MATE_THRESHOLD:
+        return score + ply
+    if score < -_MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _from_table(score: int, ply: int) -> int:
+    """Make a stored win score relative to the root again."""
+    if score > _MATE_THRESHOLD:
+        return score - ply
+    if score < -_MATE_THRESHOLD:
+        return score + ply
+    return score
@@ -0,0 +1,399 @@
+"""Reinforcement-learning environments for Tic-Tac-Toe.
+
+TicTacToeEnv wraps a single TicTacToe game behind the familiar
+reset()/step(action) interface. VectorEnv steps many N x N games at once on
+NumPy arrays and writes observations into buffers allocated up front, so
+every step returns the same arrays with new contents.
+
+Actions are cell indices row * size + col. Observations are planes of shape
+(3, size, size) seen from the side to move: its own marks, the opponent's
+marks and the empty cells. An illegal move ends the episode with
+ENV_ILLEGAL_MOVE_REWARD; the action mask marks the legal moves.
+
+Without an opponent both sides are played by the caller and each reward is
+for the side that just moved. With an opponent policy the caller plays
+agent_player and the opponent replies inside step().
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from constants import (
+    BOARD_SIZE,
+    ENV_DRAW_REWARD,
+    ENV_ILLEGAL_MOVE_REWARD,
+    ENV_LOSS_REWARD,
+    ENV_WIN_REWARD,
+    GAME_ACTIVE,
+    GAME_WON,
+    PLAYER_X,
+)
+from game_logic import TicTacToe
+from position import Geometry, get_geometry
+from solver import Solver
+
+Policy = Callable[[np.ndarray, np.ndarray, np.random.Generator], np.ndarray]
+
+
+def random_policy(
+    observation: np.ndarray, action_mask: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """Pick a uniformly random legal move in each environment."""
+    del observation
+    scores = rng.random(action_mask.shape)
+    scores[~action_mask] = -1.0
+    return scores.argmax(axis=1)
+
+
+def first_legal_policy(
+    observation: np.ndarray, action_mask: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """Pick the lowest-numbered legal cell in each environment."""
+    del observation, rng
+    return action_mask.argmax(axis=1)
+
+
+class PerfectPolicy:
+    """Pick a random move among the solver's optimal moves."""
+
+    def __init__(self, geometry: Geometry | None = None) -> None:
+        """Initialize the policy with a solver for the board geometry."""
+        self.solver = Solver(geometry)
+
+    def __call__(
+        self,
+        observation: np.ndarray,
+        action_mask: np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Return an optimal move for each environment."""
+        del action_mask
+        count = len(observation)
+        packed = np.packbits(
+            observation[:, :2].reshape(count, 2, -1), axis=2, bitorder="little"
+        )
+        actions = np.empty(count, dtype=np.intp)
+        for index, (mine, theirs) in enumerate(packed):
+            scores = self.solver.move_scores(
+                int.from_bytes(mine.tobytes(), "little"),
+                int.from_bytes(theirs.tobytes(), "little"),
+            )
+            best = max(scores.values())
+            actions[index] = rng.choice(
+                [cell for cell, score in scores.items() if score == best]
+            )
+        return actions
+
+
+def get_policy(opponent: str | Policy | None, geometry: Geometry) -> Policy | None:
+    """Resolve an opponent given by name or as a callable.
+
+    Raises:
+        ValueError: If the name is not a built-in policy
+
+    """
+    if opponent is None or callable(opponent):
+        return opponent
+    if opponent == "random":
+        return random_policy
+    if opponent == "first":
+        return first_legal_policy
+    if opponent == "perfect":
+        return PerfectPolicy(geometry)
+    msg = f"unknown opponent policy {opponent!r}"
+    raise ValueError(msg)
+
+
+class TicTacToeEnv:
+    """Single-game environment driven by the TicTacToe rules."""
+
+    def __init__(
+        self,
+        opponent: str | Policy | None = None,
+        agent_player: str = PLAYER_X,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the environment.
+
+        Args:
+            opponent: "random", "first", "perfect", a policy callable, or
+                None for self-play
+            agent_player: Side played by the caller when there is an opponent
+            seed: Seed for the opponent's random choices
+
+        """
+        self.size = BOARD_SIZE
+        self.game = TicTacToe()
+        self.opponent = get_policy(opponent, get_geometry())
+        self.agent_player = agent_player
+        self.rng = np.random.default_rng(seed)
+        self.observation = np.zeros((3, BOARD_SIZE, BOARD_SIZE), dtype=np.uint8)
+        self.action_mask = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.bool_)
+        self.done = False
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """Start a new episode.
+
+        Returns:
+            Tuple of (observation, info) where info holds the action mask
+
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.game.reset_game()
+        self.done = False
+        if self.opponent is not None and self.agent_player != PLAYER_X:
+            self._observe()
+            self._play(self._opponent_move())
+        self._observe()
+        return self.observation, {"action_mask": self.action_mask}
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        """Play a move, followed by the opponent's reply if there is one.
+
+        Returns:
+            Tuple of (observation, reward, terminated, truncated, info)
+
+        Raises:
+            ValueError: If the episode is already over
+
+        """
+        if self.done:
+            msg = "episode is over; call reset()"
+            raise ValueError(msg)
+
+        if not self._play(action):
+            self.done = True
+            return self.observation, ENV_ILLEGAL_MOVE_REWARD, True, False, self._info()
+
+        reward = self._outcome_reward(ENV_WIN_REWARD)
+        if not self.done and self.opponent is not None:
+            self._observe()
+            self._play(self._opponent_move())
+            reward = self._outcome_reward(ENV_LOSS_REWARD)
+        self._observe()
+        return self.observation, reward, self.done, False, self._info()
+
+    def _play(self, action: int) -> bool:
+        """Apply a move to the game."""
+        if not 0 <= action < self.size * self.size:
+            return False
+        return self.game.make_move(*divmod(int(action), self.size))
+
+    def _opponent_move(self) -> int:
+        """Ask the opponent policy for its move."""
+        return int(
+            self.opponent(self.observation[None], self.action_mask[None], self.rng)[0]
+        )
+
+    def _outcome_reward(self, win_reward: float) -> float:
+        """Mark the episode done if the last move ended it and score it."""
+        if self.game.game_state == GAME_ACTIVE:
+            return ENV_DRAW_REWARD
+        self.done = True
+        return win_reward if self.game.game_state == GAME_WON else ENV_DRAW_REWARD
+
+    def _observe(self) -> None:
+        """Write the board into the observation and mask buffers."""
+        own = self.game.current_player
+        for row, cells in enumerate(self.game.board):
+            for col, symbol in enumerate(cells):
+                self.observation[0, row, col] = symbol == own
+                self.observation[1, row, col] = symbol is not None and symbol != own
+                self.observation[2, row, col] = symbol is None
+        self.action_mask[:] = self.observation[2].ravel()
+
+    def _info(self) -> dict:
+        """Return the info dictionary of a step."""
+        return {"action_mask": self.action_mask}
+
+
+class VectorEnv:
+    """Many games stepped together on NumPy arrays, with automatic reset."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        num_envs: int,
+        size: int = BOARD_SIZE,
+        win_length: int | None = None,
+        opponent: str | Policy | None = None,
+        agent_player: str = PLAYER_X,
+        seed: int | None = None,
+    ) -> None:
+        """Allocate the game state and output buffers.
+
+        Args:
+            num_envs: Number of games stepped together
+            size: Board rows and columns
+            win_length: Marks in a row needed to win, defaulting to size
+            opponent: "random", "first", "perfect", a policy callable, or
+                None for self-play
+            agent_player: Side played by the caller when there is an opponent
+            seed: Seed for the opponent's random choices
+
+        """
+        self.num_envs = num_envs
+        self.geometry = geometry = get_geometry(size, win_length)
+        self.opponent = get_policy(opponent, geometry)
+        self.agent_player = agent_player
+        self.rng = np.random.default_rng(seed)
+        cells = geometry.cells
+
+        # Line L + 1 and board column `cells` are sentinels that pad the
+        # ragged cell-to-lines table; the sentinel column is always empty.
+        line_cells = [
+            [cell for cell in range(cells) if line >> cell & 1]
+            for line in geometry.lines
+        ]
+        line_cells.append([cells] * geometry.win_length)
+        self._line_cells = np.array(line_cells, dtype=np.intp)
+        index = {line: number for number, line in enumerate(geometry.lines)}
+        width = max(len(lines) for lines in geometry.cell_lines)
+        self._cell_lines = np.full((cells, width), len(geometry.lines), dtype=np.intp)
+        for cell, lines in enumerate(geometry.cell_lines):
+            self._cell_lines[cell, : len(lines)] = [index[line] for line in lines]
+
+        self._boards = np.zeros((num_envs, cells + 1), dtype=np.int8)
+        self._to_move = np.ones(num_envs, dtype=np.int8)
+        self._moves = np.zeros(num_envs, dtype=np.int32)
+        self._all = np.arange(num_envs)
+
+        self.observations = np.zeros((num_envs, 3, size, size), dtype=np.uint8)
+        self.final_observations = np.zeros_like(self.observations)
+        self.action_mask = np.zeros((num_envs, cells), dtype=np.bool_)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=np.bool_)
+        self.truncated = np.zeros(num_envs, dtype=np.bool_)
+        self._planes = self.observations.reshape(num_envs, 3, cells).view(np.bool_)
+        self.info = {
+            "action_mask": self.action_mask,
+            "final_observation": self.final_observations,
+        }
+
+    @property
+    def to_move(self) -> np.ndarray:
+        """Side to move in each game, +1 for X and -1 for O."""
+        return self._to_move
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """Reset every game.
+
+        Returns:
+            Tuple of (observations, info) where info holds the action mask
+
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset(self._all)
+        return self.observations, self.info
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Play one move in every game.
+
+        Games that end are reset at once; their last observation is kept in
+        info["final_observation"] and the returned observation is the first
+        of the next episode. The returned arrays are reused by the next call.
+
+        Args:
+            actions: Cell index to play in each game
+
+        Returns:
+            Tuple of (observations, rewards, terminated, truncated, info)
+
+        Raises:
+            ValueError: If an action is not a cell of the board
+
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        cells = self.geometry.cells
+        if actions.shape != (self.num_envs,) or (
+            actions.size and (actions.min() < 0 or actions.max() >= cells)
+        ):
+            msg = f"actions must be {self.num_envs} cell indices below {cells}"
+            raise ValueError(msg)
+
+        rewards = self.rewards
+        terminated = self.terminated
+        rewards.fill(ENV_DRAW_REWARD)
+
+        legal = self._boards[self._all, actions] == 0
+        np.logical_not(legal, out=terminated)
+        rewards[terminated] = ENV_ILLEGAL_MOVE_REWARD
+
+        envs = np.flatnonzero(legal)
+        won, ended = self._play(envs, actions[envs])
+        rewards[envs[won]] = ENV_WIN_REWARD
+        terminated[envs[ended]] = True
+
+        if self.opponent is not None:
+            envs = envs[~ended]
+            if envs.size:
+                self._observe(envs)
+                replies = self.opponent(
+                    self.observations[envs], self.action_mask[envs], self.rng
+                )
+                won, ended = self._play(envs, replies)
+                rewards[envs[won]] = ENV_LOSS_REWARD
+                terminated[envs[ended]] = True
+
+        self._observe()
+        done = np.flatnonzero(terminated)
+        if done.size:
+            self.final_observations[done] = self.observations[done]
+            self._reset(done)
+        return self.observations, rewards, terminated, self.truncated, self.info
+
+    def _play(
+        self, envs: np.ndarray, cells: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Place the side to move's mark and check only the lines through it.
+
+        Returns:
+            Tuple of (won, ended) masks over envs
+
+        """
+        players = self._to_move[envs]
+        self._boards[envs, cells] = players
+        self._moves[envs] += 1
+        self._to_move[envs] = -players
+
+        stones = self._boards[
+            envs[:, None, None], self._line_cells[self._cell_lines[cells]]
+        ]
+        won = (stones == players[:, None, None]).all(axis=2).any(axis=1)
+        ended = won | (self._moves[envs] == self.geometry.cells)
+        return won, ended
+
+    def _reset(self, envs: np.ndarray) -> None:
+        """Clear games, letting the opponent open when the agent plays O."""
+        self._boards[envs] = 0
+        self._to_move[envs] = 1
+        self._moves[envs] = 0
+        self._observe(envs)
+        if self.opponent is not None and self.agent_player != PLAYER_X:
+            replies = self.opponent(
+                self.observations[envs], self.action_mask[envs], self.rng
+            )
+            self._play(envs, replies)
+            self._observe(envs)
+
+    def _observe(self, envs: np.ndarray | None = None) -> None:
+        """Write observations and action masks from the boards."""
+        cells = self.geometry.cells
+        planes = self._planes
+        if envs is None:
+            boards = self._boards[:, :cells]
+            to_move = self._to_move[:, None]
+            np.equal(boards, to_move, out=planes[:, 0])
+            np.equal(boards, -to_move, out=planes[:, 1])
+            np.equal(boards, 0, out=planes[:, 2])
+            np.equal(boards, 0, out=self.action_mask)
+            return
+        boards = self._boards[envs, :cells]
+        to_move = self._to_move[envs, None]
+        planes[envs, 0] = boards == to_move
+        planes[envs, 1] = boards == -to_move
+        planes[envs, 2] = self.action_mask[envs] = boards == 0
@@ -1,6 +1,7 @@
 """Game logic for Tic-Tac-Toe."""
 
 from constants import BOARD_SIZE, GAME_ACTIVE, GAME_DRAW, GAME_WON, PLAYER_O, PLAYER_X
+from position import board_to_bits
 
 
 class TicTacToe:
@@ -48,6 +49,10 @@ class TicTacToe:
 
         return True
 
+    def key(self) -> tuple[int, int]:
+        """Return the (x_bits, o_bits) key the search engine knows the board by."""
+        return board_to_bits(self.board)
+
     def _is_valid_position(self, row: int, col: int) -> bool:
         """Check if the position is valid."""
         return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
@@ -1,4 +1,14 @@
-"""UI components for the Tic-Tac-Toe game using Pygame."""
+"""UI components for the Tic-Tac-Toe game using Pygame.
+
+The same GameUI draws larger grids, such as the 9 x 9 grid of ultimate
+tic-tac-toe, where lines between blocks of sub-boards are drawn thick and
+won sub-boards are covered by their winner's mark. Qubic's cube is drawn
+the same way, as its four layers laid out two by two on an 8 x 8 grid.
+
+A board too large to show whole, like the 15 x 15 five-in-a-row board, is
+seen through a view of some of its rows and columns that can be scrolled
+and zoomed. Only the cells in view are drawn.
+"""
 
 import time
 
@@ -14,13 +24,21 @@ from constants import (
     FPS,
     GAME_DRAW,
     GAME_WON,
+    HIGHLIGHT_COLOR,
+    HIGHLIGHT_WIDTH,
     LINE_COLOR,
     LINE_WIDTH,
+    MIN_VIEW,
     O_IMAGE,
     STATUS_BAR_HEIGHT,
     STATUS_Y_POSITION,
+    SUB_LINE_WIDTH,
     SYMBOL_OFFSET,
     SYMBOL_SIZE,
+    THINKING_BAR_HEIGHT,
+    THINKING_BAR_WIDTH,
+    THINKING_BAR_Y,
+    THINKING_MESSAGE,
     TOTAL_HEIGHT,
     WELCOME_IMAGE,
     WHITE,
@@ -31,13 +49,45 @@ from constants import (
     X_IMAGE,
 )
 from game_logic import TicTacToe
+from gomoku import GomokuGame
+from qubic import QubicGame
+from ultimate import UltimateGame
+
+Game = TicTacToe | UltimateGame | QubicGame | GomokuGame
 
 
 class GameUI:
     """Handles all UI operations for the Tic-Tac-Toe game."""
 
-    def __init__(self) -> None:
-        """Initialize the game UI."""
+    def __init__(
+        self,
+        board_size: int = BOARD_SIZE,
+        block: int = 1,
+        *,
+        layered: bool = False,
+        view: int | None = None,
+    ) -> None:
+        """Initialize the game UI.
+
+        Args:
+            board_size: Rows and columns of the grid
+            block: Rows and columns of each sub-board, for ultimate
+                tic-tac-toe, or of each layer of a cube; lines between
+                blocks are thick and the others thin, so 1 draws a plain
+                board in thick lines and board_size one in thin lines
+            layered: Whether the blocks are layers of a cube rather than
+                sub-boards, so that they are never covered or outlined
+            view: Rows and columns in view at first, around the centre of
+                the board; defaults to the whole board
+
+        """
+        self.board_size = board_size
+        self.block = block
+        self.layered = layered
+        self.sub_boards = 1 < block < board_size and not layered
+        self.top = 0
+        self.left = 0
+
         pygame.init()
         self.clock = pygame.time.Clock()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, TOTAL_HEIGHT), 0, 32)
@@ -45,6 +95,9 @@ class GameUI:
 
         # Load and scale images
         self._load_images()
+        self._set_view(view or board_size)
+        middle = (board_size - self.view) // 2
+        self._move_view(middle, middle)
 
         # Initialize font
         self.font = pygame.font.Font(None, FONT_SIZE)
@@ -52,17 +105,72 @@ class GameUI:
     def _load_images(self) -> None:
         """Load and scale all game images."""
         self.welcome_image = pygame.image.load(WELCOME_IMAGE)
-        self.x_image = pygame.image.load(X_IMAGE)
-        self.o_image = pygame.image.load(O_IMAGE)
+        self.x_source = pygame.image.load(X_IMAGE)
+        self.o_source = pygame.image.load(O_IMAGE)
 
-        # Scale images
-        self.x_image = pygame.transform.scale(self.x_image, SYMBOL_SIZE)
-        self.o_image = pygame.transform.scale(self.o_image, SYMBOL_SIZE)
+        # Sub-board winners are drawn at the size of a standard board's marks
+        if self.sub_boards:
+            self.x_board_image = pygame.transform.scale(self.x_source, SYMBOL_SIZE)
+            self.o_board_image = pygame.transform.scale(self.o_source, SYMBOL_SIZE)
+
+        # Marks are scaled to the cells by _set_view
         self.welcome_image = pygame.transform.scale(
             self.welcome_image,
             (WINDOW_WIDTH, TOTAL_HEIGHT),
         )
 
+    def _set_view(self, view: int) -> None:
+        """Size the cells and marks for a view of some rows and columns."""
+        self.view = view
+        self.cell_width = WINDOW_WIDTH // view
+        self.cell_height = WINDOW_HEIGHT // view
+        self.symbol_size = (
+            SYMBOL_SIZE[0] * BOARD_SIZE // view,
+            SYMBOL_SIZE[1] * BOARD_SIZE // view,
+        )
+        self.symbol_offset = SYMBOL_OFFSET * BOARD_SIZE // view
+        self.x_image = pygame.transform.scale(self.x_source, self.symbol_size)
+        self.o_image = pygame.transform.scale(self.o_source, self.symbol_size)
+
+    def zoom(self, steps: int) -> bool:
+        """Zoom in by some rows and columns, or out for negative steps.
+
+        The cell at the centre of the view stays there, as far as the
+        edges of the board allow.
+
+        Returns:
+            True if the view changed, False otherwise
+
+        """
+        view = min(max(self.view - steps, MIN_VIEW), self.board_size)
+        if view == self.view:
+            return False
+        centre_row = self.top + self.view // 2
+        centre_col = self.left + self.view // 2
+        self._set_view(view)
+        self._move_view(centre_row - view // 2, centre_col - view // 2)
+        return True
+
+    def scroll(self, rows: int, cols: int) -> bool:
+        """Move the view by some rows and columns, stopping at the edges.
+
+        Returns:
+            True if the view moved, False otherwise
+
+        """
+        return self._move_view(self.top + rows, self.left + cols)
+
+    def _move_view(self, top: int, left: int) -> bool:
+        """Put the top left corner of the view at a cell, kept on the board."""
+        last = self.board_size - self.view
+        top = min(max(top, 0), last)
+        left = min(max(left, 0), last)
+        if (top, left) == (self.top, self.left):
+            return False
+        self.top = top
+        self.left = left
+        return True
+
     def show_welcome_screen(self) -> None:
         """Display the welcome screen."""
         self.screen.blit(self.welcome_image, (0, 0))
@@ -74,43 +182,88 @@ class GameUI:
         self.screen.fill(WHITE)
 
         # Draw vertical lines
-        for i in range(1, BOARD_SIZE):
-            x_pos = i * CELL_WIDTH
+        for i in range(1, self.view):
+            x_pos = i * self.cell_width
             pygame.draw.line(
                 self.screen,
                 LINE_COLOR,
                 (x_pos, 0),
                 (x_pos, WINDOW_HEIGHT),
-                LINE_WIDTH,
+                self._line_width(self.left + i),
             )
 
         # Draw horizontal lines
-        for i in range(1, BOARD_SIZE):
-            y_pos = i * CELL_HEIGHT
+        for i in range(1, self.view):
+            y_pos = i * self.cell_height
             pygame.draw.line(
                 self.screen,
                 LINE_COLOR,
                 (0, y_pos),
                 (WINDOW_WIDTH, y_pos),
-                LINE_WIDTH,
+                self._line_width(self.top + i),
             )
 
-    def draw_symbols(self, game: TicTacToe) -> None:
-        """Draw X and O symbols on the board."""
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                symbol = game.board[row][col]
+    def _line_width(self, index: int) -> int:
+        """Return the width of a grid line, thick between sub-boards."""
+        return LINE_WIDTH if index % self.block == 0 else SUB_LINE_WIDTH
+
+    def draw_symbols(self, game: Game) -> None:
+        """Draw the X and O symbols in view."""
+        board = game.board
+        for row in range(self.top, self.top + self.view):
+            for col in range(self.left, self.left + self.view):
+                symbol = board[row][col]
                 if symbol is not None:
-                    x_pos = col * CELL_WIDTH + SYMBOL_OFFSET
-                    y_pos = row * CELL_HEIGHT + SYMBOL_OFFSET
+                    x_pos = (col - self.left) * self.cell_width + self.symbol_offset
+                    y_pos = (row - self.top) * self.cell_height + self.symbol_offset
 
                     if symbol == "x":
                         self.screen.blit(self.x_image, (x_pos, y_pos))
                     else:  # symbol == "o"
                         self.screen.blit(self.o_image, (x_pos, y_pos))
 
-    def draw_winning_line(self, game: TicTacToe) -> None:
-        """Draw the winning line if there's a winner."""
+        if self.sub_boards:
+            self._draw_sub_boards(game)
+
+    def _draw_sub_boards(self, game: UltimateGame) -> None:
+        """Cover won sub-boards with their winner and outline the playable ones."""
+        width = self.block * self.cell_width
+        height = self.block * self.cell_height
+        blocks = self.board_size // self.block
+        open_boards = game.open_boards()
+        for board, winner in enumerate(game.board_winners()):
+            row, col = divmod(board, blocks)
+            left = col * width
+            top = row * height
+            if winner is not None:
+                # Clear up to the thick lines, which are centred on the edges
+                # between sub-boards, or up to the edge of the window
+                inset = LINE_WIDTH // 2
+                x_start = left + inset if col else 0
+                y_start = top + inset if row else 0
+                x_end = left + width - inset if col < blocks - 1 else WINDOW_WIDTH
+                y_end = top + height - inset if row < blocks - 1 else WINDOW_HEIGHT
+                self.screen.fill(
+                    WHITE, (x_start, y_start, x_end - x_start, y_end - y_start)
+                )
+                image = self.x_board_image if winner == "x" else self.o_board_image
+                self.screen.blit(image, (left + SYMBOL_OFFSET, top + SYMBOL_OFFSET))
+            elif open_boards >> board & 1:
+                pygame.draw.rect(
+                    self.screen,
+                    HIGHLIGHT_COLOR,
+                    (left, top, width, height),
+                    HIGHLIGHT_WIDTH,
+                )
+
+    def draw_winning_line(self, game: Game) -> None:
+        """Draw the winning line if there's a winner.
+
+        An ultimate game's line of sub-boards spans the window the same
+        way as a line of a standard board. A line through a cube crosses
+        its layers, and a line of five may be partly out of view, so their
+        cells are outlined instead.
+        """
         winning_line = game.get_winning_line()
         if winning_line is None:
             return
@@ -146,6 +299,8 @@ class GameUI:
                 (WINDOW_WIDTH - 50, WINDOW_HEIGHT - 50),
                 WINNING_LINE_WIDTH,
             )
+        elif line_type == "cells":
+            self._outline_cells(index)
         elif line_type == "diagonal_anti":
             # Anti-diagonal (top-right to bottom-left)
             pygame.draw.line(
@@ -156,7 +311,27 @@ class GameUI:
                 WINNING_LINE_WIDTH,
             )
 
-    def draw_status(self, game: TicTacToe) -> None:
+    def _outline_cells(self, cells: int) -> None:
+        """Outline the cells in view of a grid bitboard."""
+        for cell in range(self.board_size * self.board_size):
+            if cells >> cell & 1:
+                row, col = divmod(cell, self.board_size)
+                row -= self.top
+                col -= self.left
+                if 0 <= row < self.view and 0 <= col < self.view:
+                    pygame.draw.rect(
+                        self.screen,
+                        WINNING_LINE_COLOR,
+                        (
+                            col * self.cell_width,
+                            row * self.cell_height,
+                            self.cell_width,
+                            self.cell_height,
+                        ),
+                        HIGHLIGHT_WIDTH,
+                    )
+
+    def draw_status(self, game: Game) -> None:
         """Draw the game status message."""
         if game.game_state == GAME_WON and game.winner:
             message = f"{game.winner.upper()} won!"
@@ -178,6 +353,37 @@ class GameUI:
         text_rect = text.get_rect(center=(WINDOW_WIDTH // 2, STATUS_Y_POSITION))
         self.screen.blit(text, text_rect)
 
+    def draw_thinking(self, progress: float) -> None:
+        """Draw the AI thinking indicator in the status area.
+
+        Args:
+            progress: Share of the search completed, from 0 to 1
+
+        """
+        text = self.font.render(THINKING_MESSAGE, True, WHITE)
+
+        # Clear status area
+        self.screen.fill(BLACK, (0, WINDOW_HEIGHT, WINDOW_WIDTH, STATUS_BAR_HEIGHT))
+
+        text_rect = text.get_rect(center=(WINDOW_WIDTH // 2, STATUS_Y_POSITION))
+        self.screen.blit(text, text_rect)
+
+        # Progress bar outline and the completed part
+        left = (WINDOW_WIDTH - THINKING_BAR_WIDTH) // 2
+        pygame.draw.rect(
+            self.screen,
+            WHITE,
+            (left, THINKING_BAR_Y, THINKING_BAR_WIDTH, THINKING_BAR_HEIGHT),
+            1,
+        )
+        filled = round(THINKING_BAR_WIDTH * min(max(progress, 0.0), 1.0))
+        if filled:
+            pygame.draw.rect(
+                self.screen,
+                WHITE,
+                (left, THINKING_BAR_Y, filled, THINKING_BAR_HEIGHT),
+            )
+
     def get_clicked_cell(self, mouse_pos: tuple[int, int]) -> tuple[int, int] | None:
         """Convert mouse position to board cell coordinates.
 
@@ -194,14 +400,14 @@ class GameUI:
         if x < 0 or y < 0 or x >= WINDOW_WIDTH or y >= WINDOW_HEIGHT:
             return None
 
-        col = x // CELL_WIDTH
-        row = y // CELL_HEIGHT
+        col = x // self.cell_width
+        row = y // self.cell_height
 
-        # Ensure we don't go beyond board boundaries due to rounding
-        if row >= BOARD_SIZE or col >= BOARD_SIZE:
+        # Ensure we don't go beyond the view due to rounding
+        if row >= self.view or col >= self.view:
             return None
 
-        return (row, col)
+        return (self.top + row, self.left + col)
 
     def update_display(self) -> None:
         """Update the display."""
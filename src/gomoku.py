@@ -0,0 +1,99 @@
+"""Five in a row on a 15 x 15 board.
+
+GomokuPosition counts stones with the LinePosition counters, taking
+every window of five cells along a row, column or diagonal as a line.
+
+Only cells within GOMOKU_RADIUS of a stone are offered as moves: the mask
+of those cells grows with each move and is restored by unmake, so the
+candidates are a single mask operation away.
+"""
+
+from constants import GOMOKU_RADIUS
+from line_game import LineGame, LinePosition, line_table
+from position import cells_of
+
+SIZE = 15
+WIN_LENGTH = 5
+CELLS = SIZE * SIZE
+CENTRE = SIZE // 2 * SIZE + SIZE // 2
+
+
+def _windows() -> tuple[int, ...]:
+    """Return the mask of every window of WIN_LENGTH cells in a line."""
+    windows = []
+    for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for row in range(SIZE):
+            for col in range(SIZE):
+                end_row = row + d_row * (WIN_LENGTH - 1)
+                end_col = col + d_col * (WIN_LENGTH - 1)
+                if 0 <= end_row < SIZE and 0 <= end_col < SIZE:
+                    windows.append(
+                        sum(
+                            1 << (row + d_row * k) * SIZE + col + d_col * k
+                            for k in range(WIN_LENGTH)
+                        )
+                    )
+    return tuple(windows)
+
+
+WINDOWS = _windows()
+# Cells within GOMOKU_RADIUS rows and columns of each cell
+_NEAR = tuple(
+    sum(
+        1 << other_row * SIZE + other_col
+        for other_row in range(
+            max(0, row - GOMOKU_RADIUS), min(SIZE, row + GOMOKU_RADIUS + 1)
+        )
+        for other_col in range(
+            max(0, col - GOMOKU_RADIUS), min(SIZE, col + GOMOKU_RADIUS + 1)
+        )
+    )
+    for row in range(SIZE)
+    for col in range(SIZE)
+)
+TABLE = line_table(WINDOWS, CELLS)
+
+
+class GomokuPosition(LinePosition):
+    """Five-in-a-row position that only offers moves near the stones."""
+
+    size = SIZE
+    table = TABLE
+
+    def __init__(self, x_bits: int = 0, o_bits: int = 0) -> None:
+        """Initialize a position.
+
+        Args:
+            x_bits: Bitboard of X's stones
+            o_bits: Bitboard of O's stones
+
+        """
+        self.near = 0
+        self.near_history: list[int] = []
+        super().__init__(x_bits, o_bits)
+        self.near_history = []
+
+    def legal_moves(self) -> list[int]:
+        """Return the empty cells near a stone, or the centre of an empty board."""
+        occupied = self.bits[0] | self.bits[1]
+        if not occupied:
+            return [CENTRE]
+        return cells_of(self.near & ~occupied)
+
+    def make(self, cell: int) -> None:
+        """Place the side to move's stone and widen the candidate cells."""
+        self.near_history.append(self.near)
+        self.near |= _NEAR[cell]
+        super().make(cell)
+
+    def unmake(self) -> None:
+        """Take back the last move and its candidate cells."""
+        self.near = self.near_history.pop()
+        super().unmake()
+
+
+class GomokuGame(LineGame):
+    """Five-in-a-row game handler with TicTacToe's interface."""
+
+    size = SIZE
+    position_class = GomokuPosition
@@ -0,0 +1,322 @@
+"""SQLite store of finished games and their moves.
+
+Games are queued in memory and written by a background thread in batched
+transactions, so recording a game never waits for the disk. Every move row
+carries the canonical position key reached by that move, and the key is
+indexed, so games reaching a position are found without replaying them.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+from constants import (
+    GAME_ACTIVE,
+    HISTORY_BATCH_SIZE,
+    HISTORY_FLUSH_INTERVAL,
+)
+from game_logic import TicTacToe
+from position import Board, board_to_bits, get_geometry
+
+DRAW = "draw"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player_x TEXT,
+    player_o TEXT,
+    outcome TEXT NOT NULL,
+    moves INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_player_x ON games (player_x);
+CREATE INDEX IF NOT EXISTS games_player_o ON games (player_o);
+CREATE INDEX IF NOT EXISTS games_outcome ON games (outcome);
+CREATE INDEX IF NOT EXISTS games_finished_at ON games (finished_at);
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    ply INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, ply)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS moves_position ON moves (position);
+"""
+
+_GAME_COLUMNS = "id, player_x, player_o, outcome, moves, finished_at"
+
+
+class GameRecord(NamedTuple):
+    """A stored game."""
+
+    id: int
+    player_x: str | None
+    player_o: str | None
+    outcome: str
+    moves: int
+    finished_at: float
+
+
+class _PendingGame(NamedTuple):
+    """A finished game waiting for the writer thread."""
+
+    moves: tuple[tuple[int, int], ...]
+    outcome: str
+    player_x: str | None
+    player_o: str | None
+    finished_at: float
+
+
+def position_key(x_bits: int, o_bits: int) -> int:
+    """Return the indexed key of a position, shared by its symmetric images."""
+    geometry = get_geometry()
+    x_bits, o_bits, _ = geometry.canonical(x_bits, o_bits)
+    return x_bits | o_bits << geometry.cells
+
+
+class HistoryStore:
+    """Persists finished games through a background writer thread."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        batch_size: int = HISTORY_BATCH_SIZE,
+        flush_interval: float = HISTORY_FLUSH_INTERVAL,
+    ) -> None:
+        """Open or create a history database.
+
+        Args:
+            path: SQLite database file
+            batch_size: Games written per transaction at most
+            flush_interval: Seconds a queued game may wait for its batch
+
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.executescript(_SCHEMA)
+        connection.close()
+
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._error: sqlite3.Error | None = None
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def record_game(
+        self,
+        moves: Sequence[tuple[int, int]],
+        outcome: str,
+        player_x: str | None = None,
+        player_o: str | None = None,
+        finished_at: float | None = None,
+    ) -> None:
+        """Queue a finished game for writing.
+
+        Args:
+            moves: (row, col) of every move in order
+            outcome: PLAYER_X, PLAYER_O or DRAW
+            player_x: Name of the X player
+            player_o: Name of the O player
+            finished_at: Unix time the game ended, defaulting to now
+
+        """
+        self._queue.put(
+            _PendingGame(
+                tuple(moves),
+                outcome,
+                player_x,
+                player_o,
+                time.time() if finished_at is None else finished_at,
+            )
+        )
+
+    def flush(self) -> None:
+        """Block until every queued game has been committed.
+
+        Raises:
+            sqlite3.Error: If a batch failed to commit since the last check;
+                the games of that batch are lost
+
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Commit queued games and stop the writer thread.
+
+        Raises:
+            sqlite3.Error: If a batch failed to commit since the last check
+
+        """
+        self._queue.put(None)
+        self._writer.join()
+        self._reader.close()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """Raise the writer's last error in the caller, once."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def games_reaching(self, board: Board) -> list[GameRecord]:
+        """Return games that reached a position or one of its symmetric images."""
+        key = position_key(*board_to_bits(board))
+        return self._games(
+            f"SELECT {_GAME_COLUMNS} FROM games WHERE id IN "  # noqa: S608
+            "(SELECT game_id FROM moves WHERE position = ?) ORDER BY id",
+            (key,),
+        )
+
+    def games_for_player(self, player: str) -> list[GameRecord]:
+        """Return games in which a player took part."""
+        return self._games(
+            f"SELECT {_GAME_COLUMNS} FROM games "  # noqa: S608
+            "WHERE player_x = ? OR player_o = ? ORDER BY id",
+            (player, player),
+        )
+
+    def games_by_outcome(self, outcome: str) -> list[GameRecord]:
+        """Return games with an outcome of PLAYER_X, PLAYER_O or DRAW."""
+        return self._games(
+            f"SELECT {_GAME_COLUMNS} FROM games WHERE outcome = ? ORDER BY id",  # noqa: S608
+            (outcome,),
+        )
+
+    def games_between(self, start: float, end: float) -> list[GameRecord]:
+        """Return games finished in [start, end) Unix time."""
+        return self._games(
+            f"SELECT {_GAME_COLUMNS} FROM games "  # noqa: S608
+            "WHERE finished_at >= ? AND finished_at < ? ORDER BY finished_at",
+            (start, end),
+        )
+
+    def moves_of(self, game_id: int) -> list[tuple[int, int]]:
+        """Return the (row, col) moves of a stored game."""
+        with self._reader_lock:
+            rows = self._reader.execute(
+                "SELECT row, col FROM moves WHERE game_id = ? ORDER BY ply",
+                (game_id,),
+            ).fetchall()
+        return [(row, col) for row, col in rows]
+
+    def _games(self, query: str, parameters: tuple) -> list[GameRecord]:
+        """Run a games query on the reader connection."""
+        with self._reader_lock:
+            rows = self._reader.execute(query, parameters).fetchall()
+        return [GameRecord(*row) for row in rows]
+
+    def _write_loop(self) -> None:
+        """Collect queued games into batches and commit each in one transaction."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA synchronous = NORMAL")
+        running = True
+        while running:
+            item = self._queue.get()
+            batch: list[_PendingGame] = []
+            waiters: list[threading.Event] = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    with connection:
+                        _insert_games(connection, batch)
+            except sqlite3.Error as error:
+                # Keep writing later batches; the caller sees the error on
+                # its next flush or close
+                self._error = error
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+        connection.close()
+
+
+def _insert_games(connection: sqlite3.Connection, batch: list[_PendingGame]) -> None:
+    """Insert a batch of games and their moves."""
+    geometry = get_geometry()
+    move_rows = []
+    for game in batch:
+        cursor = connection.execute(
+            "INSERT INTO games (player_x, player_o, outcome, moves, finished_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                game.player_x,
+                game.player_o,
+                game.outcome,
+                len(game.moves),
+                game.finished_at,
+            ),
+        )
+        game_id = cursor.lastrowid
+        boards = [0, 0]
+        for ply, (row, col) in enumerate(game.moves):
+            boards[ply & 1] |= 1 << (row * geometry.size + col)
+            move_rows.append((game_id, ply, row, col, position_key(*boards)))
+    connection.executemany(
+        "INSERT INTO moves (game_id, ply, row, col, position) VALUES (?, ?, ?, ?, ?)",
+        move_rows,
+    )
+
+
+class RecordedGame:
+    """A game whose moves are sent to a HistoryStore when it finishes."""
+
+    def __init__(
+        self,
+        store: HistoryStore,
+        player_x: str | None = None,
+        player_o: str | None = None,
+        game: TicTacToe | None = None,
+    ) -> None:
+        """Initialize a recorded game."""
+        self.store = store
+        self.player_x = player_x
+        self.player_o = player_o
+        self.game = game or TicTacToe()
+        self.moves: list[tuple[int, int]] = []
+
+    def make_move(self, row: int, col: int) -> bool:
+        """Make a move, queueing the game for storage if it ends.
+
+        Returns:
+            True if move was successful, False otherwise
+
+        """
+        if not self.game.make_move(row, col):
+            return False
+        self.moves.append((row, col))
+        if self.game.game_state != GAME_ACTIVE:
+            outcome = self.game.winner or DRAW
+            self.store.record_game(self.moves, outcome, self.player_x, self.player_o)
+        return True
+
+    def reset_game(self) -> None:
+        """Reset the game and start a new move list."""
+        self.game.reset_game()
+        self.moves = []
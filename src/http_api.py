@@ -0,0 +1,194 @@
+"""Local HTTP service returning the best move for Tic-Tac-Toe boards.
+
+POST /best-move accepts JSON with either a single ``"board"`` or a batch of
+``"boards"``. A board is either the TicTacToe.board layout (a list of rows
+holding "x", "o" or null) or a compact string such as ``"x.o.x...o"``.
+GET /best-move?board=... answers a single compact board, and GET /stats
+reports the solver cache counters. Connections are kept alive between
+requests.
+"""
+
+import argparse
+import contextlib
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from constants import API_HOST, API_MAX_BODY_BYTES, API_PORT, PLAYER_O, PLAYER_X
+from position import Board, parse_board
+from solver import Solution, Solver
+
+_CELL_VALUES = (PLAYER_X, PLAYER_O, None)
+
+
+def _evaluation(score: int) -> str:
+    """Describe a solver score from the side to move's point of view."""
+    if score > 0:
+        return "win"
+    if score < 0:
+        return "loss"
+    return "draw"
+
+
+def solution_to_json(solution: Solution) -> dict:
+    """Convert a solution to its JSON response object."""
+    return {
+        "best_move": solution.best_move,
+        "evaluation": _evaluation(solution.score),
+        "score": solution.score,
+        "to_move": solution.to_move,
+        "winning_line": solution.winning_line,
+    }
+
+
+def evaluate(solver: Solver, board: Board | str) -> dict:
+    """Solve one board from a request.
+
+    Raises:
+        ValueError: If the board is malformed or unreachable
+
+    """
+    if isinstance(board, str):
+        board = parse_board(board)
+    if not isinstance(board, list) or not all(isinstance(row, list) for row in board):
+        msg = "board must be a list of rows or a compact string"
+        raise TypeError(msg)
+    if any(cell not in _CELL_VALUES for row in board for cell in row):
+        msg = f"board cells must be {PLAYER_X!r}, {PLAYER_O!r} or null"
+        raise ValueError(msg)
+    return solution_to_json(solver.solve_board(board))
+
+
+class BestMoveHandler(BaseHTTPRequestHandler):
+    """Handles best-move requests over persistent HTTP/1.1 connections."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "BestMoveServer"
+
+    def do_GET(self) -> None:
+        """Answer a single compact board or the cache statistics."""
+        url = urlsplit(self.path)
+        if url.path == "/stats":
+            hits, misses, max_size, size = self.server.solver.cache_info()
+            self._send_json(
+                HTTPStatus.OK,
+                {"hits": hits, "misses": misses, "max_size": max_size, "size": size},
+            )
+        elif url.path == "/best-move":
+            boards = parse_qs(url.query).get("board")
+            if not boards:
+                self._send_error(HTTPStatus.BAD_REQUEST, "missing board parameter")
+                return
+            self._answer(boards[0])
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "unknown path")
+
+    def do_POST(self) -> None:
+        """Answer a JSON request holding one board or a batch of boards."""
+        if urlsplit(self.path).path != "/best-move":
+            self._send_error(HTTPStatus.NOT_FOUND, "unknown path")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._reject_body(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+            return
+        if length > API_MAX_BODY_BYTES:
+            self._reject_body(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large")
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._reject_body(HTTPStatus.BAD_REQUEST, "body is not valid JSON")
+            return
+        if not isinstance(request, dict):
+            self._send_error(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+            return
+
+        if "boards" in request:
+            try:
+                results = [evaluate(self.server.solver, b) for b in request["boards"]]
+            except (TypeError, ValueError) as error:
+                self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+                return
+            self._send_json(HTTPStatus.OK, {"results": results})
+        elif "board" in request:
+            self._answer(request["board"])
+        else:
+            self._send_error(HTTPStatus.BAD_REQUEST, "missing board or boards")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Silence per-request logging."""
+
+    def _answer(self, board: Board | str) -> None:
+        """Send the evaluation of a single board."""
+        try:
+            result = evaluate(self.server.solver, board)
+        except (TypeError, ValueError) as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+        self._send_json(HTTPStatus.OK, result)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        """Send a JSON error response."""
+        self._send_json(status, {"error": message})
+
+    def _reject_body(self, status: HTTPStatus, message: str) -> None:
+        """Send an error for a body that was not read or not understood.
+
+        The connection is closed afterwards, since whatever is left of the
+        body would otherwise be read as the next request.
+        """
+        self.close_connection = True
+        self._send_json(status, {"error": message}, close=True)
+
+    def _send_json(
+        self, status: HTTPStatus, payload: dict, *, close: bool = False
+    ) -> None:
+        """Send a JSON response with a Content-Length for keep-alive."""
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class BestMoveServer(ThreadingHTTPServer):
+    """Threaded HTTP server sharing one cached solver between requests."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = (API_HOST, API_PORT),
+        solver: Solver | None = None,
+    ) -> None:
+        """Initialize the server and its solver."""
+        super().__init__(address, BestMoveHandler)
+        self.solver = solver or Solver()
+
+
+def main() -> None:
+    """Run the API from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    with (
+        BestMoveServer((args.host, args.port)) as server,
+        contextlib.suppress(KeyboardInterrupt),
+    ):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
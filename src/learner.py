@@ -0,0 +1,305 @@
+"""Tabular self-play learner over afterstates.
+
+The agent learns the value of afterstates, the position just after a move,
+for the player who made it. Values live in a flat float32 array indexed by
+the base-3 code of the canonical afterstate: cells hold 0 when empty, 1 for
+the mover and 2 for the opponent, and the canonical code is the smallest
+code among the eight rotations and reflections. Both sides share the table.
+
+Training is negamax Q-learning over a self-play VectorEnv: each afterstate
+moves towards the negated value of the best afterstate the opponent can
+reach from it, and terminal afterstates towards the final reward.
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import (
+    BOARD_SIZE,
+    LEARNER_EXPLORATION,
+    LEARNER_LEARNING_RATE,
+    LEARNER_NUM_ENVS,
+    PLAYER_O,
+    PLAYER_X,
+)
+from dataset import encode_planes, reachable_positions
+from environment import Policy, VectorEnv, random_policy
+from position import get_geometry
+from solver import Solver
+
+
+class TrainingReport(NamedTuple):
+    """Work done by one call to TabularLearner.train."""
+
+    games: int
+    steps: int
+    seconds: float
+
+    @property
+    def games_per_second(self) -> float:
+        """Finished games per second of training."""
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+class EvaluationReport(NamedTuple):
+    """Outcomes of the greedy policy against an opponent."""
+
+    wins: int
+    draws: int
+    losses: int
+
+
+class TabularLearner:
+    """Afterstate value table trained by batched self-play."""
+
+    def __init__(
+        self,
+        size: int = BOARD_SIZE,
+        win_length: int | None = None,
+        values: np.ndarray | None = None,
+    ) -> None:
+        """Initialize a learner.
+
+        Args:
+            size: Board rows and columns
+            win_length: Marks in a row needed to win, defaulting to size
+            values: Existing value table, e.g. a memory map from load()
+
+        Raises:
+            ValueError: If values does not have one entry per board code
+
+        """
+        self.geometry = geometry = get_geometry(size, win_length)
+        entries = 3**geometry.cells
+        if values is None:
+            values = np.zeros(entries, dtype=np.float32)
+        elif values.shape != (entries,):
+            msg = f"value table must have {entries} entries"
+            raise ValueError(msg)
+        self.values = values
+
+        # weights[s, c] is the base-3 place value of cell c after symmetry s.
+        powers = 3 ** np.arange(geometry.cells, dtype=np.int64)
+        self._weights = np.array(
+            [powers[list(symmetry)] for symmetry in geometry.symmetries]
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        size: int = BOARD_SIZE,
+        win_length: int | None = None,
+        mmap_mode: str = "r",
+    ) -> "TabularLearner":
+        """Map a saved value table into memory.
+
+        Args:
+            path: File written by save()
+            size: Board rows and columns the table was trained on
+            win_length: Marks in a row needed to win, defaulting to size
+            mmap_mode: "r" to play, "r+" to keep training in place
+
+        """
+        values = np.load(path, mmap_mode=mmap_mode)
+        return cls(size, win_length, values)
+
+    def save(self, path: str | Path) -> None:
+        """Write the value table as a .npy file."""
+        np.save(path, self.values)
+
+    def afterstate_codes(self, observations: np.ndarray) -> np.ndarray:
+        """Return the canonical code of playing each cell.
+
+        Args:
+            observations: Own/opponent/empty planes of shape (N, 3, n, n)
+
+        Returns:
+            Array of shape (N, cells); entries for occupied cells are unused
+
+        """
+        count = len(observations)
+        planes = observations.reshape(count, 3, -1).astype(np.int64)
+        board = planes[:, 0] + 2 * planes[:, 1]
+        base = board @ self._weights.T
+        codes = base[:, :, None] + self._weights[None]
+        return codes.min(axis=1)
+
+    def greedy(
+        self,
+        observations: np.ndarray,
+        action_mask: np.ndarray,
+        rng: np.random.Generator | None = None,
+    ) -> np.ndarray:
+        """Return the highest-valued legal move in each environment.
+
+        The signature matches the environment's opponent policies, so a
+        trained learner can be used as an opponent.
+        """
+        del rng
+        values = self.values[self.afterstate_codes(observations)]
+        values[~action_mask] = -np.inf
+        return values.argmax(axis=1)
+
+    def train(
+        self,
+        games: int,
+        num_envs: int = LEARNER_NUM_ENVS,
+        learning_rate: float = LEARNER_LEARNING_RATE,
+        exploration: float = LEARNER_EXPLORATION,
+        seed: int | None = None,
+    ) -> TrainingReport:
+        """Train by self-play until at least the given number of games end.
+
+        Args:
+            games: Number of finished games to train on
+            num_envs: Games played in parallel
+            learning_rate: Step size of each value update
+            exploration: Probability of a random move instead of the greedy one
+            seed: Seed for exploration
+
+        Returns:
+            Games, environment steps and wall time of the run
+
+        """
+        values = self.values
+        rng = np.random.default_rng(seed)
+        env = VectorEnv(num_envs, self.geometry.size, self.geometry.win_length)
+        observations, info = env.reset()
+        rows = np.arange(num_envs)
+        previous = np.full(num_envs, -1, dtype=np.int64)
+
+        finished = steps = 0
+        start = time.perf_counter()
+        while finished < games:
+            mask = info["action_mask"]
+            codes = self.afterstate_codes(observations)
+            candidates = values[codes]
+            candidates[~mask] = -np.inf
+            actions = candidates.argmax(axis=1)
+            explore = rng.random(num_envs) < exploration
+            if explore.any():
+                actions[explore] = random_policy(None, mask[explore], rng)
+
+            # The opponent's last afterstate is worth minus our best reply.
+            waiting = previous >= 0
+            targets = -candidates.max(axis=1)
+            updated = previous[waiting]
+            values[updated] += learning_rate * (targets[waiting] - values[updated])
+
+            chosen = codes[rows, actions]
+            observations, rewards, terminated, _, info = env.step(actions)
+            steps += num_envs
+
+            ended = chosen[terminated]
+            values[ended] += learning_rate * (rewards[terminated] - values[ended])
+            previous[:] = chosen
+            previous[terminated] = -1
+            finished += int(terminated.sum())
+
+        return TrainingReport(finished, steps, time.perf_counter() - start)
+
+    def evaluate(
+        self,
+        opponent: str | Policy,
+        games: int,
+        agent_player: str = PLAYER_X,
+        seed: int | None = None,
+    ) -> EvaluationReport:
+        """Play the greedy policy against an opponent.
+
+        Args:
+            opponent: Opponent accepted by VectorEnv
+            games: Number of games, all played in parallel
+            agent_player: Side played by the learner
+            seed: Seed for the opponent
+
+        """
+        env = VectorEnv(
+            games,
+            self.geometry.size,
+            self.geometry.win_length,
+            opponent,
+            agent_player,
+            seed,
+        )
+        observations, info = env.reset()
+        outcome = np.zeros(games, dtype=np.float32)
+        active = np.ones(games, dtype=np.bool_)
+        while active.any():
+            actions = self.greedy(observations, info["action_mask"])
+            observations, rewards, terminated, _, info = env.step(actions)
+            newly = terminated & active
+            outcome[newly] = rewards[newly]
+            active &= ~terminated
+        return EvaluationReport(
+            int((outcome > 0).sum()),
+            int((outcome == 0).sum()),
+            int((outcome < 0).sum()),
+        )
+
+    def optimal_move_rate(self) -> float:
+        """Return the share of reachable positions where the greedy move is optimal.
+
+        A move is optimal when it keeps the game-theoretic value of the
+        position; how quickly a win arrives is not counted. Every reachable
+        position is solved exactly, so this is only practical on boards the
+        solver handles quickly.
+        """
+        geometry = self.geometry
+        positions = reachable_positions(geometry)
+        planes, to_move = encode_planes(positions, geometry.size)
+
+        # Swap the X and O planes where O is to move to get own/opponent planes.
+        observations = planes.copy()
+        o_to_move = to_move < 0
+        observations[o_to_move, 0] = planes[o_to_move, 1]
+        observations[o_to_move, 1] = planes[o_to_move, 0]
+        mask = observations[:, 2].reshape(len(positions), -1).astype(np.bool_)
+        actions = self.greedy(observations, mask)
+
+        solver = Solver(geometry)
+        optimal = 0
+        for (x_bits, o_bits), side, action in zip(
+            positions, to_move, actions.tolist(), strict=True
+        ):
+            me, opponent = (x_bits, o_bits) if side > 0 else (o_bits, x_bits)
+            scores = solver.move_scores(me, opponent)
+            optimal += np.sign(scores[action]) == np.sign(max(scores.values()))
+        return optimal / len(positions)
+
+
+def main() -> None:
+    """Train a learner from the command line and report its strength."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--games", type=int, default=200_000)
+    parser.add_argument("--envs", type=int, default=LEARNER_NUM_ENVS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--save", help="write the value table to this .npy file")
+    args = parser.parse_args()
+
+    learner = TabularLearner(args.size, args.win_length)
+    report = learner.train(args.games, args.envs, seed=args.seed)
+    print(  # noqa: T201
+        f"trained on {report.games:,} games in {report.seconds:.2f}s "
+        f"({report.games_per_second:,.0f} games/s)"
+    )
+    for player in (PLAYER_X, PLAYER_O):
+        for opponent in ("random", "perfect"):
+            result = learner.evaluate(opponent, 1000, player, args.seed)
+            print(  # noqa: T201
+                f"as {player} vs {opponent:7}: {result.wins} wins, "
+                f"{result.draws} draws, {result.losses} losses"
+            )
+    if args.save:
+        learner.save(args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Games won by filling one of a fixed table of lines.
+
+Rescanning every line for a winner after each move, as TicTacToe does,
+is far too slow for a search on a big board. LinePosition instead keeps a
+count of each player's marks on every line, and a move only updates the
+lines through its cell. A line reaching its full length is a win, the
+lines one mark short with none of the other player's marks give
+threats(), and a running score over all lines gives evaluate().
+
+A LineTable holds the lines of one board and the lookups derived from
+them. A variant subclasses LinePosition with its table, and LineGame with
+its position class; LineGame wraps a position with the board, player and
+state attributes the game loop and GameUI use for TicTacToe.
+"""
+
+from typing import NamedTuple
+
+from constants import GAME_ACTIVE, GAME_DRAW, GAME_WON, PLAYER_O, PLAYER_X
+from position import cells_of
+
+
+class LineTable(NamedTuple):
+    """Winning lines of a board and the lookups the counters use."""
+
+    lines: tuple[int, ...]
+    # Indexes of the lines through each cell
+    cell_lines: tuple[tuple[int, ...], ...]
+    # Value of a line holding (mine, theirs) marks, for the side owning mine
+    values: tuple[tuple[int, ...], ...]
+    full: int
+    length: int
+
+
+def line_table(lines: tuple[int, ...], cells: int) -> LineTable:
+    """Build the table for a set of equally long lines.
+
+    Args:
+        lines: Mask of the cells of each line
+        cells: Number of cells on the board
+
+    Returns:
+        The LineTable of the lines
+
+    """
+    length = lines[0].bit_count()
+    return LineTable(
+        lines,
+        tuple(
+            tuple(index for index, line in enumerate(lines) if line >> cell & 1)
+            for cell in range(cells)
+        ),
+        tuple(
+            tuple(
+                10**mine
+                if mine and not theirs
+                else -(10**theirs)
+                if theirs and not mine
+                else 0
+                for theirs in range(length + 1)
+            )
+            for mine in range(length + 1)
+        ),
+        (1 << cells) - 1,
+        length,
+    )
+
+
+class LinePosition:
+    """Mutable position counting marks on a table of lines, for search.
+
+    It offers the methods of the engine's SearchPosition protocol.
+    Subclasses set size, the width of the grid, and table.
+    """
+
+    size: int
+    table: LineTable
+
+    def __init__(self, x_bits: int = 0, o_bits: int = 0) -> None:
+        """Initialize a position.
+
+        Args:
+            x_bits: Bitboard of X's marks
+            o_bits: Bitboard of O's marks
+
+        """
+        lines = len(self.table.lines)
+        self.bits = [0, 0]
+        self.to_move = 0
+        self.counts = [[0] * lines, [0] * lines]
+        self.open_lines = [0, 0]
+        self.score = 0
+        self.won = False
+        self.history: list[tuple[int, int, bool]] = []
+        for player, bits in enumerate((x_bits, o_bits)):
+            for cell in cells_of(bits):
+                self.to_move = player
+                self.make(cell)
+        self.to_move = 0 if x_bits.bit_count() == o_bits.bit_count() else 1
+        self.won = False
+        self.history = []
+
+    def key(self) -> tuple[int, int]:
+        """Return a hashable key identifying the position."""
+        return self.bits[0], self.bits[1]
+
+    def legal_moves(self) -> list[int]:
+        """Return the empty cells."""
+        return cells_of(self.table.full & ~(self.bits[0] | self.bits[1]))
+
+    def make(self, cell: int) -> None:
+        """Place the side to move's mark on an empty cell."""
+        _, cell_lines, values, _, length = self.table
+        player = self.to_move
+        mine = self.counts[player]
+        theirs = self.counts[player ^ 1]
+        open_lines = self.open_lines
+        self.history.append((cell, self.score, self.won))
+        self.bits[player] |= 1 << cell
+        delta = 0
+        won = False
+        for index in cell_lines[cell]:
+            count = mine[index]
+            other = theirs[index]
+            delta += values[count + 1][other] - values[count][other]
+            mine[index] = count + 1
+            if other:
+                if not count and other == length - 1:
+                    open_lines[player ^ 1] &= ~(1 << index)
+            elif count == length - 2:
+                open_lines[player] |= 1 << index
+            elif count == length - 1:
+                won = True
+        self.won = won
+        self.score += delta if player == 0 else -delta
+        self.to_move = player ^ 1
+
+    def unmake(self) -> None:
+        """Take back the last move."""
+        _, cell_lines, _, _, length = self.table
+        player = self.to_move ^ 1
+        self.to_move = player
+        mine = self.counts[player]
+        theirs = self.counts[player ^ 1]
+        open_lines = self.open_lines
+        cell, self.score, self.won = self.history.pop()
+        self.bits[player] &= ~(1 << cell)
+        for index in cell_lines[cell]:
+            count = mine[index] - 1
+            other = theirs[index]
+            mine[index] = count
+            if other:
+                if not count and other == length - 1:
+                    open_lines[player ^ 1] |= 1 << index
+            elif count == length - 2:
+                open_lines[player] &= ~(1 << index)
+
+    def last_move_won(self) -> bool:
+        """Check whether the last move completed one of the lines through it.
+
+        make() notes this while it counts the marks on those lines.
+        """
+        return self.won
+
+    def is_full(self) -> bool:
+        """Check whether no empty cell is left."""
+        return self.bits[0] | self.bits[1] == self.table.full
+
+    def threats(self) -> tuple[int, int]:
+        """Return the cells that complete a line, as bitboards.
+
+        Returns:
+            (wins, blocks): cells where the side to move wins at once, and
+            cells it must take to stop the opponent from winning next move
+
+        """
+        lines = self.table.lines
+        empty = self.table.full & ~(self.bits[0] | self.bits[1])
+        return (
+            _open_cells(lines, self.open_lines[self.to_move], empty),
+            _open_cells(lines, self.open_lines[self.to_move ^ 1], empty),
+        )
+
+    def evaluate(self) -> int:
+        """Score the position for the side to move by its open lines.
+
+        Lines are weighted as in Position.evaluate; the score is kept up to
+        date by make and unmake.
+        """
+        return self.score if self.to_move == 0 else -self.score
+
+
+def _open_cells(lines: tuple[int, ...], indexes: int, empty: int) -> int:
+    """Return the empty cells of the lines in a mask of line indexes."""
+    cells = 0
+    while indexes:
+        low = indexes & -indexes
+        cells |= lines[low.bit_length() - 1] & empty
+        indexes ^= low
+    return cells
+
+
+class LineGame:
+    """Game handler with TicTacToe's interface around a search position.
+
+    Subclasses set size and position_class, a search position keeping a
+    bitboard per player in bits. Cells are numbered row * size + col on the
+    grid the board is drawn as.
+    """
+
+    size: int
+    position_class: type
+
+    def __init__(self) -> None:
+        """Initialize a new game."""
+        self.reset_game()
+
+    def reset_game(self) -> None:
+        """Reset the game to initial state."""
+        self.position = self.position_class()
+        self.current_player = PLAYER_X
+        self.winner: str | None = None
+        self.game_state = GAME_ACTIVE
+
+    @property
+    def board(self) -> list[list[str | None]]:
+        """The grid of marks, row by row."""
+        size = self.size
+        x_bits, o_bits = self.position.bits
+        return [
+            [
+                PLAYER_X
+                if x_bits >> (row * size + col) & 1
+                else PLAYER_O
+                if o_bits >> (row * size + col) & 1
+                else None
+                for col in range(size)
+            ]
+            for row in range(size)
+        ]
+
+    def key(self) -> tuple[int, ...]:
+        """Return the key the search engine knows the position by."""
+        return self.position.key()
+
+    def make_move(self, row: int, col: int) -> bool:
+        """Make a move at a cell of the grid.
+
+        Returns:
+            True if move was successful, False otherwise
+
+        """
+        size = self.size
+        if self.game_state != GAME_ACTIVE or not (0 <= row < size and 0 <= col < size):
+            return False
+        cell = row * size + col
+        if not self._can_play(cell):
+            return False
+
+        self.position.make(cell)
+        if self.position.last_move_won():
+            self.winner = self.current_player
+            self.game_state = GAME_WON
+        elif self.position.is_full():
+            self.game_state = GAME_DRAW
+        else:
+            self.current_player = (
+                PLAYER_O if self.current_player == PLAYER_X else PLAYER_X
+            )
+        return True
+
+    def _can_play(self, cell: int) -> bool:
+        """Check whether the current player may play a cell; any empty one."""
+        return not (self.position.bits[0] | self.position.bits[1]) >> cell & 1
+
+    def get_winning_line(self) -> tuple[str, int] | None:
+        """Get the winning line.
+
+        Returns:
+            ("cells", mask) where mask is the bitboard of the line, since
+            not every line of the table is a row, column or diagonal on
+            the screen
+
+        """
+        if self.winner is None:
+            return None
+        bits = self.position.bits[0 if self.winner == PLAYER_X else 1]
+        for line in self.position.table.lines:
+            if bits & line == line:
+                return ("cells", line)
+        return None
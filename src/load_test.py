@@ -0,0 +1,322 @@
+"""Load generator that simulates many concurrent clients of the game server.
+
+Each simulated client connects to its own game, plays random legal moves for
+both sides with a configurable think time between them and resets the game
+when it ends. Clients run as asyncio tasks, optionally spread over several
+processes, and report moves per second, latency percentiles and errors.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import math
+import multiprocessing
+import random
+import resource
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from client import GameClient
+from constants import (
+    GAME_ACTIVE,
+    LOAD_TEST_CLIENTS,
+    LOAD_TEST_DURATION,
+    LOAD_TEST_THINK_TIME,
+    LOAD_TEST_TIMEOUT,
+    SERVER_HOST,
+    SERVER_PORT,
+)
+from server import ShardedServer
+
+THINK_TIME_DISTRIBUTIONS = ("constant", "uniform", "exponential")
+
+# Latencies are bucketed on a logarithmic scale, so percentiles are accurate
+# to about one percent and reports from many processes merge by addition.
+_BUCKET_GROWTH = math.log(1.01)
+
+
+class LatencyHistogram:
+    """Mergeable histogram of request latencies."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency."""
+        self.buckets[math.floor(math.log(max(seconds, 1e-9)) / _BUCKET_GROWTH)] += 1
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples to this one."""
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency in seconds below which percent of samples fall."""
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(math.exp((bucket + 1) * _BUCKET_GROWTH), self.max)
+        return self.max
+
+
+class LoadReport:
+    """Aggregated results of a load test."""
+
+    def __init__(self) -> None:
+        """Initialize an empty report."""
+        self.moves = 0
+        self.games = 0
+        self.errors: Counter[str] = Counter()
+        self.elapsed = 0.0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other: "LoadReport") -> None:
+        """Add another report, e.g. from a different process."""
+        self.moves += other.moves
+        self.games += other.games
+        self.errors.update(other.errors)
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.latency.merge(other.latency)
+
+    @property
+    def moves_per_second(self) -> float:
+        """Overall move throughput."""
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Errors per request sent."""
+        requests = self.moves + sum(self.errors.values())
+        return sum(self.errors.values()) / requests if requests else 0.0
+
+    def summary(self) -> str:
+        """Format the report for the terminal."""
+        latency = self.latency
+        lines = [
+            f"moves:       {self.moves:,} in {self.elapsed:.1f}s "
+            f"({self.moves_per_second:,.0f} moves/s)",
+            f"games:       {self.games:,}",
+            "latency:     "
+            + "  ".join(
+                f"p{percent:g}={latency.percentile(percent) * 1e3:.2f}ms"
+                for percent in (50, 90, 99, 99.9)
+            )
+            + f"  max={latency.max * 1e3:.2f}ms",
+            f"error rate:  {self.error_rate:.4%}",
+        ]
+        lines.extend(f"  {error}: {count}" for error, count in self.errors.items())
+        return "\n".join(lines)
+
+
+class LoadTestConfig:
+    """Parameters of a load test."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        clients: int = LOAD_TEST_CLIENTS,
+        duration: float = LOAD_TEST_DURATION,
+        think_time: float = LOAD_TEST_THINK_TIME,
+        distribution: str = "exponential",
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        timeout: float = LOAD_TEST_TIMEOUT,
+        seed: int = 0,
+    ) -> None:
+        """Initialize a configuration.
+
+        Args:
+            clients: Number of simulated clients
+            duration: Seconds each client keeps playing
+            think_time: Mean seconds a client waits between moves
+            distribution: One of THINK_TIME_DISTRIBUTIONS
+            host: Server host
+            port: Server port
+            timeout: Seconds before a request counts as timed out
+            seed: Seed for move choice and think times
+
+        Raises:
+            ValueError: If the distribution is unknown
+
+        """
+        if distribution not in THINK_TIME_DISTRIBUTIONS:
+            msg = f"unknown think time distribution {distribution!r}"
+            raise ValueError(msg)
+        self.clients = clients
+        self.duration = duration
+        self.think_time = think_time
+        self.distribution = distribution
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.seed = seed
+
+    def think_time_sampler(self, rng: random.Random) -> Callable[[], float]:
+        """Return a function drawing think times from the distribution."""
+        mean = self.think_time
+        if mean <= 0 or self.distribution == "constant":
+            return lambda: mean
+        if self.distribution == "uniform":
+            return lambda: rng.uniform(0, 2 * mean)
+        return lambda: rng.expovariate(1 / mean)
+
+
+async def _simulate_client(
+    config: LoadTestConfig,
+    client_id: int,
+    deadline: float,
+    report: LoadReport,
+) -> None:
+    """Play games as one client until the deadline."""
+    rng = random.Random(config.seed * 1_000_003 + client_id)  # noqa: S311
+    think = config.think_time_sampler(rng)
+    await asyncio.sleep(rng.uniform(0, config.think_time))
+
+    try:
+        client = await asyncio.wait_for(
+            GameClient.connect(client_id, config.host, config.port), config.timeout
+        )
+    except (OSError, asyncio.TimeoutError) as error:
+        report.errors[f"connect: {type(error).__name__}"] += 1
+        return
+
+    try:
+        while time.monotonic() < deadline:
+            game = client.game
+            if game.game_state != GAME_ACTIVE:
+                await asyncio.wait_for(client.reset_game(), config.timeout)
+                report.games += 1
+                continue
+
+            row, col = rng.choice(
+                [
+                    (row, col)
+                    for row, cells in enumerate(game.board)
+                    for col, cell in enumerate(cells)
+                    if cell is None
+                ]
+            )
+            player = game.current_player
+            start = time.perf_counter()
+            game = await asyncio.wait_for(client.make_move(row, col), config.timeout)
+            report.latency.record(time.perf_counter() - start)
+            if game.board[row][col] != player:
+                report.errors["move rejected"] += 1
+            else:
+                report.moves += 1
+            await asyncio.sleep(think())
+    except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as error:
+        report.errors[f"request: {type(error).__name__}"] += 1
+    finally:
+        with contextlib.suppress(OSError):
+            await client.close()
+
+
+async def run_clients(config: LoadTestConfig, client_ids: range) -> LoadReport:
+    """Run a set of simulated clients in the current event loop."""
+    report = LoadReport()
+    start = time.monotonic()
+    deadline = start + config.duration
+    # A client failing in an unexpected way is counted, not allowed to end
+    # the run for every other client
+    results = await asyncio.gather(
+        *(_simulate_client(config, cid, deadline, report) for cid in client_ids),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            report.errors[f"client: {type(result).__name__}"] += 1
+    report.elapsed = time.monotonic() - start
+    return report
+
+
+def _run_process(config: LoadTestConfig, client_ids: range) -> LoadReport:
+    """Process pool entry point running one slice of the clients."""
+    raise_file_limit()
+    return asyncio.run(run_clients(config, client_ids))
+
+
+def run_load_test(config: LoadTestConfig, processes: int = 1) -> LoadReport:
+    """Run a load test, splitting the clients across processes.
+
+    Returns:
+        The merged report of every process
+
+    """
+    if processes <= 1:
+        raise_file_limit()
+        return asyncio.run(run_clients(config, range(config.clients)))
+
+    step = math.ceil(config.clients / processes)
+    slices = [
+        range(start, min(start + step, config.clients))
+        for start in range(0, config.clients, step)
+    ]
+    report = LoadReport()
+    with multiprocessing.get_context("fork").Pool(len(slices)) as pool:
+        for partial in pool.starmap(_run_process, [(config, s) for s in slices]):
+            report.merge(partial)
+    return report
+
+
+def raise_file_limit() -> None:
+    """Raise the open file limit to its maximum for many connections."""
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main() -> None:
+    """Run a load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=LOAD_TEST_CLIENTS)
+    parser.add_argument("--duration", type=float, default=LOAD_TEST_DURATION)
+    parser.add_argument("--think-time", type=float, default=LOAD_TEST_THINK_TIME)
+    parser.add_argument(
+        "--distribution", choices=THINK_TIME_DISTRIBUTIONS, default="exponential"
+    )
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument(
+        "--spawn-server",
+        type=int,
+        metavar="WORKERS",
+        default=0,
+        help="start a local server with this many workers for the test",
+    )
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn_server:
+        raise_file_limit()
+        server = ShardedServer(args.host, 0, args.spawn_server)
+        server.start()
+        args.port = server.port
+
+    config = LoadTestConfig(
+        clients=args.clients,
+        duration=args.duration,
+        think_time=args.think_time,
+        distribution=args.distribution,
+        host=args.host,
+        port=args.port,
+    )
+    try:
+        print(run_load_test(config, args.processes).summary())  # noqa: T201
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
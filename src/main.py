@@ -1,21 +1,62 @@
 """Main entry point for the Tic-Tac-Toe game."""
 
+import argparse
 import sys
 import time
 
 import pygame
-from pygame.locals import MOUSEBUTTONDOWN, QUIT
-
-from constants import GAME_DRAW, GAME_WON
+from pygame.locals import (
+    K_DOWN,
+    K_EQUALS,
+    K_LEFT,
+    K_MINUS,
+    K_PLUS,
+    K_RIGHT,
+    K_UP,
+    KEYDOWN,
+    MOUSEBUTTONDOWN,
+    MOUSEWHEEL,
+    QUIT,
+)
+
+from ai_worker import AIWorker
+from constants import (
+    GAME_ACTIVE,
+    GAME_DRAW,
+    GAME_WON,
+    GOMOKU_DEPTH,
+    GOMOKU_VIEW,
+    PLAYER_O,
+    PLAYER_X,
+    ULTIMATE_DEPTH,
+)
 from game_logic import TicTacToe
-from game_ui import GameUI
+from game_ui import Game, GameUI
+from gomoku import GomokuGame, GomokuPosition
+from qubic import EDGE, QubicGame, QubicPosition
+from ultimate import SIZE, SUB_SIZE, UltimateGame, UltimatePosition
+
+STANDARD = "standard"
+ULTIMATE = "ultimate"
+QUBIC = "qubic"
+GOMOKU = "gomoku"
+
+# Rows and columns the view moves for each arrow key
+SCROLL_KEYS = {K_UP: (-1, 0), K_DOWN: (1, 0), K_LEFT: (0, -1), K_RIGHT: (0, 1)}
 
 
-def main() -> None:
-    """Entry point for the game."""
+def main(ai_player: str | None = None, variant: str = STANDARD) -> None:
+    """Entry point for the game.
+
+    Args:
+        ai_player: Symbol played by the computer, or None for two humans
+        variant: STANDARD, ULTIMATE for ultimate tic-tac-toe, QUBIC for
+            four in a row on a 4 x 4 x 4 cube or GOMOKU for five in a row
+            on a 15 x 15 board
+
+    """
     # Initialize game components
-    game = TicTacToe()
-    ui = GameUI()
+    game, ui, worker = new_game(variant, ai_player)
 
     # Show welcome screen and initial board
     ui.show_welcome_screen()
@@ -29,16 +70,53 @@ def main() -> None:
         for event in pygame.event.get():
             if event.type == QUIT:
                 running = False
-            elif event.type == MOUSEBUTTONDOWN:
+            elif event.type == MOUSEBUTTONDOWN and (
+                worker is None or game.current_player != ai_player
+            ):
                 handle_mouse_click(event.pos, game, ui)
+            elif event.type in (MOUSEWHEEL, KEYDOWN):
+                handle_view_event(event, game, ui)
+
+        if worker is not None:
+            poll_ai(game, ui, worker, ai_player)
 
         ui.tick()
 
+    if worker is not None:
+        worker.close()
     ui.quit()
     sys.exit()
 
 
-def handle_mouse_click(mouse_pos: tuple[int, int], game: TicTacToe, ui: GameUI) -> None:
+def new_game(
+    variant: str, ai_player: str | None
+) -> tuple[Game, GameUI, AIWorker | None]:
+    """Create the game, its UI and the AI worker for a variant."""
+    worker = None
+    if variant == GOMOKU:
+        game: Game = GomokuGame()
+        ui = GameUI(GomokuGame.size, GomokuGame.size, view=GOMOKU_VIEW)
+        if ai_player is not None:
+            worker = AIWorker(depth=GOMOKU_DEPTH, variant=GomokuPosition)
+    elif variant == QUBIC:
+        game = QubicGame()
+        ui = GameUI(QubicGame.size, EDGE, layered=True)
+        if ai_player is not None:
+            worker = AIWorker(variant=QubicPosition)
+    elif variant == ULTIMATE:
+        game = UltimateGame()
+        ui = GameUI(SIZE, SUB_SIZE)
+        if ai_player is not None:
+            worker = AIWorker(depth=ULTIMATE_DEPTH, variant=UltimatePosition)
+    else:
+        game = TicTacToe()
+        ui = GameUI()
+        if ai_player is not None:
+            worker = AIWorker()
+    return game, ui, worker
+
+
+def handle_mouse_click(mouse_pos: tuple[int, int], game: Game, ui: GameUI) -> None:
     """Handle mouse click events."""
     # Get the clicked cell
     cell = ui.get_clicked_cell(mouse_pos)
@@ -46,7 +124,30 @@ def handle_mouse_click(mouse_pos: tuple[int, int], game: TicTacToe, ui: GameUI)
         return
 
     row, col = cell
+    play_move(row, col, game, ui)
+
+
+def handle_view_event(event: pygame.event.Event, game: Game, ui: GameUI) -> None:
+    """Zoom with the mouse wheel or +/- and scroll with the arrow keys."""
+    if event.type == MOUSEWHEEL:
+        changed = ui.zoom(event.y)
+    elif event.key in SCROLL_KEYS:
+        changed = ui.scroll(*SCROLL_KEYS[event.key])
+    elif event.key in (K_PLUS, K_EQUALS, K_MINUS):
+        changed = ui.zoom(-1 if event.key == K_MINUS else 1)
+    else:
+        return
+    if changed:
+        ui.draw_board()
+        ui.draw_symbols(game)
+        if game.game_state == GAME_WON:
+            ui.draw_winning_line(game)
+        ui.draw_status(game)
+        ui.update_display()
+
 
+def play_move(row: int, col: int, game: Game, ui: GameUI) -> None:
+    """Make a move and redraw the game."""
     # Try to make a move
     if game.make_move(row, col):
         # Redraw the game
@@ -69,5 +170,60 @@ def handle_mouse_click(mouse_pos: tuple[int, int], game: TicTacToe, ui: GameUI)
             ui.update_display()
 
 
+def poll_ai(
+    game: Game,
+    ui: GameUI,
+    worker: AIWorker,
+    ai_player: str,
+) -> None:
+    """Drive the AI worker once per frame without blocking.
+
+    A search is requested when the computer is to move; while the human is
+    to move the worker ponders the replies instead. Anything in flight is
+    cancelled once the game is over. Progress reports redraw the thinking
+    indicator and a finished search plays its move.
+    """
+    if game.game_state != GAME_ACTIVE:
+        worker.cancel()
+        return
+
+    position = game.key()
+    if game.current_player != ai_player:
+        if worker.pondering != position:
+            worker.ponder(*position)
+        return
+
+    if worker.pending != position:
+        worker.request(*position)
+
+    update = worker.poll()
+    if update is None:
+        return
+    if update.move is None:
+        ui.draw_thinking(update.progress)
+        ui.update_display()
+        return
+    play_move(*update.move, game, ui)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--ai",
+        choices=(PLAYER_X, PLAYER_O),
+        default=None,
+        help="let the computer play this symbol",
+    )
+    parser.add_argument(
+        "--variant",
+        choices=(STANDARD, ULTIMATE, QUBIC, GOMOKU),
+        default=STANDARD,
+        help="game to play",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(args.ai, args.variant)
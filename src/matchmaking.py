@@ -0,0 +1,223 @@
+"""Matchmaking queue that pairs waiting players into Tic-Tac-Toe matches."""
+
+import time
+from collections import deque
+from collections.abc import Callable, Hashable
+from itertools import count
+
+from constants import DEFAULT_RATING, MAX_RATING_GAP, RATING_BUCKET_WIDTH
+from game_logic import TicTacToe
+
+
+class JoinRequest:
+    """A player waiting in the matchmaking queue."""
+
+    __slots__ = ("joined_at", "player_id", "preference", "rating")
+
+    def __init__(
+        self,
+        player_id: Hashable,
+        rating: int,
+        preference: Hashable,
+        joined_at: float,
+    ) -> None:
+        """Initialize a join request."""
+        self.player_id = player_id
+        self.rating = rating
+        self.preference = preference
+        self.joined_at = joined_at
+
+
+class Match:
+    """Two paired players and the game they play."""
+
+    def __init__(self, match_id: int, player_x: Hashable, player_o: Hashable) -> None:
+        """Initialize a match with a fresh game."""
+        self.match_id = match_id
+        self.player_x = player_x
+        self.player_o = player_o
+        self.game = TicTacToe()
+
+
+class Matchmaker:
+    """Pairs join requests in batches by preference and rating.
+
+    Requests are queued in buckets keyed on (preference, rating bucket), so
+    joining is O(1) and a pairing pass is linear in the number of requests
+    it pairs plus the number of non-empty buckets. Requests withdrawn with
+    leave() are dropped lazily when they reach the front of their bucket.
+    """
+
+    def __init__(
+        self,
+        bucket_width: int = RATING_BUCKET_WIDTH,
+        max_rating_gap: int = MAX_RATING_GAP,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty matchmaker.
+
+        Args:
+            bucket_width: Rating range covered by one queue bucket
+            max_rating_gap: Largest rating difference allowed between buckets
+                when pairing leftover players
+            clock: Monotonic time source used for wait-time metrics
+
+        """
+        self.bucket_width = bucket_width
+        self.max_rating_gap = max_rating_gap
+        self.clock = clock
+        self._buckets: dict[tuple[Hashable, int], deque[JoinRequest]] = {}
+        self._waiting: dict[Hashable, JoinRequest] = {}
+        self._match_ids = count(1)
+
+        self.matches_made = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def join(
+        self,
+        player_id: Hashable,
+        rating: int = DEFAULT_RATING,
+        preference: Hashable = None,
+    ) -> bool:
+        """Add a player to the queue.
+
+        Args:
+            player_id: Unique identifier of the player or bot
+            rating: Skill rating used to pick an opponent
+            preference: Players are only paired with others of equal preference
+
+        Returns:
+            True if the player was queued, False if already waiting
+
+        """
+        if player_id in self._waiting:
+            return False
+
+        request = JoinRequest(player_id, rating, preference, self.clock())
+        self._waiting[player_id] = request
+        key = (preference, rating // self.bucket_width)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+        bucket.append(request)
+        return True
+
+    def leave(self, player_id: Hashable) -> bool:
+        """Withdraw a waiting player.
+
+        Returns:
+            True if the player was waiting, False otherwise
+
+        """
+        return self._waiting.pop(player_id, None) is not None
+
+    def pair(self, max_matches: int | None = None) -> list[Match]:
+        """Pair waiting players and start a match for each pair.
+
+        Players are paired first-come first-served within a bucket. A player
+        left over in one bucket is offered to the next bucket of the same
+        preference if their ratings are within max_rating_gap.
+
+        Args:
+            max_matches: Upper bound on matches created in this batch
+
+        Returns:
+            The matches created, in pairing order
+
+        """
+        now = self.clock()
+        matches: list[Match] = []
+        limit = max_matches if max_matches is not None else len(self._waiting) // 2
+        leftover: JoinRequest | None = None
+
+        for key in sorted(self._buckets, key=_bucket_order):
+            bucket = self._buckets[key]
+            if leftover is not None and leftover.preference != key[0]:
+                self._requeue(leftover)
+                leftover = None
+
+            while len(matches) < limit:
+                first = self._pop_live(bucket)
+                if first is None:
+                    break
+                if leftover is not None:
+                    if abs(leftover.rating - first.rating) <= self.max_rating_gap:
+                        matches.append(self._start_match(leftover, first, now))
+                        leftover = None
+                        continue
+                    self._requeue(leftover)
+                    leftover = None
+                second = self._pop_live(bucket)
+                if second is None:
+                    leftover = first
+                    break
+                matches.append(self._start_match(first, second, now))
+
+            if not bucket:
+                del self._buckets[key]
+
+        if leftover is not None:
+            self._requeue(leftover)
+        return matches
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of players currently waiting."""
+        return len(self._waiting)
+
+    @property
+    def average_wait(self) -> float:
+        """Mean time in seconds matched players spent waiting."""
+        if self.matches_made == 0:
+            return 0.0
+        return self.total_wait / (2 * self.matches_made)
+
+    def oldest_wait(self) -> float:
+        """Time in seconds the longest-waiting player has been queued."""
+        now = self.clock()
+        oldest = now
+        for bucket in self._buckets.values():
+            while bucket and self._waiting.get(bucket[0].player_id) is not bucket[0]:
+                bucket.popleft()
+            if bucket:
+                oldest = min(oldest, bucket[0].joined_at)
+        return now - oldest
+
+    def _pop_live(self, bucket: deque[JoinRequest]) -> JoinRequest | None:
+        """Pop the next request that has not left the queue."""
+        while bucket:
+            request = bucket.popleft()
+            if self._waiting.get(request.player_id) is request:
+                return request
+        return None
+
+    def _requeue(self, request: JoinRequest) -> None:
+        """Put a popped request back at the front of its bucket."""
+        key = (request.preference, request.rating // self.bucket_width)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+        bucket.appendleft(request)
+
+    def _start_match(
+        self, first: JoinRequest, second: JoinRequest, now: float
+    ) -> Match:
+        """Create a match, giving X to the player who waited longer."""
+        del self._waiting[first.player_id]
+        del self._waiting[second.player_id]
+        if second.joined_at < first.joined_at:
+            first, second = second, first
+
+        for request in (first, second):
+            wait = now - request.joined_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        self.matches_made += 1
+        return Match(next(self._match_ids), first.player_id, second.player_id)
+
+
+def _bucket_order(key: tuple[Hashable, int]) -> tuple[str, int]:
+    """Sort buckets by preference, then rating, so neighbours are adjacent."""
+    preference, bucket = key
+    return (repr(preference), bucket)
@@ -0,0 +1,245 @@
+"""Write-ahead log of live Tic-Tac-Toe games with crash recovery.
+
+Every accepted move, reset and game end is appended as a five-byte record:
+the game id as a little-endian 32-bit integer followed by the wire move byte
+or a marker byte. Records are buffered and written with a single fsync per
+group commit, taken when enough bytes are buffered or, by a background
+thread, once the oldest buffered record has waited the commit interval even
+if no more appends arrive. A snapshot stores every live game and starts a
+new log generation, so recovery loads the snapshot and replays only the logs
+written since.
+"""
+
+import math
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from constants import (
+    LOG_GROUP_COMMIT_BYTES,
+    LOG_GROUP_COMMIT_INTERVAL,
+    LOG_SNAPSHOT_RECORDS,
+)
+from game_logic import TicTacToe
+from wire import (
+    RESET_MESSAGE,
+    SNAPSHOT_SIZE,
+    decode_board,
+    decode_move,
+    encode_board_into,
+    encode_move,
+)
+
+_RECORD = struct.Struct("<IB")
+_END_OP = 0xFE
+_SNAPSHOT_HEADER = struct.Struct("<4sII")
+_SNAPSHOT_MAGIC = b"TTTS"
+_GAME_ID = struct.Struct("<I")
+_ENTRY_SIZE = _GAME_ID.size + SNAPSHOT_SIZE
+
+SNAPSHOT_FILE = "games.snapshot"
+
+
+def _log_path(directory: Path, generation: int) -> Path:
+    """Return the path of a log generation."""
+    return directory / f"moves.{generation:08d}.log"
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make a rename or new file in a directory durable."""
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class MoveLog:
+    """Live games whose every change is journaled to disk."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        group_commit_bytes: int = LOG_GROUP_COMMIT_BYTES,
+        group_commit_interval: float = LOG_GROUP_COMMIT_INTERVAL,
+        snapshot_records: int = LOG_SNAPSHOT_RECORDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Open a log directory, recovering any games it already holds.
+
+        Args:
+            directory: Directory holding the snapshot and log files
+            group_commit_bytes: Buffered bytes that force a commit
+            group_commit_interval: Seconds after which buffered records are
+                committed, by the next append or by the background thread
+            snapshot_records: Records after which a snapshot is taken
+            clock: Monotonic time source for the commit interval
+
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.group_commit_bytes = group_commit_bytes
+        self.group_commit_interval = group_commit_interval
+        self.snapshot_records = snapshot_records
+        self.clock = clock
+
+        self.games: dict[int, TicTacToe] = {}
+        self.generation = self._recover()
+        self._buffer = bytearray()
+        self._records_since_snapshot = 0
+        self._last_commit = clock()
+        self._file = _log_path(self.directory, self.generation).open("ab", buffering=0)
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._committer = threading.Thread(target=self._commit_loop, daemon=True)
+        self._committer.start()
+
+    def game(self, game_id: int) -> TicTacToe:
+        """Return a live game, creating it if it does not exist."""
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = TicTacToe()
+        return game
+
+    def make_move(self, game_id: int, row: int, col: int) -> bool:
+        """Make a move on a game and journal it if it was accepted.
+
+        Returns:
+            True if move was successful, False otherwise
+
+        """
+        game = self.game(game_id)
+        player = game.current_player
+        if not game.make_move(row, col):
+            return False
+        self._append(game_id, encode_move(row, col, player))
+        return True
+
+    def reset_game(self, game_id: int) -> None:
+        """Reset a game and journal the reset."""
+        self.game(game_id).reset_game()
+        self._append(game_id, RESET_MESSAGE)
+
+    def end_game(self, game_id: int) -> None:
+        """Stop tracking a game, e.g. once it has been archived."""
+        if self.games.pop(game_id, None) is not None:
+            self._append(game_id, _END_OP)
+
+    def flush(self) -> None:
+        """Write buffered records and fsync them as one group commit."""
+        with self._lock:
+            if self._buffer:
+                self._file.write(self._buffer)
+                os.fsync(self._file.fileno())
+                self._buffer.clear()
+            self._last_commit = self.clock()
+
+    def snapshot(self) -> None:
+        """Persist every live game and start a new log generation."""
+        with self._lock:
+            self.flush()
+            self._file.close()
+            self.generation += 1
+            self._file = _log_path(self.directory, self.generation).open(
+                "ab", buffering=0
+            )
+
+            data = bytearray(_SNAPSHOT_HEADER.size + _ENTRY_SIZE * len(self.games))
+            _SNAPSHOT_HEADER.pack_into(
+                data, 0, _SNAPSHOT_MAGIC, self.generation, len(self.games)
+            )
+            offset = _SNAPSHOT_HEADER.size
+            for game_id, game in self.games.items():
+                _GAME_ID.pack_into(data, offset, game_id)
+                offset = encode_board_into(game, data, offset + _GAME_ID.size)
+
+            temporary = self.directory / (SNAPSHOT_FILE + ".tmp")
+            with temporary.open("wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            temporary.replace(self.directory / SNAPSHOT_FILE)
+            _fsync_directory(self.directory)
+
+            for generation in range(self.generation):
+                _log_path(self.directory, generation).unlink(missing_ok=True)
+            self._records_since_snapshot = 0
+
+    def close(self) -> None:
+        """Stop the background commits, commit pending records and close."""
+        self._closed.set()
+        self._committer.join()
+        with self._lock:
+            self.flush()
+            self._file.close()
+
+    def _append(self, game_id: int, op: int) -> None:
+        """Buffer a record, committing or snapshotting when due."""
+        with self._lock:
+            self._buffer += _RECORD.pack(game_id, op)
+            self._records_since_snapshot += 1
+            if self._records_since_snapshot >= self.snapshot_records:
+                self.snapshot()
+            elif (
+                len(self._buffer) >= self.group_commit_bytes
+                or self.clock() - self._last_commit >= self.group_commit_interval
+            ):
+                self.flush()
+
+    def _commit_loop(self) -> None:
+        """Commit records left buffered for the commit interval until closed.
+
+        Appends only commit when they arrive, so without this the records
+        of a game that goes quiet would wait for the next move.
+        """
+        interval = self.group_commit_interval
+        # Appends already commit every record with no interval, and never
+        # with an infinite one
+        timeout = interval if 0 < interval < math.inf else None
+        while not self._closed.wait(timeout):
+            with self._lock:
+                if self._buffer and self.clock() - self._last_commit >= interval:
+                    self.flush()
+
+    def _recover(self) -> int:
+        """Rebuild games from the snapshot and log tail.
+
+        Returns:
+            The newest log generation found, which new records append to
+
+        """
+        generation = 0
+        snapshot_path = self.directory / SNAPSHOT_FILE
+        if snapshot_path.exists():
+            data = snapshot_path.read_bytes()
+            magic, generation, count = _SNAPSHOT_HEADER.unpack_from(data)
+            if magic != _SNAPSHOT_MAGIC:
+                msg = f"{snapshot_path} is not a game snapshot"
+                raise ValueError(msg)
+            offset = _SNAPSHOT_HEADER.size
+            for _ in range(count):
+                (game_id,) = _GAME_ID.unpack_from(data, offset)
+                self.games[game_id] = decode_board(data, offset + _GAME_ID.size)
+                offset += _ENTRY_SIZE
+
+        while _log_path(self.directory, generation).exists():
+            self._replay(_log_path(self.directory, generation).read_bytes())
+            if not _log_path(self.directory, generation + 1).exists():
+                break
+            generation += 1
+        return generation
+
+    def _replay(self, data: bytes) -> None:
+        """Apply log records, ignoring a torn record at the end."""
+        usable = len(data) - len(data) % _RECORD.size
+        for game_id, op in _RECORD.iter_unpack(memoryview(data)[:usable]):
+            if op == RESET_MESSAGE:
+                self.game(game_id).reset_game()
+            elif op == _END_OP:
+                self.games.pop(game_id, None)
+            else:
+                row, col, _ = decode_move(op)
+                self.game(game_id).make_move(row, col)
@@ -0,0 +1,306 @@
+"""Opening book of searched moves for the first plies of a game.
+
+The book maps canonical early positions to weighted moves. Every root
+move of a position is scored by a deep engine search, and the moves that
+trail the best by at most BOOK_MARGIN are kept. A move's weight runs from
+255 for the best down to 1 at the margin. Moves are stored in canonical
+coordinates, and a lookup maps them back through the symmetry that
+canonicalized the position.
+
+Only positions the book side can actually meet are covered. When the book
+plays X these are the empty board and every reply to its book moves; when
+it plays O they are every first move and every reply after that.
+
+The book file is a header followed by fixed-width records of (X bits,
+O bits, move, weight) sorted by position. A lookup binary-searches the
+memory-mapped records, so the book is never loaded as a whole.
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import time
+from bisect import bisect_left
+from pathlib import Path
+from types import TracebackType
+
+from constants import (
+    BOARD_SIZE,
+    BOOK_DEPTH,
+    BOOK_MARGIN,
+    BOOK_PLIES,
+    ENGINE_WIN_SCORE,
+)
+from engine import Engine
+from position import Geometry, Position, get_geometry
+
+_HEADER = struct.Struct("<4sBBBBI")
+_MAGIC = b"TTTO"
+_VERSION = 1
+_RECORD = struct.Struct("<QQBB")
+
+Book = dict[tuple[int, int], list[tuple[int, int]]]
+
+
+def weigh_moves(
+    position: Position, depth: int, margin: int = BOOK_MARGIN
+) -> list[tuple[int, int]]:
+    """Score every move of a position and return the book moves.
+
+    Args:
+        position: Unfinished position to search
+        depth: Search depth in plies for each move
+        margin: Evaluation points a kept move may trail the best by; with
+            0 only the best moves are kept, all at the full weight
+
+    Returns:
+        (move, weight) pairs, best first
+
+    Raises:
+        ValueError: If margin is negative
+
+    """
+    if margin < 0:
+        msg = "margin must not be negative"
+        raise ValueError(msg)
+    engine = Engine()
+    scores = {}
+    for move in position.legal_moves():
+        position.make(move)
+        try:
+            if position.last_move_won():
+                scores[move] = ENGINE_WIN_SCORE - 1
+            elif position.is_full():
+                scores[move] = 0
+            elif depth <= 1:
+                scores[move] = -position.evaluate()
+            else:
+                scores[move] = -engine.search(position, depth - 1).score
+        finally:
+            position.unmake()
+
+    best = max(scores.values())
+    kept = sorted(
+        ((score, move) for move, score in scores.items() if score >= best - margin),
+        reverse=True,
+    )
+    if not margin:
+        return [(move, 255) for _, move in kept]
+    return [(move, 1 + 254 * (score - best + margin) // margin) for score, move in kept]
+
+
+def _search_task(
+    x_bits: int, o_bits: int, size: int, win_length: int, depth: int
+) -> list[tuple[int, int]]:
+    """Return the book moves of one position, for a worker process."""
+    return weigh_moves(Position(get_geometry(size, win_length), x_bits, o_bits), depth)
+
+
+def generate_book(
+    geometry: Geometry,
+    plies: int = BOOK_PLIES,
+    depth: int = BOOK_DEPTH,
+    processes: int | None = None,
+) -> Book:
+    """Search every position the book side can meet in the first plies.
+
+    Args:
+        geometry: Board geometry
+        plies: Positions with fewer marks than this get book moves
+        depth: Search depth for each move
+        processes: Worker processes, defaulting to the CPU count; positions
+            are searched by the calling process when this is 1
+
+    Returns:
+        Mapping of canonical (x_bits, o_bits) to (move, weight) pairs
+
+    """
+    book: Book = {}
+    empty = Position(geometry)
+    frontier = {(0, 0)} | {
+        geometry.canonical(1 << move, 0)[:2] for move in empty.legal_moves()
+    }
+    processes = processes or os.cpu_count() or 1
+    while frontier:
+        frontier = {key for key in frontier if key not in book and _marks(key) < plies}
+        tasks = [
+            (x_bits, o_bits, geometry.size, geometry.win_length, depth)
+            for x_bits, o_bits in sorted(frontier)
+        ]
+        if processes <= 1 or len(tasks) <= 1:
+            results = [_search_task(*task) for task in tasks]
+        else:
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                results = pool.starmap(_search_task, tasks, chunksize=1)
+        book.update(zip(sorted(frontier), results, strict=True))
+        frontier = {
+            reply
+            for key in frontier
+            for move, _ in book[key]
+            for reply in _replies(Position(geometry, *key), move)
+        }
+    return book
+
+
+def _marks(key: tuple[int, int]) -> int:
+    """Return the number of marks of a position key."""
+    return (key[0] | key[1]).bit_count()
+
+
+def _replies(position: Position, move: int) -> set[tuple[int, int]]:
+    """Return the canonical positions after a move and each reply to it."""
+    position.make(move)
+    replies = set()
+    if not position.last_move_won() and not position.is_full():
+        for reply in position.legal_moves():
+            position.make(reply)
+            if not position.last_move_won() and not position.is_full():
+                replies.add(position.geometry.canonical(*position.key())[:2])
+            position.unmake()
+    return replies
+
+
+def write_book(path: str | Path, book: Book, geometry: Geometry, plies: int) -> None:
+    """Write a book as sorted fixed-width records."""
+    records = sorted(
+        (x_bits, o_bits, move, weight)
+        for (x_bits, o_bits), moves in book.items()
+        for move, weight in moves
+    )
+    temporary = Path(str(path) + ".tmp")
+    with temporary.open("wb") as file:
+        file.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                geometry.size,
+                geometry.win_length,
+                plies,
+                len(records),
+            )
+        )
+        file.writelines(_RECORD.pack(*record) for record in records)
+    temporary.replace(path)
+
+
+class _Keys:
+    """Sequence view of the record keys, for bisect."""
+
+    def __init__(self, data: mmap.mmap, count: int) -> None:
+        self._data = data
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> tuple[int, int]:
+        return _RECORD.unpack_from(self._data, _HEADER.size + index * _RECORD.size)[:2]
+
+
+class OpeningBook:
+    """Memory-mapped opening book with symmetric lookup."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Map a book file.
+
+        Raises:
+            ValueError: If the file has an unknown header
+
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, win_length, plies, count = _HEADER.unpack_from(self._map)
+        if (magic, version) != (_MAGIC, _VERSION):
+            self._map.close()
+            msg = f"{path} is not a version {_VERSION} opening book"
+            raise ValueError(msg)
+        self.geometry = get_geometry(size, win_length)
+        self.plies = plies
+        self._keys = _Keys(self._map, count)
+
+    def __len__(self) -> int:
+        """Return the number of book moves."""
+        return len(self._keys)
+
+    def moves(self, x_bits: int, o_bits: int) -> list[tuple[int, int]]:
+        """Return the (cell, weight) book moves of a position, best first."""
+        geometry = self.geometry
+        canonical_x, canonical_o, symmetry = geometry.canonical(x_bits, o_bits)
+        key = (canonical_x, canonical_o)
+        index = bisect_left(self._keys, key)
+        inverse = geometry.inverse_symmetries[symmetry]
+        moves = []
+        while index < len(self._keys):
+            *record_key, move, weight = _RECORD.unpack_from(
+                self._map, _HEADER.size + index * _RECORD.size
+            )
+            if tuple(record_key) != key:
+                break
+            moves.append((inverse[move], weight))
+            index += 1
+        return sorted(moves, key=lambda item: -item[1])
+
+    def choose(
+        self, x_bits: int, o_bits: int, rng: random.Random | None = None
+    ) -> int | None:
+        """Pick a book move, or None when the position is not in the book.
+
+        Args:
+            x_bits: Bitboard of X's marks
+            o_bits: Bitboard of O's marks
+            rng: Picks among the book moves by weight; without it the best
+                move is returned
+
+        """
+        moves = self.moves(x_bits, o_bits)
+        if not moves:
+            return None
+        if rng is None:
+            return moves[0][0]
+        cells, weights = zip(*moves, strict=True)
+        return rng.choices(cells, weights)[0]
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+
+    def __enter__(self) -> "OpeningBook":
+        """Use the book as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the book."""
+        self.close()
+
+
+def main() -> None:
+    """Generate a book from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES)
+    parser.add_argument("--depth", type=int, default=BOOK_DEPTH)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    geometry = get_geometry(args.size, args.win_length)
+    start = time.perf_counter()
+    book = generate_book(geometry, args.plies, args.depth, args.processes)
+    write_book(args.path, book, geometry, args.plies)
+    print(  # noqa: T201
+        f"{len(book):,} positions searched in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Lazy SMP: several processes searching one position through a shared table.
+
+Every worker runs its own iterative-deepening search of the same root and
+shares nothing but the transposition table, which lives in a shared memory
+block. Helpers diverge from the main line by searching the moves of the
+first SMP_SHUFFLE_PLIES plies in their own random order and, for every
+other helper, one ply deeper, so the entries they store are the ones the
+others will need next. The first worker to finish its last iteration
+answers, with the deeper result when it is such a helper; the rest are
+stopped by bumping a shared generation number.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from multiprocessing import shared_memory
+from multiprocessing.queues import SimpleQueue
+from multiprocessing.sharedctypes import Synchronized
+
+from constants import SMP_WORKERS, TT_MEGABYTES
+from engine import Engine, SearchAbortedError, SearchPosition, SearchResult
+from position import Position, get_geometry
+from transposition import TranspositionTable
+
+
+def _work(
+    index: int,
+    table: TranspositionTable,
+    jobs: SimpleQueue,
+    results: SimpleQueue,
+    generation: Synchronized,
+) -> None:
+    """Search the positions sent on jobs until a None job arrives.
+
+    The table is inherited from the parent through fork and is backed by
+    the same shared memory there.
+    """
+    engine = Engine(table, random.Random(index) if index else None)  # noqa: S311
+    extra = index % 2
+    while (job := jobs.get()) is not None:
+        request_id, position, depth = job
+
+        def should_stop(request_id: int = request_id) -> bool:
+            return generation.value != request_id
+
+        try:
+            for iteration in range(1, depth + extra + 1):
+                result = engine.search(position, iteration, should_stop=should_stop)
+            results.put((request_id, index, result))
+        except SearchAbortedError:
+            continue
+
+
+class ParallelSearch:
+    """Pool of search processes sharing one transposition table."""
+
+    def __init__(
+        self, workers: int | None = SMP_WORKERS, megabytes: float = TT_MEGABYTES
+    ) -> None:
+        """Start the worker processes.
+
+        Args:
+            workers: Number of processes, defaulting to the CPU count
+            megabytes: Memory budget of the shared transposition table
+
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=TranspositionTable.nbytes(megabytes)
+        )
+        self.table = TranspositionTable(megabytes, self._memory.buf)
+        self.table.clear()
+
+        context = multiprocessing.get_context("fork")
+        self._generation = context.Value("q", 0, lock=False)
+        self._jobs = [context.SimpleQueue() for _ in range(self.workers)]
+        self._results = context.SimpleQueue()
+        self._processes = [
+            context.Process(
+                target=_work,
+                args=(index, self.table, jobs, self._results, self._generation),
+                daemon=True,
+            )
+            for index, jobs in enumerate(self._jobs)
+        ]
+        for process in self._processes:
+            process.start()
+        self.helper: int | None = None
+
+    def search(self, position: SearchPosition, depth: int) -> SearchResult:
+        """Search a position to at least the given depth with every worker.
+
+        Args:
+            position: Position to search; it is sent to the workers by value
+            depth: Plies to search
+
+        Returns:
+            The result of the first worker to finish; helper holds its index
+
+        """
+        self._generation.value += 1
+        request_id = self._generation.value
+        for jobs in self._jobs:
+            jobs.put((request_id, position, depth))
+        while True:
+            finished, index, result = self._results.get()
+            if finished == request_id:
+                break
+        self._generation.value += 1
+        self.helper = index
+        return result
+
+    def clear(self) -> None:
+        """Empty the shared transposition table."""
+        self.table.clear()
+
+    def close(self) -> None:
+        """Shut the workers down and release the shared memory."""
+        self._generation.value += 1
+        for jobs in self._jobs:
+            jobs.put(None)
+        for process in self._processes:
+            process.join()
+        del self.table
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> "ParallelSearch":
+        """Return the pool for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Shut the pool down."""
+        self.close()
+
+
+def time_to_depth(
+    position: SearchPosition, depth: int, workers: int, megabytes: float = TT_MEGABYTES
+) -> float:
+    """Return the seconds a fresh pool needs to search a position to a depth."""
+    with ParallelSearch(workers, megabytes) as search:
+        start = time.perf_counter()
+        search.search(position, depth)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    """Report time-to-depth for growing worker counts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    position = Position(get_geometry(args.size, args.win_length))
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        seconds = time_to_depth(position, args.depth, workers)
+        baseline = baseline or seconds
+        print(  # noqa: T201
+            f"{workers:3} workers: depth {args.depth} in {seconds:.3f}s "
+            f"(speedup {baseline / seconds:.2f}x)"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
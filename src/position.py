@@ -0,0 +1,335 @@
+"""Bitboard positions, winning lines and board symmetries.
+
+A position is a pair of integers holding one bit per cell for each player,
+with cell index row * size + col. Geometry describes an n x n board with
+k in a row and is shared by the solver and the search engine. Position is
+the mutable make/unmake form the search engine walks.
+"""
+
+from functools import cache
+
+from constants import BOARD_SIZE, EMPTY_CELL_CHARS, PLAYER_O, PLAYER_X, WIN_LENGTH
+
+Board = list[list[str | None]]
+
+_CHUNK_BITS = 8
+
+
+class Geometry:
+    """Winning lines and symmetries of a square board."""
+
+    def __init__(self, size: int = BOARD_SIZE, win_length: int = WIN_LENGTH) -> None:
+        """Precompute line masks and symmetry tables.
+
+        Args:
+            size: Number of rows and columns
+            win_length: Marks in a row needed to win
+
+        """
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+
+        lines = []
+        for row in range(size):
+            for col in range(size):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row = row + d_row * (win_length - 1)
+                    end_col = col + d_col * (win_length - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        mask = 0
+                        for step in range(win_length):
+                            cell = (row + d_row * step) * size + col + d_col * step
+                            mask |= 1 << cell
+                        lines.append(mask)
+        self.lines = tuple(lines)
+        self.cell_lines = tuple(
+            tuple(line for line in lines if line >> cell & 1)
+            for cell in range(self.cells)
+        )
+
+        self.symmetries = tuple(self._symmetries())
+        self.inverse_symmetries = tuple(
+            tuple(sorted(range(self.cells), key=symmetry.__getitem__))
+            for symmetry in self.symmetries
+        )
+        self._chunk_tables = tuple(
+            self._chunk_table(symmetry) for symmetry in self.symmetries
+        )
+
+    def _symmetries(self) -> list[tuple[int, ...]]:
+        """Return the eight rotations and reflections as cell permutations."""
+        size = self.size
+        last = size - 1
+        maps = (
+            lambda r, c: (r, c),
+            lambda r, c: (c, last - r),
+            lambda r, c: (last - r, last - c),
+            lambda r, c: (last - c, r),
+            lambda r, c: (r, last - c),
+            lambda r, c: (last - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (last - c, last - r),
+        )
+        symmetries = []
+        for mapping in maps:
+            permutation = []
+            for cell in range(self.cells):
+                row, col = mapping(*divmod(cell, size))
+                permutation.append(row * size + col)
+            symmetries.append(tuple(permutation))
+        return symmetries
+
+    def _chunk_table(self, symmetry: tuple[int, ...]) -> tuple[tuple[int, ...], ...]:
+        """Map every byte-sized chunk of a bitboard to its transformed bits."""
+        tables = []
+        for start in range(0, self.cells, _CHUNK_BITS):
+            table = []
+            for chunk in range(1 << _CHUNK_BITS):
+                bits = 0
+                for offset in range(_CHUNK_BITS):
+                    cell = start + offset
+                    if chunk >> offset & 1 and cell < self.cells:
+                        bits |= 1 << symmetry[cell]
+                table.append(bits)
+            tables.append(tuple(table))
+        return tuple(tables)
+
+    def transform(self, bits: int, symmetry: int) -> int:
+        """Apply a symmetry to a bitboard."""
+        result = 0
+        for table in self._chunk_tables[symmetry]:
+            result |= table[bits & 0xFF]
+            bits >>= _CHUNK_BITS
+        return result
+
+    def canonical(self, first: int, second: int) -> tuple[int, int, int]:
+        """Return the smallest symmetric image of a position.
+
+        Returns:
+            Tuple of (first, second, symmetry) where symmetry is the index of
+            the transformation that produced the canonical bitboards
+
+        """
+        best = (first, second, 0)
+        for symmetry in range(1, len(self.symmetries)):
+            candidate = (
+                self.transform(first, symmetry),
+                self.transform(second, symmetry),
+                symmetry,
+            )
+            best = min(best, candidate)
+        return best
+
+    def wins_with(self, bits: int, cell: int) -> bool:
+        """Check whether the player owning bits has a line through cell."""
+        return any(bits & line == line for line in self.cell_lines[cell])
+
+    def winning_line(self, bits: int) -> int | None:
+        """Return the mask of a completed line, or None."""
+        for line in self.lines:
+            if bits & line == line:
+                return line
+        return None
+
+
+def get_geometry(size: int = BOARD_SIZE, win_length: int | None = None) -> Geometry:
+    """Return the shared Geometry for a board size and win length."""
+    return _shared_geometry(size, win_length or size)
+
+
+@cache
+def _shared_geometry(size: int, win_length: int) -> Geometry:
+    """Build each geometry once."""
+    return Geometry(size, win_length)
+
+
+class Position:
+    """Mutable k-in-a-row position with make/unmake for search.
+
+    This is the interface the search engine relies on; other games provide
+    the same methods.
+    """
+
+    def __init__(
+        self, geometry: Geometry | None = None, x_bits: int = 0, o_bits: int = 0
+    ) -> None:
+        """Initialize a position.
+
+        Args:
+            geometry: Board geometry, defaulting to the game's board
+            x_bits: Bitboard of X's marks
+            o_bits: Bitboard of O's marks
+
+        """
+        self.geometry = geometry or get_geometry()
+        self.bits = [x_bits, o_bits]
+        self.to_move = 0 if x_bits.bit_count() == o_bits.bit_count() else 1
+        self.history: list[int] = []
+
+    @classmethod
+    def from_board(cls, board: Board, geometry: Geometry | None = None) -> "Position":
+        """Build a position from a TicTacToe.board layout."""
+        return cls(geometry or get_geometry(len(board)), *board_to_bits(board))
+
+    @property
+    def player(self) -> str:
+        """Symbol of the side to move."""
+        return PLAYER_X if self.to_move == 0 else PLAYER_O
+
+    def key(self) -> tuple[int, int]:
+        """Return a hashable key identifying the position."""
+        return self.bits[0], self.bits[1]
+
+    def legal_moves(self) -> list[int]:
+        """Return the empty cells."""
+        empty = self.geometry.full & ~(self.bits[0] | self.bits[1])
+        moves = []
+        while empty:
+            low = empty & -empty
+            moves.append(low.bit_length() - 1)
+            empty ^= low
+        return moves
+
+    def make(self, cell: int) -> None:
+        """Place the side to move's mark on an empty cell."""
+        self.bits[self.to_move] |= 1 << cell
+        self.history.append(cell)
+        self.to_move ^= 1
+
+    def unmake(self) -> None:
+        """Take back the last move."""
+        self.to_move ^= 1
+        self.bits[self.to_move] &= ~(1 << self.history.pop())
+
+    def last_move_won(self) -> bool:
+        """Check whether the last move completed a line."""
+        if not self.history:
+            return False
+        return self.geometry.wins_with(self.bits[self.to_move ^ 1], self.history[-1])
+
+    def is_full(self) -> bool:
+        """Check whether no empty cell is left."""
+        return self.bits[0] | self.bits[1] == self.geometry.full
+
+    def threats(self) -> tuple[int, int]:
+        """Return the cells that complete a line, as bitboards.
+
+        Returns:
+            (wins, blocks): cells where the side to move wins at once, and
+            cells it must take to stop the opponent from winning next move
+
+        """
+        me = self.bits[self.to_move]
+        opponent = self.bits[self.to_move ^ 1]
+        needed = self.geometry.win_length - 1
+        wins = blocks = 0
+        for line in self.geometry.lines:
+            mine = me & line
+            theirs = opponent & line
+            if not theirs:
+                if mine.bit_count() == needed:
+                    wins |= line ^ mine
+            elif not mine and theirs.bit_count() == needed:
+                blocks |= line ^ theirs
+        return wins, blocks
+
+    def evaluate(self) -> int:
+        """Score the position for the side to move by its open lines.
+
+        A line still open to only one side counts for that side, weighted
+        by a factor of ten per mark already on it.
+        """
+        me = self.bits[self.to_move]
+        opponent = self.bits[self.to_move ^ 1]
+        score = 0
+        for line in self.geometry.lines:
+            mine = me & line
+            theirs = opponent & line
+            if mine and not theirs:
+                score += 10 ** mine.bit_count()
+            elif theirs and not mine:
+                score -= 10 ** theirs.bit_count()
+        return score
+
+
+def board_to_bits(board: Board) -> tuple[int, int]:
+    """Convert a TicTacToe.board layout to (x_bits, o_bits)."""
+    x_bits = 0
+    o_bits = 0
+    cell = 0
+    for row in board:
+        for symbol in row:
+            if symbol == PLAYER_X:
+                x_bits |= 1 << cell
+            elif symbol == PLAYER_O:
+                o_bits |= 1 << cell
+            cell += 1
+    return x_bits, o_bits
+
+
+# Bits set in each byte
+_BYTE_CELLS = tuple(
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)
+)
+
+
+def cells_of(bits: int) -> list[int]:
+    """Return the cells of a bitboard in increasing order, a byte at a time."""
+    cells: list[int] = []
+    base = 0
+    while bits:
+        byte = bits & 0xFF
+        if byte:
+            cells.extend(base + bit for bit in _BYTE_CELLS[byte])
+        bits >>= 8
+        base += 8
+    return cells
+
+
+def bits_to_board(x_bits: int, o_bits: int, size: int = BOARD_SIZE) -> Board:
+    """Convert (x_bits, o_bits) to a TicTacToe.board layout."""
+    return [
+        [
+            PLAYER_X
+            if x_bits >> (row * size + col) & 1
+            else PLAYER_O
+            if o_bits >> (row * size + col) & 1
+            else None
+            for col in range(size)
+        ]
+        for row in range(size)
+    ]
+
+
+def parse_board(text: str) -> Board:
+    """Parse a compact board string such as ``"x.o.x...o"``.
+
+    Raises:
+        ValueError: If the string is not a square board of x, o and empties
+
+    """
+    size = round(len(text) ** 0.5)
+    if size * size != len(text) or size == 0:
+        msg = f"board string of length {len(text)} is not square"
+        raise ValueError(msg)
+
+    board: Board = []
+    for start in range(0, len(text), size):
+        row: list[str | None] = []
+        for char in text[start : start + size].lower():
+            if char in (PLAYER_X, PLAYER_O):
+                row.append(char)
+            elif char in EMPTY_CELL_CHARS:
+                row.append(None)
+            else:
+                msg = f"invalid board character {char!r}"
+                raise ValueError(msg)
+        board.append(row)
+    return board
+
+
+def format_board(board: Board) -> str:
+    """Format a board as a compact string."""
+    return "".join(symbol or "." for row in board for symbol in row)
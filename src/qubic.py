@@ -0,0 +1,63 @@
+"""Qubic: four in a row on a 4 x 4 x 4 cube.
+
+QubicPosition stores the cube as two 64-bit masks, one per player, and
+counts marks on the 76 winning lines with the LinePosition counters: 48
+rows, columns and pillars, 24 diagonals of planes and 4 space diagonals.
+
+The four layers are laid out two by two on an 8 x 8 grid, layer 0 top
+left and layer 3 bottom right, and cells are numbered row * 8 + col on
+that grid. GameUI draws the grid as it draws any board, and moves map to
+rows and columns the same way as on the standard board.
+"""
+
+from line_game import LineGame, LinePosition, line_table
+
+EDGE = 4
+SIZE = 2 * EDGE
+CELLS = EDGE**3
+
+
+def cell(layer: int, row: int, col: int) -> int:
+    """Return the grid cell of a point of the cube."""
+    return (layer // 2 * EDGE + row) * SIZE + layer % 2 * EDGE + col
+
+
+def _lines() -> tuple[int, ...]:
+    """Return the mask of every line of four through the cube."""
+    steps = [
+        (d_layer, d_row, d_col)
+        for d_layer in (-1, 0, 1)
+        for d_row in (-1, 0, 1)
+        for d_col in (-1, 0, 1)
+        if (d_layer, d_row, d_col) > (0, 0, 0)
+    ]
+    lines = set()
+    for layer in range(EDGE):
+        for row in range(EDGE):
+            for col in range(EDGE):
+                for d_layer, d_row, d_col in steps:
+                    points = [
+                        (layer + d_layer * k, row + d_row * k, col + d_col * k)
+                        for k in range(EDGE)
+                    ]
+                    if all(0 <= value < EDGE for point in points for value in point):
+                        lines.add(sum(1 << cell(*point) for point in points))
+    return tuple(sorted(lines))
+
+
+LINES = _lines()
+TABLE = line_table(LINES, CELLS)
+
+
+class QubicPosition(LinePosition):
+    """Mutable Qubic position with make/unmake for search."""
+
+    size = SIZE
+    table = TABLE
+
+
+class QubicGame(LineGame):
+    """Qubic game handler with TicTacToe's interface on the 8 x 8 grid."""
+
+    size = SIZE
+    position_class = QubicPosition
@@ -0,0 +1,235 @@
+"""Retrograde solver over every board encoding.
+
+Boards are encoded as base-3 integers: cell c contributes 3**c times 0
+when empty, 1 for X and 2 for O. The solver builds a dense int8 table with
+one entry per code, so a lookup is a single array index, and fills it
+without recursion: positions are grouped by the number of marks, the full
+boards are scored first, and each earlier level takes the best of its
+children from the level after it, all with NumPy array operations.
+
+Scores follow Solver: from the side to move's view, positive for a win and
+negative for a loss, with magnitude one more than the number of empty
+cells left when the game ends; draws are zero. Codes that no game can
+reach, such as boards with more O's than X's, hold UNREACHABLE.
+"""
+
+import argparse
+import functools
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from constants import BOARD_SIZE
+from position import Geometry, get_geometry
+
+UNREACHABLE = -128
+
+
+class RetrogradeTable:
+    """Dense table of exact scores indexed by base-3 board code."""
+
+    def __init__(self, geometry: Geometry, values: np.ndarray) -> None:
+        """Wrap a solved value table.
+
+        Args:
+            geometry: Board geometry the table was solved for
+            values: int8 scores, one per code, e.g. a memory map from load()
+
+        Raises:
+            ValueError: If values does not have one entry per board code
+
+        """
+        entries = 3**geometry.cells
+        if values.shape != (entries,):
+            msg = f"value table must have {entries} entries"
+            raise ValueError(msg)
+        self.geometry = geometry
+        self.values = values
+        self._powers = [3**cell for cell in range(geometry.cells)]
+
+    @classmethod
+    def solve(
+        cls,
+        size: int = BOARD_SIZE,
+        win_length: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> "RetrogradeTable":
+        """Solve every board of a geometry.
+
+        Args:
+            size: Board rows and columns
+            win_length: Marks in a row needed to win, defaulting to size
+            progress: Called with (marks, positions) after each level
+
+        """
+        geometry = get_geometry(size, win_length)
+        return cls(geometry, solve_values(geometry, progress))
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        size: int = BOARD_SIZE,
+        win_length: int | None = None,
+        mmap_mode: str | None = "r",
+    ) -> "RetrogradeTable":
+        """Map a saved table into memory.
+
+        Args:
+            path: File written by save()
+            size: Board rows and columns the table was solved for
+            win_length: Marks in a row needed to win, defaulting to size
+            mmap_mode: Passed to numpy.load; None reads the whole table
+
+        """
+        values = np.load(path, mmap_mode=mmap_mode)
+        return cls(get_geometry(size, win_length), values)
+
+    def save(self, path: str | Path) -> None:
+        """Write the value table as a .npy file."""
+        np.save(path, self.values)
+
+    def encode(self, x_bits: int, o_bits: int) -> int:
+        """Return the base-3 code of a board given as bitboards."""
+        powers = self._powers
+        code = 0
+        for cell, power in enumerate(powers):
+            if x_bits >> cell & 1:
+                code += power
+            elif o_bits >> cell & 1:
+                code += 2 * power
+        return code
+
+    def score(self, x_bits: int, o_bits: int) -> int:
+        """Return the exact score of a board for the side to move."""
+        return int(self.values[self.encode(x_bits, o_bits)])
+
+    def move_scores(self, x_bits: int, o_bits: int) -> dict[int, int]:
+        """Score every legal move of a board with no winner yet.
+
+        Returns:
+            Mapping of cell index to the score of playing it, for the side
+            playing it
+
+        """
+        code = self.encode(x_bits, o_bits)
+        digit = 1 if x_bits.bit_count() == o_bits.bit_count() else 2
+        empty = self.geometry.full & ~(x_bits | o_bits)
+        return {
+            cell: -int(self.values[code + digit * power])
+            for cell, power in enumerate(self._powers)
+            if empty >> cell & 1
+        }
+
+
+def solve_values(
+    geometry: Geometry, progress: Callable[[int, int], None] | None = None
+) -> np.ndarray:
+    """Return the int8 score of every board code of a geometry.
+
+    Args:
+        geometry: Board geometry to solve
+        progress: Called with (marks, positions) after each level
+
+    """
+    cells = geometry.cells
+    x_count, o_count, x_line, o_line = _board_features(geometry)
+    marks = x_count + o_count
+    powers = 3 ** np.arange(cells, dtype=np.int64)
+
+    values = np.full(3**cells, UNREACHABLE, dtype=np.int8)
+    for level in range(cells, -1, -1):
+        x_moved = (level + 1) // 2
+        codes = np.flatnonzero((marks == level) & (x_count == x_moved))
+        # The side that just moved may have won; the side to move cannot
+        # have a line, or the game would have ended a move earlier.
+        mover_line, waiting_line = (x_line, o_line) if level % 2 else (o_line, x_line)
+        codes = codes[~waiting_line[codes]]
+        ended = mover_line[codes]
+        values[codes[ended]] = -(cells - level + 1)
+
+        open_codes = codes[~ended]
+        if level == cells:
+            values[open_codes] = 0
+        else:
+            values[open_codes] = _best_child(
+                values, open_codes, powers, 1 if level % 2 == 0 else 2
+            )
+        if progress is not None:
+            progress(level, len(codes))
+    return values
+
+
+def _best_child(
+    values: np.ndarray, codes: np.ndarray, powers: np.ndarray, digit: int
+) -> np.ndarray:
+    """Return the best negated child score of each position."""
+    best = np.full(len(codes), UNREACHABLE, dtype=np.int8)
+    for power in powers.tolist():
+        empty = codes // power % 3 == 0
+        children = values[codes[empty] + digit * power]
+        best[empty] = np.maximum(best[empty], -children)
+    return best
+
+
+def _board_features(
+    geometry: Geometry,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return the X count, O count and line flags of every board code.
+
+    The arrays are built by broadcasting over a view with one axis of
+    length three per cell, so no code is decoded digit by digit.
+    """
+    cells = geometry.cells
+    shape = (3,) * cells
+
+    def indicator(cell: int, digit: int) -> np.ndarray:
+        # Cell c is axis cells-1-c, since the last axis varies fastest.
+        axes = [1] * cells
+        axes[cells - 1 - cell] = 3
+        return (np.arange(3) == digit).reshape(axes)
+
+    x_count = np.zeros(shape, dtype=np.uint8)
+    o_count = np.zeros(shape, dtype=np.uint8)
+    for cell in range(cells):
+        x_count += indicator(cell, 1)
+        o_count += indicator(cell, 2)
+
+    x_line = np.zeros(shape, dtype=np.bool_)
+    o_line = np.zeros(shape, dtype=np.bool_)
+    for line in geometry.lines:
+        line_cells = [cell for cell in range(cells) if line >> cell & 1]
+        x_line |= functools.reduce(
+            np.logical_and, [indicator(cell, 1) for cell in line_cells]
+        )
+        o_line |= functools.reduce(
+            np.logical_and, [indicator(cell, 2) for cell in line_cells]
+        )
+    return x_count.ravel(), o_count.ravel(), x_line.ravel(), o_line.ravel()
+
+
+def main() -> None:
+    """Solve a board from the command line and save the table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--output", help="write the value table to this .npy file")
+    args = parser.parse_args()
+
+    def progress(level: int, positions: int) -> None:
+        print(f"{level:3} marks: {positions:>12,} positions")  # noqa: T201
+
+    start = time.perf_counter()
+    table = RetrogradeTable.solve(args.size, args.win_length, progress)
+    print(  # noqa: T201
+        f"solved {table.values.size:,} codes in {time.perf_counter() - start:.2f}s; "
+        f"empty board scores {table.score(0, 0)}"
+    )
+    if args.output:
+        table.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""Multi-process sharded game server.
+
+Protocol: a client opens a TCP connection and sends the game id as a
+little-endian 32-bit integer. The server answers with a wire snapshot of
+the game; the client must wait for it before sending requests. Each request
+is one byte, either a wire move or RESET_MESSAGE, and is answered with a
+snapshot of the game after the request was applied.
+
+Every worker process listens on the same port with SO_REUSEPORT and owns the
+games whose id maps to its shard. A worker that accepts a connection for a
+game it does not own hands the socket to the owning worker over a Unix
+socket, so all moves of a game are applied by one process.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+from collections.abc import Coroutine
+from pathlib import Path
+
+from constants import (
+    GAME_ACTIVE,
+    SERVER_BACKLOG,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_READ_SIZE,
+)
+from game_logic import TicTacToe
+from move_log import MoveLog
+from wire import (
+    RESET_MESSAGE,
+    SNAPSHOT_SIZE,
+    decode_move,
+    encode_board,
+    encode_board_into,
+)
+
+HELLO = struct.Struct("<I")
+
+
+def shard_for(game_id: int, shard_count: int) -> int:
+    """Return the shard that owns a game."""
+    return game_id % shard_count
+
+
+class ShardWorker:
+    """Serves the games of one shard inside a worker process."""
+
+    def __init__(
+        self,
+        shard: int,
+        listener: socket.socket,
+        inbox: socket.socket,
+        outboxes: list[socket.socket],
+        log_directory: Path | None = None,
+    ) -> None:
+        """Initialize a shard worker.
+
+        Args:
+            shard: Index of the shard this worker owns
+            listener: Listening socket shared with or parallel to other workers
+            inbox: Unix datagram socket receiving handed-off connections
+            outboxes: Unix datagram sockets to every shard, indexed by shard
+            log_directory: Directory for this shard's move log, or None to
+                keep games in memory only
+
+        """
+        self.shard = shard
+        self.listener = listener
+        self.inbox = inbox
+        self.outboxes = outboxes
+        self.log = MoveLog(log_directory) if log_directory is not None else None
+        self.games: dict[int, TicTacToe] = self.log.games if self.log else {}
+        self._tasks: set[asyncio.Task] = set()
+        self._handoff_locks = [asyncio.Lock() for _ in outboxes]
+
+    async def run(self) -> None:
+        """Accept connections and handoffs until cancelled or terminated."""
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        self.inbox.setblocking(False)
+        for outbox in self.outboxes:
+            outbox.setblocking(False)
+        loop.add_reader(self.inbox.fileno(), self._receive_handoff)
+        server = await asyncio.start_server(
+            self._on_connect, sock=self.listener, backlog=SERVER_BACKLOG
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            loop.remove_reader(self.inbox.fileno())
+            if self.log is not None:
+                self.log.close()
+
+    def _spawn(self, coroutine: Coroutine[None, None, None]) -> None:
+        """Run a coroutine as a task that is kept alive until it finishes."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _on_connect(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read the hello and serve the game or hand the socket off."""
+        try:
+            hello = await reader.readexactly(HELLO.size)
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+
+        (game_id,) = HELLO.unpack(hello)
+        owner = shard_for(game_id, len(self.outboxes))
+        if owner == self.shard:
+            await self._serve(game_id, reader, writer)
+            return
+
+        sock = writer.get_extra_info("socket")
+        await self._hand_off(owner, hello, sock.fileno())
+        writer.close()
+
+    async def _hand_off(self, owner: int, hello: bytes, fd: int) -> None:
+        """Send a connection to its owner, waiting while the outbox is full.
+
+        The outboxes are non-blocking, so a busy owner never stalls this
+        worker's event loop. Handoffs to one owner take turns, since the
+        loop keeps a single writer callback per socket.
+        """
+        loop = asyncio.get_running_loop()
+        outbox = self.outboxes[owner]
+        async with self._handoff_locks[owner]:
+            while not _try_send_fd(outbox, hello, fd):
+                writable = loop.create_future()
+                loop.add_writer(outbox.fileno(), writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    loop.remove_writer(outbox.fileno())
+
+    def _receive_handoff(self) -> None:
+        """Adopt a connection handed over by another worker."""
+        try:
+            hello, fds, _, _ = socket.recv_fds(self.inbox, HELLO.size, 1)
+        except BlockingIOError:
+            return
+        (game_id,) = HELLO.unpack(hello)
+        sock = socket.socket(fileno=fds[0])
+        self._spawn(self._serve_socket(game_id, sock))
+
+    async def _serve_socket(self, game_id: int, sock: socket.socket) -> None:
+        """Serve a handed-off socket."""
+        reader, writer = await asyncio.open_connection(sock=sock)
+        await self._serve(game_id, reader, writer)
+
+    async def _serve(
+        self,
+        game_id: int,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Apply requests for one game until the client disconnects.
+
+        A game is ended as soon as it has a result, after its final
+        snapshot is encoded, so finished games are neither kept in memory
+        nor written to snapshots; a later request starts a new game. A game
+        without moves is ended when its client disconnects, since
+        recovering it would give the same empty board.
+        """
+        writer.write(encode_board(self._game(game_id)))
+        try:
+            while requests := await reader.read(SERVER_READ_SIZE):
+                replies = bytearray(len(requests) * SNAPSHOT_SIZE)
+                offset = 0
+                for request in requests:
+                    game = self._apply(game_id, request)
+                    offset = encode_board_into(game, replies, offset)
+                    if game.game_state != GAME_ACTIVE:
+                        self._end_game(game_id)
+                writer.write(replies)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            game = self.games.get(game_id)
+            if game is not None and game.key() == (0, 0):
+                self._end_game(game_id)
+            if self.log is not None:
+                self.log.flush()
+            writer.close()
+
+    def _game(self, game_id: int) -> TicTacToe:
+        """Return a game owned by this shard, creating it if needed."""
+        if self.log is not None:
+            return self.log.game(game_id)
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = TicTacToe()
+        return game
+
+    def _apply(self, game_id: int, request: int) -> TicTacToe:
+        """Apply one request byte to a game.
+
+        Returns:
+            The game the request was applied to
+
+        """
+        game = self._game(game_id)
+        if request == RESET_MESSAGE:
+            if self.log is not None:
+                self.log.reset_game(game_id)
+            else:
+                game.reset_game()
+            return game
+
+        row, col, _ = decode_move(request)
+        if self.log is not None:
+            self.log.make_move(game_id, row, col)
+        else:
+            game.make_move(row, col)
+        return game
+
+    def _end_game(self, game_id: int) -> None:
+        """Forget a game, journaling its end if games are logged."""
+        if self.log is not None:
+            self.log.end_game(game_id)
+        else:
+            self.games.pop(game_id, None)
+
+
+def _try_send_fd(sock: socket.socket, message: bytes, fd: int) -> bool:
+    """Send a file descriptor on a non-blocking socket, if there is room.
+
+    Returns:
+        True if the message was sent, False if the socket would block
+
+    """
+    try:
+        socket.send_fds(sock, [message], [fd])
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _run_worker(
+    shard: int,
+    listeners: list[socket.socket],
+    inboxes: list[socket.socket],
+    outboxes: list[socket.socket],
+    log_directory: Path | None,
+) -> None:
+    """Worker process entry point.
+
+    The forked worker inherits every shard's listener and inbox. It closes
+    all but its own, so connections are never queued on a listener that no
+    worker accepts from, and a shard's sockets go away with its worker.
+    """
+    listener = listeners[shard]
+    inbox = inboxes[shard]
+    for sock in {*listeners, *inboxes} - {listener, inbox}:
+        sock.close()
+    worker = ShardWorker(shard, listener, inbox, outboxes, log_directory)
+    with contextlib.suppress(KeyboardInterrupt, asyncio.CancelledError):
+        asyncio.run(worker.run())
+
+
+class ShardedServer:
+    """Launches and supervises one worker process per shard."""
+
+    def __init__(
+        self,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        workers: int | None = None,
+        log_directory: str | Path | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: TCP port, or 0 to pick a free one
+            workers: Number of worker processes, defaulting to the CPU count
+            log_directory: Directory for per-shard move logs, or None
+
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.log_directory = Path(log_directory) if log_directory else None
+        self.processes: list[multiprocessing.process.BaseProcess] = []
+
+    def start(self) -> None:
+        """Bind the listening sockets and fork the workers."""
+        listeners = self._listeners()
+        channels = [
+            socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+            for _ in range(self.workers)
+        ]
+        outboxes = [sender for sender, _ in channels]
+        inboxes = [receiver for _, receiver in channels]
+        context = multiprocessing.get_context("fork")
+
+        for shard in range(self.workers):
+            log_directory = None
+            if self.log_directory is not None:
+                log_directory = self.log_directory / f"shard-{shard}"
+            process = context.Process(
+                target=_run_worker,
+                args=(shard, listeners, inboxes, outboxes, log_directory),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+        for sock in {*listeners}:
+            sock.close()
+        for sender, receiver in channels:
+            sender.close()
+            receiver.close()
+
+    def stop(self) -> None:
+        """Terminate the workers and wait for them to exit."""
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        self.processes.clear()
+
+    def serve_forever(self) -> None:
+        """Start the workers and block until they exit."""
+        self.start()
+        try:
+            for process in self.processes:
+                process.join()
+        finally:
+            self.stop()
+
+    def _listeners(self) -> list[socket.socket]:
+        """Create one listening socket per worker.
+
+        With SO_REUSEPORT the kernel spreads incoming connections across the
+        workers' sockets. Without it the workers share a single socket.
+        """
+        if not hasattr(socket, "SO_REUSEPORT"):
+            listener = socket.create_server((self.host, self.port))
+            self.port = listener.getsockname()[1]
+            return [listener] * self.workers
+
+        listeners = []
+        for _ in range(self.workers):
+            listener = socket.create_server((self.host, self.port), reuse_port=True)
+            self.port = listener.getsockname()[1]
+            listeners.append(listener)
+        return listeners
+
+
+def main() -> None:
+    """Run the server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--log-directory", default=None)
+    args = parser.parse_args()
+
+    server = ShardedServer(args.host, args.port, args.workers, args.log_directory)
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Headless games between computer players.
+
+Games are played on any position object offering the engine's
+SearchPosition methods, with no window or game loop, for soak tests and
+for measuring how fast a board variant plays out. A player is a function
+that picks a move for the side to move.
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from constants import AI_MOVE_SECONDS, GOMOKU_DEPTH, ULTIMATE_DEPTH
+from engine import Engine, SearchPosition
+from gomoku import GomokuPosition
+from position import Position
+from qubic import QubicPosition
+from ultimate import UltimatePosition
+
+Player = Callable[[SearchPosition], int]
+
+VARIANTS: dict[str, tuple[Callable[[], SearchPosition], int | None]] = {
+    "standard": (Position, None),
+    "ultimate": (UltimatePosition, ULTIMATE_DEPTH),
+    "qubic": (QubicPosition, None),
+    "gomoku": (GomokuPosition, GOMOKU_DEPTH),
+}
+
+
+class GameRecord(NamedTuple):
+    """Moves and result of one game."""
+
+    moves: tuple[int, ...]
+    winner: int | None  # 0 for X, 1 for O, None for a draw
+
+
+class SimulationReport(NamedTuple):
+    """Results of a batch of games."""
+
+    games: int
+    x_wins: int
+    o_wins: int
+    draws: int
+    moves: int
+    seconds: float
+
+    @property
+    def moves_per_second(self) -> float:
+        """Moves played per second, including the players' thinking."""
+        return self.moves / self.seconds if self.seconds else 0.0
+
+
+def random_player(rng: random.Random) -> Player:
+    """Return a player that picks uniformly among the legal moves."""
+
+    def play(position: SearchPosition) -> int:
+        return rng.choice(position.legal_moves())
+
+    return play
+
+
+def engine_player(
+    depth: int | None = None, seconds: float | None = AI_MOVE_SECONDS
+) -> Player:
+    """Return a player that searches with its own engine.
+
+    Args:
+        depth: Search depth, or the deepest iteration with a time budget
+        seconds: Thinking time per move; None searches to the full depth
+
+    """
+    engine = Engine()
+
+    def play(position: SearchPosition) -> int:
+        if seconds is None:
+            return engine.search(position, depth).move
+        return engine.think(position, seconds, depth).move
+
+    return play
+
+
+def play_game(position: SearchPosition, players: tuple[Player, Player]) -> GameRecord:
+    """Play a game to the end, X first, on the position in place."""
+    moves = []
+    while True:
+        move = players[len(moves) % 2](position)
+        position.make(move)
+        moves.append(move)
+        if position.last_move_won():
+            return GameRecord(tuple(moves), (len(moves) - 1) % 2)
+        if position.is_full():
+            return GameRecord(tuple(moves), None)
+
+
+def simulate(
+    new_position: Callable[[], SearchPosition],
+    players: tuple[Player, Player],
+    games: int,
+) -> SimulationReport:
+    """Play a batch of games from fresh positions.
+
+    Args:
+        new_position: Returns the starting position of a game
+        players: Players of X and O
+        games: Number of games
+
+    """
+    wins = [0, 0]
+    draws = moves = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        record = play_game(new_position(), players)
+        moves += len(record.moves)
+        if record.winner is None:
+            draws += 1
+        else:
+            wins[record.winner] += 1
+    seconds = time.perf_counter() - start
+    return SimulationReport(games, wins[0], wins[1], draws, moves, seconds)
+
+
+def main() -> None:
+    """Play engine against random games from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default="standard")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    new_position, depth = VARIANTS[args.variant]
+    players = (
+        engine_player(depth, args.seconds),
+        random_player(random.Random(args.seed)),  # noqa: S311
+    )
+    report = simulate(new_position, players, args.games)
+    print(  # noqa: T201
+        f"{report.games} games: engine won {report.x_wins}, random won "
+        f"{report.o_wins}, {report.draws} drawn; "
+        f"{report.moves_per_second:,.0f} moves/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
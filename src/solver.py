@@ -0,0 +1,155 @@
+"""Exact game-theoretic solver for small boards."""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from constants import PLAYER_O, PLAYER_X, SOLVER_CACHE_SIZE
+from position import Board, Geometry, board_to_bits, cells_of, get_geometry
+
+
+class Solution(NamedTuple):
+    """Result of solving a position for the side to move.
+
+    score is positive for a win, negative for a loss and zero for a draw.
+    Its magnitude is one more than the number of empty cells left when the
+    game ends, so quicker wins score higher.
+    """
+
+    score: int
+    best_move: tuple[int, int] | None
+    to_move: str
+    winning_line: list[tuple[int, int]] | None
+
+
+class Solver:
+    """Solves positions exactly by memoized negamax over canonical positions."""
+
+    def __init__(
+        self,
+        geometry: Geometry | None = None,
+        cache_size: int = SOLVER_CACHE_SIZE,
+    ) -> None:
+        """Initialize a solver.
+
+        Args:
+            geometry: Board geometry, defaulting to the game's board
+            cache_size: Entries in the LRU cache of solved root positions
+
+        """
+        self.geometry = geometry or get_geometry()
+        self._scores: dict[tuple[int, int], int] = {}
+        self._solve_canonical = lru_cache(maxsize=cache_size)(self._best_move)
+
+    def solve_board(self, board: Board) -> Solution:
+        """Solve a board given in the TicTacToe.board layout.
+
+        Raises:
+            ValueError: If the board has the wrong size or is unreachable
+
+        """
+        size = self.geometry.size
+        if len(board) != size or any(len(row) != size for row in board):
+            msg = f"board must be {size}x{size}"
+            raise ValueError(msg)
+
+        x_bits, o_bits = board_to_bits(board)
+        x_count = x_bits.bit_count()
+        o_count = o_bits.bit_count()
+        if x_count - o_count not in (0, 1):
+            msg = "board is not reachable: wrong number of x and o marks"
+            raise ValueError(msg)
+        x_line = self.geometry.winning_line(x_bits)
+        o_line = self.geometry.winning_line(o_bits)
+        if x_line is not None and o_line is not None:
+            msg = "board is not reachable: both players have a line"
+            raise ValueError(msg)
+        # The winner moved last, so X can only have won with one mark more
+        # and O only with equal counts
+        if x_line is not None and x_count == o_count:
+            msg = "board is not reachable: x has a line but o moved last"
+            raise ValueError(msg)
+        if o_line is not None and x_count != o_count:
+            msg = "board is not reachable: o has a line but x moved last"
+            raise ValueError(msg)
+
+        if x_count == o_count:
+            return self.solve(x_bits, o_bits, PLAYER_X)
+        return self.solve(o_bits, x_bits, PLAYER_O)
+
+    def solve(self, me: int, opponent: int, to_move: str = PLAYER_X) -> Solution:
+        """Solve a position given as bitboards of the side to move and its opponent.
+
+        Args:
+            me: Bitboard of the side to move
+            opponent: Bitboard of the side that just moved
+            to_move: Symbol of the side to move, reported in the solution
+
+        Returns:
+            The solution, with no best move if the game is already over
+
+        """
+        geometry = self.geometry
+        line = geometry.winning_line(opponent) or geometry.winning_line(me)
+        if line is not None:
+            cells = [divmod(cell, geometry.size) for cell in cells_of(line)]
+            empty = geometry.cells - (me | opponent).bit_count()
+            score = -(empty + 1) if line & opponent == line else empty + 1
+            return Solution(score, None, to_move, cells)
+        if me | opponent == geometry.full:
+            return Solution(0, None, to_move, None)
+
+        canonical_me, canonical_opponent, symmetry = geometry.canonical(me, opponent)
+        score, cell = self._solve_canonical(canonical_me, canonical_opponent)
+        cell = geometry.inverse_symmetries[symmetry][cell]
+        return Solution(score, divmod(cell, geometry.size), to_move, None)
+
+    def move_scores(self, me: int, opponent: int) -> dict[int, int]:
+        """Score every legal move of a position with no winner yet.
+
+        Args:
+            me: Bitboard of the side to move
+            opponent: Bitboard of the side that just moved
+
+        Returns:
+            Mapping of cell index to the exact score of playing it
+
+        """
+        geometry = self.geometry
+        empty = geometry.full & ~(me | opponent)
+        remaining = empty.bit_count() - 1
+        scores = {}
+        for cell in cells_of(empty):
+            mine = me | 1 << cell
+            if geometry.wins_with(mine, cell):
+                scores[cell] = remaining + 1
+            else:
+                scores[cell] = -self._score(opponent, mine) if remaining else 0
+        return scores
+
+    def cache_info(self) -> tuple[int, int, int | None, int]:
+        """Return hits, misses, max size and size of the root cache."""
+        return tuple(self._solve_canonical.cache_info())
+
+    def _best_move(self, me: int, opponent: int) -> tuple[int, int]:
+        """Return (score, cell) of the best move in a canonical position."""
+        geometry = self.geometry
+        empty = geometry.full & ~(me | opponent)
+        remaining = empty.bit_count() - 1
+        best_score = -geometry.cells - 2
+        best_cell = -1
+        for cell in cells_of(empty):
+            mine = me | 1 << cell
+            if geometry.wins_with(mine, cell):
+                return remaining + 1, cell
+            score = -self._score(opponent, mine) if remaining else 0
+            if score > best_score:
+                best_score, best_cell = score, cell
+        return best_score, best_cell
+
+    def _score(self, me: int, opponent: int) -> int:
+        """Return the exact score of a position with no winner yet."""
+        key = self.geometry.canonical(me, opponent)[:2]
+        score = self._scores.get(key)
+        if score is None:
+            score = self._scores[key] = self._best_move(*key)[0]
+        return score
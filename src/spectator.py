@@ -0,0 +1,178 @@
+"""Fan-out of live game updates to spectators.
+
+Each published update is encoded once as a frame and the same bytes object
+is queued for every subscriber. A frame is a kind byte, a little-endian
+32-bit sequence number and a payload: a wire snapshot for snapshot frames
+or a single move byte for delta frames.
+"""
+
+import struct
+from collections import deque
+
+from constants import SPECTATOR_BUFFER_SIZE
+from game_logic import TicTacToe
+from wire import SNAPSHOT_SIZE, decode_board, decode_move, encode_board, encode_move
+
+FRAME_SNAPSHOT = 0
+FRAME_DELTA = 1
+
+_HEADER = struct.Struct("<BI")
+HEADER_SIZE = _HEADER.size
+
+
+class Subscriber:
+    """A spectator's bounded queue of pending frames."""
+
+    def __init__(self, broadcast: "GameBroadcast", buffer_size: int) -> None:
+        """Initialize a subscriber that starts with a snapshot."""
+        self.broadcast = broadcast
+        self.buffer_size = buffer_size
+        self.frames: deque[bytes] = deque()
+        self.needs_resync = True
+        self.dropped = 0
+
+    def push(self, frame: bytes) -> None:
+        """Queue a delta frame, switching to resync if the buffer is full."""
+        if self.needs_resync:
+            return
+        if len(self.frames) >= self.buffer_size:
+            self.dropped += len(self.frames)
+            self.frames.clear()
+            self.needs_resync = True
+            return
+        self.frames.append(frame)
+
+    def drain(self) -> list[bytes]:
+        """Take all pending frames, starting with a snapshot after a resync.
+
+        Returns:
+            Frames in the order they should be delivered
+
+        """
+        if self.needs_resync:
+            self.needs_resync = False
+            return [self.broadcast.snapshot_frame()]
+        frames = list(self.frames)
+        self.frames.clear()
+        return frames
+
+    def close(self) -> None:
+        """Stop receiving updates."""
+        self.broadcast.unsubscribe(self)
+
+
+class GameBroadcast:
+    """Publishes one game's updates to any number of subscribers."""
+
+    def __init__(
+        self,
+        game: TicTacToe,
+        buffer_size: int = SPECTATOR_BUFFER_SIZE,
+    ) -> None:
+        """Initialize a broadcast for a live game.
+
+        Args:
+            game: The game being watched
+            buffer_size: Frames a subscriber may fall behind before resync
+
+        """
+        self.game = game
+        self.buffer_size = buffer_size
+        self.sequence = 0
+        self.subscribers: set[Subscriber] = set()
+        self._snapshot: bytes | None = None
+
+    def subscribe(self) -> Subscriber:
+        """Add a spectator, who first receives a snapshot of the game."""
+        subscriber = Subscriber(self, self.buffer_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a spectator."""
+        self.subscribers.discard(subscriber)
+
+    def make_move(self, row: int, col: int) -> bool:
+        """Make a move on the game and publish it if it was accepted.
+
+        Returns:
+            True if move was successful, False otherwise
+
+        """
+        player = self.game.current_player
+        if not self.game.make_move(row, col):
+            return False
+        self.publish_move(row, col, player)
+        return True
+
+    def reset_game(self) -> None:
+        """Reset the game and resynchronize spectators."""
+        self.game.reset_game()
+        self.publish_reset()
+
+    def publish_move(self, row: int, col: int, player: str) -> None:
+        """Send a move that has just been made on the game.
+
+        Args:
+            row: Row index of the move
+            col: Column index of the move
+            player: Symbol of the player who moved
+
+        """
+        self.sequence += 1
+        self._snapshot = None
+        frame = _HEADER.pack(FRAME_DELTA, self.sequence) + bytes(
+            (encode_move(row, col, player),)
+        )
+        for subscriber in self.subscribers:
+            subscriber.push(frame)
+
+    def publish_reset(self) -> None:
+        """Resynchronize every spectator after the game is reset."""
+        self.sequence += 1
+        self._snapshot = None
+        for subscriber in self.subscribers:
+            subscriber.frames.clear()
+            subscriber.needs_resync = True
+
+    def snapshot_frame(self) -> bytes:
+        """Return a snapshot frame of the current game, cached per sequence."""
+        if self._snapshot is None:
+            self._snapshot = _HEADER.pack(FRAME_SNAPSHOT, self.sequence) + (
+                encode_board(self.game)
+            )
+        return self._snapshot
+
+
+class SpectatorView:
+    """Client-side replica of a game rebuilt from broadcast frames."""
+
+    def __init__(self) -> None:
+        """Initialize a view that waits for its first snapshot."""
+        self.game = TicTacToe()
+        self.sequence: int | None = None
+
+    def apply(self, frame: bytes | memoryview) -> bool:
+        """Apply one frame to the replica.
+
+        Returns:
+            False if the frame does not follow the last one applied, in which
+            case the view must wait for a snapshot
+
+        """
+        kind, sequence = _HEADER.unpack_from(frame)
+        if kind == FRAME_SNAPSHOT:
+            if len(frame) < HEADER_SIZE + SNAPSHOT_SIZE:
+                msg = "truncated snapshot frame"
+                raise ValueError(msg)
+            decode_board(frame, HEADER_SIZE, self.game)
+            self.sequence = sequence
+            return True
+
+        if self.sequence is None or sequence != self.sequence + 1:
+            self.sequence = None
+            return False
+        row, col, _ = decode_move(frame[HEADER_SIZE])
+        self.game.make_move(row, col)
+        self.sequence = sequence
+        return True
@@ -0,0 +1,452 @@
+"""Disk-backed endgame tablebases split by the number of marks on the board.
+
+Each slice holds every board with a given number of marks. X has moved
+ceil(marks / 2) times and O floor(marks / 2) times. A board's index in its
+slice ranks the X cells among all cells, then the O cells among the cells
+X left free, both in the combinatorial number system. Slices therefore
+have no gaps: a slice holds exactly C(cells, x) * C(cells - x, o) scores.
+
+Slices are solved from the full board backwards. Each one needs only the
+slice after it, so memory use is bounded by the two largest adjacent
+slices, not by the whole game. Within a slice, chunks of positions are
+solved by independent worker processes that read the next slice from
+disk.
+
+A slice file is a header, a table of page offsets and zlib-compressed
+pages of int8 scores. Readers memory-map the files, and the operating
+system caches the pages it reads. Decompressed pages are kept in an LRU
+cache.
+
+Scores follow Solver: from the side to move's view, positive for a win and
+negative for a loss, with magnitude one more than the number of empty
+cells left when the game ends.
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+import zlib
+from collections.abc import Callable, Hashable
+from functools import lru_cache
+from math import comb
+from pathlib import Path
+from types import TracebackType
+
+import numpy as np
+
+from constants import (
+    ENGINE_WIN_SCORE,
+    TABLEBASE_CACHE_PAGES,
+    TABLEBASE_CHUNK_ENTRIES,
+    TABLEBASE_PAGE_ENTRIES,
+)
+from position import get_geometry
+from retrograde import UNREACHABLE
+
+_HEADER = struct.Struct("<4sBBBBIQ")
+_MAGIC = b"TTTB"
+_VERSION = 1
+_OFFSET = struct.Struct("<Q")
+
+
+def slice_path(directory: str | Path, marks: int) -> Path:
+    """Return the path of the slice holding boards with the given marks."""
+    return Path(directory) / f"slice-{marks:03d}.tttb"
+
+
+def slice_entries(cells: int, marks: int) -> int:
+    """Return the number of boards in a slice."""
+    x_count = (marks + 1) // 2
+    return comb(cells, x_count) * comb(cells - x_count, marks // 2)
+
+
+def rank(x_bits: int, o_bits: int, cells: int) -> int:
+    """Return the index of a board within its slice."""
+    rank_x = rank_o = seen_x = seen_o = free = 0
+    for cell in range(cells):
+        if x_bits >> cell & 1:
+            seen_x += 1
+            rank_x += comb(cell, seen_x)
+        else:
+            if o_bits >> cell & 1:
+                seen_o += 1
+                rank_o += comb(free, seen_o)
+            free += 1
+    return rank_x * comb(cells - seen_x, seen_o) + rank_o
+
+
+def rank_boards(x_bits: np.ndarray, o_bits: np.ndarray, cells: int) -> np.ndarray:
+    """Return the index of each board within its slice.
+
+    Args:
+        x_bits: uint64 bitboards of X's marks
+        o_bits: uint64 bitboards of O's marks, all with the same mark counts
+        cells: Cells on the board
+
+    """
+    binomials = _binomials(cells)
+    rank_x = np.zeros(len(x_bits), dtype=np.int64)
+    rank_o = np.zeros_like(rank_x)
+    seen_x = np.zeros_like(rank_x)
+    seen_o = np.zeros_like(rank_x)
+    free = np.zeros_like(rank_x)
+    for cell in range(cells):
+        shift = np.uint64(cell)
+        is_x = (x_bits >> shift & np.uint64(1)).astype(np.int64)
+        is_o = (o_bits >> shift & np.uint64(1)).astype(np.int64)
+        seen_x += is_x
+        rank_x += is_x * binomials[cell, seen_x]
+        seen_o += is_o
+        rank_o += is_o * binomials[free, seen_o]
+        free += 1 - is_x
+    return rank_x * binomials[cells - seen_x, seen_o] + rank_o
+
+
+def unrank_boards(
+    indices: np.ndarray, cells: int, marks: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the X and O uint64 bitboards of slice indices."""
+    binomials = _binomials(cells)
+    x_count = (marks + 1) // 2
+    remaining_x, remaining_o = np.divmod(indices, comb(cells - x_count, marks // 2))
+    x_left = np.full(len(indices), x_count, dtype=np.int64)
+    o_left = np.full(len(indices), marks // 2, dtype=np.int64)
+    x_bits = np.zeros(len(indices), dtype=np.uint64)
+    o_bits = np.zeros_like(x_bits)
+
+    for cell in range(cells - 1, -1, -1):
+        take = remaining_x >= binomials[cell, x_left]
+        remaining_x -= np.where(take, binomials[cell, x_left], 0)
+        x_left -= take
+        x_bits |= take.astype(np.uint64) << np.uint64(cell)
+
+    # free is the number of cells below this one that X left empty.
+    x_below = np.full(len(indices), x_count, dtype=np.int64)
+    for cell in range(cells - 1, -1, -1):
+        is_x = (x_bits >> np.uint64(cell) & np.uint64(1)).astype(np.bool_)
+        x_below -= is_x
+        free = cell - x_below
+        take = ~is_x & (remaining_o >= binomials[free, o_left])
+        remaining_o -= np.where(take, binomials[free, o_left], 0)
+        o_left -= take
+        o_bits |= take.astype(np.uint64) << np.uint64(cell)
+    return x_bits, o_bits
+
+
+@lru_cache(maxsize=4)
+def _binomials(cells: int) -> np.ndarray:
+    """Return binomials[n, k] = C(n, k) for n <= cells and k <= cells + 1."""
+    return np.array(
+        [[comb(n, k) for k in range(cells + 2)] for n in range(cells + 1)],
+        dtype=np.int64,
+    )
+
+
+def solve_chunk(  # noqa: PLR0913
+    directory: str | Path,
+    marks: int,
+    start: int,
+    stop: int,
+    size: int,
+    win_length: int,
+) -> np.ndarray:
+    """Return the scores of slice entries start to stop.
+
+    The slice with one more mark must already be written to directory.
+    """
+    geometry = get_geometry(size, win_length)
+    cells = geometry.cells
+    x_bits, o_bits = unrank_boards(np.arange(start, stop, dtype=np.int64), cells, marks)
+    # X just moved when the number of marks is odd.
+    mover, waiting = (x_bits, o_bits) if marks % 2 else (o_bits, x_bits)
+    lines = np.array(geometry.lines, dtype=np.uint64)
+
+    def has_line(bits: np.ndarray) -> np.ndarray:
+        return ((bits[:, None] & lines) == lines).any(axis=1)
+
+    values = np.zeros(stop - start, dtype=np.int8)
+    unreachable = has_line(waiting)
+    ended = has_line(mover) & ~unreachable
+    values[unreachable] = UNREACHABLE
+    values[ended] = -(cells - marks + 1)
+    active = ~(unreachable | ended)
+    if marks == cells or not active.any():
+        return values
+
+    following = _load_slice(str(directory), marks + 1)
+    x_moves = marks % 2 == 0
+    occupied = x_bits | o_bits
+    best = np.full(stop - start, UNREACHABLE, dtype=np.int8)
+    for cell in range(cells):
+        bit = np.uint64(1 << cell)
+        empty = active & (occupied & bit == 0)
+        child_x = x_bits[empty] | bit if x_moves else x_bits[empty]
+        child_o = o_bits[empty] if x_moves else o_bits[empty] | bit
+        children = following[rank_boards(child_x, child_o, cells)]
+        best[empty] = np.maximum(best[empty], -children)
+    values[active] = best[active]
+    return values
+
+
+@lru_cache(maxsize=1)
+def _load_slice(directory: str, marks: int) -> np.ndarray:
+    """Return a whole slice decompressed into memory."""
+    with TablebaseSlice(slice_path(directory, marks)) as table:
+        return np.concatenate([table.page(page) for page in range(table.pages)])
+
+
+def write_slice(  # noqa: PLR0913
+    path: str | Path,
+    values: np.ndarray,
+    size: int,
+    win_length: int,
+    marks: int,
+    page_entries: int = TABLEBASE_PAGE_ENTRIES,
+) -> None:
+    """Write a slice's scores as compressed pages."""
+    pages = [
+        zlib.compress(values[start : start + page_entries].tobytes())
+        for start in range(0, len(values), page_entries)
+    ]
+    offset = _HEADER.size + _OFFSET.size * (len(pages) + 1)
+    offsets = [offset]
+    for page in pages:
+        offset += len(page)
+        offsets.append(offset)
+
+    temporary = Path(str(path) + ".tmp")
+    with temporary.open("wb") as file:
+        file.write(
+            _HEADER.pack(
+                _MAGIC, _VERSION, size, win_length, marks, page_entries, len(values)
+            )
+        )
+        file.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+        file.writelines(pages)
+    temporary.replace(path)
+
+
+def generate_tablebase(  # noqa: PLR0913
+    directory: str | Path,
+    size: int,
+    win_length: int | None = None,
+    min_marks: int = 0,
+    processes: int | None = None,
+    chunk_entries: int = TABLEBASE_CHUNK_ENTRIES,
+    progress: Callable[[int, int], None] | None = None,
+) -> None:
+    """Solve and write every slice from the full board down to min_marks.
+
+    Args:
+        directory: Output directory, created if missing
+        size: Board rows and columns
+        win_length: Marks in a row needed to win, defaulting to size
+        min_marks: Fewest marks covered
+        processes: Worker processes, defaulting to the CPU count; chunks are
+            solved by the calling process when this is 1
+        chunk_entries: Positions solved per task
+        progress: Called with (marks, entries) after each slice
+
+    """
+    geometry = get_geometry(size, win_length)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    for marks in range(geometry.cells, min_marks - 1, -1):
+        entries = slice_entries(geometry.cells, marks)
+        tasks = [
+            (
+                directory,
+                marks,
+                start,
+                min(start + chunk_entries, entries),
+                size,
+                geometry.win_length,
+            )
+            for start in range(0, entries, chunk_entries)
+        ]
+        if processes <= 1 or len(tasks) == 1:
+            chunks = [solve_chunk(*task) for task in tasks]
+        else:
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                chunks = pool.starmap(solve_chunk, tasks, chunksize=1)
+        write_slice(
+            slice_path(directory, marks),
+            np.concatenate(chunks),
+            size,
+            geometry.win_length,
+            marks,
+        )
+        if progress is not None:
+            progress(marks, entries)
+    _load_slice.cache_clear()
+
+
+class TablebaseSlice:
+    """Memory-mapped slice file with page-level access."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Map a slice file.
+
+        Raises:
+            ValueError: If the file has an unknown header
+
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, win_length, marks, page_entries, entries = (
+            _HEADER.unpack_from(self._map)
+        )
+        if (magic, version) != (_MAGIC, _VERSION):
+            self._map.close()
+            msg = f"{path} is not a version {_VERSION} tablebase slice"
+            raise ValueError(msg)
+        self.size = size
+        self.win_length = win_length
+        self.marks = marks
+        self.page_entries = page_entries
+        self.entries = entries
+        self.pages = -(-entries // page_entries)
+        self._offsets = [
+            offset
+            for (offset,) in _OFFSET.iter_unpack(
+                self._map[_HEADER.size : _HEADER.size + _OFFSET.size * (self.pages + 1)]
+            )
+        ]
+
+    def page(self, page: int) -> np.ndarray:
+        """Return one page of scores, decompressed."""
+        data = self._map[self._offsets[page] : self._offsets[page + 1]]
+        return np.frombuffer(zlib.decompress(data), dtype=np.int8)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+
+    def __enter__(self) -> "TablebaseSlice":
+        """Use the slice as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the slice."""
+        self.close()
+
+
+class Tablebase:
+    """Lookups in a directory of tablebase slices."""
+
+    def __init__(
+        self, directory: str | Path, cache_pages: int = TABLEBASE_CACHE_PAGES
+    ) -> None:
+        """Open every slice in a directory.
+
+        Args:
+            directory: Directory written by generate_tablebase
+            cache_pages: Decompressed pages kept in memory
+
+        Raises:
+            ValueError: If there are no slices or they disagree on the board
+
+        """
+        self.slices = {
+            table.marks: table
+            for table in map(
+                TablebaseSlice, sorted(Path(directory).glob("slice-*.tttb"))
+            )
+        }
+        boards = {(table.size, table.win_length) for table in self.slices.values()}
+        if len(boards) != 1:
+            self.close()
+            msg = f"{directory} does not hold slices of a single board"
+            raise ValueError(msg)
+        self.geometry = get_geometry(*boards.pop())
+        self.min_marks = min(self.slices)
+        self._page = lru_cache(maxsize=cache_pages)(self._read_page)
+
+    def score(self, x_bits: int, o_bits: int) -> int | None:
+        """Return the exact score for the side to move, or None if not covered."""
+        table = self.slices.get((x_bits | o_bits).bit_count())
+        if table is None:
+            return None
+        page, offset = divmod(
+            rank(x_bits, o_bits, self.geometry.cells), table.page_entries
+        )
+        return int(self._page(table.marks, page)[offset])
+
+    def probe(self, key: Hashable) -> int | None:
+        """Return an engine score for a position key, or None if not covered.
+
+        Wins and losses are counted in plies from the position itself, as
+        the engine stores them in its transposition table.
+        """
+        x_bits, o_bits = key
+        score = self.score(x_bits, o_bits)
+        if not score:
+            return score
+        empty = self.geometry.cells - (x_bits | o_bits).bit_count()
+        plies = empty - (abs(score) - 1)
+        return ENGINE_WIN_SCORE - plies if score > 0 else plies - ENGINE_WIN_SCORE
+
+    def cache_info(self) -> tuple[int, int, int | None, int]:
+        """Return hits, misses, max size and size of the page cache."""
+        return tuple(self._page.cache_info())
+
+    def _read_page(self, marks: int, page: int) -> np.ndarray:
+        """Decompress a page of a slice."""
+        return self.slices[marks].page(page)
+
+    def close(self) -> None:
+        """Release every slice."""
+        for table in self.slices.values():
+            table.close()
+        self.slices = {}
+
+    def __enter__(self) -> "Tablebase":
+        """Use the tablebase as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the tablebase."""
+        self.close()
+
+
+def main() -> None:
+    """Generate a tablebase from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--min-marks", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    def progress(marks: int, entries: int) -> None:
+        print(f"{marks:3} marks: {entries:>13,} boards")  # noqa: T201
+
+    start = time.perf_counter()
+    generate_tablebase(
+        args.directory,
+        args.size,
+        args.win_length,
+        args.min_marks,
+        args.processes,
+        progress=progress,
+    )
+    print(f"done in {time.perf_counter() - start:.2f}s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
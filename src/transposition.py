@@ -0,0 +1,189 @@
+"""Fixed-memory transposition table in a flat buffer that processes can share.
+
+The table never grows: it is a preallocated buffer of 64-bit words split
+into buckets of two entries. The first entry of a bucket is depth-preferred
+and only gives way to a search at least as deep; the second always takes
+the newest position that did not fit in the first.
+
+Each entry is two words: the entry's data and the data XORed with the
+position hash. A reader accepts an entry only if the two words agree with
+its hash, which both verifies the position and turns a write torn by a
+concurrent writer into a miss, so no locks are needed. The data word
+packs the search depth, bound type, best move and score.
+"""
+
+from collections.abc import Hashable
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import TT_MEGABYTES
+
+_MASK64 = (1 << 64) - 1
+_VALID = 1 << 63
+_DEPTH_SHIFT = 50
+_BOUND_SHIFT = 48
+_MOVE_SHIFT = 32
+_MOVE_MASK = 0xFFFF
+_SCORE_OFFSET = 1 << 31
+_SCORE_MASK = (1 << 32) - 1
+
+_BUCKET_WORDS = 4
+_BUCKET_BYTES = 8 * _BUCKET_WORDS
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def hash64(key: Hashable) -> int:
+    """Return a well-mixed 64-bit hash of a position key.
+
+    Python hashes integers and tuples of integers the same way in every
+    process, so all workers agree on it.
+    """
+    h = hash(key) * _GOLDEN & _MASK64
+    return h ^ h >> 32
+
+
+class TableStats(NamedTuple):
+    """Usage counters of a transposition table.
+
+    Probes, hits, stores and collisions are counted by the process that
+    made them; used entries are counted over the whole shared buffer.
+    """
+
+    probes: int
+    hits: int
+    stores: int
+    collisions: int
+    used: int
+    entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of probes that found their position."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def collision_rate(self) -> float:
+        """Share of stores that evicted a different position."""
+        return self.collisions / self.stores if self.stores else 0.0
+
+    @property
+    def fill(self) -> float:
+        """Share of entries holding a position."""
+        return self.used / self.entries
+
+
+class TranspositionTable:
+    """Bucketed transposition table of fixed size.
+
+    It offers the get/setitem/clear subset of a dict that Engine uses.
+    """
+
+    def __init__(
+        self, megabytes: float = TT_MEGABYTES, buffer: memoryview | None = None
+    ) -> None:
+        """Initialize a table.
+
+        Args:
+            megabytes: Memory budget; the table takes the largest power of
+                two number of buckets that fits
+            buffer: Zero-filled memory of nbytes(megabytes) bytes to use
+                instead of a private buffer, e.g. a shared memory block
+
+        Raises:
+            ValueError: If the budget does not fit a single bucket
+
+        """
+        self.buckets = _bucket_count(megabytes)
+        self._mask = self.buckets - 1
+        if buffer is None:
+            buffer = memoryview(bytearray(self.nbytes(megabytes)))
+        self._words = buffer[: self.buckets * _BUCKET_BYTES].cast("Q")
+        self.reset_stats()
+
+    @staticmethod
+    def nbytes(megabytes: float) -> int:
+        """Return the memory a table with the given budget occupies."""
+        return _bucket_count(megabytes) * _BUCKET_BYTES
+
+    @property
+    def entries(self) -> int:
+        """Number of positions the table can hold."""
+        return 2 * self.buckets
+
+    def get(self, key: Hashable) -> tuple[int, int, int, int] | None:
+        """Return (depth, score, bound, best_move) for a key, or None."""
+        self.probes += 1
+        words = self._words
+        h = hash(key) * _GOLDEN & _MASK64  # hash64, inlined for speed
+        h ^= h >> 32
+        index = _BUCKET_WORDS * (h & self._mask)
+        data = words[index + 1]
+        if not (data and words[index] ^ data == h):
+            data = words[index + 3]
+            if not (data and words[index + 2] ^ data == h):
+                return None
+        self.hits += 1
+        move = data >> _MOVE_SHIFT & _MOVE_MASK
+        return (
+            data >> _DEPTH_SHIFT & 0xFF,
+            (data & _SCORE_MASK) - _SCORE_OFFSET,
+            data >> _BOUND_SHIFT & 0b11,
+            -1 if move == _MOVE_MASK else move,
+        )
+
+    def __setitem__(self, key: Hashable, entry: tuple[int, int, int, int]) -> None:
+        """Store (depth, score, bound, best_move) for a key.
+
+        The depth-preferred entry is replaced by the same position or by a
+        search at least as deep as the one it holds; anything else goes to
+        the always-replace entry.
+        """
+        depth, score, bound, move = entry
+        depth = min(depth, 0xFF)
+        data = (
+            _VALID
+            | depth << _DEPTH_SHIFT
+            | bound << _BOUND_SHIFT
+            | (move & _MOVE_MASK) << _MOVE_SHIFT
+            | (score + _SCORE_OFFSET) & _SCORE_MASK
+        )
+        words = self._words
+        h = hash(key) * _GOLDEN & _MASK64
+        h ^= h >> 32
+        index = _BUCKET_WORDS * (h & self._mask)
+        old = words[index + 1]
+        if old and words[index] ^ old != h:
+            if depth < old >> _DEPTH_SHIFT & 0xFF:
+                index += 2
+                old = words[index + 1]
+            if old and words[index] ^ old != h:
+                self.collisions += 1
+        self.stores += 1
+        words[index] = h ^ data
+        words[index + 1] = data
+
+    def clear(self) -> None:
+        """Empty the table."""
+        np.frombuffer(self._words, dtype=np.uint64).fill(0)
+
+    def stats(self) -> TableStats:
+        """Return the usage counters and the number of entries in use."""
+        data = np.frombuffer(self._words, dtype=np.uint64)[1::2]
+        used = int(np.count_nonzero(data))
+        return TableStats(
+            self.probes, self.hits, self.stores, self.collisions, used, self.entries
+        )
+
+    def reset_stats(self) -> None:
+        """Zero the probe, hit, store and collision counters."""
+        self.probes = self.hits = self.stores = self.collisions = 0
+
+
+def _bucket_count(megabytes: float) -> int:
+    """Return the largest power of two number of buckets within a budget."""
+    budget = int(megabytes * (1 << 20)) // _BUCKET_BYTES
+    if budget < 1:
+        msg = "transposition table budget is smaller than one bucket"
+        raise ValueError(msg)
+    return 1 << (budget.bit_length() - 1)
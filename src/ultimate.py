@@ -0,0 +1,296 @@
+"""Ultimate tic-tac-toe on bitboards.
+
+The board is a 3 x 3 grid of 3 x 3 sub-boards. Winning a sub-board claims
+its square on the meta-board, and three claimed squares in a row win the
+game. Each move sends the opponent to the sub-board matching the square
+just played; if that sub-board is already won or full, they may play in
+any open sub-board.
+
+UltimatePosition keeps one 9-bit mask per player and sub-board, plus a
+9-bit meta-board mask per player and a mask of closed sub-boards. Move
+generation, sub-board wins and meta-board wins are table lookups on these
+masks, so the search engine can walk the game quickly. Cells are numbered
+row * 9 + col on the full 9 x 9 grid, like Position numbers its board.
+
+UltimateGame is the LineGame wrapper around a position, playing only in
+the open sub-boards and reporting the winning line of sub-boards.
+"""
+
+from functools import cache
+
+from constants import GAME_ACTIVE, PLAYER_O, PLAYER_X, ULTIMATE_META_WEIGHT
+from line_game import LineGame
+
+SIZE = 9
+SUB_SIZE = 3
+CELLS = SIZE * SIZE
+ANY_BOARD = -1
+
+_FULL = 0x1FF
+_LINES = (0o007, 0o070, 0o700, 0o111, 0o222, 0o444, 0o421, 0o124)
+_LINE_NAMES = (
+    ("row", 0),
+    ("row", 1),
+    ("row", 2),
+    ("col", 0),
+    ("col", 1),
+    ("col", 2),
+    ("diagonal_main", 0),
+    ("diagonal_anti", 0),
+)
+
+
+def _cell(board: int, square: int) -> int:
+    """Return the grid cell of a square of a sub-board."""
+    board_row, board_col = divmod(board, SUB_SIZE)
+    row, col = divmod(square, SUB_SIZE)
+    return (board_row * SUB_SIZE + row) * SIZE + board_col * SUB_SIZE + col
+
+
+def _squares(mask: int) -> tuple[int, ...]:
+    """Return the squares set in a 9-bit mask."""
+    return tuple(square for square in range(SUB_SIZE * SUB_SIZE) if mask >> square & 1)
+
+
+def _completions(mask: int) -> int:
+    """Return the squares that would complete a line for a 9-bit mask."""
+    squares = 0
+    for line in _LINES:
+        if (mask & line).bit_count() == SUB_SIZE - 1:
+            squares |= line & ~mask
+    return squares
+
+
+_BOARD = tuple(
+    cell // SIZE // SUB_SIZE * SUB_SIZE + cell % SIZE // SUB_SIZE
+    for cell in range(CELLS)
+)
+_SQUARE = tuple(
+    cell // SIZE % SUB_SIZE * SUB_SIZE + cell % SUB_SIZE for cell in range(CELLS)
+)
+_WINNING = tuple(
+    any(mask & line == line for line in _LINES) for mask in range(_FULL + 1)
+)
+_COMPLETIONS = tuple(_completions(mask) for mask in range(_FULL + 1))
+# Grid cells and grid bitboard of every set of squares in every sub-board
+_MOVES = tuple(
+    tuple(
+        tuple(_cell(board, square) for square in _squares(mask))
+        for mask in range(_FULL + 1)
+    )
+    for board in range(SUB_SIZE * SUB_SIZE)
+)
+_GRID_BITS = tuple(
+    tuple(sum(1 << cell for cell in cells) for cells in moves) for moves in _MOVES
+)
+
+
+@cache
+def _board_score(mine: int, theirs: int, dead: int = 0) -> int:
+    """Score a 3 x 3 board by its open lines, like Position.evaluate.
+
+    Lines through a dead square count for neither side.
+    """
+    score = 0
+    for line in _LINES:
+        if line & dead:
+            continue
+        own = mine & line
+        other = theirs & line
+        if own and not other:
+            score += 10 ** own.bit_count()
+        elif other and not own:
+            score -= 10 ** other.bit_count()
+    return score
+
+
+class UltimatePosition:
+    """Mutable ultimate tic-tac-toe position with make/unmake for search.
+
+    It offers the methods of the engine's SearchPosition protocol.
+    """
+
+    size = SIZE
+
+    def __init__(
+        self, x_bits: int = 0, o_bits: int = 0, forced: int = ANY_BOARD
+    ) -> None:
+        """Initialize a position.
+
+        Args:
+            x_bits: Grid bitboard of X's marks
+            o_bits: Grid bitboard of O's marks
+            forced: Sub-board the side to move must play in, or ANY_BOARD
+
+        """
+        self.bits = [x_bits, o_bits]
+        self.to_move = 0 if x_bits.bit_count() == o_bits.bit_count() else 1
+        self.forced = forced
+        self.boards = [[0] * SUB_SIZE**2, [0] * SUB_SIZE**2]
+        for player, bits in enumerate(self.bits):
+            for cell in range(CELLS):
+                if bits >> cell & 1:
+                    self.boards[player][_BOARD[cell]] |= 1 << _SQUARE[cell]
+        self.meta = [0, 0]
+        self.closed = 0
+        for board in range(SUB_SIZE**2):
+            x_board = self.boards[0][board]
+            o_board = self.boards[1][board]
+            if _WINNING[x_board]:
+                self.meta[0] |= 1 << board
+            elif _WINNING[o_board]:
+                self.meta[1] |= 1 << board
+            elif x_board | o_board != _FULL:
+                continue
+            self.closed |= 1 << board
+        self.history: list[tuple[int, int]] = []
+
+    def key(self) -> tuple[int, int, int]:
+        """Return a hashable key identifying the position."""
+        return self.bits[0], self.bits[1], self.forced
+
+    def open_boards(self) -> int:
+        """Return the mask of sub-boards the side to move may play in."""
+        if self.forced != ANY_BOARD:
+            return 1 << self.forced
+        return _FULL & ~self.closed
+
+    def legal_moves(self) -> list[int]:
+        """Return the empty cells of the sub-boards the side to move may use."""
+        x_boards, o_boards = self.boards
+        moves: list[int] = []
+        if self.forced != ANY_BOARD:
+            board = self.forced
+            moves.extend(_MOVES[board][_FULL & ~(x_boards[board] | o_boards[board])])
+            return moves
+        closed = self.closed
+        for board in range(SUB_SIZE**2):
+            if not closed >> board & 1:
+                moves.extend(
+                    _MOVES[board][_FULL & ~(x_boards[board] | o_boards[board])]
+                )
+        return moves
+
+    def make(self, cell: int) -> None:
+        """Place the side to move's mark on an empty cell of an open board."""
+        player = self.to_move
+        board = _BOARD[cell]
+        square = _SQUARE[cell]
+        self.history.append((cell, self.forced))
+        self.bits[player] |= 1 << cell
+        mask = self.boards[player][board] | 1 << square
+        self.boards[player][board] = mask
+        if _WINNING[mask]:
+            self.meta[player] |= 1 << board
+            self.closed |= 1 << board
+        elif mask | self.boards[player ^ 1][board] == _FULL:
+            self.closed |= 1 << board
+        self.forced = ANY_BOARD if self.closed >> square & 1 else square
+        self.to_move ^= 1
+
+    def unmake(self) -> None:
+        """Take back the last move.
+
+        Moves are only made on open sub-boards, so the sub-board of the
+        last move was open before it.
+        """
+        self.to_move ^= 1
+        player = self.to_move
+        cell, self.forced = self.history.pop()
+        board = _BOARD[cell]
+        self.bits[player] &= ~(1 << cell)
+        self.boards[player][board] &= ~(1 << _SQUARE[cell])
+        self.meta[player] &= ~(1 << board)
+        self.closed &= ~(1 << board)
+
+    def last_move_won(self) -> bool:
+        """Check whether the last move completed a line of sub-boards."""
+        return bool(self.history) and _WINNING[self.meta[self.to_move ^ 1]]
+
+    def is_full(self) -> bool:
+        """Check whether every sub-board is won or full."""
+        return self.closed == _FULL
+
+    def threats(self) -> tuple[int, int]:
+        """Return the cells that win or save a sub-board, as grid bitboards.
+
+        Returns:
+            (wins, blocks): cells where the side to move wins a sub-board it
+            may play in, and cells there that stop the opponent from winning
+            that sub-board
+
+        """
+        mine = self.boards[self.to_move]
+        theirs = self.boards[self.to_move ^ 1]
+        wins = blocks = 0
+        allowed = self.open_boards()
+        for board in range(SUB_SIZE**2):
+            if allowed >> board & 1:
+                empty = _FULL & ~(mine[board] | theirs[board])
+                wins |= _GRID_BITS[board][_COMPLETIONS[mine[board]] & empty]
+                blocks |= _GRID_BITS[board][_COMPLETIONS[theirs[board]] & empty]
+        return wins, blocks
+
+    def evaluate(self) -> int:
+        """Score the position for the side to move.
+
+        Open lines of the meta-board count ULTIMATE_META_WEIGHT times as
+        much as open lines inside the sub-boards still in play.
+        """
+        me = self.to_move
+        mine = self.boards[me]
+        theirs = self.boards[me ^ 1]
+        closed = self.closed
+        drawn = closed & ~(self.meta[0] | self.meta[1])
+        score = ULTIMATE_META_WEIGHT * _board_score(
+            self.meta[me], self.meta[me ^ 1], drawn
+        )
+        for board in range(SUB_SIZE**2):
+            if not closed >> board & 1:
+                score += _board_score(mine[board], theirs[board])
+        return score
+
+
+class UltimateGame(LineGame):
+    """Ultimate tic-tac-toe game handler with TicTacToe's interface."""
+
+    size = SIZE
+    position_class = UltimatePosition
+
+    def _can_play(self, cell: int) -> bool:
+        """Check whether a cell is empty and in a sub-board open to play."""
+        return cell in self.position.legal_moves()
+
+    def board_winners(self) -> list[str | None]:
+        """Return the winner of each sub-board, row by row."""
+        x_meta, o_meta = self.position.meta
+        return [
+            PLAYER_X
+            if x_meta >> board & 1
+            else PLAYER_O
+            if o_meta >> board & 1
+            else None
+            for board in range(SUB_SIZE**2)
+        ]
+
+    def open_boards(self) -> int:
+        """Return the mask of sub-boards the current player may play in."""
+        if self.game_state != GAME_ACTIVE:
+            return 0
+        return self.position.open_boards()
+
+    def get_winning_line(self) -> tuple[str, int] | None:
+        """Get the winning line of sub-boards.
+
+        Returns:
+            Tuple of (line_type, index) as TicTacToe.get_winning_line gives
+            for its board, since the meta-board spans the same area
+
+        """
+        if self.winner is None:
+            return None
+        meta = self.position.meta[0 if self.winner == PLAYER_X else 1]
+        for line, name in zip(_LINES, _LINE_NAMES, strict=True):
+            if meta & line == line:
+                return name
+        return None
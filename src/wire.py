@@ -0,0 +1,187 @@
+"""Compact binary wire format for Tic-Tac-Toe boards and moves.
+
+A board snapshot is a version byte followed by a little-endian bit field:
+two bits per cell in row-major order (0 empty, 1 X, 2 O), one bit for the
+player to move, two bits for the game state and two bits for the winner.
+A 3x3 board therefore fits in four bytes.
+
+A move is a single byte holding the cell index in the low seven bits and
+the moving player in the high bit. RESET_MESSAGE is the one-byte request to
+reset the game.
+"""
+
+from itertools import product
+
+from constants import (
+    BOARD_SIZE,
+    GAME_ACTIVE,
+    GAME_DRAW,
+    GAME_WON,
+    PLAYER_O,
+    PLAYER_X,
+    WIRE_HEADER_SIZE,
+    WIRE_VERSION,
+)
+from game_logic import TicTacToe
+
+_CELL_SYMBOLS = (None, PLAYER_X, PLAYER_O)
+_CELL_CODES = {symbol: code for code, symbol in enumerate(_CELL_SYMBOLS)}
+_GAME_STATES = (GAME_ACTIVE, GAME_WON, GAME_DRAW)
+_STATE_CODES = {state: code for code, state in enumerate(_GAME_STATES)}
+
+_ROW_BITS = 2 * BOARD_SIZE
+_TURN_SHIFT = _ROW_BITS * BOARD_SIZE
+_STATE_SHIFT = _TURN_SHIFT + 1
+_WINNER_SHIFT = _STATE_SHIFT + 2
+_PAYLOAD_BITS = _WINNER_SHIFT + 2
+_ROW_MASK = (1 << _ROW_BITS) - 1
+_ROW_SHIFTS = tuple(row * _ROW_BITS for row in range(BOARD_SIZE))
+
+_MOVE_PLAYER_BIT = 0x80
+_MOVE_CELL_MASK = 0x7F
+
+RESET_MESSAGE = 0xFF
+
+PAYLOAD_SIZE = (_PAYLOAD_BITS + 7) // 8
+SNAPSHOT_SIZE = WIRE_HEADER_SIZE + PAYLOAD_SIZE
+
+# Every possible row maps to its packed code and back, so encoding and
+# decoding touch one table entry per row instead of one per cell.
+_ROW_CODES: dict[tuple[str | None, ...], int] = {}
+_ROW_CELLS: dict[int, tuple[str | None, ...]] = {}
+for _row in product(_CELL_SYMBOLS, repeat=BOARD_SIZE):
+    _code = 0
+    for _col, _symbol in enumerate(_row):
+        _code |= _CELL_CODES[_symbol] << (2 * _col)
+    _ROW_CODES[_row] = _code
+    _ROW_CELLS[_code] = _row
+
+
+def _pack(game: TicTacToe) -> int:
+    """Pack a game into its payload bit field."""
+    packed = 0
+    for row, shift in zip(game.board, _ROW_SHIFTS, strict=True):
+        packed |= _ROW_CODES[tuple(row)] << shift
+    if game.current_player == PLAYER_O:
+        packed |= 1 << _TURN_SHIFT
+    packed |= _STATE_CODES[game.game_state] << _STATE_SHIFT
+    packed |= _CELL_CODES[game.winner] << _WINNER_SHIFT
+    return packed
+
+
+def encode_board(game: TicTacToe) -> bytes:
+    """Encode a game snapshot.
+
+    Args:
+        game: Game whose board, turn, state and winner are encoded
+
+    Returns:
+        The SNAPSHOT_SIZE byte snapshot
+
+    """
+    return ((_pack(game) << 8) | WIRE_VERSION).to_bytes(SNAPSHOT_SIZE, "little")
+
+
+def encode_board_into(
+    game: TicTacToe, buffer: bytearray | memoryview, offset: int = 0
+) -> int:
+    """Encode a game snapshot into an existing writable buffer.
+
+    Args:
+        game: Game to encode
+        buffer: Writable buffer with room for SNAPSHOT_SIZE bytes at offset
+        offset: Position in the buffer to start writing
+
+    Returns:
+        The offset just past the written snapshot
+
+    """
+    end = offset + SNAPSHOT_SIZE
+    buffer[offset] = WIRE_VERSION
+    buffer[offset + WIRE_HEADER_SIZE : end] = _pack(game).to_bytes(
+        PAYLOAD_SIZE, "little"
+    )
+    return end
+
+
+def decode_board(
+    data: bytes | bytearray | memoryview,
+    offset: int = 0,
+    game: TicTacToe | None = None,
+) -> TicTacToe:
+    """Decode a game snapshot.
+
+    Args:
+        data: Buffer holding the snapshot
+        offset: Position of the snapshot within the buffer
+        game: Existing game to overwrite, or None to create a new one
+
+    Returns:
+        The decoded game
+
+    Raises:
+        ValueError: If the buffer is too short, the version is unknown or
+            a row, state or winner code is not a valid one
+
+    """
+    if len(data) - offset < SNAPSHOT_SIZE:
+        msg = f"snapshot needs {SNAPSHOT_SIZE} bytes"
+        raise ValueError(msg)
+    if data[offset] != WIRE_VERSION:
+        msg = f"unsupported wire version {data[offset]}"
+        raise ValueError(msg)
+
+    packed = int.from_bytes(
+        data[offset + WIRE_HEADER_SIZE : offset + SNAPSHOT_SIZE], "little"
+    )
+
+    rows = [_ROW_CELLS.get(packed >> shift & _ROW_MASK) for shift in _ROW_SHIFTS]
+    state_code = packed >> _STATE_SHIFT & 0b11
+    winner_code = packed >> _WINNER_SHIFT & 0b11
+    if (
+        None in rows
+        or state_code >= len(_GAME_STATES)
+        or winner_code >= len(_CELL_SYMBOLS)
+    ):
+        msg = "corrupt snapshot payload"
+        raise ValueError(msg)
+
+    if game is None:
+        game = TicTacToe()
+    game.board = [list(row) for row in rows]
+    game.current_player = PLAYER_O if packed >> _TURN_SHIFT & 1 else PLAYER_X
+    game.game_state = _GAME_STATES[state_code]
+    game.winner = _CELL_SYMBOLS[winner_code]
+    return game
+
+
+def encode_move(row: int, col: int, player: str) -> int:
+    """Encode a move as a single byte value.
+
+    Args:
+        row: Row index
+        col: Column index
+        player: Symbol of the player making the move
+
+    Returns:
+        The move byte
+
+    """
+    move = row * BOARD_SIZE + col
+    if player == PLAYER_O:
+        move |= _MOVE_PLAYER_BIT
+    return move
+
+
+def decode_move(move: int) -> tuple[int, int, str]:
+    """Decode a move byte.
+
+    Args:
+        move: The move byte, e.g. ``data[offset]`` of a received buffer
+
+    Returns:
+        Tuple of (row, col, player)
+
+    """
+    row, col = divmod(move & _MOVE_CELL_MASK, BOARD_SIZE)
+    return row, col, PLAYER_O if move & _MOVE_PLAYER_BIT else PLAYER_X
@@ -143,3 +143,13 @@ def sample_board_states():
         "o_wins_col": [["o", "x", "x"], ["o", "x", None], ["o", None, None]],
         "x_wins_diagonal": [["x", "o", "o"], ["o", "x", None], [None, None, "x"]],
     }
+
+
+@pytest.fixture
+def game_server():
+    """Run a two-worker game server on a free port."""
+    from src.server import ShardedServer
+    server = ShardedServer(port=0, workers=2)
+    server.start()
+    yield server
+    server.stop()
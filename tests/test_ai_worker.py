@@ -0,0 +1,154 @@
+"""Tests for the ai_worker module."""
+
+import time
+
+import pytest
+
+from src.ai_worker import AIWorker
+from src.position import get_geometry
+
+
+def wait_for_move(worker, timeout=10.0):
+    """Poll the worker until it answers and return every update seen."""
+    updates = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        update = worker.poll()
+        if update is not None:
+            updates.append(update)
+            if update.move is not None:
+                return updates
+        time.sleep(0.001)
+    pytest.fail("worker did not answer")
+
+
+@pytest.fixture
+def worker():
+    """Start a worker for the standard board."""
+    with AIWorker() as worker:
+        yield worker
+
+
+class TestAIWorker:
+    """Test searching in a background process."""
+
+    def test_answers_request(self, worker):
+        """Test a request is answered with a move and progress before it."""
+        worker.request(0b000000011, 0b000011000)
+        updates = wait_for_move(worker)
+        assert updates[-1].move == (0, 2)
+        assert updates[-1].progress == 1.0
+        assert all(update.move is None for update in updates[:-1])
+        assert not worker.busy
+
+    def test_poll_does_not_block(self, worker):
+        """Test polling with nothing to report returns at once."""
+        start = time.perf_counter()
+        assert worker.poll() is None
+        assert time.perf_counter() - start < 0.05
+
+    def test_new_request_replaces_old(self, worker):
+        """Test only the latest request is answered."""
+        worker.request(0, 0)
+        worker.request(0b000000011, 0b000011000)
+        updates = wait_for_move(worker)
+        assert updates[-1].move == (0, 2)
+
+    def test_cancel_drops_answer(self, worker):
+        """Test a cancelled request never reports."""
+        worker.request(0b000000011, 0b000011000)
+        worker.cancel()
+        assert not worker.busy
+        time.sleep(0.2)
+        assert worker.poll() is None
+
+    def test_close_stops_long_search(self):
+        """Test closing interrupts a search in flight promptly."""
+        worker = AIWorker(get_geometry(5, 4), depth=12)
+        worker.request(0, 0)
+        time.sleep(0.1)
+        start = time.perf_counter()
+        worker.close()
+        assert time.perf_counter() - start < 1.0
+        assert worker._process.exitcode == 0
+
+    def test_answers_within_budget(self):
+        """Test a large board is answered in about the time budget."""
+        with AIWorker(get_geometry(6, 4), seconds=0.2) as worker:
+            start = time.monotonic()
+            worker.request(0, 0)
+            updates = wait_for_move(worker)
+            elapsed = time.monotonic() - start
+        assert updates[-1].move is not None
+        assert elapsed < 0.5
+
+    def test_variant_positions(self):
+        """Test another game's positions are searched from their keys."""
+        from src.ultimate import UltimatePosition
+
+        with AIWorker(depth=3, variant=UltimatePosition, seconds=0.2) as worker:
+            # X has two in a row in the centre board and is sent there
+            worker.request((1 << 30) | (1 << 31), (1 << 0) | (1 << 10), 4)
+            updates = wait_for_move(worker)
+        assert updates[-1].move == (3, 5)
+
+    @pytest.mark.parametrize("option", ["tablebase", "book"])
+    def test_variant_rejects_standard_board_files(self, tmp_path, option):
+        """Test a variant refuses a tablebase or book made for the standard board."""
+        from src.ultimate import UltimatePosition
+
+        with pytest.raises(ValueError, match="standard board"):
+            AIWorker(variant=UltimatePosition, **{option: tmp_path})
+
+
+class TestPondering:
+    """Test searching replies during the opponent's turn."""
+
+    def test_pondered_reply_answers_at_once(self):
+        """Test a request for a pondered position is answered without search."""
+        geometry = get_geometry(4)
+        with AIWorker(geometry, depth=3) as worker:
+            worker.ponder(0, 0)
+            assert worker.pondering == (0, 0)
+            time.sleep(1.0)
+            worker.request(1, 0)
+            assert worker.pondering is None
+            updates = wait_for_move(worker)
+        # Only the result is sent, no progress from a fresh search
+        assert len(updates) == 1
+
+    @pytest.mark.parametrize("variant", ["4x4", "ultimate"])
+    def test_pondered_reply_within_time_budget(self, variant):
+        """Test pondering under the default time budget answers replies at once."""
+        from src.constants import AI_MOVE_SECONDS, ULTIMATE_DEPTH
+        from src.ultimate import UltimatePosition
+
+        if variant == "ultimate":
+            worker = AIWorker(depth=ULTIMATE_DEPTH, variant=UltimatePosition)
+            state, reply = (0, 0, -1), (1 << 40, 0, 4)
+        else:
+            worker = AIWorker(get_geometry(4))
+            state, reply = (0, 0), (1 << 5, 0)
+        with worker:
+            worker.ponder(*state)
+            time.sleep(1.0)
+            start = time.monotonic()
+            worker.request(*reply)
+            updates = wait_for_move(worker)
+            elapsed = time.monotonic() - start
+        assert len(updates) == 1
+        assert elapsed < AI_MOVE_SECONDS / 2
+
+    def test_request_interrupts_pondering(self, worker):
+        """Test a request is answered even if pondering had not finished."""
+        worker.ponder(0, 0)
+        worker.request(0b000000011, 0b000011000)
+        updates = wait_for_move(worker)
+        assert updates[-1].move == (0, 2)
+
+    def test_cancel_stops_pondering(self, worker):
+        """Test cancelling clears pondering."""
+        worker.ponder(0, 0)
+        worker.cancel()
+        assert worker.pondering is None
+        assert not worker.busy
@@ -0,0 +1,126 @@
+"""Tests for the archive analytics module."""
+
+import pytest
+
+import src.constants as constants
+from src.analytics import DRAW, GameStats, aggregate, analyze_archive, replay
+from src.archive import ArchiveWriter
+
+X_WINS = (0, 3, 1, 4, 2)
+O_WINS = (1, 0, 4, 3, 8, 6)
+DRAWN = (0, 1, 2, 3, 5, 4, 6, 8, 7)
+
+
+def write_archive(path, games, chunk_games=4):
+    """Write cell sequences to an archive."""
+    with ArchiveWriter(path, chunk_games=chunk_games) as writer:
+        for cells in games:
+            writer.append([divmod(cell, 3) for cell in cells])
+
+
+class TestReplay:
+    """Test replaying games on bitboards."""
+
+    def test_outcomes(self):
+        """Test winners and lengths match the games."""
+        results = list(replay([X_WINS, O_WINS, DRAWN]))
+        assert [r.winner for r in results] == [
+            constants.PLAYER_X,
+            constants.PLAYER_O,
+            None,
+        ]
+        assert [r.length for r in results] == [5, 6, 9]
+        assert [r.opening for r in results] == [0, 1, 0]
+
+    def test_losing_position_is_before_winning_move(self):
+        """Test the losing position excludes the winning move."""
+        (result,) = replay([X_WINS])
+        x_bits, o_bits = result.losing_position
+        assert x_bits.bit_count() == 2
+        assert o_bits.bit_count() == 2
+
+    def test_losing_positions_combined_by_symmetry(self):
+        """Test mirrored games share a losing position in the report."""
+        mirrored = (2, 5, 1, 4, 0)
+        stats = aggregate(replay([X_WINS, mirrored]))
+        assert len(stats.losing_positions) == 2
+        ((_, games),) = stats.most_common_losing_positions()
+        assert games == 2
+
+    def test_moves_after_win_ignored(self):
+        """Test a record continuing past the win stops at the win."""
+        (result,) = replay([X_WINS + (5,)])
+        assert result.length == 5
+
+    def test_empty_game_skipped(self):
+        """Test empty records produce no result."""
+        assert list(replay([()])) == []
+
+
+class TestGameStats:
+    """Test aggregate statistics."""
+
+    def test_aggregates(self):
+        """Test rates, lengths and advantage."""
+        stats = aggregate(replay([X_WINS, X_WINS, O_WINS, DRAWN]))
+
+        assert stats.games == 4
+        assert stats.average_length == pytest.approx((5 + 5 + 6 + 9) / 4)
+        assert stats.first_mover_advantage == pytest.approx(0.25)
+        rates = stats.win_rates_by_opening()
+        assert rates[(0, 0)] == pytest.approx(
+            {constants.PLAYER_X: 2 / 3, constants.PLAYER_O: 0.0, DRAW: 1 / 3}
+        )
+        assert rates[(0, 1)][constants.PLAYER_O] == 1.0
+
+    def test_most_common_losing_positions(self):
+        """Test losing positions are ranked by frequency."""
+        stats = aggregate(replay([X_WINS, X_WINS, O_WINS]))
+        (board, games), _ = stats.most_common_losing_positions()
+        assert games == 2
+        assert board.count("x") == 2
+        assert board.count("o") == 2
+
+    def test_merge_matches_single_pass(self):
+        """Test merging partial aggregates matches one aggregate."""
+        games = [X_WINS, O_WINS, DRAWN, X_WINS, DRAWN]
+        first = aggregate(replay(games[:2]))
+        first.merge(aggregate(replay(games[2:])))
+        whole = aggregate(replay(games))
+
+        assert first.games == whole.games
+        assert first.outcomes == whole.outcomes
+        assert first.openings == whole.openings
+        assert first.losing_positions == whole.losing_positions
+
+    def test_empty_stats(self):
+        """Test empty statistics report zeros."""
+        stats = GameStats()
+        assert stats.average_length == 0.0
+        assert stats.first_mover_advantage == 0.0
+        assert "games:" in stats.report()
+
+
+class TestAnalyzeArchive:
+    """Test analysis of archives on disk."""
+
+    @pytest.mark.parametrize("processes", [1, 3])
+    def test_analyze_archive(self, tmp_path, processes):
+        """Test serial and parallel analysis agree with the games."""
+        games = [X_WINS, O_WINS, DRAWN] * 5
+        write_archive(tmp_path, games)
+
+        stats = analyze_archive(tmp_path, processes=processes)
+        assert stats.games == 15
+        assert stats.outcomes == {
+            constants.PLAYER_X: 5,
+            constants.PLAYER_O: 5,
+            DRAW: 5,
+        }
+
+    def test_report(self, tmp_path):
+        """Test the report lists openings and losing positions."""
+        write_archive(tmp_path, [X_WINS, DRAWN])
+        report = analyze_archive(tmp_path, processes=1).report()
+        assert "(0, 0)" in report
+        assert "most common losing positions" in report
@@ -0,0 +1,156 @@
+"""Tests for the game archive module."""
+
+import pytest
+
+from src.archive import (
+    INDEX_FILE,
+    RECORD_SIZE,
+    ArchiveReader,
+    ArchiveWriter,
+    decode_game,
+    encode_game,
+)
+
+X_WINS = ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2))
+DRAW = ((0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (1, 1), (2, 0), (2, 2), (2, 1))
+
+
+class TestRecordEncoding:
+    """Test fixed-width game records."""
+
+    @pytest.mark.parametrize("moves", [(), ((1, 1),), X_WINS, DRAW])
+    def test_round_trip(self, moves):
+        """Test games survive encoding and decoding."""
+        data = encode_game(moves)
+        assert len(data) == RECORD_SIZE == 5
+        assert decode_game(data) == moves
+
+    def test_too_many_moves(self):
+        """Test a game longer than the board is rejected."""
+        with pytest.raises(ValueError):
+            encode_game(DRAW + ((0, 0),))
+
+
+class TestArchive:
+    """Test writing and reading archives."""
+
+    def test_write_and_read(self, tmp_path):
+        """Test games are read back in order."""
+        with ArchiveWriter(tmp_path) as writer:
+            assert writer.append(X_WINS) == 0
+            assert writer.append(DRAW) == 1
+
+        with ArchiveReader(tmp_path) as reader:
+            assert len(reader) == 2
+            assert list(reader) == [X_WINS, DRAW]
+            assert reader[1] == DRAW
+            assert reader[-2] == X_WINS
+
+    def test_chunks_and_random_access(self, tmp_path):
+        """Test random access across many chunks."""
+        games = [DRAW[: index % 10] for index in range(100)]
+        with ArchiveWriter(tmp_path, chunk_games=7) as writer:
+            for game in games:
+                writer.append(game)
+
+        with ArchiveReader(tmp_path) as reader:
+            assert len(reader.chunks) == 15
+            assert reader.starts[:3] == [0, 7, 14]
+            for index in (0, 6, 7, 50, 99):
+                assert reader[index] == games[index]
+            assert list(reader) == games
+
+    def test_index_out_of_range(self, tmp_path):
+        """Test reading past the end raises IndexError."""
+        with ArchiveWriter(tmp_path) as writer:
+            writer.append(X_WINS)
+        with ArchiveReader(tmp_path) as reader, pytest.raises(IndexError):
+            reader[1]
+
+    def test_empty_archive(self, tmp_path):
+        """Test an archive with no games."""
+        ArchiveWriter(tmp_path).close()
+        with ArchiveReader(tmp_path) as reader:
+            assert len(reader) == 0
+            assert list(reader) == []
+
+    def test_reopen_appends(self, tmp_path):
+        """Test a reopened archive continues where it stopped."""
+        with ArchiveWriter(tmp_path, chunk_games=3) as writer:
+            for _ in range(4):
+                writer.append(X_WINS)
+        with ArchiveWriter(tmp_path, chunk_games=3) as writer:
+            assert writer.append(DRAW) == 4
+            writer.append(DRAW)
+            writer.append(DRAW)
+
+        with ArchiveReader(tmp_path) as reader:
+            assert len(reader) == 7
+            assert reader.starts == [0, 3, 6]
+            assert reader[4] == DRAW
+
+    def test_missing_index_rebuilt(self, tmp_path):
+        """Test the index is rebuilt from chunk sizes if lost."""
+        with ArchiveWriter(tmp_path, chunk_games=2) as writer:
+            for _ in range(5):
+                writer.append(X_WINS)
+        (tmp_path / INDEX_FILE).unlink()
+
+        with ArchiveReader(tmp_path) as reader:
+            assert reader.starts == [0, 2, 4]
+            assert len(reader) == 5
+
+    def test_torn_record_ignored(self, tmp_path):
+        """Test a partial trailing record is ignored and later overwritten."""
+        with ArchiveWriter(tmp_path) as writer:
+            writer.append(X_WINS)
+        (chunk,) = tmp_path.glob("chunk-*")
+        with chunk.open("ab") as file:
+            file.write(b"\x01\x02")
+
+        with ArchiveReader(tmp_path) as reader:
+            assert len(reader) == 1
+        with ArchiveWriter(tmp_path) as writer:
+            writer.append(DRAW)
+        with ArchiveReader(tmp_path) as reader:
+            assert list(reader) == [X_WINS, DRAW]
+
+    def test_reader_during_new_chunk(self, tmp_path):
+        """Test a reader opened right after a chunk starts sees its header."""
+        with ArchiveWriter(tmp_path, chunk_games=1) as writer:
+            writer.append(X_WINS)
+            writer.append(DRAW)
+            with ArchiveReader(tmp_path) as reader:
+                assert reader.starts == [0, 1]
+                assert len(reader) == 1
+
+    def test_chunk_without_header(self, tmp_path):
+        """Test a chunk created but not yet written holds no games."""
+        with ArchiveWriter(tmp_path, chunk_games=1) as writer:
+            writer.append(X_WINS)
+            writer.append(DRAW)
+        chunk = sorted(tmp_path.glob("chunk-*"))[-1]
+        chunk.write_bytes(b"")
+
+        with ArchiveReader(tmp_path) as reader:
+            assert list(reader) == [X_WINS]
+        with ArchiveWriter(tmp_path, chunk_games=1) as writer:
+            writer.append(DRAW)
+        with ArchiveReader(tmp_path) as reader:
+            assert list(reader) == [X_WINS, DRAW]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test a chunk with a bad header is rejected."""
+        with ArchiveWriter(tmp_path) as writer:
+            writer.append(X_WINS)
+        (chunk,) = tmp_path.glob("chunk-*")
+        chunk.write_bytes(b"NOPE" + chunk.read_bytes()[4:])
+        with pytest.raises(ValueError, match="archive"):
+            ArchiveReader(tmp_path)
+
+    def test_iter_cells(self, tmp_path):
+        """Test chunks can be scanned as cell indices."""
+        with ArchiveWriter(tmp_path) as writer:
+            writer.append(X_WINS)
+        with ArchiveReader(tmp_path) as reader:
+            assert list(reader.iter_cells(0)) == [(0, 3, 1, 4, 2)]
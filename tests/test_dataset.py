@@ -0,0 +1,151 @@
+"""Tests for the dataset module."""
+
+import numpy as np
+import pytest
+
+from src.dataset import (
+    encode_planes,
+    export_dataset,
+    label_positions,
+    load_dataset,
+    random_positions,
+    reachable_positions,
+)
+from src.position import board_to_bits, get_geometry, parse_board
+
+
+def bits(text):
+    """Return the (x_bits, o_bits) position of a compact board string."""
+    return board_to_bits(parse_board(text))
+
+
+class TestPositions:
+    """Test enumerating and sampling positions."""
+
+    def test_reachable_count(self):
+        """Test every non-terminal reachable 3x3 position is listed once."""
+        positions = reachable_positions()
+        assert len(positions) == 4520
+        assert len(set(positions)) == len(positions)
+        assert positions[0] == (0, 0)
+
+    def test_reachable_excludes_finished_games(self):
+        """Test won and full boards are not listed."""
+        positions = set(reachable_positions())
+        assert bits("xxxoo....") not in positions
+        assert bits("xoxxoooxx") not in positions
+        assert bits("xx.oo....") in positions
+
+    def test_random_positions(self):
+        """Test samples are distinct, reachable and respect min_stones."""
+        positions = random_positions(200, min_stones=4, seed=1)
+        assert len(set(positions)) == 200
+        assert set(positions) <= set(reachable_positions())
+        assert all((x | o).bit_count() >= 4 for x, o in positions)
+
+    def test_random_positions_seeded(self):
+        """Test the same seed gives the same sample."""
+        assert random_positions(50, seed=3) == random_positions(50, seed=3)
+
+    def test_random_positions_larger_board(self):
+        """Test sampling works on boards wider than 64 cells."""
+        geometry = get_geometry(9, 5)
+        positions = random_positions(20, geometry, min_stones=70, seed=0)
+        assert all((x | o).bit_count() >= 70 for x, o in positions)
+
+    def test_invalid_min_stones(self):
+        """Test min_stones must leave a move to play."""
+        with pytest.raises(ValueError, match="min_stones"):
+            random_positions(1, min_stones=9)
+
+    def test_too_many_positions(self, monkeypatch):
+        """Test asking for more positions than exist stops with ValueError."""
+        monkeypatch.setattr("src.dataset.DATASET_PLAYOUTS_PER_POSITION", 10)
+        eight_stones = sum((x | o).bit_count() == 8 for x, o in reachable_positions())
+        with pytest.raises(ValueError, match="distinct positions"):
+            random_positions(eight_stones + 1, min_stones=8, seed=0)
+
+
+class TestEncoding:
+    """Test encoding positions as arrays."""
+
+    def test_planes_are_one_hot(self):
+        """Test each cell is set in exactly one plane."""
+        planes, _ = encode_planes(reachable_positions(), 3)
+        assert planes.shape == (4520, 3, 3, 3)
+        assert planes.dtype == np.uint8
+        assert (planes.sum(axis=1) == 1).all()
+
+    def test_planes_match_board(self):
+        """Test the planes place the marks in row-major order."""
+        planes, to_move = encode_planes([bits("x...o...x")], 3)
+        assert planes[0, 0].tolist() == [[1, 0, 0], [0, 0, 0], [0, 0, 1]]
+        assert planes[0, 1].tolist() == [[0, 0, 0], [0, 1, 0], [0, 0, 0]]
+        assert to_move.tolist() == [-1]
+
+    def test_side_to_move(self):
+        """Test X moves on even mark counts and O on odd ones."""
+        _, to_move = encode_planes([bits("........."), bits("x........")], 3)
+        assert to_move.tolist() == [1, -1]
+
+
+class TestLabels:
+    """Test exact labels."""
+
+    def test_empty_board(self):
+        """Test the empty board is a draw where every move draws."""
+        value, best_moves = label_positions([(0, 0)])
+        assert value.tolist() == [0]
+        assert best_moves[0].all()
+
+    def test_immediate_win(self):
+        """Test a winning move is the only best move."""
+        value, best_moves = label_positions([bits("xx.oo....")])
+        assert value.tolist() == [1]
+        assert np.flatnonzero(best_moves[0]).tolist() == [2]
+
+    def test_lost_position(self):
+        """Test a position with two open threats is lost for the defender."""
+        value, _ = label_positions([bits("xx.xo...o")])
+        assert value.tolist() == [-1]
+
+
+class TestExport:
+    """Test writing and loading sharded datasets."""
+
+    def test_round_trip(self, tmp_path):
+        """Test loaded shards hold the exported arrays in order."""
+        positions = reachable_positions()[:1000]
+        shards = export_dataset(tmp_path, positions, shard_positions=300, processes=1)
+        assert shards == 4
+
+        loaded = load_dataset(tmp_path)
+        assert len(loaded) == 4
+        assert [len(shard.value) for shard in loaded] == [300, 300, 300, 100]
+
+        planes, to_move = encode_planes(positions, 3)
+        value, best_moves = label_positions(positions)
+        assert (np.concatenate([s.planes for s in loaded]) == planes).all()
+        assert (np.concatenate([s.to_move for s in loaded]) == to_move).all()
+        assert (np.concatenate([s.value for s in loaded]) == value).all()
+        assert (np.concatenate([s.best_moves for s in loaded]) == best_moves).all()
+
+    def test_loaded_arrays_are_memory_mapped(self, tmp_path):
+        """Test shards are read-only memory maps."""
+        export_dataset(tmp_path, reachable_positions()[:10], processes=1)
+        (shard,) = load_dataset(tmp_path)
+        assert isinstance(shard.planes, np.memmap)
+        assert not shard.planes.flags.writeable
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test a process pool writes the same shards."""
+        positions = reachable_positions()[:600]
+        export_dataset(tmp_path / "serial", positions, shard_positions=200, processes=1)
+        export_dataset(
+            tmp_path / "parallel", positions, shard_positions=200, processes=3
+        )
+        serial = load_dataset(tmp_path / "serial")
+        parallel = load_dataset(tmp_path / "parallel")
+        for left, right in zip(serial, parallel, strict=True):
+            for a, b in zip(left, right, strict=True):
+                assert (a == b).all()
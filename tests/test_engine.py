@@ -0,0 +1,203 @@
+"""Tests for the engine module."""
+
+import time
+
+import pytest
+
+import src.constants as constants
+from src.dataset import reachable_positions
+from src.engine import Engine, SearchAbortedError
+from src.position import Position, get_geometry, parse_board
+from src.solver import Solver
+
+
+def position(text, geometry=None):
+    """Build a position from a compact board string."""
+    return Position.from_board(parse_board(text), geometry)
+
+
+def sign(value):
+    """Return -1, 0 or 1."""
+    return (value > 0) - (value < 0)
+
+
+class TestSearch:
+    """Test fixed-depth alpha-beta search."""
+
+    def test_takes_immediate_win(self):
+        """Test the winning move is found and scored as a win in one."""
+        result = Engine().search(position("xx.oo...."))
+        assert result.move == 2
+        assert result.score == constants.ENGINE_WIN_SCORE - 1
+
+    def test_blocks_threat(self):
+        """Test the only non-losing move is chosen."""
+        result = Engine().search(position("xx..o...."))
+        assert result.move == 2
+
+    def test_empty_board_is_draw(self):
+        """Test an exact search of the empty board scores a draw."""
+        result = Engine().search(position("........."))
+        assert result.score == 0
+        assert result.depth == 9
+
+    def test_agrees_with_solver(self):
+        """Test exact searches preserve the value of every reachable position."""
+        engine = Engine()
+        solver = Solver()
+        for x_bits, o_bits in reachable_positions():
+            root = Position(None, x_bits, o_bits)
+            result = engine.search(root)
+            me, opponent = (x_bits, o_bits) if root.to_move == 0 else (o_bits, x_bits)
+            scores = solver.move_scores(me, opponent)
+            best = max(scores.values())
+            assert sign(result.score) == sign(best)
+            assert sign(scores[result.move]) == sign(best)
+
+    def test_position_restored(self):
+        """Test the searched position is unchanged afterwards."""
+        root = position("x...o....")
+        Engine().search(root)
+        assert root.key() == position("x...o....").key()
+        assert root.history == []
+
+    def test_depth_limited_search_on_larger_board(self):
+        """Test a shallow search finds a forced win on a 4x4 board."""
+        geometry = get_geometry(4)
+        root = position("xxx.ooo.........", geometry)
+        result = Engine().search(root, depth=2)
+        assert result.move == 3
+        assert result.nodes > 0
+
+    def test_no_legal_move(self):
+        """Test a full board cannot be searched."""
+        with pytest.raises(ValueError, match="no legal move"):
+            Engine().search(position("xoxxoooxx"))
+
+
+class TestSearchControl:
+    """Test progress reports and aborting."""
+
+    def test_progress_per_root_move(self):
+        """Test progress is reported once per root move."""
+        reports = []
+        Engine().search(
+            position("x........"), progress=lambda *report: reports.append(report)
+        )
+        assert reports == [(done, 8) for done in range(1, 9)]
+
+    def test_abort(self):
+        """Test a search stops when asked to."""
+        with pytest.raises(SearchAbortedError):
+            Engine().search(
+                Position(get_geometry(4)), depth=8, should_stop=lambda: True
+            )
+
+    def test_table_is_kept_between_searches(self):
+        """Test a repeated search reuses the transposition table."""
+        engine = Engine()
+        first = engine.search(position("........."))
+        second = engine.search(position("........."))
+        assert second.nodes < first.nodes
+        engine.clear()
+        assert engine.table.stats().used == 0
+
+
+class TestMoveOrdering:
+    """Test the move-ordering heuristics."""
+
+    def test_fewer_nodes_with_ordering(self):
+        """Test ordering shrinks the tree without changing the result."""
+        root = Position(get_geometry(4))
+        plain = Engine(ordering=False).search(root, depth=5)
+        ordered = Engine().search(root, depth=5)
+        assert ordered.score == plain.score
+        assert ordered.nodes < plain.nodes
+
+    def test_threats_searched_first(self):
+        """Test an immediate win comes before a block and other moves."""
+        engine = Engine()
+        moves = engine._ordered_moves(position("xx.oo...."), 0, -1)
+        assert moves[:2] == [2, 5]
+
+    def test_table_move_searched_first(self):
+        """Test the stored best move leads the order."""
+        engine = Engine()
+        moves = engine._ordered_moves(position("xx.oo...."), 0, 7)
+        assert moves[0] == 7
+
+    def test_cutoffs_feed_killers_and_history(self):
+        """Test refutations are remembered per ply and overall."""
+        engine = Engine()
+        engine.search(Position(get_geometry(4)), depth=4)
+        assert any(move >= 0 for killers in engine.killers for move in killers)
+        assert engine.history
+        engine.clear()
+        assert engine.history == {}
+
+
+class TestThink:
+    """Test iterative deepening under a time budget."""
+
+    def test_exact_when_time_allows(self):
+        """Test a small board is searched to the end within the budget."""
+        result = Engine().think(position("........."), 5.0)
+        assert result.depth == 9
+        assert result.score == 0
+
+    def test_matches_fixed_depth_search(self):
+        """Test aspiration windows do not change the score of a depth."""
+        root = Position(get_geometry(4))
+        thought = Engine().think(root, 60.0, depth=4)
+        searched = Engine().search(root, depth=4)
+        assert thought.depth == 4
+        assert thought.score == searched.score
+
+    def test_stops_at_deadline(self):
+        """Test a large board is answered close to the budget."""
+        root = Position(get_geometry(6, 4))
+        start = time.monotonic()
+        result = Engine().think(root, 0.2)
+        elapsed = time.monotonic() - start
+        assert result.move in root.legal_moves()
+        assert 1 <= result.depth < 36
+        assert elapsed < 0.4
+        assert root.history == []
+
+    def test_completes_depth_one_without_time(self):
+        """Test a move is found even with no time to think."""
+        result = Engine().think(position("xx..o...."), 0.0)
+        assert result.depth == 1
+        assert result.move == 2
+
+    def test_stops_on_forced_win(self):
+        """Test deepening ends once a win is proven."""
+        result = Engine().think(position("xx.oo...."), 5.0)
+        assert result.move == 2
+        assert result.depth == 1
+
+    def test_without_time_budget(self):
+        """Test no budget deepens to the requested depth and reports root moves."""
+        reports = []
+        root = Position(get_geometry(4))
+        result = Engine().think(
+            root, None, depth=3, progress=lambda *report: reports.append(report)
+        )
+        assert result.depth == 3
+        assert reports[-1] == (16, 16)
+
+    def test_progress_reports_time(self):
+        """Test progress is the share of the budget used."""
+        reports = []
+        Engine().think(
+            Position(get_geometry(5, 4)),
+            0.1,
+            progress=lambda *report: reports.append(report),
+        )
+        assert reports
+        assert all(total == 100 and 0 <= done <= 100 for done, total in reports)
+
+    def test_abort(self):
+        """Test should_stop abandons the search instead of answering."""
+        with pytest.raises(SearchAbortedError):
+            Engine().think(Position(get_geometry(5, 4)), 5.0, should_stop=lambda: True)
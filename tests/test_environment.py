@@ -0,0 +1,217 @@
+"""Tests for the environment module."""
+
+import numpy as np
+import pytest
+
+import src.constants as constants
+from src.environment import (
+    PerfectPolicy,
+    TicTacToeEnv,
+    VectorEnv,
+    first_legal_policy,
+    get_policy,
+    random_policy,
+)
+from src.position import get_geometry
+
+X_WINS = (0, 3, 1, 4, 2)
+
+
+class TestPolicies:
+    """Test the built-in opponent policies."""
+
+    def test_random_policy_is_legal(self):
+        """Test random moves only pick legal cells."""
+        mask = np.zeros((100, 9), dtype=bool)
+        mask[:, [2, 7]] = True
+        actions = random_policy(None, mask, np.random.default_rng(0))
+        assert set(actions.tolist()) == {2, 7}
+
+    def test_first_legal_policy(self):
+        """Test the lowest legal cell is picked."""
+        mask = np.array([[False, True, True], [True, False, False]])
+        assert first_legal_policy(None, mask, None).tolist() == [1, 0]
+
+    def test_perfect_policy_takes_win(self):
+        """Test the solver policy completes its own line."""
+        observation = np.zeros((1, 3, 3, 3), dtype=np.uint8)
+        observation[0, 0, 0, :2] = 1
+        observation[0, 1, 1, :2] = 1
+        observation[0, 2] = 1 - observation[0, 0] - observation[0, 1]
+        mask = observation[:, 2].reshape(1, 9).astype(bool)
+        action = PerfectPolicy()(observation, mask, np.random.default_rng(0))
+        assert action.tolist() == [2]
+
+    def test_unknown_policy(self):
+        """Test unknown policy names are rejected."""
+        with pytest.raises(ValueError, match="unknown opponent"):
+            get_policy("greedy", get_geometry())
+
+
+class TestTicTacToeEnv:
+    """Test the single-game environment."""
+
+    def test_reset(self):
+        """Test the first observation is an empty board."""
+        env = TicTacToeEnv()
+        observation, info = env.reset()
+        assert observation.shape == (3, 3, 3)
+        assert observation[2].all()
+        assert info["action_mask"].all()
+
+    def test_self_play_win(self):
+        """Test the winning move is rewarded for its mover."""
+        env = TicTacToeEnv()
+        env.reset()
+        rewards = [env.step(cell)[1] for cell in X_WINS]
+        assert rewards[-1] == constants.ENV_WIN_REWARD
+        assert env.done
+        assert env.game.winner == constants.PLAYER_X
+
+    def test_observation_from_side_to_move(self):
+        """Test the own plane holds the marks of the player to move."""
+        env = TicTacToeEnv()
+        env.reset()
+        observation, *_ = env.step(4)
+        assert observation[1, 1, 1] == 1
+        assert observation[0].sum() == 0
+        assert not env.action_mask[4]
+
+    def test_illegal_move_ends_episode(self):
+        """Test playing an occupied cell is penalized."""
+        env = TicTacToeEnv()
+        env.reset()
+        env.step(0)
+        _, reward, terminated, _, _ = env.step(0)
+        assert reward == constants.ENV_ILLEGAL_MOVE_REWARD
+        assert terminated
+        with pytest.raises(ValueError, match="reset"):
+            env.step(1)
+
+    def test_opponent_replies(self):
+        """Test the opponent moves inside step."""
+        env = TicTacToeEnv(opponent="first")
+        env.reset()
+        observation, reward, terminated, _, _ = env.step(4)
+        assert observation[0, 1, 1] == 1
+        assert observation[1, 0, 0] == 1
+        assert observation[1].sum() == 1
+        assert (reward, terminated) == (constants.ENV_DRAW_REWARD, False)
+
+    def test_agent_as_o(self):
+        """Test the opponent opens when the agent plays O."""
+        env = TicTacToeEnv(opponent="first", agent_player=constants.PLAYER_O)
+        observation, _ = env.reset()
+        assert observation[1, 0, 0] == 1
+        assert env.game.current_player == constants.PLAYER_O
+
+    def test_loss_against_opponent(self):
+        """Test losing to the opponent is penalized."""
+        env = TicTacToeEnv(opponent="perfect", seed=0)
+        env.reset()
+        rewards = []
+        for cell in (1, 3, 5, 7, 2, 6, 8, 0):
+            if env.action_mask[cell]:
+                _, reward, terminated, _, _ = env.step(cell)
+                rewards.append(reward)
+                if terminated:
+                    break
+        assert rewards[-1] in (constants.ENV_LOSS_REWARD, constants.ENV_DRAW_REWARD)
+        assert constants.ENV_WIN_REWARD not in rewards
+
+
+class TestVectorEnv:
+    """Test the vectorized environment."""
+
+    def test_buffers_are_reused(self):
+        """Test every step returns the preallocated arrays."""
+        env = VectorEnv(8)
+        observations, info = env.reset()
+        result = env.step(np.zeros(8, dtype=int))
+        assert result[0] is observations
+        assert result[4] is info
+        assert info["action_mask"] is env.action_mask
+
+    def test_self_play_win_and_auto_reset(self):
+        """Test a finished game reports its final board and starts over."""
+        env = VectorEnv(2)
+        env.reset()
+        for cell in X_WINS:
+            observations, rewards, terminated, _, info = env.step([cell, 8 - cell])
+        assert rewards.tolist() == [constants.ENV_WIN_REWARD] * 2
+        assert terminated.all()
+        assert observations[:, 2].all()
+        final = info["final_observation"][0]
+        assert final[1, 0].tolist() == [1, 1, 1]
+
+    def test_illegal_move(self):
+        """Test an illegal move only ends its own game."""
+        env = VectorEnv(2)
+        env.reset()
+        env.step([0, 0])
+        _, rewards, terminated, _, _ = env.step([0, 1])
+        assert rewards.tolist() == [constants.ENV_ILLEGAL_MOVE_REWARD, 0.0]
+        assert terminated.tolist() == [True, False]
+        assert env.to_move.tolist() == [1, 1]
+
+    def test_rejects_out_of_range_actions(self):
+        """Test actions must be cells of the board."""
+        env = VectorEnv(2)
+        env.reset()
+        with pytest.raises(ValueError, match="cell indices"):
+            env.step([0, 9])
+
+    def test_draw(self):
+        """Test a full board without a line is a draw."""
+        env = VectorEnv(1)
+        env.reset()
+        for cell in (0, 1, 2, 4, 3, 5, 7, 6):
+            _, _, terminated, _, _ = env.step([cell])
+            assert not terminated[0]
+        _, rewards, terminated, _, _ = env.step([8])
+        assert terminated[0]
+        assert rewards[0] == constants.ENV_DRAW_REWARD
+
+    def test_matches_single_env(self):
+        """Test random games agree with the TicTacToe rules."""
+        rng = np.random.default_rng(0)
+        vector = VectorEnv(1)
+        single = TicTacToeEnv()
+        observations, info = vector.reset()
+        single.reset()
+        for _ in range(500):
+            action = int(random_policy(observations, info["action_mask"], rng)[0])
+            observations, rewards, terminated, _, info = vector.step([action])
+            observation, reward, done, _, _ = single.step(action)
+            assert (reward, done) == (rewards[0], terminated[0])
+            if done:
+                single.reset()
+            else:
+                assert (observation == observations[0]).all()
+
+    def test_random_never_beats_perfect(self):
+        """Test a random agent cannot win against the solver."""
+        env = VectorEnv(64, opponent="perfect", seed=1)
+        observations, info = env.reset()
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            actions = random_policy(observations, info["action_mask"], rng)
+            observations, rewards, _, _, info = env.step(actions)
+            assert (rewards != constants.ENV_WIN_REWARD).all()
+
+    def test_agent_as_o_starts_after_opponent(self):
+        """Test reset games already hold the opponent's opening move."""
+        env = VectorEnv(4, opponent="random", agent_player=constants.PLAYER_O, seed=0)
+        observations, _ = env.reset()
+        assert (observations[:, 1].sum(axis=(1, 2)) == 1).all()
+        assert (env.to_move == -1).all()
+
+    def test_larger_board(self):
+        """Test k-in-a-row on a larger board."""
+        env = VectorEnv(1, size=5, win_length=4)
+        env.reset()
+        for cell in (0, 5, 1, 6, 2, 7):
+            env.step([cell])
+        _, rewards, terminated, _, _ = env.step([3])
+        assert terminated[0]
+        assert rewards[0] == constants.ENV_WIN_REWARD
@@ -85,6 +85,13 @@ class TestMakeMove:
         assert game_instance.board[1][1] == constants.PLAYER_O
         assert game_instance.current_player == constants.PLAYER_X
 
+    def test_key_follows_moves(self, game_instance):
+        """Test the search key holds each player's cells as bits."""
+        game_instance.make_move(0, 0)  # X
+        game_instance.make_move(1, 1)  # O
+
+        assert game_instance.key() == (1 << 0, 1 << 4)
+
     def test_invalid_move_occupied_cell(self, game_instance):
         """Test move to already occupied cell fails."""
         game_instance.make_move(0, 0)  # X
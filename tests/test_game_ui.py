@@ -317,6 +317,48 @@ class TestStatusDrawing:
         assert black_fill_call is not None
 
 
+class TestThinkingIndicator:
+    """Test the AI thinking indicator."""
+
+    def test_draw_thinking_message(self, mock_ui_dependencies):
+        """Test the thinking message replaces the status text."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI()
+
+        ui.draw_thinking(0.5)
+
+        ui.font.render.assert_called_once()
+        assert ui.font.render.call_args[0][0] == constants.THINKING_MESSAGE
+        ui.screen.fill.assert_called_once()
+        assert ui.screen.fill.call_args[0][0] == constants.BLACK
+
+    def test_draw_thinking_progress_bar(self, mock_ui_dependencies):
+        """Test the filled part of the bar follows the progress."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI()
+
+        ui.draw_thinking(0.25)
+
+        outline, filled = mock_pygame.draw.rect.call_args_list
+        assert outline[0][2][2] == constants.THINKING_BAR_WIDTH
+        assert filled[0][2][2] == constants.THINKING_BAR_WIDTH // 4
+
+    def test_draw_thinking_no_progress(self, mock_ui_dependencies):
+        """Test only the outline is drawn before any progress."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI()
+
+        ui.draw_thinking(0.0)
+
+        assert mock_pygame.draw.rect.call_count == 1
+
+
 class TestMouseClickHandling:
     """Test mouse click to cell conversion."""
 
@@ -481,3 +523,168 @@ class TestUIIntegration:
         # Messages should be different
         assert first_call != second_call
         assert "WON" in second_call.upper()
+
+
+class TestUltimateBoard:
+    """Test drawing the 9 x 9 grid of ultimate tic-tac-toe."""
+
+    def test_sub_board_lines_are_thick(self, mock_ui_dependencies):
+        """Test lines between sub-boards are thick and the others thin."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI(9, 3)
+
+        ui.draw_board()
+
+        widths = [call[0][4] for call in mock_pygame.draw.line.call_args_list]
+        assert len(widths) == 16
+        assert widths.count(constants.LINE_WIDTH) == 4
+        assert widths.count(constants.SUB_LINE_WIDTH) == 12
+
+    def test_won_sub_board_covered(self, mock_ui_dependencies):
+        """Test a won sub-board is covered by one large mark."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        from src.ultimate import UltimateGame, UltimatePosition
+        ui = GameUI(9, 3)
+        game = UltimateGame()
+        # X owns the top row of the top-left sub-board; O is sent top-right
+        game.position = UltimatePosition(0b111, (1 << 30) | (1 << 31), 2)
+        game.current_player = constants.PLAYER_O
+
+        ui.draw_symbols(game)
+
+        assert game.board_winners()[0] == constants.PLAYER_X
+        # Five small marks and the winner of the top-left sub-board
+        assert ui.screen.blit.call_count == 6
+        ui.screen.blit.assert_called_with(
+            ui.x_board_image, (constants.SYMBOL_OFFSET, constants.SYMBOL_OFFSET)
+        )
+        # O was sent to the top-right sub-board, which is outlined
+        outline = mock_pygame.draw.rect.call_args
+        assert outline[0][2][0] == 6 * ui.cell_width
+
+    def test_clicks_map_to_small_cells(self, mock_ui_dependencies):
+        """Test clicks are mapped to cells of the 9 x 9 grid."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI(9, 3)
+
+        assert ui.get_clicked_cell((ui.cell_width * 8 + 1, 1)) == (0, 8)
+        assert ui.get_clicked_cell((1, ui.cell_height * 4 + 1)) == (4, 0)
+
+
+class TestQubicBoard:
+    """Test drawing the layers of a Qubic cube."""
+
+    def test_layers_are_not_covered(self, mock_ui_dependencies):
+        """Test layers are separated by thick lines but never covered."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        from src.qubic import QubicGame
+        ui = GameUI(8, 4, layered=True)
+        game = QubicGame()
+        game.make_move(0, 0)
+        game.make_move(7, 7)
+
+        ui.draw_board()
+        ui.draw_symbols(game)
+
+        widths = [call[0][4] for call in mock_pygame.draw.line.call_args_list]
+        assert widths.count(constants.LINE_WIDTH) == 2
+        assert widths.count(constants.SUB_LINE_WIDTH) == 12
+        assert ui.screen.blit.call_count == 2
+        mock_pygame.draw.rect.assert_not_called()
+
+    def test_winning_cells_outlined(self, mock_ui_dependencies):
+        """Test a line through the layers is drawn as four outlined cells."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        from src.qubic import QubicGame, cell
+        ui = GameUI(8, 4, layered=True)
+        game = QubicGame()
+        for layer in range(4):
+            game.make_move(*divmod(cell(layer, layer, layer), 8))
+            if layer < 3:
+                game.make_move(*divmod(cell(layer, 0, 3), 8))
+
+        ui.draw_winning_line(game)
+
+        corners = sorted(call[0][2][:2] for call in mock_pygame.draw.rect.call_args_list)
+        assert corners == [
+            (0, 0),
+            (2 * ui.cell_width, 6 * ui.cell_height),
+            (5 * ui.cell_width, ui.cell_height),
+            (7 * ui.cell_width, 7 * ui.cell_height),
+        ]
+
+
+class TestBoardView:
+    """Test scrolling and zooming a view of a large board."""
+
+    def test_view_starts_at_centre(self, mock_ui_dependencies):
+        """Test the first view shows the middle of the board."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI(15, 15, view=9)
+
+        assert (ui.top, ui.left, ui.view) == (3, 3, 9)
+        assert ui.cell_width == constants.WINDOW_WIDTH // 9
+
+    def test_scroll_stops_at_edges(self, mock_ui_dependencies):
+        """Test scrolling moves the view but never off the board."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI(15, 15, view=9)
+
+        assert ui.scroll(-2, 10)
+        assert (ui.top, ui.left) == (1, 6)
+        assert not ui.scroll(0, 1)
+        assert ui.get_clicked_cell((1, ui.cell_height + 1)) == (2, 6)
+
+    def test_zoom_keeps_centre(self, mock_ui_dependencies):
+        """Test zooming keeps the centre cell and stops at the limits."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        ui = GameUI(15, 15, view=9)
+
+        assert ui.zoom(2)
+        assert (ui.top, ui.left, ui.view) == (4, 4, 7)
+        assert ui.zoom(10)
+        assert ui.view == constants.MIN_VIEW
+        assert ui.zoom(-20)
+        assert (ui.top, ui.left, ui.view) == (0, 0, 15)
+        assert not ui.zoom(-1)
+
+    def test_only_cells_in_view_drawn(self, mock_ui_dependencies):
+        """Test stones, lines and outlines outside the view are not drawn."""
+        mock_pygame, mock_time = mock_ui_dependencies
+
+        from src.game_ui import GameUI
+        from src.gomoku import GomokuGame
+        ui = GameUI(15, 15, view=5)
+        game = GomokuGame()
+        # X fills row 7 from column 5; O plays row 0, out of view
+        for col in range(5, 10):
+            game.make_move(7, col)
+            if col < 9:
+                game.make_move(0, col)
+
+        ui.draw_board()
+        ui.draw_symbols(game)
+        ui.draw_winning_line(game)
+
+        assert mock_pygame.draw.line.call_count == 8
+        widths = {call[0][4] for call in mock_pygame.draw.line.call_args_list}
+        assert widths == {constants.SUB_LINE_WIDTH}
+        # Columns 5 to 9 are in view, at the middle of the board
+        assert ui.screen.blit.call_count == 5
+        assert mock_pygame.draw.rect.call_count == 5
@@ -0,0 +1,140 @@
+"""Tests for the gomoku module."""
+
+import random
+
+import src.constants as constants
+from src.engine import Engine
+from src.gomoku import CENTRE, WINDOWS, GomokuGame, GomokuPosition
+
+
+def cell(row, col):
+    """Return the cell of a row and column."""
+    return row * 15 + col
+
+
+def naive_five(bits):
+    """Check for five in a row by scanning the whole board."""
+    for row in range(15):
+        for col in range(15):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if all(
+                    0 <= row + d_row * k < 15
+                    and 0 <= col + d_col * k < 15
+                    and bits >> cell(row + d_row * k, col + d_col * k) & 1
+                    for k in range(5)
+                ):
+                    return True
+    return False
+
+
+def naive_candidates(position):
+    """Return the empty cells within two rows and columns of a stone."""
+    occupied = position.bits[0] | position.bits[1]
+    stones = [
+        (row, col)
+        for row in range(15)
+        for col in range(15)
+        if occupied >> cell(row, col) & 1
+    ]
+    return sorted(
+        cell(row, col)
+        for row in range(15)
+        for col in range(15)
+        if not occupied >> cell(row, col) & 1
+        and any(abs(row - r) <= 2 and abs(col - c) <= 2 for r, c in stones)
+    )
+
+
+class TestGomokuPosition:
+    """Test the windows and the candidate moves kept by make/unmake."""
+
+    def test_windows(self):
+        """Test every window is five cells in a row, column or diagonal."""
+        assert len(WINDOWS) == 2 * 15 * 11 + 2 * 11 * 11
+        assert len(set(WINDOWS)) == len(WINDOWS)
+        assert all(window.bit_count() == 5 and naive_five(window) for window in WINDOWS)
+
+    def test_matches_naive_scan(self):
+        """Test wins and candidates agree with full scans move by move."""
+        rng = random.Random(0)
+        for _ in range(10):
+            position = GomokuPosition()
+            while True:
+                moves = position.legal_moves()
+                assert sorted(moves) == (naive_candidates(position) or [CENTRE])
+                position.make(rng.choice(moves))
+                won = naive_five(position.bits[position.to_move ^ 1])
+                assert position.last_move_won() == won
+                if won or position.is_full():
+                    break
+
+    def test_unmake_restores_candidates(self):
+        """Test taking every move back restores the candidate cells."""
+        rng = random.Random(1)
+        position = GomokuPosition()
+        states = []
+        while not position.last_move_won() and not position.is_full():
+            states.append(position.near)
+            position.make(rng.choice(position.legal_moves()))
+        while states:
+            position.unmake()
+            assert position.near == states.pop()
+        assert position.legal_moves() == [CENTRE]
+
+    def test_rebuilt_from_key(self):
+        """Test a position built from a key has the same candidates."""
+        rng = random.Random(2)
+        position = GomokuPosition()
+        for _ in range(30):
+            position.make(rng.choice(position.legal_moves()))
+        rebuilt = GomokuPosition(*position.key())
+        assert rebuilt.near == position.near
+        assert rebuilt.near_history == []
+
+    def test_candidates_stay_near_stones(self):
+        """Test only cells within two rows and columns of a stone are moves."""
+        position = GomokuPosition(1 << cell(0, 0))
+        assert sorted(position.legal_moves()) == sorted(
+            cell(row, col)
+            for row in range(3)
+            for col in range(3)
+            if (row, col) != (0, 0)
+        )
+
+    def test_engine_blocks_four(self):
+        """Test the engine takes the only cell that stops a four."""
+        o_bits = sum(1 << cell(7, col) for col in (4, 5, 6, 7))
+        x_bits = sum(
+            1 << cell(row, col) for row, col in ((7, 3), (0, 0), (0, 14), (14, 0))
+        )
+        position = GomokuPosition(x_bits, o_bits)
+        result = Engine().search(position, depth=2)
+        assert result.move == cell(7, 8)
+
+    def test_engine_wins(self):
+        """Test the engine completes five when it can."""
+        x_bits = sum(1 << cell(row, row) for row in range(3, 7))
+        o_bits = sum(1 << cell(0, col) for col in range(4))
+        position = GomokuPosition(x_bits, o_bits)
+        result = Engine().search(position, depth=2)
+        assert result.move in (cell(2, 2), cell(7, 7))
+        assert result.score == constants.ENGINE_WIN_SCORE - 1
+
+
+class TestGomokuGame:
+    """Test the game wrapper used by the game loop."""
+
+    def test_win_and_line(self):
+        """Test five in a column ends the game and is the winning line."""
+        game = GomokuGame()
+        for row in range(5):
+            game.make_move(row, 2)
+            if row < 4:
+                game.make_move(row, 3)
+        assert game.game_state == constants.GAME_WON
+        assert game.winner == constants.PLAYER_X
+        assert game.get_winning_line() == (
+            "cells",
+            sum(1 << cell(row, 2) for row in range(5)),
+        )
+        assert not game.make_move(10, 10)
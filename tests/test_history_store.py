@@ -0,0 +1,193 @@
+"""Tests for the game history store."""
+
+import sqlite3
+
+import pytest
+
+import src.constants as constants
+from src.history_store import DRAW, HistoryStore, RecordedGame, position_key
+from src.position import board_to_bits, parse_board
+
+X_WINS = [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]
+O_WINS = [(0, 1), (0, 0), (1, 1), (1, 0), (0, 2), (2, 0)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Open a history store in a temporary directory."""
+    store = HistoryStore(tmp_path / "history.db", flush_interval=0.01)
+    yield store
+    store.close()
+
+
+class TestRecording:
+    """Test queued writes."""
+
+    def test_record_and_flush(self, store):
+        """Test recorded games are visible after a flush."""
+        store.record_game(X_WINS, constants.PLAYER_X, "alice", "bob", finished_at=100.0)
+        store.flush()
+
+        (record,) = store.games_for_player("alice")
+        assert record.player_o == "bob"
+        assert record.outcome == constants.PLAYER_X
+        assert record.moves == 5
+        assert store.moves_of(record.id) == X_WINS
+
+    def test_batches_committed(self, tmp_path):
+        """Test many games are committed in few transactions."""
+        store = HistoryStore(tmp_path / "history.db", batch_size=50)
+        for index in range(120):
+            store.record_game(X_WINS, constants.PLAYER_X, f"p{index}")
+        store.close()
+
+        connection = sqlite3.connect(tmp_path / "history.db")
+        assert connection.execute("SELECT COUNT(*) FROM games").fetchone() == (120,)
+        assert connection.execute("SELECT COUNT(*) FROM moves").fetchone() == (600,)
+        connection.close()
+
+    def test_close_commits_pending_games(self, tmp_path):
+        """Test closing the store writes everything queued."""
+        store = HistoryStore(tmp_path / "history.db", flush_interval=60)
+        store.record_game(X_WINS, constants.PLAYER_X)
+        store.close()
+
+        reopened = HistoryStore(tmp_path / "history.db")
+        assert len(reopened.games_by_outcome(constants.PLAYER_X)) == 1
+        reopened.close()
+
+    def test_failed_batch_raises_in_flush(self, store):
+        """Test a failed insert is raised by flush and later games still commit."""
+        store.record_game(X_WINS, None)
+        with pytest.raises(sqlite3.IntegrityError):
+            store.flush()
+        store.record_game(X_WINS, constants.PLAYER_X)
+        store.flush()
+        assert len(store.games_by_outcome(constants.PLAYER_X)) == 1
+
+    def test_failed_batch_raises_in_close(self, tmp_path):
+        """Test close reports a failed insert instead of hanging."""
+        store = HistoryStore(tmp_path / "history.db", flush_interval=60)
+        store.record_game(X_WINS, None)
+        with pytest.raises(sqlite3.IntegrityError):
+            store.close()
+
+    def test_schema_has_indexes(self, store):
+        """Test the query columns are indexed."""
+        connection = sqlite3.connect(store.path)
+        indexes = {
+            row[0]
+            for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        connection.close()
+        assert {
+            "games_player_x",
+            "games_player_o",
+            "games_outcome",
+            "games_finished_at",
+            "moves_position",
+        } <= indexes
+
+
+class TestQueries:
+    """Test query helpers."""
+
+    def test_games_by_outcome(self, store):
+        """Test filtering by outcome."""
+        store.record_game(X_WINS, constants.PLAYER_X)
+        store.record_game(O_WINS, constants.PLAYER_O)
+        store.record_game(X_WINS, constants.PLAYER_X)
+        store.flush()
+
+        assert len(store.games_by_outcome(constants.PLAYER_X)) == 2
+        assert len(store.games_by_outcome(constants.PLAYER_O)) == 1
+        assert store.games_by_outcome(DRAW) == []
+
+    def test_games_between(self, store):
+        """Test filtering by finish time."""
+        for finished_at in (10.0, 20.0, 30.0):
+            store.record_game(X_WINS, constants.PLAYER_X, finished_at=finished_at)
+        store.flush()
+
+        assert [g.finished_at for g in store.games_between(15.0, 30.0)] == [20.0]
+
+    def test_games_reaching_position(self, store):
+        """Test position lookup finds games through the index."""
+        store.record_game(X_WINS, constants.PLAYER_X)
+        store.record_game(O_WINS, constants.PLAYER_O)
+        store.flush()
+
+        reached = store.games_reaching(parse_board("xx.o....."))
+        assert [game.outcome for game in reached] == [constants.PLAYER_X]
+        assert store.games_reaching(parse_board("o........")) == []
+
+    def test_games_reaching_symmetric_position(self, store):
+        """Test rotated positions match the same games."""
+        store.record_game(X_WINS, constants.PLAYER_X)
+        store.flush()
+        assert len(store.games_reaching(parse_board("xo.x....."))) == 1
+
+    def test_position_key_uses_index(self, store):
+        """Test the position query is answered from the index."""
+        connection = sqlite3.connect(store.path)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT game_id FROM moves WHERE position = ?", (1,)
+        ).fetchall()
+        connection.close()
+        assert "moves_position" in " ".join(str(row) for row in plan)
+
+    def test_position_key_symmetric(self):
+        """Test symmetric positions share a key."""
+        assert position_key(*board_to_bits(parse_board("x........"))) == position_key(
+            *board_to_bits(parse_board("........x"))
+        )
+
+
+class TestRecordedGame:
+    """Test games recorded as they are played."""
+
+    def test_finished_game_recorded(self, store):
+        """Test a game is stored when it ends."""
+        recorded = RecordedGame(store, "alice", "bob")
+        for row, col in X_WINS:
+            assert recorded.make_move(row, col) is True
+        store.flush()
+
+        (record,) = store.games_for_player("bob")
+        assert record.outcome == constants.PLAYER_X
+        assert store.moves_of(record.id) == X_WINS
+
+    def test_invalid_move_not_recorded(self, store):
+        """Test rejected moves are not added to the move list."""
+        recorded = RecordedGame(store)
+        recorded.make_move(0, 0)
+        assert recorded.make_move(0, 0) is False
+        assert recorded.moves == [(0, 0)]
+
+    def test_draw_recorded(self, store):
+        """Test a drawn game is stored as a draw."""
+        recorded = RecordedGame(store)
+        for row, col in [
+            (0, 0),
+            (0, 1),
+            (0, 2),
+            (1, 0),
+            (1, 2),
+            (1, 1),
+            (2, 0),
+            (2, 2),
+            (2, 1),
+        ]:
+            recorded.make_move(row, col)
+        store.flush()
+        assert len(store.games_by_outcome(DRAW)) == 1
+
+    def test_reset_starts_new_move_list(self, store):
+        """Test resetting clears the recorded moves."""
+        recorded = RecordedGame(store)
+        recorded.make_move(0, 0)
+        recorded.reset_game()
+        assert recorded.moves == []
+        assert recorded.game.board[0][0] is None
@@ -0,0 +1,173 @@
+"""Tests for the best-move HTTP API."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+import src.constants as constants
+from src.http_api import BestMoveServer
+
+
+@pytest.fixture
+def api():
+    """Run the API on a free port in a background thread."""
+    server = BestMoveServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def connection(api):
+    """Open a persistent connection to the API."""
+    connection = http.client.HTTPConnection(
+        "127.0.0.1", api.server_address[1], timeout=5
+    )
+    yield connection
+    connection.close()
+
+
+def post(connection, payload):
+    """POST a JSON payload and return (status, decoded body)."""
+    connection.request(
+        "POST",
+        "/best-move",
+        body=json.dumps(payload),
+        headers={"Content-Type": "application/json"},
+    )
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def get(connection, path):
+    """GET a path and return (status, decoded body)."""
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+class TestSingleBoard:
+    """Test single-board requests."""
+
+    def test_board_layout(self, connection, game_with_moves):
+        """Test a board in the TicTacToe.board layout is answered."""
+        status, body = post(connection, {"board": game_with_moves.board})
+        assert status == 200
+        assert body["to_move"] == constants.PLAYER_O
+        assert body["best_move"] == [0, 2]
+        assert body["evaluation"] == "draw"
+        assert body["winning_line"] is None
+
+    def test_compact_string(self, connection):
+        """Test a compact board string is answered."""
+        status, body = post(connection, {"board": "xx.oo...."})
+        assert status == 200
+        assert body["best_move"] == [0, 2]
+        assert body["evaluation"] == "win"
+
+    def test_get_compact_string(self, connection):
+        """Test GET with a board query parameter."""
+        status, body = get(connection, "/best-move?board=xx.oo....")
+        assert status == 200
+        assert body["best_move"] == [0, 2]
+
+    def test_finished_board_reports_line(self, connection, winning_game_x):
+        """Test the winning line of a finished board is returned."""
+        status, body = post(connection, {"board": winning_game_x.board})
+        assert status == 200
+        assert body["best_move"] is None
+        assert body["evaluation"] == "loss"
+        assert body["winning_line"] == [[0, 0], [0, 1], [0, 2]]
+
+
+class TestBatchAndKeepAlive:
+    """Test batched requests over one connection."""
+
+    def test_batch(self, connection):
+        """Test many boards are answered in one request, in order."""
+        boards = [
+            "xx.oo....",
+            ".........",
+            [["o", "o", None], ["x", "x", None], ["x", None, None]],
+        ]
+        status, body = post(connection, {"boards": boards})
+        assert status == 200
+        assert [r["evaluation"] for r in body["results"]] == ["win", "draw", "win"]
+        assert body["results"][2]["best_move"] == [0, 2]
+
+    def test_connection_reused(self, connection):
+        """Test several requests share one connection."""
+        for _ in range(5):
+            status, _ = post(connection, {"board": "........."})
+            assert status == 200
+        assert connection.sock is not None
+
+    def test_stats_count_cache_hits(self, connection):
+        """Test repeated symmetric boards hit the cache."""
+        post(connection, {"boards": ["x........", "..x......", "......x.."]})
+        status, body = get(connection, "/stats")
+        assert status == 200
+        assert body["hits"] == 2
+        assert body["misses"] == 1
+
+
+class TestErrors:
+    """Test malformed requests."""
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {},
+            {"board": "xxx"},
+            {"board": 5},
+            {"board": "xxx......"},
+            {"boards": ["..", "........."]},
+            [1],
+        ],
+    )
+    def test_bad_request(self, connection, payload):
+        """Test invalid payloads return 400 with an error message."""
+        status, body = post(connection, payload)
+        assert status == 400
+        assert "error" in body
+
+    def test_invalid_cell(self, connection):
+        """Test unknown cell values are rejected."""
+        status, _ = post(connection, {"board": [["z", None, None]] + [[None] * 3] * 2})
+        assert status == 400
+
+    def test_invalid_json(self, connection):
+        """Test a body that is not JSON is rejected."""
+        connection.request("POST", "/best-move", body=b"{nope")
+        response = connection.getresponse()
+        assert response.status == 400
+        response.read()
+
+    @pytest.mark.parametrize(
+        ("length", "body", "status"),
+        [
+            ("abc", b"{}", 400),
+            ("-1", b"{}", 400),
+            ("2", b"\xff\xfe", 400),
+            (str(constants.API_MAX_BODY_BYTES + 1), b"{}", 413),
+        ],
+    )
+    def test_rejected_body_closes_connection(self, connection, length, body, status):
+        """Test a bad length or undecodable body is rejected and the connection closed."""
+        connection.putrequest("POST", "/best-move")
+        connection.putheader("Content-Length", length)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        assert response.status == status
+        assert response.getheader("Connection") == "close"
+        assert "error" in json.loads(response.read())
+        assert response.will_close
+
+    def test_unknown_path(self, connection):
+        """Test unknown paths return 404."""
+        status, _ = get(connection, "/nope")
+        assert status == 404
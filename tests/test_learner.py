@@ -0,0 +1,97 @@
+"""Tests for the learner module."""
+
+import numpy as np
+import pytest
+
+import src.constants as constants
+from src.environment import VectorEnv
+from src.learner import TabularLearner
+
+
+@pytest.fixture(scope="module")
+def trained():
+    """Train a learner once for the tests that need a strong policy."""
+    learner = TabularLearner()
+    learner.train(150_000, seed=1)
+    return learner
+
+
+class TestAfterstateCodes:
+    """Test indexing afterstates by canonical code."""
+
+    def test_symmetric_moves_share_code(self):
+        """Test opening in any corner leads to the same entry."""
+        env = VectorEnv(1)
+        observations, _ = env.reset()
+        codes = TabularLearner().afterstate_codes(observations)[0]
+        assert codes[0] == codes[2] == codes[6] == codes[8]
+        assert codes[1] == codes[3] == codes[5] == codes[7]
+        assert len({codes[0], codes[1], codes[4]}) == 3
+
+    def test_codes_fit_table(self):
+        """Test codes index the value table."""
+        learner = TabularLearner()
+        env = VectorEnv(16)
+        observations, _ = env.reset()
+        codes = learner.afterstate_codes(observations)
+        assert codes.min() >= 0
+        assert codes.max() < len(learner.values)
+
+
+class TestTraining:
+    """Test self-play training."""
+
+    def test_report(self):
+        """Test the report counts games, steps and throughput."""
+        report = TabularLearner().train(2000, num_envs=256, seed=0)
+        assert report.games >= 2000
+        assert report.steps % 256 == 0
+        assert report.games_per_second > 0
+
+    def test_converges_to_perfect_play(self, trained):
+        """Test every reachable position gets a value-preserving move."""
+        assert trained.optimal_move_rate() == 1.0
+
+    @pytest.mark.parametrize("player", [constants.PLAYER_X, constants.PLAYER_O])
+    def test_never_loses_to_perfect_play(self, trained, player):
+        """Test the greedy policy holds the draw against the solver."""
+        result = trained.evaluate("perfect", 200, player, seed=0)
+        assert result.losses == 0
+        assert result.wins == 0
+
+    def test_beats_random_play(self, trained):
+        """Test the greedy policy wins most games against random moves."""
+        result = trained.evaluate("random", 500, seed=0)
+        assert result.losses == 0
+        assert result.wins > 450
+
+    def test_untrained_is_weaker(self):
+        """Test an untrained table does not play perfectly."""
+        assert TabularLearner().optimal_move_rate() < 1.0
+
+
+class TestPersistence:
+    """Test saving and memory-mapping value tables."""
+
+    def test_round_trip(self, trained, tmp_path):
+        """Test a loaded table is a read-only memory map of the saved one."""
+        path = tmp_path / "values.npy"
+        trained.save(path)
+        loaded = TabularLearner.load(path)
+        assert isinstance(loaded.values, np.memmap)
+        assert not loaded.values.flags.writeable
+        assert (loaded.values == trained.values).all()
+
+    def test_continue_training_in_place(self, tmp_path):
+        """Test training a table opened with mmap_mode r+ updates the file."""
+        path = tmp_path / "values.npy"
+        TabularLearner().save(path)
+        learner = TabularLearner.load(path, mmap_mode="r+")
+        learner.train(500, num_envs=64, seed=0)
+        learner.values.flush()
+        assert np.load(path).any()
+
+    def test_rejects_wrong_table_size(self):
+        """Test a table for another board is rejected."""
+        with pytest.raises(ValueError, match="entries"):
+            TabularLearner(values=np.zeros(10, dtype=np.float32))
@@ -0,0 +1,141 @@
+"""Tests for the line_game module shared by Qubic and five in a row."""
+
+import random
+
+import pytest
+
+import src.constants as constants
+from src.gomoku import GomokuGame, GomokuPosition
+from src.line_game import line_table
+from src.qubic import QubicGame, QubicPosition
+
+
+def naive_won(bits, lines):
+    """Check whether a bitboard fills any of the lines."""
+    return any(bits & line == line for line in lines)
+
+
+def naive_score(position):
+    """Score a position for the side to move by scanning every line."""
+    x_bits, o_bits = position.bits
+    score = 0
+    for line in position.table.lines:
+        x_count = (x_bits & line).bit_count()
+        o_count = (o_bits & line).bit_count()
+        if x_count and not o_count:
+            score += 10**x_count
+        elif o_count and not x_count:
+            score -= 10**o_count
+    return score if position.to_move == 0 else -score
+
+
+def naive_threats(position):
+    """Return the cells completing a line for each side, by scanning."""
+    mine = position.bits[position.to_move]
+    theirs = position.bits[position.to_move ^ 1]
+    empty = ~(mine | theirs)
+    short = position.table.length - 1
+    wins = blocks = 0
+    for line in position.table.lines:
+        if (mine & line).bit_count() == short and not theirs & line:
+            wins |= line & empty
+        if (theirs & line).bit_count() == short and not mine & line:
+            blocks |= line & empty
+    return wins, blocks
+
+
+class TestLineTable:
+    """Test the lookups built from a table of lines."""
+
+    def test_lookups(self):
+        """Test the lines through each cell, the line values and the full mask."""
+        table = line_table((0b0111, 0b1110), 4)
+        assert table.cell_lines == ((0,), (0, 1), (0, 1), (1,))
+        assert table.length == 3
+        assert table.full == 0b1111
+        assert table.values[2][0] == 100
+        assert table.values[0][1] == -10
+        assert table.values[1][1] == 0
+
+
+@pytest.mark.parametrize(
+    ("position_class", "games"), [(QubicPosition, 100), (GomokuPosition, 10)]
+)
+class TestLinePosition:
+    """Test the line counters kept by make/unmake on every variant."""
+
+    def test_matches_naive_scan(self, position_class, games):
+        """Test wins, threats and scores agree with full scans move by move."""
+        rng = random.Random(0)
+        lines = position_class.table.lines
+        for _ in range(games):
+            position = position_class()
+            while True:
+                position.make(rng.choice(position.legal_moves()))
+                won = naive_won(position.bits[position.to_move ^ 1], lines)
+                assert position.last_move_won() == won
+                assert position.evaluate() == naive_score(position)
+                assert position.threats() == naive_threats(position)
+                if won or position.is_full():
+                    break
+
+    def test_unmake_restores(self, position_class, games):
+        """Test taking every move back restores the counters."""
+        rng = random.Random(1)
+        position = position_class()
+        states = []
+        while not position.last_move_won() and not position.is_full():
+            states.append(
+                (
+                    position.key(),
+                    [counts[:] for counts in position.counts],
+                    position.open_lines[:],
+                    position.score,
+                )
+            )
+            position.make(rng.choice(position.legal_moves()))
+        while states:
+            position.unmake()
+            key, counts, open_lines, score = states.pop()
+            assert position.key() == key
+            assert position.counts == counts
+            assert position.open_lines == open_lines
+            assert position.score == score
+        assert position.to_move == 0
+
+    def test_rebuilt_from_key(self, position_class, games):
+        """Test a position built from a key has the same counters."""
+        rng = random.Random(2)
+        position = position_class()
+        for _ in range(25):
+            position.make(rng.choice(position.legal_moves()))
+        rebuilt = position_class(*position.key())
+        assert rebuilt.counts == position.counts
+        assert rebuilt.open_lines == position.open_lines
+        assert rebuilt.evaluate() == position.evaluate()
+        assert rebuilt.to_move == position.to_move
+        assert not rebuilt.last_move_won()
+
+
+@pytest.mark.parametrize("game_class", [QubicGame, GomokuGame])
+class TestLineGame:
+    """Test the game wrapper used by the game loop on every variant."""
+
+    def test_moves_and_turns(self, game_class):
+        """Test moves switch players and occupied or outside cells are refused."""
+        game = game_class()
+        last = game.size - 1
+        assert game.make_move(0, last)
+        assert game.current_player == constants.PLAYER_O
+        assert game.board[0][last] == constants.PLAYER_X
+        assert not game.make_move(0, last)
+        assert not game.make_move(game.size, 0)
+
+    def test_reset(self, game_class):
+        """Test resetting returns to the empty board."""
+        game = game_class()
+        game.make_move(0, 0)
+        game.reset_game()
+        assert game.key() == (0, 0)
+        assert game.current_player == constants.PLAYER_X
+        assert game.get_winning_line() is None
@@ -0,0 +1,148 @@
+"""Tests for the load testing harness."""
+
+import random
+
+import pytest
+
+from src.game_logic import TicTacToe
+from src.load_test import (
+    LatencyHistogram,
+    LoadReport,
+    LoadTestConfig,
+    run_load_test,
+)
+
+
+class TestLatencyHistogram:
+    """Test latency recording and percentiles."""
+
+    def test_empty_histogram(self):
+        """Test percentiles of an empty histogram are zero."""
+        assert LatencyHistogram().percentile(99) == 0.0
+
+    def test_percentiles_are_close(self):
+        """Test percentiles are within the bucket resolution."""
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.02)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.02)
+        assert histogram.percentile(100) == histogram.max == 1.0
+
+    def test_sub_second_samples_not_overstated(self):
+        """Test short latencies land in the bucket at or just above them."""
+        histogram = LatencyHistogram()
+        histogram.record(0.005)
+        histogram.record(1.0)
+        assert 0.005 <= histogram.percentile(50) <= 0.005 * 1.01
+
+    def test_merge(self):
+        """Test merged histograms match one histogram of all samples."""
+        first, second, combined = (
+            LatencyHistogram(),
+            LatencyHistogram(),
+            LatencyHistogram(),
+        )
+        rng = random.Random(1)
+        for index in range(500):
+            sample = rng.expovariate(100)
+            (first if index % 2 else second).record(sample)
+            combined.record(sample)
+
+        first.merge(second)
+        assert first.count == combined.count
+        assert first.max == combined.max
+        assert first.percentile(90) == combined.percentile(90)
+
+
+class TestLoadReport:
+    """Test report aggregation."""
+
+    def test_merge_and_rates(self):
+        """Test merged reports add moves and errors."""
+        first, second = LoadReport(), LoadReport()
+        first.moves, first.elapsed = 90, 2.0
+        second.moves, second.elapsed = 10, 2.5
+        second.errors["move rejected"] = 100
+
+        first.merge(second)
+        assert first.moves == 100
+        assert first.elapsed == 2.5
+        assert first.moves_per_second == 40.0
+        assert first.error_rate == 0.5
+        assert "move rejected: 100" in first.summary()
+
+
+class TestLoadTestConfig:
+    """Test configuration and think-time sampling."""
+
+    def test_unknown_distribution(self):
+        """Test an unknown distribution is rejected."""
+        with pytest.raises(ValueError, match="distribution"):
+            LoadTestConfig(distribution="pareto")
+
+    @pytest.mark.parametrize("distribution", ["constant", "uniform", "exponential"])
+    def test_sampler_mean(self, distribution):
+        """Test think times average to the configured mean."""
+        config = LoadTestConfig(think_time=0.1, distribution=distribution)
+        sample = config.think_time_sampler(random.Random(0))
+        mean = sum(sample() for _ in range(20_000)) / 20_000
+        assert mean == pytest.approx(0.1, rel=0.05)
+
+
+class TestRunLoadTest:
+    """Test load runs against a local server."""
+
+    def test_clients_play_games(self, game_server):
+        """Test simulated clients make moves without errors."""
+        config = LoadTestConfig(
+            clients=20, duration=0.5, think_time=0.001, port=game_server.port
+        )
+        report = run_load_test(config)
+
+        assert report.moves > 0
+        assert report.games > 0
+        assert not report.errors
+        assert report.latency.count == report.moves
+
+    def test_multiple_processes(self, game_server):
+        """Test reports from several processes are merged."""
+        config = LoadTestConfig(
+            clients=10, duration=0.3, think_time=0.001, port=game_server.port
+        )
+        report = run_load_test(config, processes=2)
+        assert report.moves > 0
+        assert not report.errors
+
+    def test_connection_errors_counted(self):
+        """Test a missing server is reported as errors, not raised."""
+        config = LoadTestConfig(clients=3, duration=0.1, think_time=0.0, port=1)
+        report = run_load_test(config)
+        assert report.moves == 0
+        assert sum(report.errors.values()) == 3
+
+    def test_failing_client_counted(self, monkeypatch):
+        """Test an unexpected client error is counted instead of ending the run."""
+
+        class BrokenClient:
+            """Client whose replies cannot be decoded and whose close fails."""
+
+            def __init__(self):
+                self.game = TicTacToe()
+
+            @classmethod
+            async def connect(cls, *_args):
+                return cls()
+
+            async def make_move(self, _row, _col):
+                raise ValueError("corrupt snapshot payload")
+
+            async def close(self):
+                raise OSError("already closed")
+
+        monkeypatch.setattr("src.load_test.GameClient", BrokenClient)
+        config = LoadTestConfig(clients=3, duration=0.1, think_time=0.0, port=1)
+        report = run_load_test(config)
+        assert report.errors == {"client: ValueError": 3}
@@ -386,6 +386,302 @@ class TestGameIntegration:
         mock_ui.draw_board.assert_not_called()
 
 
+class TestAIOpponent:
+    """Test driving the background AI worker from the game loop."""
+
+    @patch('src.main.sys.exit')
+    @patch('src.main.AIWorker')
+    @patch('src.main.GameUI')
+    @patch('src.main.TicTacToe')
+    @patch('src.main.pygame.event.get')
+    @patch('src.main.QUIT', 1)  # Mock the QUIT constant
+    def test_no_worker_without_ai(self, mock_event_get, mock_tictactoe, mock_gameui, mock_worker, mock_exit):
+        """Test two-player games do not start a worker."""
+        mock_quit_event = Mock()
+        mock_quit_event.type = 1
+        mock_event_get.return_value = [mock_quit_event]
+
+        from src.main import main
+        main()
+
+        mock_worker.assert_not_called()
+
+    @patch('src.main.handle_mouse_click')
+    @patch('src.main.poll_ai')
+    @patch('src.main.sys.exit')
+    @patch('src.main.AIWorker')
+    @patch('src.main.GameUI')
+    @patch('src.main.TicTacToe')
+    @patch('src.main.pygame.event.get')
+    @patch('src.main.MOUSEBUTTONDOWN', 2)  # Mock the MOUSEBUTTONDOWN constant
+    @patch('src.main.QUIT', 1)  # Mock the QUIT constant
+    def test_ai_turn_ignores_clicks(self, mock_event_get, mock_tictactoe, mock_gameui, mock_worker, mock_exit, mock_poll, mock_handle_click):
+        """Test clicks are ignored while the computer is to move and the worker is closed."""
+        mock_game = Mock()
+        mock_game.current_player = constants.PLAYER_O
+        mock_tictactoe.return_value = mock_game
+
+        mock_mouse_event = Mock()
+        mock_mouse_event.type = 2
+        mock_mouse_event.pos = (100, 100)
+        mock_quit_event = Mock()
+        mock_quit_event.type = 1
+        mock_event_get.side_effect = [[mock_mouse_event], [mock_quit_event]]
+
+        from src.main import main
+        main(constants.PLAYER_O)
+
+        mock_handle_click.assert_not_called()
+        assert mock_poll.call_count == 2
+        mock_worker.return_value.close.assert_called_once()
+
+    def test_poll_requests_search_on_ai_turn(self):
+        """Test a search is requested for the current board."""
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        game = TicTacToe()
+        game.make_move(1, 1)
+        worker = Mock()
+        worker.pending = None
+        worker.poll.return_value = None
+
+        poll_ai(game, Mock(), worker, constants.PLAYER_O)
+
+        worker.request.assert_called_once_with(1 << 4, 0)
+
+    def test_poll_does_not_repeat_request(self):
+        """Test a search already in flight is not requested again."""
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        game = TicTacToe()
+        game.make_move(1, 1)
+        worker = Mock()
+        worker.pending = (1 << 4, 0)
+        worker.poll.return_value = None
+
+        poll_ai(game, Mock(), worker, constants.PLAYER_O)
+
+        worker.request.assert_not_called()
+
+    def test_poll_ponders_on_human_turn(self):
+        """Test the worker ponders while the human is to move."""
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        worker = Mock()
+        worker.pondering = None
+        poll_ai(TicTacToe(), Mock(), worker, constants.PLAYER_O)
+
+        worker.ponder.assert_called_once_with(0, 0)
+        worker.request.assert_not_called()
+
+    def test_poll_does_not_repeat_ponder(self):
+        """Test pondering already in flight is not restarted."""
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        worker = Mock()
+        worker.pondering = (0, 0)
+        poll_ai(TicTacToe(), Mock(), worker, constants.PLAYER_O)
+
+        worker.ponder.assert_not_called()
+
+    def test_poll_cancels_when_game_over(self, winning_game_x):
+        """Test a finished game cancels the work in flight."""
+        from src.main import poll_ai
+
+        worker = Mock()
+        poll_ai(winning_game_x, Mock(), worker, constants.PLAYER_O)
+
+        worker.cancel.assert_called_once()
+        worker.request.assert_not_called()
+        worker.ponder.assert_not_called()
+
+    def test_poll_draws_progress(self):
+        """Test progress reports redraw the thinking indicator."""
+        from src.ai_worker import AIUpdate
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        game = TicTacToe()
+        game.make_move(1, 1)
+        worker = Mock()
+        worker.pending = (1 << 4, 0)
+        worker.poll.return_value = AIUpdate(0.5, None, None)
+        mock_ui = Mock()
+
+        poll_ai(game, mock_ui, worker, constants.PLAYER_O)
+
+        mock_ui.draw_thinking.assert_called_once_with(0.5)
+        mock_ui.update_display.assert_called_once()
+
+    def test_poll_plays_result(self):
+        """Test the computer's move is played when the search ends."""
+        from src.ai_worker import AIUpdate
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        game = TicTacToe()
+        game.make_move(1, 1)
+        worker = Mock()
+        worker.pending = (1 << 4, 0)
+        worker.poll.return_value = AIUpdate(1.0, (0, 0), 0)
+        mock_ui = Mock()
+
+        poll_ai(game, mock_ui, worker, constants.PLAYER_O)
+
+        assert game.board[0][0] == constants.PLAYER_O
+        assert game.current_player == constants.PLAYER_X
+        mock_ui.draw_symbols.assert_called_once_with(game)
+
+    def test_game_against_real_worker(self):
+        """Test the worker answers the game loop within a few frames."""
+        import time
+
+        from src.ai_worker import AIWorker
+        from src.main import poll_ai
+        from src.game_logic import TicTacToe
+
+        game = TicTacToe()
+        game.make_move(0, 0)
+        with AIWorker() as worker:
+            deadline = time.monotonic() + 10
+            while game.current_player == constants.PLAYER_O and time.monotonic() < deadline:
+                poll_ai(game, Mock(), worker, constants.PLAYER_O)
+                time.sleep(0.001)
+
+        # The only move that does not lose to a corner opening is the centre
+        assert game.board[1][1] == constants.PLAYER_O
+
+
+class TestUltimateVariant:
+    """Test playing ultimate tic-tac-toe through the game loop."""
+
+    @patch('src.main.sys.exit')
+    @patch('src.main.AIWorker')
+    @patch('src.main.GameUI')
+    @patch('src.main.pygame.event.get')
+    @patch('src.main.QUIT', 1)  # Mock the QUIT constant
+    def test_main_builds_ultimate_components(self, mock_event_get, mock_gameui, mock_worker, mock_exit):
+        """Test the ultimate variant uses a 9 x 9 UI and its own positions."""
+        from src.main import ULTIMATE, main
+
+        mock_quit_event = Mock()
+        mock_quit_event.type = 1
+        mock_event_get.return_value = [mock_quit_event]
+
+        main(constants.PLAYER_O, ULTIMATE)
+
+        mock_gameui.assert_called_once_with(9, 3)
+        assert mock_worker.call_args.kwargs["variant"].__name__ == "UltimatePosition"
+
+    def test_poll_requests_ultimate_key(self):
+        """Test the search request carries the board the player is sent to."""
+        from src.main import poll_ai
+        from src.ultimate import UltimateGame
+
+        game = UltimateGame()
+        game.make_move(0, 2)
+        worker = Mock()
+        worker.pending = None
+        worker.poll.return_value = None
+
+        poll_ai(game, Mock(), worker, constants.PLAYER_O)
+
+        worker.request.assert_called_once_with(1 << 2, 0, 2)
+
+
+class TestQubicVariant:
+    """Test playing Qubic through the game loop."""
+
+    @patch('src.main.sys.exit')
+    @patch('src.main.AIWorker')
+    @patch('src.main.GameUI')
+    @patch('src.main.pygame.event.get')
+    @patch('src.main.QUIT', 1)  # Mock the QUIT constant
+    def test_main_builds_qubic_components(self, mock_event_get, mock_gameui, mock_worker, mock_exit):
+        """Test the Qubic variant draws its layers and uses its own positions."""
+        from src.main import QUBIC, main
+
+        mock_quit_event = Mock()
+        mock_quit_event.type = 1
+        mock_event_get.return_value = [mock_quit_event]
+
+        main(constants.PLAYER_O, QUBIC)
+
+        mock_gameui.assert_called_once_with(8, 4, layered=True)
+        assert mock_worker.call_args.kwargs["variant"].__name__ == "QubicPosition"
+
+    def test_poll_requests_qubic_key(self):
+        """Test the search request carries both masks of the cube."""
+        from src.main import poll_ai
+        from src.qubic import QubicGame
+
+        game = QubicGame()
+        game.make_move(0, 1)
+        worker = Mock()
+        worker.pending = None
+        worker.poll.return_value = None
+
+        poll_ai(game, Mock(), worker, constants.PLAYER_O)
+
+        worker.request.assert_called_once_with(1 << 1, 0)
+
+
+class TestGomokuVariant:
+    """Test playing five in a row through the game loop."""
+
+    @patch('src.main.sys.exit')
+    @patch('src.main.AIWorker')
+    @patch('src.main.GameUI')
+    @patch('src.main.pygame.event.get')
+    @patch('src.main.QUIT', 1)  # Mock the QUIT constant
+    def test_main_builds_gomoku_components(self, mock_event_get, mock_gameui, mock_worker, mock_exit):
+        """Test the gomoku variant shows part of the board and uses its own positions."""
+        from src.main import GOMOKU, main
+
+        mock_quit_event = Mock()
+        mock_quit_event.type = 1
+        mock_event_get.return_value = [mock_quit_event]
+
+        main(constants.PLAYER_O, GOMOKU)
+
+        mock_gameui.assert_called_once_with(15, 15, view=constants.GOMOKU_VIEW)
+        assert mock_worker.call_args.kwargs["variant"].__name__ == "GomokuPosition"
+        assert mock_worker.call_args.kwargs["depth"] == constants.GOMOKU_DEPTH
+
+    def test_arrow_keys_scroll_and_redraw(self):
+        """Test an arrow key scrolls the view and redraws the board."""
+        from src.gomoku import GomokuGame
+        from src.main import KEYDOWN, K_LEFT, handle_view_event
+
+        ui = Mock()
+        ui.scroll.return_value = True
+        event = Mock(type=KEYDOWN, key=K_LEFT)
+
+        handle_view_event(event, GomokuGame(), ui)
+
+        ui.scroll.assert_called_once_with(0, -1)
+        ui.draw_board.assert_called_once()
+        ui.update_display.assert_called_once()
+
+    def test_wheel_zooms_without_redraw_at_limit(self):
+        """Test the mouse wheel zooms and nothing is redrawn if the view is unchanged."""
+        from src.gomoku import GomokuGame
+        from src.main import MOUSEWHEEL, handle_view_event
+
+        ui = Mock()
+        ui.zoom.return_value = False
+        event = Mock(type=MOUSEWHEEL, y=-1)
+
+        handle_view_event(event, GomokuGame(), ui)
+
+        ui.zoom.assert_called_once_with(-1)
+        ui.draw_board.assert_not_called()
+
+
 class TestMainModuleImports:
     """Test main module imports and dependencies."""
 
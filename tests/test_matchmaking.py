@@ -0,0 +1,171 @@
+"""Tests for the matchmaking module."""
+
+import src.constants as constants
+from src.matchmaking import Matchmaker
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic wait times."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJoinAndLeave:
+    """Test queue membership."""
+
+    def test_join_increases_depth(self):
+        """Test joining adds players to the queue."""
+        matchmaker = Matchmaker()
+        assert matchmaker.join("alice") is True
+        assert matchmaker.join("bob") is True
+        assert matchmaker.queue_depth == 2
+
+    def test_duplicate_join_rejected(self):
+        """Test a waiting player cannot join twice."""
+        matchmaker = Matchmaker()
+        matchmaker.join("alice")
+        assert matchmaker.join("alice") is False
+        assert matchmaker.queue_depth == 1
+
+    def test_leave_removes_player(self):
+        """Test leaving withdraws a player from pairing."""
+        matchmaker = Matchmaker()
+        matchmaker.join("alice")
+        matchmaker.join("bob")
+        assert matchmaker.leave("alice") is True
+        assert matchmaker.leave("alice") is False
+        assert matchmaker.pair() == []
+        assert matchmaker.queue_depth == 1
+
+    def test_rejoin_after_leave(self):
+        """Test a player can rejoin after leaving."""
+        matchmaker = Matchmaker()
+        matchmaker.join("alice")
+        matchmaker.leave("alice")
+        matchmaker.join("alice")
+        matchmaker.join("bob")
+
+        matches = matchmaker.pair()
+        assert len(matches) == 1
+        assert {matches[0].player_x, matches[0].player_o} == {"alice", "bob"}
+
+
+class TestPairing:
+    """Test batched pairing."""
+
+    def test_pairs_start_fresh_games(self):
+        """Test each match gets a new active game."""
+        matchmaker = Matchmaker()
+        for player in range(4):
+            matchmaker.join(player)
+
+        matches = matchmaker.pair()
+        assert len(matches) == 2
+        assert matches[0].game is not matches[1].game
+        assert matches[0].match_id != matches[1].match_id
+        for match in matches:
+            assert match.game.game_state == constants.GAME_ACTIVE
+        assert matchmaker.queue_depth == 0
+
+    def test_longer_waiter_plays_x(self):
+        """Test the player who joined first moves first."""
+        clock = FakeClock()
+        matchmaker = Matchmaker(clock=clock)
+        matchmaker.join("early")
+        clock.now = 5.0
+        matchmaker.join("late")
+
+        (match,) = matchmaker.pair()
+        assert match.player_x == "early"
+        assert match.player_o == "late"
+
+    def test_pairs_by_rating(self):
+        """Test players are paired with similarly rated opponents."""
+        matchmaker = Matchmaker()
+        matchmaker.join("novice1", rating=800)
+        matchmaker.join("master1", rating=2400)
+        matchmaker.join("novice2", rating=820)
+        matchmaker.join("master2", rating=2390)
+
+        pairs = {frozenset((m.player_x, m.player_o)) for m in matchmaker.pair()}
+        assert pairs == {
+            frozenset(("novice1", "novice2")),
+            frozenset(("master1", "master2")),
+        }
+
+    def test_rating_gap_too_large(self):
+        """Test players too far apart in rating stay queued."""
+        matchmaker = Matchmaker(max_rating_gap=200)
+        matchmaker.join("novice", rating=800)
+        matchmaker.join("master", rating=2400)
+
+        assert matchmaker.pair() == []
+        assert matchmaker.queue_depth == 2
+
+    def test_adjacent_buckets_pair(self):
+        """Test leftovers pair across neighbouring rating buckets."""
+        matchmaker = Matchmaker(bucket_width=100, max_rating_gap=50)
+        matchmaker.join("a", rating=1490)
+        matchmaker.join("b", rating=1510)
+
+        assert len(matchmaker.pair()) == 1
+
+    def test_preferences_never_mix(self):
+        """Test players with different preferences are not paired."""
+        matchmaker = Matchmaker()
+        matchmaker.join("human", preference="human")
+        matchmaker.join("bot", preference="bot")
+        assert matchmaker.pair() == []
+
+        matchmaker.join("bot2", preference="bot")
+        (match,) = matchmaker.pair()
+        assert {match.player_x, match.player_o} == {"bot", "bot2"}
+
+    def test_max_matches_limits_batch(self):
+        """Test a batch stops at max_matches."""
+        matchmaker = Matchmaker()
+        for player in range(10):
+            matchmaker.join(player)
+
+        assert len(matchmaker.pair(max_matches=2)) == 2
+        assert matchmaker.queue_depth == 6
+        assert len(matchmaker.pair()) == 3
+
+    def test_large_burst(self):
+        """Test a burst of joins is fully paired in one batch."""
+        matchmaker = Matchmaker()
+        for player in range(20_000):
+            matchmaker.join(player, rating=1000 + player % 1000)
+
+        matches = matchmaker.pair()
+        assert len(matches) == 10_000
+        assert matchmaker.queue_depth == 0
+
+
+class TestMetrics:
+    """Test queue depth and wait-time metrics."""
+
+    def test_wait_metrics(self):
+        """Test average and max wait are recorded on pairing."""
+        clock = FakeClock()
+        matchmaker = Matchmaker(clock=clock)
+        matchmaker.join("a")
+        clock.now = 2.0
+        matchmaker.join("b")
+        clock.now = 4.0
+
+        assert matchmaker.oldest_wait() == 4.0
+        matchmaker.pair()
+
+        assert matchmaker.matches_made == 1
+        assert matchmaker.max_wait == 4.0
+        assert matchmaker.average_wait == 3.0
+        assert matchmaker.oldest_wait() == 0.0
+
+    def test_average_wait_without_matches(self):
+        """Test average wait is zero before any match."""
+        assert Matchmaker().average_wait == 0.0
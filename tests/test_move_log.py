@@ -0,0 +1,207 @@
+"""Tests for the move log module."""
+
+import os
+import stat
+import time
+
+import src.constants as constants
+from src.move_log import SNAPSHOT_FILE, MoveLog
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic commits."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def open_log(path, **kwargs):
+    """Open a log that only commits when told to."""
+    kwargs.setdefault("group_commit_interval", float("inf"))
+    return MoveLog(path, **kwargs)
+
+
+class TestJournaling:
+    """Test moves and resets are applied and journaled."""
+
+    def test_make_move_applies_to_game(self, tmp_path):
+        """Test moves update the live game."""
+        log = open_log(tmp_path)
+        assert log.make_move(1, 0, 0) is True
+        assert log.game(1).board[0][0] == constants.PLAYER_X
+        log.close()
+
+    def test_invalid_move_not_logged(self, tmp_path):
+        """Test rejected moves leave the log untouched."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        assert log.make_move(1, 0, 0) is False
+        log.close()
+        assert sum(f.stat().st_size for f in tmp_path.glob("*.log")) == 5
+
+    def test_records_buffered_until_commit(self, tmp_path):
+        """Test records reach disk only on group commit."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        assert sum(f.stat().st_size for f in tmp_path.glob("*.log")) == 0
+        log.flush()
+        assert sum(f.stat().st_size for f in tmp_path.glob("*.log")) == 5
+        log.close()
+
+    def test_commit_after_interval(self, tmp_path):
+        """Test an append commits once the interval has elapsed."""
+        clock = FakeClock()
+        log = MoveLog(tmp_path, group_commit_interval=0.01, clock=clock)
+        log.make_move(1, 0, 0)
+        clock.now = 0.02
+        log.make_move(1, 1, 1)
+        assert sum(f.stat().st_size for f in tmp_path.glob("*.log")) == 10
+        log.close()
+
+    def test_idle_records_committed(self, tmp_path):
+        """Test buffered records are committed without a further append."""
+        log = MoveLog(tmp_path, group_commit_interval=0.01)
+        log.make_move(1, 0, 0)
+        deadline = time.monotonic() + 5
+        while sum(f.stat().st_size for f in tmp_path.glob("*.log")) < 5:
+            assert time.monotonic() < deadline, "record was never committed"
+            time.sleep(0.005)
+        log.close()
+
+    def test_commit_after_byte_threshold(self, tmp_path):
+        """Test an append commits once enough bytes are buffered."""
+        log = open_log(tmp_path, group_commit_bytes=10)
+        log.make_move(1, 0, 0)
+        log.make_move(1, 1, 1)
+        assert sum(f.stat().st_size for f in tmp_path.glob("*.log")) == 10
+        log.close()
+
+
+class TestRecovery:
+    """Test rebuilding games after a restart."""
+
+    def test_recover_from_log(self, tmp_path):
+        """Test games are rebuilt by replaying the log."""
+        log = open_log(tmp_path)
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            log.make_move(7, row, col)
+        log.make_move(8, 2, 2)
+        log.close()
+
+        recovered = open_log(tmp_path)
+        assert recovered.game(7).winner == constants.PLAYER_X
+        assert recovered.game(8).board[2][2] == constants.PLAYER_X
+        assert recovered.game(8).current_player == constants.PLAYER_O
+        recovered.close()
+
+    def test_unflushed_records_lost(self, tmp_path):
+        """Test a crash loses only uncommitted records."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.flush()
+        log.make_move(1, 1, 1)
+
+        recovered = open_log(tmp_path)
+        assert recovered.game(1).board[0][0] == constants.PLAYER_X
+        assert recovered.game(1).board[1][1] is None
+        recovered.close()
+
+    def test_reset_replayed(self, tmp_path):
+        """Test resets are replayed in order."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.reset_game(1)
+        log.make_move(1, 2, 2)
+        log.close()
+
+        recovered = open_log(tmp_path)
+        assert recovered.game(1).board[0][0] is None
+        assert recovered.game(1).board[2][2] == constants.PLAYER_X
+        recovered.close()
+
+    def test_end_game_replayed(self, tmp_path):
+        """Test ended games are not recovered."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.make_move(2, 0, 0)
+        log.end_game(1)
+        log.close()
+
+        recovered = open_log(tmp_path)
+        assert set(recovered.games) == {2}
+        recovered.close()
+
+    def test_torn_record_ignored(self, tmp_path):
+        """Test a partially written final record is ignored."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.close()
+        (log_file,) = tmp_path.glob("*.log")
+        with log_file.open("ab") as file:
+            file.write(b"\x01\x00")
+
+        recovered = open_log(tmp_path)
+        assert recovered.game(1).board[0][0] == constants.PLAYER_X
+        recovered.close()
+
+    def test_recover_from_snapshot_and_tail(self, tmp_path):
+        """Test recovery combines the snapshot with the log tail."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.make_move(2, 1, 1)
+        log.snapshot()
+        log.make_move(1, 2, 2)
+        log.close()
+
+        assert (tmp_path / SNAPSHOT_FILE).exists()
+        assert len(list(tmp_path.glob("*.log"))) == 1
+
+        recovered = open_log(tmp_path)
+        assert recovered.game(1).board[0][0] == constants.PLAYER_X
+        assert recovered.game(1).board[2][2] == constants.PLAYER_O
+        assert recovered.game(2).board[1][1] == constants.PLAYER_X
+        recovered.close()
+
+    def test_crash_before_snapshot_replace(self, tmp_path):
+        """Test logs from both generations replay if the snapshot was lost."""
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.snapshot()
+        log.make_move(1, 1, 1)
+        log.close()
+        (tmp_path / SNAPSHOT_FILE).unlink()
+        (tmp_path / "moves.00000000.log").write_bytes(b"\x01\x00\x00\x00\x00")
+
+        recovered = open_log(tmp_path)
+        assert recovered.game(1).board[0][0] == constants.PLAYER_X
+        assert recovered.game(1).board[1][1] == constants.PLAYER_O
+        recovered.close()
+
+    def test_snapshot_syncs_directory(self, tmp_path, monkeypatch):
+        """Test the directory is synced so the snapshot rename is durable."""
+        synced = []
+
+        def fsync(descriptor):
+            synced.append(stat.S_ISDIR(os.fstat(descriptor).st_mode))
+
+        monkeypatch.setattr("src.move_log.os.fsync", fsync)
+        log = open_log(tmp_path)
+        log.make_move(1, 0, 0)
+        log.snapshot()
+        log.close()
+        assert synced[-1] is True
+
+    def test_automatic_snapshot(self, tmp_path):
+        """Test a snapshot is taken after snapshot_records appends."""
+        log = open_log(tmp_path, snapshot_records=3)
+        for game_id in range(3):
+            log.make_move(game_id, 0, 0)
+        assert log.generation == 1
+        log.close()
+
+        recovered = open_log(tmp_path)
+        assert set(recovered.games) == {0, 1, 2}
+        recovered.close()
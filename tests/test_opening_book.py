@@ -0,0 +1,128 @@
+"""Tests for the opening_book module."""
+
+import random
+import time
+
+import pytest
+
+from src.ai_worker import AIWorker
+from src.opening_book import OpeningBook, generate_book, weigh_moves, write_book
+from src.position import Position, get_geometry
+
+
+@pytest.fixture(scope="module")
+def book_path(tmp_path_factory):
+    """Write an exact 3x3 book covering the first four plies."""
+    geometry = get_geometry()
+    path = tmp_path_factory.mktemp("book") / "3x3.book"
+    write_book(
+        path, generate_book(geometry, plies=4, depth=9, processes=2), geometry, 4
+    )
+    return path
+
+
+@pytest.fixture
+def book(book_path):
+    """Open the 3x3 book."""
+    with OpeningBook(book_path) as book:
+        yield book
+
+
+class TestWeighMoves:
+    """Test scoring and weighting the moves of a position."""
+
+    def test_only_best_moves_kept(self):
+        """Test losing moves are dropped from the book."""
+        moves = weigh_moves(Position(None, 1, 0), depth=8)
+        assert moves == [(4, 255)]
+
+    def test_equal_moves_share_weight(self):
+        """Test every drawing first move gets the full weight."""
+        moves = weigh_moves(Position(), depth=9)
+        assert sorted(moves) == [(cell, 255) for cell in range(9)]
+
+    def test_weights_fall_with_score(self):
+        """Test weaker moves within the margin weigh less."""
+        moves = weigh_moves(Position(get_geometry(5, 4)), depth=1, margin=1000)
+        weights = [weight for _, weight in moves]
+        assert weights[0] == 255
+        assert weights == sorted(weights, reverse=True)
+        assert weights[-1] < 255
+
+    def test_zero_margin_keeps_best_moves(self):
+        """Test a zero margin keeps only the best moves at the full weight."""
+        position = Position(get_geometry(5, 4))
+        moves = weigh_moves(position, depth=1, margin=0)
+        assert moves
+        assert all(weight == 255 for _, weight in moves)
+        assert len(moves) < len(weigh_moves(position, depth=1, margin=1000))
+
+    def test_negative_margin(self):
+        """Test a negative margin is rejected."""
+        with pytest.raises(ValueError, match="margin"):
+            weigh_moves(Position(), depth=1, margin=-1)
+
+
+class TestOpeningBook:
+    """Test book files and lookups."""
+
+    def test_covers_both_sides(self, book):
+        """Test the empty board and every first move are in the book."""
+        assert book.moves(0, 0)
+        for cell in range(9):
+            assert book.moves(1 << cell, 0)
+
+    def test_symmetric_lookup(self, book):
+        """Test a corner opening is answered in the centre from every corner."""
+        for corner in (0, 2, 6, 8):
+            assert book.choose(1 << corner, 0) == 4
+
+    def test_replies_to_book_moves_covered(self, book):
+        """Test every reply to a book move is answered from the book."""
+        position = Position()
+        for move, _ in book.moves(0, 0):
+            position.make(move)
+            for reply in position.legal_moves():
+                position.make(reply)
+                assert book.moves(*position.key())
+                position.unmake()
+            position.unmake()
+
+    def test_outside_book(self, book):
+        """Test positions past the covered plies are not answered."""
+        assert book.choose(0b000010011, 0b100000100) is None
+
+    def test_weighted_choice(self, book):
+        """Test a random choice only picks book moves."""
+        rng = random.Random(0)
+        choices = {book.choose(0, 0, rng) for _ in range(50)}
+        assert choices <= set(range(9))
+        assert len(choices) > 1
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test a file that is not a book is refused."""
+        path = tmp_path / "other.book"
+        path.write_bytes(b"\0" * 32)
+        with pytest.raises(ValueError, match="opening book"):
+            OpeningBook(path)
+
+
+class TestWorkerBook:
+    """Test the AI worker playing from a book."""
+
+    def test_book_move_without_search(self, book_path):
+        """Test a book position is answered at once with no progress."""
+        with AIWorker(book=book_path) as worker:
+            worker.request(1, 0)
+            deadline = time.monotonic() + 10.0
+            update = None
+            while update is None and time.monotonic() < deadline:
+                update = worker.poll()
+                time.sleep(0.001)
+        assert update is not None
+        assert update.move == (1, 1)
+
+    def test_rejects_book_for_other_board(self, book_path):
+        """Test the worker refuses a book for another board."""
+        with pytest.raises(ValueError, match="not 4x4"):
+            AIWorker(get_geometry(4), book=book_path)
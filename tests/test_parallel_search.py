@@ -0,0 +1,66 @@
+"""Tests for the parallel_search module."""
+
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from src.parallel_search import ParallelSearch, _work
+from src.position import Position, get_geometry, parse_board
+from src.solver import Solver
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Start a pool of three workers on a small shared table."""
+    with ParallelSearch(3, 0.125) as pool:
+        yield pool
+
+
+class TestParallelSearch:
+    """Test Lazy SMP search over a shared table."""
+
+    @pytest.mark.parametrize(
+        "board", ["xx.oo....", "x...o....", "xo.......", "........."]
+    )
+    def test_scores_match_solver(self, pool, board):
+        """Test the pool finds a move of the solved value."""
+        position = Position.from_board(parse_board(board))
+        result = pool.search(position, len(position.legal_moves()))
+        me, opponent = (
+            position.bits[position.to_move],
+            position.bits[1 - position.to_move],
+        )
+        scores = Solver(get_geometry()).move_scores(me, opponent)
+        best = max(scores.values())
+        assert (scores[result.move] > 0) == (best > 0)
+        assert (scores[result.move] < 0) == (best < 0)
+        assert (result.score > 0) == (best > 0)
+
+    def test_workers_fill_shared_table(self, pool):
+        """Test entries stored by worker processes reach the parent."""
+        pool.clear()
+        position = Position(get_geometry())
+        pool.search(position, 9)
+        assert any(pool.table.get((1 << cell, 0)) is not None for cell in range(9))
+
+    def test_answers_consecutive_searches(self, pool):
+        """Test stale results from stopped helpers are not returned."""
+        geometry = get_geometry(4)
+        for depth in (2, 3, 4):
+            result = pool.search(Position(geometry), depth)
+            assert result.depth >= depth
+            assert pool.helper in range(pool.workers)
+
+    @pytest.mark.parametrize(("index", "depth"), [(0, 3), (1, 4), (2, 3)])
+    def test_odd_helpers_search_one_ply_deeper(self, index, depth):
+        """Test every other helper answers with a search one ply deeper."""
+        jobs = queue.Queue()
+        results = queue.Queue()
+        jobs.put((1, Position(get_geometry(4)), 3))
+        jobs.put(None)
+
+        _work(index, {}, jobs, results, SimpleNamespace(value=1))
+
+        request_id, helper, result = results.get_nowait()
+        assert (request_id, helper, result.depth) == (1, index, depth)
@@ -0,0 +1,169 @@
+"""Tests for the position module."""
+
+import pytest
+
+import src.constants as constants
+from src.position import (
+    Geometry,
+    Position,
+    bits_to_board,
+    board_to_bits,
+    cells_of,
+    format_board,
+    get_geometry,
+    parse_board,
+)
+
+
+class TestGeometry:
+    """Test winning lines and symmetries."""
+
+    def test_standard_board_has_eight_lines(self):
+        """Test 3x3 three-in-a-row has rows, columns and two diagonals."""
+        assert len(Geometry(3, 3).lines) == 8
+
+    def test_line_count_for_larger_boards(self):
+        """Test line counts for k-in-a-row on larger boards."""
+        assert len(Geometry(4, 4).lines) == 10
+        assert len(Geometry(4, 3).lines) == 24
+        assert len(Geometry(15, 5).lines) == 572
+
+    def test_center_cell_lines(self):
+        """Test the centre of a 3x3 board is on four lines."""
+        assert len(Geometry(3, 3).cell_lines[4]) == 4
+
+    def test_wins_with(self):
+        """Test a completed line through the last move is detected."""
+        geometry = Geometry(3, 3)
+        assert geometry.wins_with(0b111, 2) is True
+        assert geometry.wins_with(0b011, 1) is False
+
+    def test_winning_line(self):
+        """Test the completed line mask is returned."""
+        geometry = Geometry(3, 3)
+        diagonal = 1 << 0 | 1 << 4 | 1 << 8
+        assert geometry.winning_line(diagonal | 1 << 1) == diagonal
+        assert geometry.winning_line(0b11) is None
+
+    def test_symmetries_are_permutations(self):
+        """Test each symmetry maps the cells one to one."""
+        geometry = Geometry(4, 4)
+        assert len(set(geometry.symmetries)) == 8
+        for symmetry in geometry.symmetries:
+            assert sorted(symmetry) == list(range(16))
+
+    def test_inverse_symmetries(self):
+        """Test applying a symmetry then its inverse is the identity."""
+        geometry = Geometry(3, 3)
+        for symmetry, inverse in zip(geometry.symmetries, geometry.inverse_symmetries):
+            for cell in range(9):
+                assert inverse[symmetry[cell]] == cell
+
+    def test_transform_matches_permutation(self):
+        """Test table-driven transforms match the cell permutation."""
+        geometry = Geometry(5, 4)
+        bits = 0b1011001110001011101
+        for index, symmetry in enumerate(geometry.symmetries):
+            expected = sum(1 << symmetry[c] for c in range(25) if bits >> c & 1)
+            assert geometry.transform(bits, index) == expected
+
+    def test_canonical_identifies_symmetric_positions(self):
+        """Test all corner openings share a canonical form."""
+        geometry = Geometry(3, 3)
+        corners = {geometry.canonical(1 << cell, 0)[:2] for cell in (0, 2, 6, 8)}
+        assert len(corners) == 1
+        assert geometry.canonical(1 << 4, 0)[:2] not in corners
+
+    def test_get_geometry_is_shared(self):
+        """Test geometries are cached and default to the game board."""
+        assert get_geometry() is get_geometry(constants.BOARD_SIZE)
+        assert get_geometry().win_length == constants.BOARD_SIZE
+
+
+class TestConversions:
+    """Test conversions between boards, bitboards and strings."""
+
+    def test_board_round_trip(self, sample_board_states):
+        """Test boards survive conversion to bitboards and back."""
+        for board in sample_board_states.values():
+            assert bits_to_board(*board_to_bits(board)) == board
+
+    def test_parse_board(self):
+        """Test compact strings parse to the board layout."""
+        assert parse_board("x.o-X_ ..") == [
+            ["x", None, "o"],
+            [None, "x", None],
+            [None, None, None],
+        ]
+
+    def test_format_board(self, sample_board_states):
+        """Test boards format to compact strings that parse back."""
+        board = sample_board_states["partial"]
+        assert format_board(board) == "x.o.x.o.."
+        assert parse_board(format_board(board)) == board
+
+    @pytest.mark.parametrize("text", ["", "x.o", "x.o.x.o.z"])
+    def test_parse_board_rejects_invalid(self, text):
+        """Test malformed strings are rejected."""
+        with pytest.raises(ValueError):
+            parse_board(text)
+
+    def test_cells_of(self):
+        """Test the set bits of a bitboard are listed in order across bytes."""
+        bits = 1 | 1 << 7 | 1 << 8 | 1 << 63
+        assert cells_of(bits) == [0, 7, 8, 63]
+        assert cells_of(0) == []
+
+
+class TestPosition:
+    """Test the make/unmake position used by the engine."""
+
+    def test_make_and_unmake(self):
+        """Test moves alternate sides and are taken back exactly."""
+        position = Position()
+        position.make(4)
+        position.make(0)
+        assert position.key() == (1 << 4, 1)
+        assert position.player == constants.PLAYER_X
+        position.unmake()
+        position.unmake()
+        assert position.key() == (0, 0)
+        assert position.history == []
+
+    def test_side_to_move_from_marks(self):
+        """Test the side to move follows the mark counts."""
+        assert Position(None, 1, 0).player == constants.PLAYER_O
+        assert Position(None, 1, 2).player == constants.PLAYER_X
+
+    def test_legal_moves(self):
+        """Test legal moves are the empty cells."""
+        position = Position.from_board(parse_board("xo.x....o"))
+        assert position.legal_moves() == [2, 4, 5, 6, 7]
+
+    def test_last_move_won(self):
+        """Test a completed line is detected after the move."""
+        position = Position.from_board(parse_board("xx.oo...."))
+        assert not position.last_move_won()
+        position.make(2)
+        assert position.last_move_won()
+
+    def test_is_full(self):
+        """Test a full board is detected."""
+        assert Position.from_board(parse_board("xoxxoooxx")).is_full()
+        assert not Position().is_full()
+
+    def test_evaluate_favours_open_lines(self):
+        """Test the side with more open lines scores higher."""
+        position = Position.from_board(parse_board("x........"))
+        assert position.evaluate() < 0
+        position.make(4)
+        assert position.evaluate() < 0
+        assert Position().evaluate() == 0
+
+    def test_threats(self):
+        """Test winning and blocking cells are found for the side to move."""
+        position = Position.from_board(parse_board("xx.oo...."))
+        wins, blocks = position.threats()
+        assert wins == 1 << 2
+        assert blocks == 1 << 5
+        assert Position().threats() == (0, 0)
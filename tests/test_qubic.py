@@ -0,0 +1,76 @@
+"""Tests for the qubic module."""
+
+import itertools
+
+import src.constants as constants
+from src.engine import Engine
+from src.qubic import LINES, QubicGame, QubicPosition, cell
+
+
+def naive_lines():
+    """Return every line of four points through the cube, by brute force."""
+    points = list(itertools.product(range(4), repeat=3))
+    lines = set()
+    for start in points:
+        for step in itertools.product((-1, 0, 1), repeat=3):
+            if step == (0, 0, 0):
+                continue
+            line = [tuple(s + d * k for s, d in zip(start, step)) for k in range(4)]
+            if all(0 <= value < 4 for point in line for value in point):
+                lines.add(frozenset(line))
+    return lines
+
+
+class TestQubicPosition:
+    """Test the cube's lines and play on them."""
+
+    def test_lines(self):
+        """Test the 76 lines are exactly the lines of four through the cube."""
+        expected = {sum(1 << cell(*point) for point in line) for line in naive_lines()}
+        assert len(LINES) == 76
+        assert set(LINES) == expected
+        assert all(line.bit_count() == 4 for line in LINES)
+
+    def test_space_diagonal_wins(self):
+        """Test a line through all four layers wins."""
+        position = QubicPosition()
+        for layer in range(3):
+            position.make(cell(layer, layer, 3 - layer))
+            position.make(cell(layer, 0, 0))
+            assert not position.last_move_won()
+        position.make(cell(3, 3, 0))
+        assert position.last_move_won()
+
+    def test_engine_blocks(self):
+        """Test the engine takes the cell that stops a pillar."""
+        x_bits = (1 << cell(0, 0, 0)) | (1 << cell(1, 1, 1)) | (1 << cell(2, 3, 0))
+        o_bits = sum(1 << cell(layer, 2, 2) for layer in range(3))
+        position = QubicPosition(x_bits, o_bits)
+        result = Engine().search(position, depth=2)
+        assert result.move == cell(3, 2, 2)
+
+    def test_engine_wins(self):
+        """Test the engine completes its own line when it can."""
+        x_bits = sum(1 << cell(1, 3, col) for col in range(3))
+        o_bits = sum(1 << cell(2, row, 0) for row in range(3))
+        position = QubicPosition(x_bits, o_bits)
+        result = Engine().search(position, depth=2)
+        assert result.move == cell(1, 3, 3)
+        assert result.score == constants.ENGINE_WIN_SCORE - 1
+
+
+class TestQubicGame:
+    """Test the game wrapper used by the game loop."""
+
+    def test_win_and_line(self):
+        """Test a line of cells across the layers ends the game."""
+        game = QubicGame()
+        for layer in range(4):
+            game.make_move(*divmod(cell(layer, 1, 2), 8))
+            if layer < 3:
+                game.make_move(*divmod(cell(layer, 0, 0), 8))
+        assert game.game_state == constants.GAME_WON
+        assert game.winner == constants.PLAYER_X
+        expected = sum(1 << cell(layer, 1, 2) for layer in range(4))
+        assert game.get_winning_line() == ("cells", expected)
+        assert not game.make_move(7, 7)
@@ -0,0 +1,66 @@
+"""Tests for the retrograde module."""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.dataset import reachable_positions
+from src.position import get_geometry
+from src.retrograde import UNREACHABLE, RetrogradeTable
+from src.solver import Solver
+
+
+@pytest.fixture(scope="module")
+def table():
+    """Solve the standard board once."""
+    return RetrogradeTable.solve()
+
+
+class TestRetrogradeTable:
+    """Test the dense retrograde value table."""
+
+    def test_solves_quickly(self):
+        """Test the 3x3 board is solved well under a second."""
+        start = time.perf_counter()
+        RetrogradeTable.solve()
+        assert time.perf_counter() - start < 1.0
+
+    def test_matches_solver(self, table):
+        """Test every reachable position scores exactly as the solver does."""
+        solver = Solver()
+        for x_bits, o_bits in reachable_positions():
+            me, opponent = (
+                (x_bits, o_bits)
+                if x_bits.bit_count() == o_bits.bit_count()
+                else (o_bits, x_bits)
+            )
+            assert table.move_scores(x_bits, o_bits) == solver.move_scores(me, opponent)
+
+    def test_terminal_scores(self, table):
+        """Test finished games score from the side to move."""
+        assert table.score(0b000000111, 0b000011000) == -5
+        assert table.score(0b101011010, 0b010100101) == 0
+        assert table.score(0, 0) == 0
+
+    def test_unreachable_codes(self, table):
+        """Test impossible boards are marked."""
+        assert table.score(0, 1) == UNREACHABLE
+        assert table.score(0b000000111, 0b000111000) == UNREACHABLE
+
+    def test_encode(self, table):
+        """Test cells are base-3 digits, X as 1 and O as 2."""
+        assert table.encode(0b1, 0b10) == 1 + 2 * 3
+
+    def test_save_and_map(self, table, tmp_path):
+        """Test a saved table can be memory-mapped back."""
+        path = tmp_path / "values.npy"
+        table.save(path)
+        loaded = RetrogradeTable.load(path)
+        assert isinstance(loaded.values, np.memmap)
+        assert (loaded.values == table.values).all()
+
+    def test_rejects_wrong_size(self):
+        """Test the table must cover every code of the geometry."""
+        with pytest.raises(ValueError, match="entries"):
+            RetrogradeTable(get_geometry(4), np.zeros(3**9, dtype=np.int8))
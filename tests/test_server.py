@@ -0,0 +1,284 @@
+"""Tests for the sharded game server and its client."""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import src.constants as constants
+from src.client import GameClient
+from src.move_log import MoveLog
+from src.server import ShardedServer, ShardWorker, shard_for
+
+
+def run(coroutine):
+    """Run a coroutine with a timeout so a hung server fails the test."""
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+def listening_inodes(port):
+    """Return the socket inodes listening on a TCP port, from /proc/net."""
+    inodes = set()
+    for table in ("tcp", "tcp6"):
+        path = Path("/proc/net") / table
+        if not path.exists():
+            continue
+        for line in path.read_text().splitlines()[1:]:
+            fields = line.split()
+            if int(fields[1].rsplit(":", 1)[1], 16) == port and fields[3] == "0A":
+                inodes.add(fields[9])
+    return inodes
+
+
+def held_listeners(pid, inodes):
+    """Count the listening sockets among a process's open files."""
+    fd_directory = Path(f"/proc/{pid}/fd")
+    held = 0
+    for fd in fd_directory.iterdir():
+        try:
+            target = os.readlink(fd)
+        except OSError:
+            continue
+        held += target.startswith("socket:[") and target[8:-1] in inodes
+    return held
+
+
+class TestSharding:
+    """Test game-to-shard assignment."""
+
+    def test_shard_for_is_stable(self):
+        """Test a game always maps to the same shard."""
+        assert shard_for(5, 4) == shard_for(5, 4) == 1
+
+    def test_shard_for_covers_all_shards(self):
+        """Test consecutive games spread across every shard."""
+        assert {shard_for(game_id, 4) for game_id in range(8)} == {0, 1, 2, 3}
+
+
+class TestServer:
+    """Test the server end to end over localhost."""
+
+    def test_new_game_snapshot(self, game_server):
+        """Test connecting returns an empty game."""
+
+        async def scenario():
+            client = await GameClient.connect(1, port=game_server.port)
+            await client.close()
+            return client.game
+
+        game = run(scenario())
+        assert game.game_state == constants.GAME_ACTIVE
+        assert all(cell is None for row in game.board for cell in row)
+
+    def test_moves_are_applied(self, game_server):
+        """Test a full game is played through the server."""
+
+        async def scenario():
+            client = await GameClient.connect(2, port=game_server.port)
+            for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+                game = await client.make_move(row, col)
+            await client.close()
+            return game
+
+        game = run(scenario())
+        assert game.game_state == constants.GAME_WON
+        assert game.winner == constants.PLAYER_X
+
+    def test_invalid_move_rejected(self, game_server):
+        """Test the server ignores a move on an occupied cell."""
+
+        async def scenario():
+            client = await GameClient.connect(3, port=game_server.port)
+            await client.make_move(1, 1)
+            game = await client.make_move(1, 1)
+            await client.close()
+            return game
+
+        game = run(scenario())
+        assert game.board[1][1] == constants.PLAYER_X
+        assert game.current_player == constants.PLAYER_O
+
+    def test_reset(self, game_server):
+        """Test a reset request clears the game."""
+
+        async def scenario():
+            client = await GameClient.connect(4, port=game_server.port)
+            await client.make_move(0, 0)
+            game = await client.reset_game()
+            await client.close()
+            return game
+
+        game = run(scenario())
+        assert game.board[0][0] is None
+
+    def test_finished_game_is_ended(self, game_server):
+        """Test the winning snapshot is sent and the next request starts anew."""
+
+        async def scenario():
+            client = await GameClient.connect(30, port=game_server.port)
+            for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+                await client.make_move(row, col)
+            winner = client.game.winner
+            await client.close()
+            client = await GameClient.connect(30, port=game_server.port)
+            await client.close()
+            return winner, client.game
+
+        winner, game = run(scenario())
+        assert winner == constants.PLAYER_X
+        assert game.board == [[None] * 3 for _ in range(3)]
+
+    def test_game_state_shared_across_connections(self, game_server):
+        """Test every connection to a game reaches the owning shard."""
+
+        async def scenario():
+            games = []
+            for game_id in (10, 11):
+                for row, col in [(0, 0), (1, 1), (2, 2)]:
+                    client = await GameClient.connect(game_id, port=game_server.port)
+                    await client.make_move(row, col)
+                    await client.close()
+                client = await GameClient.connect(game_id, port=game_server.port)
+                games.append(client.game)
+                await client.close()
+            return games
+
+        for game in run(scenario()):
+            assert game.board[0][0] == constants.PLAYER_X
+            assert game.board[1][1] == constants.PLAYER_O
+            assert game.board[2][2] == constants.PLAYER_X
+
+    def test_pipelined_requests(self, game_server):
+        """Test several requests in one write get one reply each."""
+
+        async def scenario():
+            client = await GameClient.connect(20, port=game_server.port)
+            client.writer.write(bytes([0, 4 | 0x80, 8]))
+            data = await client.reader.readexactly(3 * 4)
+            await client.close()
+            return data
+
+        from src.wire import decode_board
+
+        game = decode_board(run(scenario()), 8)
+        assert game.board[0][0] == constants.PLAYER_X
+        assert game.board[1][1] == constants.PLAYER_O
+        assert game.board[2][2] == constants.PLAYER_X
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+    def test_workers_hold_only_their_listener(self, game_server):
+        """Test each worker closes the listeners of the other shards."""
+        inodes = listening_inodes(game_server.port)
+        deadline = time.monotonic() + 5
+        while True:
+            held = [
+                held_listeners(process.pid, inodes) for process in game_server.processes
+            ]
+            if held == [1, 1] or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        assert held == [1, 1]
+
+
+class TestHandoff:
+    """Test handing a connection to the shard that owns its game."""
+
+    def test_waits_for_a_full_outbox(self):
+        """Test a handoff to a full outbox waits instead of blocking the loop."""
+        sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sender.setblocking(False)
+        receiver.setblocking(False)
+        worker = ShardWorker(1, None, None, [sender])
+        connection, peer = socket.socketpair()
+        with sender, receiver, connection, peer:
+            filled = 0
+            while True:
+                try:
+                    sender.send(b"x")
+                except BlockingIOError:
+                    break
+                filled += 1
+
+            async def scenario():
+                handoff = asyncio.create_task(
+                    worker._hand_off(0, b"hand", connection.fileno())
+                )
+                await asyncio.sleep(0.05)
+                assert not handoff.done()
+                for _ in range(filled):
+                    receiver.recv(1)
+                await handoff
+
+            run(scenario())
+            message, fds, _, _ = socket.recv_fds(receiver, 4, 1)
+            assert message == b"hand"
+            with socket.socket(fileno=fds[0]) as handed:
+                handed.sendall(b"ok")
+                assert peer.recv(2) == b"ok"
+
+
+class TestDurableServer:
+    """Test the server with per-shard move logs."""
+
+    def test_games_survive_restart(self, tmp_path):
+        """Test games are recovered from the logs after a restart."""
+
+        async def play(port):
+            client = await GameClient.connect(7, port=port)
+            await client.make_move(2, 0)
+            await client.close()
+
+        async def fetch(port):
+            client = await GameClient.connect(7, port=port)
+            await client.close()
+            return client.game
+
+        server = ShardedServer(port=0, workers=2, log_directory=tmp_path)
+        server.start()
+        try:
+            run(play(server.port))
+        finally:
+            server.stop()
+
+        server = ShardedServer(port=0, workers=2, log_directory=tmp_path)
+        server.start()
+        try:
+            game = run(fetch(server.port))
+        finally:
+            server.stop()
+        assert game.board[2][0] == constants.PLAYER_X
+
+    def test_finished_games_left_out_of_snapshots(self, tmp_path):
+        """Test finished and empty games are ended in the log."""
+
+        async def play(port):
+            client = await GameClient.connect(7, port=port)
+            for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+                await client.make_move(row, col)
+            await client.close()
+            client = await GameClient.connect(8, port=port)
+            await client.make_move(1, 1)
+            await client.close()
+            client = await GameClient.connect(9, port=port)
+            await client.close()
+
+        server = ShardedServer(port=0, workers=1, log_directory=tmp_path)
+        server.start()
+        try:
+            run(play(server.port))
+        finally:
+            server.stop()
+
+        log = MoveLog(tmp_path / "shard-0")
+        assert set(log.games) == {8}
+        log.snapshot()
+        log.close()
+
+        recovered = MoveLog(tmp_path / "shard-0")
+        assert set(recovered.games) == {8}
+        assert recovered.games[8].board[1][1] == constants.PLAYER_X
+        recovered.close()
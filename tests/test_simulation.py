@@ -0,0 +1,44 @@
+"""Tests for the simulation module."""
+
+import random
+
+from src.position import Position
+from src.simulation import (
+    VARIANTS,
+    engine_player,
+    play_game,
+    random_player,
+    simulate,
+)
+
+
+class TestSimulation:
+    """Test headless games between computer players."""
+
+    def test_random_game_ends(self):
+        """Test a game between random players reaches a result."""
+        rng = random.Random(0)
+        position = Position()
+        record = play_game(position, (random_player(rng), random_player(rng)))
+        assert position.last_move_won() == (record.winner is not None)
+        assert len(set(record.moves)) == len(record.moves)
+
+    def test_engines_draw(self):
+        """Test two exact engines draw the standard game."""
+        players = (engine_player(seconds=None), engine_player(seconds=None))
+        assert play_game(Position(), players).winner is None
+
+    def test_report_counts(self):
+        """Test the report adds up over a batch of games."""
+        rng = random.Random(1)
+        report = simulate(Position, (random_player(rng), random_player(rng)), 50)
+        assert report.x_wins + report.o_wins + report.draws == 50
+        assert report.moves >= 50 * 5
+        assert report.moves_per_second > 0
+
+    def test_every_variant_plays(self):
+        """Test an engine beats or draws a random player in every variant."""
+        for new_position, depth in VARIANTS.values():
+            players = (engine_player(depth, 0.01), random_player(random.Random(2)))
+            report = simulate(new_position, players, 1)
+            assert report.o_wins == 0
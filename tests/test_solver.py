@@ -0,0 +1,121 @@
+"""Tests for the solver module."""
+
+import pytest
+
+import src.constants as constants
+from src.position import Geometry, board_to_bits, parse_board
+from src.solver import Solver
+
+
+@pytest.fixture
+def solver():
+    """Create a solver for the standard board."""
+    return Solver()
+
+
+class TestSolveBoard:
+    """Test solving boards in the TicTacToe.board layout."""
+
+    def test_empty_board_is_draw(self, solver):
+        """Test perfect play from the start is a draw."""
+        solution = solver.solve_board(parse_board("........."))
+        assert solution.score == 0
+        assert solution.to_move == constants.PLAYER_X
+        assert solution.best_move is not None
+
+    def test_takes_immediate_win(self, solver):
+        """Test the side to move completes its line."""
+        solution = solver.solve_board(parse_board("xx.oo...."))
+        assert solution.best_move == (0, 2)
+        assert solution.score > 0
+
+    def test_blocks_opponent(self, solver):
+        """Test the side to move blocks a threat it cannot outrun."""
+        solution = solver.solve_board(parse_board("x...o...x"))
+        assert solution.to_move == constants.PLAYER_O
+        assert solution.best_move in {(0, 1), (1, 0), (1, 2), (2, 1)}
+        assert solution.score == 0
+
+    def test_prefers_quicker_win(self, solver):
+        """Test a win now beats a win later."""
+        solution = solver.solve_board(parse_board("x.xo.o..."))
+        assert solution.best_move == (0, 1)
+
+    def test_best_move_in_original_orientation(self, solver):
+        """Test the best move is mapped back through the symmetry."""
+        geometry = solver.geometry
+        x_bits, o_bits = 0b000011, 0b011000
+        for symmetry in geometry.symmetries:
+            x_image = sum(1 << symmetry[c] for c in range(9) if x_bits >> c & 1)
+            o_image = sum(1 << symmetry[c] for c in range(9) if o_bits >> c & 1)
+            solution = solver.solve(x_image, o_image)
+            assert solution.best_move == divmod(symmetry[2], 3)
+
+    def test_finished_game(self, solver, sample_board_states):
+        """Test a won board reports the loss and winning line."""
+        solution = solver.solve_board(sample_board_states["x_wins_row"])
+        assert solution.best_move is None
+        assert solution.score < 0
+        assert solution.winning_line == [(0, 0), (0, 1), (0, 2)]
+
+    def test_full_board_is_draw(self, solver, draw_game):
+        """Test a full board without a line is a draw."""
+        solution = solver.solve_board(draw_game.board)
+        assert solution.score == 0
+        assert solution.best_move is None
+
+    @pytest.mark.parametrize("text", ["xxx......", "oo.......", "xxxooo..."])
+    def test_rejects_unreachable_boards(self, solver, text):
+        """Test impossible boards are rejected."""
+        with pytest.raises(ValueError, match="reachable"):
+            solver.solve_board(parse_board(text))
+
+    @pytest.mark.parametrize(
+        ("text", "message"),
+        [("xxxoo.o..", "x has a line"), ("oooxx.x.x", "o has a line")],
+    )
+    def test_rejects_winner_that_did_not_move_last(self, solver, text, message):
+        """Test a line is only accepted from the player who moved last."""
+        with pytest.raises(ValueError, match=message):
+            solver.solve_board(parse_board(text))
+
+    def test_rejects_wrong_size(self, solver):
+        """Test boards of the wrong size are rejected."""
+        with pytest.raises(ValueError, match="3x3"):
+            solver.solve_board(parse_board("." * 16))
+
+
+class TestMoveScores:
+    """Test scoring every legal move."""
+
+    def test_scores_every_empty_cell(self, solver):
+        """Test each empty cell gets a score and the best matches solve."""
+        x_bits, o_bits = board_to_bits(parse_board("xx.oo...."))
+        scores = solver.move_scores(x_bits, o_bits)
+        assert sorted(scores) == [2, 5, 6, 7, 8]
+        assert max(scores, key=scores.get) == 2
+        assert scores[2] == solver.solve(x_bits, o_bits).score
+
+    def test_losing_moves_score_negative(self, solver):
+        """Test moves that ignore an immediate threat lose quickest."""
+        x_bits, o_bits = board_to_bits(parse_board("xx.o....."))
+        scores = solver.move_scores(o_bits, x_bits)
+        assert all(score < scores[2] for cell, score in scores.items() if cell != 2)
+        assert all(score < 0 for score in scores.values())
+
+
+class TestSolverCache:
+    """Test the root position cache."""
+
+    def test_symmetric_positions_share_cache_entry(self, solver):
+        """Test rotated positions hit the same cache entry."""
+        solver.solve_board(parse_board("x........"))
+        solver.solve_board(parse_board("..x......"))
+        hits, misses, _, _ = solver.cache_info()
+        assert (hits, misses) == (1, 1)
+
+    def test_larger_board_geometry(self):
+        """Test the solver handles other small geometries."""
+        solver = Solver(Geometry(4, 3))
+        solution = solver.solve_board(parse_board("xx..oo.........."))
+        assert solution.best_move in {(0, 2)}
@@ -0,0 +1,169 @@
+"""Tests for the spectator broadcast module."""
+
+import src.constants as constants
+from src.spectator import FRAME_DELTA, FRAME_SNAPSHOT, GameBroadcast, SpectatorView
+
+
+def deliver(subscriber, view):
+    """Apply every pending frame to a view, returning the frames."""
+    frames = subscriber.drain()
+    for frame in frames:
+        assert view.apply(frame) is True
+    return frames
+
+
+class TestSubscription:
+    """Test joining and leaving a broadcast."""
+
+    def test_late_joiner_gets_snapshot(self, game_instance):
+        """Test a new subscriber starts from a snapshot, not the history."""
+        broadcast = GameBroadcast(game_instance)
+        broadcast.make_move(0, 0)
+        broadcast.make_move(1, 1)
+
+        subscriber = broadcast.subscribe()
+        frames = subscriber.drain()
+        assert len(frames) == 1
+        assert frames[0][0] == FRAME_SNAPSHOT
+
+        view = SpectatorView()
+        view.apply(frames[0])
+        assert view.game.board == game_instance.board
+        assert view.sequence == broadcast.sequence
+
+    def test_unsubscribe_stops_updates(self, game_instance):
+        """Test a closed subscriber receives nothing further."""
+        broadcast = GameBroadcast(game_instance)
+        subscriber = broadcast.subscribe()
+        subscriber.drain()
+        subscriber.close()
+
+        broadcast.make_move(0, 0)
+        assert subscriber.drain() == []
+        assert not broadcast.subscribers
+
+
+class TestDeltas:
+    """Test move delta delivery."""
+
+    def test_deltas_follow_snapshot(self, game_instance):
+        """Test moves arrive as one-byte deltas after the snapshot."""
+        broadcast = GameBroadcast(game_instance)
+        subscriber = broadcast.subscribe()
+        view = SpectatorView()
+        deliver(subscriber, view)
+
+        broadcast.make_move(0, 0)
+        broadcast.make_move(2, 2)
+        frames = deliver(subscriber, view)
+
+        assert [frame[0] for frame in frames] == [FRAME_DELTA, FRAME_DELTA]
+        assert view.game.board == game_instance.board
+        assert view.game.current_player == constants.PLAYER_X
+
+    def test_frames_shared_between_subscribers(self, game_instance):
+        """Test a delta is encoded once and shared by every subscriber."""
+        broadcast = GameBroadcast(game_instance)
+        subscribers = [broadcast.subscribe() for _ in range(100)]
+        for subscriber in subscribers:
+            subscriber.drain()
+
+        broadcast.make_move(1, 1)
+        frames = [subscriber.drain()[0] for subscriber in subscribers]
+        assert all(frame is frames[0] for frame in frames)
+
+    def test_invalid_move_not_published(self, game_instance):
+        """Test rejected moves produce no frames."""
+        broadcast = GameBroadcast(game_instance)
+        subscriber = broadcast.subscribe()
+        subscriber.drain()
+
+        broadcast.make_move(0, 0)
+        assert broadcast.make_move(0, 0) is False
+        assert len(subscriber.drain()) == 1
+
+    def test_view_follows_game_to_win(self, game_instance):
+        """Test a spectator sees the game finish."""
+        broadcast = GameBroadcast(game_instance)
+        subscriber = broadcast.subscribe()
+        view = SpectatorView()
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            broadcast.make_move(row, col)
+            deliver(subscriber, view)
+
+        assert view.game.game_state == constants.GAME_WON
+        assert view.game.winner == constants.PLAYER_X
+
+
+class TestLagAndResync:
+    """Test bounded buffers and resynchronization."""
+
+    def test_overflow_triggers_resync(self, game_instance):
+        """Test a lagging subscriber drops deltas and gets a snapshot."""
+        broadcast = GameBroadcast(game_instance, buffer_size=2)
+        subscriber = broadcast.subscribe()
+        view = SpectatorView()
+        deliver(subscriber, view)
+
+        for row, col in [(0, 0), (1, 1), (2, 2), (0, 1)]:
+            broadcast.make_move(row, col)
+
+        assert subscriber.dropped == 2
+        frames = deliver(subscriber, view)
+        assert len(frames) == 1
+        assert frames[0][0] == FRAME_SNAPSHOT
+        assert view.game.board == game_instance.board
+
+    def test_fast_subscriber_unaffected_by_slow_one(self, game_instance):
+        """Test one lagging subscriber does not affect others."""
+        broadcast = GameBroadcast(game_instance, buffer_size=2)
+        slow = broadcast.subscribe()
+        fast = broadcast.subscribe()
+        slow.drain()
+        view = SpectatorView()
+        deliver(fast, view)
+
+        for row, col in [(0, 0), (1, 1), (2, 2)]:
+            broadcast.make_move(row, col)
+            deliver(fast, view)
+
+        assert slow.needs_resync is True
+        assert fast.dropped == 0
+        assert view.game.board == game_instance.board
+
+    def test_reset_resyncs_spectators(self, game_instance):
+        """Test resetting the game sends a fresh snapshot."""
+        broadcast = GameBroadcast(game_instance)
+        subscriber = broadcast.subscribe()
+        view = SpectatorView()
+        deliver(subscriber, view)
+        broadcast.make_move(0, 0)
+
+        broadcast.reset_game()
+        frames = deliver(subscriber, view)
+        assert len(frames) == 1
+        assert frames[0][0] == FRAME_SNAPSHOT
+        assert all(cell is None for row in view.game.board for cell in row)
+
+    def test_view_detects_sequence_gap(self, game_instance):
+        """Test a view rejects a delta that skips a sequence number."""
+        broadcast = GameBroadcast(game_instance)
+        subscriber = broadcast.subscribe()
+        view = SpectatorView()
+        deliver(subscriber, view)
+
+        broadcast.make_move(0, 0)
+        broadcast.make_move(1, 1)
+        frames = subscriber.drain()
+        assert view.apply(frames[1]) is False
+        assert view.sequence is None
+
+    def test_snapshot_cached_until_next_update(self, game_instance):
+        """Test late joiners share one snapshot until the game changes."""
+        broadcast = GameBroadcast(game_instance)
+        first = broadcast.subscribe().drain()[0]
+        second = broadcast.subscribe().drain()[0]
+        assert first is second
+
+        broadcast.make_move(0, 0)
+        assert broadcast.subscribe().drain()[0] is not first
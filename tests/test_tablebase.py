@@ -0,0 +1,149 @@
+"""Tests for the tablebase module."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.ai_worker import AIWorker
+from src.dataset import reachable_positions
+from src.engine import Engine
+from src.position import Position, get_geometry
+from src.retrograde import RetrogradeTable
+from src.solver import Solver
+from src.tablebase import (
+    Tablebase,
+    TablebaseSlice,
+    generate_tablebase,
+    rank,
+    rank_boards,
+    slice_entries,
+    slice_path,
+    unrank_boards,
+)
+
+
+@pytest.fixture(scope="module")
+def tablebase_3x3(tmp_path_factory):
+    """Generate the whole 3x3 tablebase in parallel, in small chunks."""
+    directory = tmp_path_factory.mktemp("tablebase-3x3")
+    generate_tablebase(directory, 3, processes=2, chunk_entries=100)
+    with Tablebase(directory) as tablebase:
+        yield tablebase
+
+
+@pytest.fixture(scope="module")
+def tablebase_4x4(tmp_path_factory):
+    """Generate the 4x4 slices with at least thirteen marks."""
+    directory = tmp_path_factory.mktemp("tablebase-4x4")
+    generate_tablebase(directory, 4, min_marks=13, processes=1)
+    with Tablebase(directory) as tablebase:
+        yield tablebase
+
+
+class TestIndexing:
+    """Test ranking boards within their slice."""
+
+    def test_round_trip(self):
+        """Test unranking then ranking returns every index of a slice."""
+        entries = slice_entries(16, 7)
+        indices = np.arange(entries, dtype=np.int64)
+        x_bits, o_bits = unrank_boards(indices, 16, 7)
+        assert (rank_boards(x_bits, o_bits, 16) == indices).all()
+        assert len(set(zip(x_bits.tolist(), o_bits.tolist(), strict=True))) == entries
+
+    def test_scalar_rank_matches(self):
+        """Test the scalar rank agrees with the vectorized one."""
+        x_bits, o_bits = unrank_boards(np.arange(0, 900_900, 997), 16, 8)
+        ranks = rank_boards(x_bits, o_bits, 16).tolist()
+        for x, o, expected in zip(x_bits.tolist(), o_bits.tolist(), ranks, strict=True):
+            assert rank(x, o, 16) == expected
+
+    def test_mark_counts(self):
+        """Test unranked boards have the slice's mark counts."""
+        x_bits, o_bits = unrank_boards(np.arange(slice_entries(9, 5)), 9, 5)
+        assert {int(x).bit_count() for x in x_bits} == {3}
+        assert {int(o).bit_count() for o in o_bits} == {2}
+        assert not (x_bits & o_bits).any()
+
+
+class TestTablebase:
+    """Test generating and reading tablebases."""
+
+    def test_matches_retrograde_table(self, tablebase_3x3):
+        """Test every reachable 3x3 board scores as in the dense table."""
+        table = RetrogradeTable.solve()
+        for x_bits, o_bits in reachable_positions():
+            assert tablebase_3x3.score(x_bits, o_bits) == table.score(x_bits, o_bits)
+
+    def test_slices_are_compressed(self, tablebase_3x3):
+        """Test one file per mark count, smaller than the raw scores."""
+        directory = tablebase_3x3.slices[9].path.parent
+        for marks in range(10):
+            path = slice_path(directory, marks)
+            with TablebaseSlice(path) as table:
+                assert table.entries == slice_entries(9, marks)
+        assert slice_path(directory, 4).stat().st_size < slice_entries(9, 4)
+
+    def test_partial_coverage(self, tablebase_4x4):
+        """Test boards with fewer marks than covered are not answered."""
+        assert tablebase_4x4.min_marks == 13
+        assert tablebase_4x4.score(0, 0) is None
+        assert tablebase_4x4.probe((0, 0)) is None
+
+    def test_matches_solver_on_larger_board(self, tablebase_4x4):
+        """Test covered 4x4 boards score exactly as the solver does."""
+        geometry = get_geometry(4)
+        solver = Solver(geometry)
+        rng = random.Random(0)
+        checked = 0
+        while checked < 50:
+            position = Position(geometry)
+            for _ in range(13):
+                position.make(rng.choice(position.legal_moves()))
+                if position.last_move_won():
+                    break
+            if position.last_move_won():
+                continue
+            x_bits, o_bits = position.key()
+            me, opponent = (
+                position.bits[position.to_move],
+                position.bits[1 - position.to_move],
+            )
+            expected = max(solver.move_scores(me, opponent).values())
+            assert tablebase_4x4.score(x_bits, o_bits) == expected
+            checked += 1
+
+    def test_page_cache(self, tablebase_4x4):
+        """Test repeated lookups are served from the page cache."""
+        x_bits, o_bits = unrank_boards(np.arange(3), 16, 13)
+        for _ in range(3):
+            for x, o in zip(x_bits.tolist(), o_bits.tolist(), strict=True):
+                tablebase_4x4.score(x, o)
+        hits, misses, _, _ = tablebase_4x4.cache_info()
+        assert hits >= 8
+        assert misses >= 1
+
+    def test_engine_consults_tablebase(self, tablebase_4x4):
+        """Test covered positions are scored without searching below them."""
+        geometry = get_geometry(4)
+        position = Position(geometry, 0b0000000001010101, 0b0000000010101010)
+        for cell in (8, 12, 9, 13):
+            position.make(cell)
+        plain = Engine().search(position)
+        fast = Engine(tablebase=tablebase_4x4).search(position)
+        assert fast.score == plain.score
+        assert fast.nodes < plain.nodes
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test a file that is not a slice is refused."""
+        path = slice_path(tmp_path, 3)
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError, match="tablebase slice"):
+            TablebaseSlice(path)
+
+    def test_worker_rejects_other_board(self, tmp_path):
+        """Test the AI worker refuses a tablebase for another board."""
+        generate_tablebase(tmp_path, 3, min_marks=8, processes=1)
+        with pytest.raises(ValueError, match="not 4x4"):
+            AIWorker(get_geometry(4), tablebase=tmp_path)
@@ -0,0 +1,112 @@
+"""Tests for the transposition module."""
+
+import random
+
+import pytest
+
+from src.engine import EXACT, LOWER, UPPER, Engine
+from src.position import Position, get_geometry
+from src.transposition import TranspositionTable, hash64
+
+TINY = 32 / (1 << 20)  # one bucket
+
+
+def same_bucket_keys(table, count):
+    """Return distinct keys that all hash to bucket 0."""
+    keys = []
+    key = 0
+    while len(keys) < count:
+        key += 1
+        if hash64((key, 0)) & (table.buckets - 1) == 0:
+            keys.append((key, 0))
+    return keys
+
+
+class TestTranspositionTable:
+    """Test the fixed-memory transposition table."""
+
+    def test_round_trip(self):
+        """Test stored entries come back unchanged."""
+        table = TranspositionTable(0.01)
+        table[(3, 5)] = (4, -1234, LOWER, 7)
+        table[(1, 2)] = (9, 1 << 30, EXACT, -1)
+        assert table.get((3, 5)) == (4, -1234, LOWER, 7)
+        assert table.get((1, 2)) == (9, 1 << 30, EXACT, -1)
+
+    def test_miss(self):
+        """Test unknown and cleared keys are misses."""
+        table = TranspositionTable(0.01)
+        assert table.get((0, 0)) is None
+        table[(0, 0)] = (1, 0, UPPER, 0)
+        table.clear()
+        assert table.get((0, 0)) is None
+
+    def test_size_from_megabytes(self):
+        """Test the table fills its budget with a power of two of buckets."""
+        assert TranspositionTable(1).entries == 1 << 16
+        assert TranspositionTable.nbytes(1.5) == 1 << 20
+        with pytest.raises(ValueError, match="budget"):
+            TranspositionTable(TINY / 2)
+
+    def test_torn_entry_is_a_miss(self):
+        """Test an entry whose words disagree is ignored."""
+        table = TranspositionTable(TINY)
+        table[(3, 5)] = (4, 10, EXACT, 2)
+        table._words[1] ^= 1
+        assert table.get((3, 5)) is None
+
+    def test_depth_preferred_entry_is_kept(self):
+        """Test a shallower position goes to the always-replace entry."""
+        table = TranspositionTable(TINY)
+        deep, shallow, newest = same_bucket_keys(table, 3)
+        table[deep] = (6, 1, EXACT, 0)
+        table[shallow] = (2, 2, EXACT, 0)
+        table[newest] = (1, 3, EXACT, 0)
+        assert table.get(deep) == (6, 1, EXACT, 0)
+        assert table.get(shallow) is None
+        assert table.get(newest) == (1, 3, EXACT, 0)
+
+    def test_deeper_search_takes_depth_preferred_entry(self):
+        """Test a search at least as deep replaces the depth-preferred entry."""
+        table = TranspositionTable(TINY)
+        first, second = same_bucket_keys(table, 2)
+        table[first] = (3, 1, EXACT, 0)
+        table[second] = (3, 2, EXACT, 0)
+        assert table.get(first) is None
+        assert table.get(second) == (3, 2, EXACT, 0)
+
+    def test_stats(self):
+        """Test hits, collisions and fill are counted."""
+        table = TranspositionTable(TINY)
+        keys = same_bucket_keys(table, 3)
+        for depth, key in zip((3, 2, 1), keys, strict=True):
+            table[key] = (depth, 0, EXACT, 0)
+        table.get(keys[0])
+        table.get(keys[1])
+        stats = table.stats()
+        assert (stats.probes, stats.hits, stats.stores) == (2, 1, 3)
+        assert stats.collisions == 1
+        assert stats.fill == 1.0
+        assert stats.hit_rate == 0.5
+        table.reset_stats()
+        assert table.stats().probes == 0
+
+    def test_shared_buffer(self):
+        """Test two tables over one buffer see each other's entries."""
+        buffer = memoryview(bytearray(TranspositionTable.nbytes(0.01)))
+        writer = TranspositionTable(0.01, buffer)
+        reader = TranspositionTable(0.01, buffer)
+        writer[(1, 0)] = (2, 3, EXACT, 4)
+        assert reader.get((1, 0)) == (2, 3, EXACT, 4)
+
+    def test_engine_scores_match_unbounded_table(self):
+        """Test a small table changes no search result."""
+        geometry = get_geometry(4)
+        rng = random.Random(0)
+        for _ in range(5):
+            position = Position(geometry)
+            for _ in range(6):
+                position.make(rng.choice(position.legal_moves()))
+            expected = Engine({}).search(position, 4).score
+            table = TranspositionTable(0.01)
+            assert Engine(table).search(position, 4).score == expected
@@ -0,0 +1,205 @@
+"""Tests for the ultimate module."""
+
+import random
+
+import src.constants as constants
+from src.engine import Engine
+from src.ultimate import ANY_BOARD, UltimateGame, UltimatePosition
+
+
+def cell(board, square):
+    """Return the grid cell of a square of a sub-board."""
+    board_row, board_col = divmod(board, 3)
+    row, col = divmod(square, 3)
+    return (board_row * 3 + row) * 9 + board_col * 3 + col
+
+
+def naive_winner(marks):
+    """Return the owner of a completed line of nine squares, or None."""
+    for a, b, c in (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6),
+        (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6),
+    ):  # fmt: skip
+        if marks[a] is not None and marks[a] == marks[b] == marks[c]:
+            return marks[a]
+    return None
+
+
+class NaiveGame:
+    """Ultimate tic-tac-toe from nine plain boards, to check the bitboards."""
+
+    def __init__(self):
+        """Start from the empty board."""
+        self.boards = [[None] * 9 for _ in range(9)]
+        self.forced = ANY_BOARD
+        self.player = 0
+
+    def closed(self, board):
+        """Check whether a sub-board is won or full."""
+        marks = self.boards[board]
+        return naive_winner(marks) is not None or None not in marks
+
+    def winner(self):
+        """Return the winner of the meta-board, or None."""
+        return naive_winner([naive_winner(marks) for marks in self.boards])
+
+    def legal_moves(self):
+        """Return the legal grid cells."""
+        if self.forced != ANY_BOARD and not self.closed(self.forced):
+            boards = [self.forced]
+        else:
+            boards = [board for board in range(9) if not self.closed(board)]
+        return sorted(
+            cell(board, square)
+            for board in boards
+            for square in range(9)
+            if self.boards[board][square] is None
+        )
+
+    def make(self, move):
+        """Play a grid cell."""
+        row, col = divmod(move, 9)
+        board = row // 3 * 3 + col // 3
+        square = row % 3 * 3 + col % 3
+        self.boards[board][square] = self.player
+        self.forced = square
+        self.player ^= 1
+
+
+class TestUltimatePosition:
+    """Test bitboard move generation, wins and make/unmake."""
+
+    def test_matches_naive_rules(self):
+        """Test random games agree with nine plain boards move by move."""
+        rng = random.Random(0)
+        for _ in range(200):
+            position = UltimatePosition()
+            naive = NaiveGame()
+            while True:
+                assert position.last_move_won() == (naive.winner() is not None)
+                moves = naive.legal_moves()
+                assert sorted(position.legal_moves()) == moves
+                if naive.winner() is not None:
+                    break
+                if not moves:
+                    assert position.is_full()
+                    break
+                move = rng.choice(moves)
+                position.make(move)
+                naive.make(move)
+
+    def test_unmake_restores(self):
+        """Test taking every move back returns to the earlier states."""
+        rng = random.Random(1)
+        position = UltimatePosition()
+        states = []
+        while not position.last_move_won() and not position.is_full():
+            states.append(
+                (position.key(), [row[:] for row in position.boards], position.closed)
+            )
+            position.make(rng.choice(position.legal_moves()))
+        while states:
+            position.unmake()
+            key, boards, closed = states.pop()
+            assert position.key() == key
+            assert position.boards == boards
+            assert position.closed == closed
+        assert position.meta == [0, 0]
+
+    def test_rebuilt_from_key(self):
+        """Test a position built from a key has the same boards."""
+        rng = random.Random(2)
+        position = UltimatePosition()
+        for _ in range(30):
+            position.make(rng.choice(position.legal_moves()))
+        rebuilt = UltimatePosition(*position.key())
+        assert rebuilt.boards == position.boards
+        assert rebuilt.meta == position.meta
+        assert rebuilt.closed == position.closed
+        assert rebuilt.to_move == position.to_move
+        assert sorted(rebuilt.legal_moves()) == sorted(position.legal_moves())
+
+    def test_send_rule(self):
+        """Test a move sends the opponent to the matching sub-board."""
+        position = UltimatePosition()
+        position.make(cell(4, 2))
+        assert position.forced == 2
+        assert sorted(position.legal_moves()) == [
+            cell(2, square) for square in range(9)
+        ]
+
+    def test_closed_board_frees_the_opponent(self):
+        """Test being sent to a won sub-board allows any open sub-board."""
+        x_bits = sum(1 << cell(0, square) for square in (0, 1, 2))
+        o_bits = (1 << cell(5, 0)) | (1 << cell(6, 0))
+        position = UltimatePosition(x_bits, o_bits, ANY_BOARD)
+        position.make(cell(3, 0))
+        assert position.forced == ANY_BOARD
+        moves = position.legal_moves()
+        assert cell(0, 4) not in moves
+        assert cell(8, 8) in moves
+
+    def test_threats(self):
+        """Test sub-board wins and blocks are found where play is allowed."""
+        x_bits = (1 << cell(4, 0)) | (1 << cell(4, 1))
+        o_bits = (1 << cell(4, 3)) | (1 << cell(4, 6))
+        position = UltimatePosition(x_bits, o_bits, 4)
+        wins, blocks = position.threats()
+        assert wins == 1 << cell(4, 2)
+        assert blocks == 0
+        position.forced = 0
+        assert position.threats() == (0, 0)
+
+    def test_engine_wins_the_game(self):
+        """Test the engine completes a line of sub-boards when it can."""
+        x_bits = sum(
+            1 << cell(board, square) for board in (0, 1) for square in (0, 1, 2)
+        )
+        x_bits |= (1 << cell(2, 0)) | (1 << cell(2, 1))
+        o_bits = (
+            sum(1 << cell(board, square) for board in (3, 6, 7) for square in (4, 5))
+            | (1 << cell(8, 0))
+            | (1 << cell(8, 1))
+        )
+        position = UltimatePosition(x_bits, o_bits, 2)
+        result = Engine().search(position, depth=2)
+        assert result.move == cell(2, 2)
+        assert result.score == constants.ENGINE_WIN_SCORE - 1
+
+
+class TestUltimateGame:
+    """Test the game wrapper used by the game loop."""
+
+    def test_moves_and_turns(self):
+        """Test legal moves switch players and illegal ones are refused."""
+        game = UltimateGame()
+        assert game.make_move(4, 4)
+        assert game.current_player == constants.PLAYER_O
+        assert game.board[4][4] == constants.PLAYER_X
+        # X played the centre square, so O must answer in the centre board
+        assert not game.make_move(0, 0)
+        assert game.make_move(3, 3)
+        assert not game.make_move(3, 3)
+        assert game.open_boards() == 1 << 0
+
+    def test_win_and_line(self):
+        """Test winning a line of sub-boards ends the game."""
+        game = UltimateGame()
+        rng = random.Random(3)
+        while game.game_state == constants.GAME_ACTIVE:
+            move = rng.choice(game.position.legal_moves())
+            assert game.make_move(*divmod(move, 9))
+        assert game.open_boards() == 0
+        if game.game_state == constants.GAME_WON:
+            assert game.get_winning_line() is not None
+            assert game.winner in game.board_winners()
+        else:
+            assert game.get_winning_line() is None
+
+    def test_reset(self):
+        """Test resetting returns to the empty board."""
+        game = UltimateGame()
+        game.make_move(0, 0)
+        game.reset_game()
+        assert game.position.key() == (0, 0, ANY_BOARD)
+        assert game.current_player == constants.PLAYER_X
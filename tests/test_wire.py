@@ -0,0 +1,136 @@
+"""Tests for the wire format module."""
+
+import json
+
+import pytest
+
+import src.constants as constants
+from src.wire import (
+    SNAPSHOT_SIZE,
+    decode_board,
+    decode_move,
+    encode_board,
+    encode_board_into,
+    encode_move,
+)
+
+
+class TestBoardEncoding:
+    """Test board snapshot encoding and decoding."""
+
+    def test_snapshot_is_compact(self, game_instance):
+        """Test a 3x3 snapshot fits in four bytes."""
+        data = encode_board(game_instance)
+        assert len(data) == SNAPSHOT_SIZE == 4
+        assert data[0] == constants.WIRE_VERSION
+
+    def test_snapshot_smaller_than_json(self, game_with_moves):
+        """Test the snapshot is far smaller than the JSON equivalent."""
+        as_json = json.dumps(
+            {
+                "board": game_with_moves.board,
+                "current_player": game_with_moves.current_player,
+                "game_state": game_with_moves.game_state,
+                "winner": game_with_moves.winner,
+            }
+        )
+        assert len(encode_board(game_with_moves)) * 10 < len(as_json)
+
+    @pytest.mark.parametrize(
+        "fixture_name",
+        [
+            "game_instance",
+            "game_with_moves",
+            "winning_game_x",
+            "winning_game_o",
+            "draw_game",
+        ],
+    )
+    def test_round_trip(self, request, fixture_name):
+        """Test decoding an encoded game restores every field."""
+        game = request.getfixturevalue(fixture_name)
+        decoded = decode_board(encode_board(game))
+
+        assert decoded.board == game.board
+        assert decoded.current_player == game.current_player
+        assert decoded.game_state == game.game_state
+        assert decoded.winner == game.winner
+
+    def test_decoded_game_is_playable(self, game_with_moves):
+        """Test a decoded game accepts further moves."""
+        decoded = decode_board(encode_board(game_with_moves))
+        assert decoded.make_move(2, 2) is True
+        assert decoded.board[2][2] == constants.PLAYER_O
+
+    def test_decoded_rows_are_independent(self, game_instance):
+        """Test decoded rows are separate mutable lists."""
+        decoded = decode_board(encode_board(game_instance))
+        decoded.board[0][0] = constants.PLAYER_X
+        assert decoded.board[1][0] is None
+
+    def test_decode_into_existing_game(self, winning_game_x, game_instance):
+        """Test decoding can overwrite an existing game in place."""
+        result = decode_board(encode_board(winning_game_x), game=game_instance)
+        assert result is game_instance
+        assert game_instance.winner == constants.PLAYER_X
+
+    def test_encode_into_buffer_at_offset(self, game_with_moves):
+        """Test encoding into a preallocated buffer."""
+        buffer = bytearray(2 + SNAPSHOT_SIZE)
+        end = encode_board_into(game_with_moves, memoryview(buffer), 2)
+
+        assert end == 2 + SNAPSHOT_SIZE
+        assert bytes(buffer[2:]) == encode_board(game_with_moves)
+
+    def test_decode_from_memoryview_offset(self, draw_game):
+        """Test decoding from a memoryview at an offset."""
+        data = memoryview(b"\x00" + encode_board(draw_game))
+        assert decode_board(data, 1).game_state == constants.GAME_DRAW
+
+    def test_rejects_unknown_version(self, game_instance):
+        """Test an unknown version byte is rejected."""
+        data = bytearray(encode_board(game_instance))
+        data[0] = constants.WIRE_VERSION + 1
+        with pytest.raises(ValueError, match="version"):
+            decode_board(data)
+
+    def test_rejects_truncated_snapshot(self, game_instance):
+        """Test a truncated snapshot is rejected."""
+        with pytest.raises(ValueError, match="bytes"):
+            decode_board(encode_board(game_instance)[:-1])
+
+    @pytest.mark.parametrize(
+        "packed",
+        [0xFFFFFF, 0b11 << 2, 0b11 << 19, 0b11 << 21],
+        ids=["all-ones", "cell", "state", "winner"],
+    )
+    def test_rejects_corrupt_payload(self, game_with_moves, packed):
+        """Test invalid cell, state or winner codes raise ValueError."""
+        data = bytes([constants.WIRE_VERSION]) + packed.to_bytes(3, "little")
+        before = encode_board(game_with_moves)
+        with pytest.raises(ValueError, match="corrupt"):
+            decode_board(data, game=game_with_moves)
+        assert encode_board(game_with_moves) == before
+
+
+class TestMoveEncoding:
+    """Test single-byte move messages."""
+
+    def test_all_moves_round_trip(self):
+        """Test every cell and player survives a round trip."""
+        for player in (constants.PLAYER_X, constants.PLAYER_O):
+            for row in range(constants.BOARD_SIZE):
+                for col in range(constants.BOARD_SIZE):
+                    move = encode_move(row, col, player)
+                    assert 0 <= move <= 0xFF
+                    assert decode_move(move) == (row, col, player)
+
+    def test_moves_are_distinct(self):
+        """Test no two moves share an encoding."""
+        moves = {
+            encode_move(row, col, player)
+            for player in (constants.PLAYER_X, constants.PLAYER_O)
+            for row in range(constants.BOARD_SIZE)
+            for col in range(constants.BOARD_SIZE)
+        }
+        assert len(moves) == 2 * constants.BOARD_SIZE**2